@@ -7,8 +7,12 @@ contact_content.py
 import os
 import re
 import sqlite3
+import threading
+from bisect import bisect_right
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from backup_analyzer import tracing
 
 
 # ──────────────────────────────
@@ -95,7 +99,7 @@ class ContactContentAnalyzer:
             return False, f"DB 파일이 없습니다: {self.db_path}"
 
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = tracing.connect(self.db_path)
             cur = conn.cursor()
 
             # ABPerson 기본 정보
@@ -148,3 +152,101 @@ class ContactContentAnalyzer:
             or k in c.org.lower()
             or k in c.phone.replace("-", "")
         ]
+
+
+# ──────────────────────────────
+# 전화번호 → 이름 (통화기록·iMessage 공용)
+# ──────────────────────────────
+class PhoneNameLookup:
+    """
+    In-memory replacement for the per-row
+    ``c16Phone LIKE '%digits%' LIMIT 1`` + ``ABPerson`` lookups that the
+    call-history and iMessage analyzers used to run. AddressBook is read
+    once; every c16Phone value is packed into one newline-delimited corpus
+    searched with ``str.find`` (first match in table order, like LIMIT 1).
+    """
+
+    __slots__ = ("db_path", "signature", "_text", "_starts", "_docids", "_names", "_memo")
+
+    def __init__(self, db_path: str, signature: Tuple[int, int] = (0, 0)):
+        self.db_path = db_path
+        self.signature = signature
+        self._text = "\n"
+        self._starts: List[int] = [1]
+        self._docids: List[int] = []
+        self._names: Dict[int, str] = {}
+        self._memo: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, db_path: str) -> Optional["PhoneNameLookup"]:
+        try:
+            st = os.stat(db_path)
+            conn = tracing.connect(f"file:{db_path}?mode=ro", uri=True)
+        except (OSError, sqlite3.Error):
+            return None
+        lookup = cls(db_path, (st.st_size, st.st_mtime_ns))
+        try:
+            cur = conn.cursor()
+            phones: List[str] = []
+            for docid, blob in cur.execute("SELECT docid, c16Phone FROM ABPersonFullTextSearch_content"):
+                lookup._docids.append(docid)
+                phones.append(str(blob or "").replace("\n", " "))
+            for rowid, first, last in cur.execute("SELECT ROWID, First, Last FROM ABPerson"):
+                lookup._names[rowid] = " ".join(p for p in (last, first) if p).strip()
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+        lookup._text = "\n" + "\n".join(phones) + "\n"
+        for phone in phones:
+            lookup._starts.append(lookup._starts[-1] + len(phone) + 1)
+        return lookup
+
+    def name_for(self, digits: str) -> str:
+        """Name of the first contact whose c16Phone contains *digits* ("" if none)."""
+        if not digits:
+            return ""
+        name = self._memo.get(digits)
+        if name is None:
+            pos = self._text.find(digits)
+            name = ""
+            if pos >= 0:
+                docid = self._docids[bisect_right(self._starts, pos) - 1]
+                name = self._names.get(docid, "")
+            self._memo[digits] = name
+        return name
+
+
+_LOOKUPS: Dict[str, PhoneNameLookup] = {}
+_LOOKUP_LOCK = threading.Lock()
+
+
+def _lookup_key(db_path: str) -> str:
+    return os.path.normcase(os.path.abspath(db_path))
+
+
+def get_phone_lookup(db_path: Optional[str]) -> Optional[PhoneNameLookup]:
+    """Shared :class:`PhoneNameLookup` of an AddressBook file (reloaded if it changed)."""
+    if not db_path:
+        return None
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    key = _lookup_key(db_path)
+    with _LOOKUP_LOCK:
+        lookup = _LOOKUPS.get(key)
+        if lookup is not None and lookup.signature == (st.st_size, st.st_mtime_ns):
+            return lookup
+        lookup = PhoneNameLookup.load(db_path)
+        if lookup is None:
+            _LOOKUPS.pop(key, None)
+        else:
+            _LOOKUPS[key] = lookup
+        return lookup
+
+
+def register_phone_lookup(lookup: PhoneNameLookup) -> None:
+    """Install a lookup built elsewhere (e.g. shipped to a worker process)."""
+    with _LOOKUP_LOCK:
+        _LOOKUPS[_lookup_key(lookup.db_path)] = lookup
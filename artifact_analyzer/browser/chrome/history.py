@@ -0,0 +1,61 @@
+from pathlib import Path
+from datetime import datetime
+
+from artifact_analyzer.browser.chrome.snss_parser import parse_snss_session
+from backup_analyzer.manifest_index import get_manifest_index
+
+# Chrome 세션 파일 fileID
+CHROME_SESSION_FILE_IDS = (
+    "fe90cf53890f383fb2b28ec36ac2b5d8a678eaec",   # 현재 탭
+    "27598ef0cedfcb929996cc6f9112a95ad1cd0fd7",   # 최종 탭
+)
+
+# ────────────────────────────────────────────────
+# Chrome SNSS-탭 → (title, url, timestamp) 리스트
+# ────────────────────────────────────────────────
+
+def _is_valid_web_url(url: str) -> bool:
+    """http/https 로 시작하고 chrome:// 등 내부 페이지·북마크·썸네일 제외"""
+    if not url:
+        return False
+    lowered = url.lower()
+    if not lowered.startswith(("http://", "https://")):
+        return False
+    if lowered.startswith((
+        "http://chrome://",
+        "https://chrome://",
+        "http://chrome-native://",
+        "https://chrome-native://",
+        "http://edge://",
+        "https://edge://",
+    )):
+        return False
+    if any(keyword in lowered for keyword in ("thumbnail", "썸네일", "bookmarks", "북마크")):
+        return False
+    return True
+
+
+def get_chrome_history(backup_path: str | Path):
+    """Chrome ‘현재 탭’·‘최종 탭’ 기록을 파싱해 (title, url, timestamp) 반환."""
+    backup_path = Path(backup_path)
+    index = get_manifest_index(str(backup_path))
+
+    records: list[tuple[str, str, int | float | str | datetime]] = []
+
+    def _append_records(snss_file: Path | None):
+        if snss_file is None or not snss_file.exists():
+            return
+        for rec in parse_snss_session(snss_file):
+            url = rec.get("url", "")
+            if not _is_valid_web_url(url):
+                continue
+            title = rec.get("title") or ""
+            records.append((title, url, rec.get("timestamp")))
+
+    for file_id in CHROME_SESSION_FILE_IDS:
+        if index is not None:
+            blob = index.blob_path(file_id)
+            _append_records(Path(blob) if blob else None)
+        else:
+            _append_records(backup_path / file_id[:2] / file_id)
+    return records
@@ -1,6 +1,7 @@
 import os
 import sqlite3
 from backup_analyzer.backuphelper import BackupPathHelper
+from backup_analyzer import tracing
 
 def find_safari_bookmarks(backup_path=None):
     """
@@ -47,7 +48,7 @@ def get_safari_bookmarks(backup_path=None):
         return "Safari 북마크 데이터베이스를 찾을 수 없습니다."
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = tracing.connect(db_path)
         cursor = conn.cursor()
         cursor.execute("""
                         WITH RECURSIVE FolderHierarchy AS (
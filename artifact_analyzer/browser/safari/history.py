@@ -1,7 +1,7 @@
 import os
-import sqlite3
 import datetime
 from backup_analyzer.backuphelper import BackupPathHelper
+from backup_analyzer import tracing
 
 def find_safari_history(backup_path=None):
     """
@@ -38,7 +38,7 @@ def get_safari_history(backup_path=None):
         return "Safari 기록 데이터베이스를 찾을 수 없습니다."
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = tracing.connect(db_path)
         cursor = conn.cursor()
         cursor.execute("""SELECT url, title, visit_time
                         FROM history_visits
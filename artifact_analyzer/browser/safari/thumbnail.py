@@ -1,6 +1,7 @@
 import os
 import io
 from PIL import Image, ImageTk
+from artifact_analyzer.media.image_decode import open_image
 from backup_analyzer.backuphelper import BackupPathHelper
 
 def find_safari_thumbnails(backup_path):
@@ -61,10 +62,12 @@ def get_safari_thumbnails(backup_path=None, max_thumbnails=50):
         # 지정된 개수만큼 썸네일 정보 수집
         for img_path in image_files[:max_thumbnails]:
             try:
-                with Image.open(img_path) as img:
-                    # 원본 이미지 크기 저장
-                    original_size = img.size
+                # 원본 이미지 크기 저장 (헤더만 읽음)
+                with Image.open(img_path) as probe:
+                    original_size = probe.size
 
+                # 표시 크기만큼만 디코딩 (JPEG 는 draft 축소)
+                with open_image(img_path, (200, 350)) as img:
                     # GUI 표시용 작은 썸네일 생성 
                     img.thumbnail((200, 350), Image.LANCZOS)
 
@@ -3,6 +3,9 @@ import sqlite3
 from datetime import datetime
 import pandas as pd
 
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer import tracing
+
 
 class BackupPathHelper:
     """
@@ -15,31 +18,21 @@ class BackupPathHelper:
     def get_file_path_from_manifest(self, relative_path: str) -> str:
         """Return the absolute path to a file referenced in Manifest.db or ``None`` if it
         cannot be resolved."""
-        manifest_path = os.path.join(self.backup_path, "Manifest.db")
-        if not os.path.exists(manifest_path):
-            print(f"[Error] Manifest.db not found: {manifest_path}")
+        index = get_manifest_index(self.backup_path)
+        if index is None:
+            print(f"[Error] Manifest.db not found: {os.path.join(self.backup_path, 'Manifest.db')}")
             return None
 
-        try:
-            with sqlite3.connect(manifest_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT fileID FROM Files WHERE relativePath = ?", (relative_path,)
-                )
-                result = cursor.fetchone()
-
-            if result:
-                file_hash = result[0]
-                file_path = os.path.join(self.backup_path, file_hash[:2], file_hash)
-                if os.path.exists(file_path):
-                    return file_path
-                print(
-                    f"[Warning] Hash listed in Manifest.db but file is missing on disk: {file_path}"
-                )
-            else:
-                print(f"[Warning] {relative_path} not found in Manifest.db")
-        except Exception as e:
-            print(f"[Error] Failed to query Manifest.db: {e}")
+        file_hash = index.file_id_by_rel_path(relative_path)
+        if file_hash:
+            file_path = index.blob_path(file_hash)
+            if file_path and os.path.exists(file_path):
+                return file_path
+            print(
+                f"[Warning] Hash listed in Manifest.db but file is missing on disk: {file_path}"
+            )
+        else:
+            print(f"[Warning] {relative_path} not found in Manifest.db")
         return None
 
 
@@ -79,7 +72,7 @@ class CalendarAnalyser:
 
         try:
             # Open read‑only to avoid accidental mutations
-            self.conn = sqlite3.connect(f"file:{calendar_db_path}?mode=ro", uri=True)
+            self.conn = tracing.connect(f"file:{calendar_db_path}?mode=ro", uri=True)
             self.conn.row_factory = sqlite3.Row
             # print(f"[Success] Connected to calendar DB: {calendar_db_path}")
             return True
@@ -118,20 +111,7 @@ class CalendarAnalyser:
     # ---------------------------------------------------------------------
     # Public API
     # ---------------------------------------------------------------------
-    def get_events_for_month(self, year: int, month: int) -> pd.DataFrame:
-        """Return a ``DataFrame`` with all events that **start** in ``year``/``month``."""
-        if not self.conn and not self.connect_to_db():
-            return pd.DataFrame()
-
-        try:
-            from calendar import monthrange
-
-            start_date = datetime(year, month, 1)
-            end_date = datetime(year, month, monthrange(year, month)[1], 23, 59, 59)
-            start_ts = start_date.timestamp() - self.IOS_EPOCH
-            end_ts = end_date.timestamp() - self.IOS_EPOCH
-
-            query = """
+    EVENTS_SQL = """
             SELECT ci.ROWID                AS event_id,
                    ci.summary,
                    ci.start_date,
@@ -144,9 +124,40 @@ class CalendarAnalyser:
                    c.symbolic_color_name
             FROM   CalendarItem ci
                    LEFT JOIN Calendar c ON ci.calendar_id = c.ROWID
-            WHERE  ci.start_date BETWEEN ? AND ?
+            {where}
             ORDER  BY ci.start_date;
             """
+
+    def get_all_events(self) -> pd.DataFrame:
+        """Return a ``DataFrame`` with every event in the calendar database."""
+        if not self.conn and not self.connect_to_db():
+            return pd.DataFrame()
+
+        try:
+            df = pd.read_sql_query(self.EVENTS_SQL.format(where=""), self.conn)
+            df["start_date"] = df["start_date"].apply(self._convert_date)
+            df["end_date"] = df["end_date"].apply(self._convert_date)
+            return df
+        except Exception as e:
+            print(f"[Error] Failed to query events: {e}")
+            return pd.DataFrame()
+
+    def get_events_for_month(self, year: int, month: int) -> pd.DataFrame:
+        """Return a ``DataFrame`` with all events that **start** in ``year``/``month``."""
+        if not self.conn and not self.connect_to_db():
+            return pd.DataFrame()
+
+        try:
+            from calendar import monthrange
+
+            start_date = datetime(year, month, 1)
+            end_date = datetime(year, month, monthrange(year, month)[1], 23, 59, 59)
+            start_ts = start_date.timestamp() - self.IOS_EPOCH
+            end_ts = end_date.timestamp() - self.IOS_EPOCH
+
+            query = self.EVENTS_SQL.format(
+                where="WHERE  ci.start_date BETWEEN ? AND ?"
+            )
             df = pd.read_sql_query(query, self.conn, params=(start_ts, end_ts))
             df["start_date"] = df["start_date"].apply(self._convert_date)
             df["end_date"] = df["end_date"].apply(self._convert_date)
@@ -1,10 +1,12 @@
 import os
-import sqlite3
 import base64
 import json
 from datetime import datetime
 from typing import List, Optional, Tuple
 
+from artifact_analyzer.addressbook.addressbook_analyzer import get_phone_lookup
+from backup_analyzer import tracing
+
 MAC_EPOCH_OFFSET = 978307200  # 2001-01-01 00:00:00 UTC
 
 
@@ -126,7 +128,7 @@ class CallHistoryAnalyzer:
             return False, msg
 
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = tracing.connect(self.db_path)
             cur = conn.cursor()
             cur.execute(
                 """
@@ -155,45 +157,15 @@ class CallHistoryAnalyzer:
 
     # 이름 보완
     def _patch_missing_names(self):
-        contacts_db = self._resolve_contacts_path()
-        if not contacts_db:
+        lookup = get_phone_lookup(self._resolve_contacts_path())
+        if lookup is None:
             return
-        try:
-            conn = sqlite3.connect(contacts_db)
-            cur = conn.cursor()
-            for rec in self.call_records:
-                if rec.zname:
-                    continue
-                digits = self._digits_only(rec.phone_number or rec.zvalue)
-                if not digits:
-                    continue
-                cur.execute(
-                    """
-                    SELECT docid
-                    FROM ABPersonFullTextSearch_content
-                    WHERE c16Phone LIKE ?
-                    LIMIT 1;
-                    """,
-                    (f"%{digits}%",),
-                )
-                row = cur.fetchone()
-                if not row:
-                    continue
-                docid = row[0]
-                cur.execute(
-                    "SELECT First, Last FROM ABPerson WHERE ROWID = ? LIMIT 1;",
-                    (docid,),
-                )
-                person = cur.fetchone()
-                if not person:
-                    continue
-                first, last = person
-                patched = " ".join(p for p in (last, first) if p).strip()
-                if patched:
-                    rec.zname = patched
-            conn.close()
-        except Exception:
-            pass  # 무시
+        for rec in self.call_records:
+            if rec.zname:
+                continue
+            patched = lookup.name_for(self._digits_only(rec.phone_number or rec.zvalue))
+            if patched:
+                rec.zname = patched
 
     @staticmethod
     def _digits_only(text: str) -> str:
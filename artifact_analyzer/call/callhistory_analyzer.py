@@ -12,6 +12,9 @@ from datetime import datetime
 import pandas as pd
 from typing import Optional, List, Dict, Tuple, Union, Any
 
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer import tracing
+
 
 class BackupPathHelper:
     """
@@ -26,31 +29,21 @@ class BackupPathHelper:
         Manifest.db에서 참조된 파일의 절대 경로를 반환하거나 
         찾을 수 없는 경우 None을 반환
         """
-        manifest_path = os.path.join(self.backup_path, "Manifest.db")
-        if not os.path.exists(manifest_path):
-            print(f"[Error] Manifest.db를 찾을 수 없습니다: {manifest_path}")
+        index = get_manifest_index(self.backup_path)
+        if index is None:
+            print(f"[Error] Manifest.db를 찾을 수 없습니다: {os.path.join(self.backup_path, 'Manifest.db')}")
             return None
 
-        try:
-            with sqlite3.connect(manifest_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT fileID FROM Files WHERE relativePath = ?", (relative_path,)
-                )
-                result = cursor.fetchone()
-
-            if result:
-                file_hash = result[0]
-                file_path = os.path.join(self.backup_path, file_hash[:2], file_hash)
-                if os.path.exists(file_path):
-                    return file_path
-                print(
-                    f"[Warning] 해시가 Manifest.db에 있지만 파일이 디스크에 없습니다: {file_path}"
-                )
-            else:
-                print(f"[Warning] {relative_path}를 Manifest.db에서 찾을 수 없습니다")
-        except Exception as e:
-            print(f"[Error] Manifest.db 쿼리 실패: {e}")
+        file_hash = index.file_id_by_rel_path(relative_path)
+        if file_hash:
+            file_path = index.blob_path(file_hash)
+            if file_path and os.path.exists(file_path):
+                return file_path
+            print(
+                f"[Warning] 해시가 Manifest.db에 있지만 파일이 디스크에 없습니다: {file_path}"
+            )
+        else:
+            print(f"[Warning] {relative_path}를 Manifest.db에서 찾을 수 없습니다")
         return None
 
 
@@ -99,7 +92,7 @@ class CallHistoryAnalyzer:
 
         try:
             # 실수로 변경되는 것을 방지하기 위해 읽기 전용으로 열기
-            self.conn = sqlite3.connect(f"file:{callhistory_db_path}?mode=ro", uri=True)
+            self.conn = tracing.connect(f"file:{callhistory_db_path}?mode=ro", uri=True)
             self.conn.row_factory = sqlite3.Row
             return True
         except sqlite3.Error as e:
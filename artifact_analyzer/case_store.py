@@ -0,0 +1,826 @@
+"""
+Per-backup case store: one normalized SQLite database of every extracted artifact.
+
+``<backup>/.case_store.sqlite`` is written by the ``ArtifactOrchestrator``
+in one transaction per run and holds two views of each artifact:
+
+* normalized tables – ``contacts``, ``calls``, ``conversations``,
+  ``participants``, ``messages``, ``notes``, ``events``,
+  ``browser_visits``, ``device_info`` plus ``files`` / ``media`` from the
+  ``ManifestIndex`` – with every timestamp as UTC epoch seconds and phone
+  numbers reduced to comparable digits, so panels, exports and cross-artifact queries
+  (timelines, everything known about one number) run on indexes;
+* ``artifacts`` – status, record count and a compressed snapshot of the
+  analyzer result, from which a re-opened case is published instantly
+  without re-running any analyzer.
+
+Snapshots are JSON with an allowlist of analyzer / DTO classes (never
+pickle: the sidecar sits in an evidence folder and must not be able to run
+code when a case is opened). The store is discarded and rebuilt when the
+Manifest.db fingerprint, the backup location or the schema version changes.
+
+Successive backups of one device are analysed incrementally: each artifact
+records the (fileID, size, mtime) of the files it read, and a new backup
+reuses the previous case's result – found in the old store of the same
+folder or, by UniqueDeviceID, under ``~/.ios_forensic/cases`` – for every
+artifact whose source files are unchanged.
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import datetime as _dt
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from artifact_analyzer.orchestrator import STATUS_MISSING, STATUS_OK, JobResult
+from backup_analyzer.manifest_cache import manifest_fingerprint
+from backup_analyzer.manifest_index import FLAG_FILE, ManifestIndex
+
+CASE_STORE_FILE_NAME = ".case_store.sqlite"
+CASE_STORE_VERSION = 2
+
+MAC_EPOCH_OFFSET = 978307200           # 2001-01-01 – 1970-01-01 (초)
+KST = _dt.timezone(_dt.timedelta(hours=9))
+_TEXT_TIME = "%Y-%m-%d %H:%M:%S"
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".heic", ".dng")
+VIDEO_EXTS = (".mov", ".mp4")
+
+
+# ─────────────────────────────────────────────────────────────────
+# 스키마
+# ─────────────────────────────────────────────────────────────────
+# 아티팩트 테이블은 모두 첫 컬럼이 artifact (JOBS 이름) – 아티팩트 단위 교체
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "device_info":    ("artifact", "key", "value"),
+    "contacts":       ("artifact", "contact_id", "name", "first", "last", "org",
+                       "phone", "phone_digits", "created_ts", "modified_ts"),
+    "calls":          ("artifact", "call_id", "phone", "phone_digits", "name",
+                       "direction", "ts", "duration", "service"),
+    "conversations":  ("artifact", "conv_key", "title", "last_ts"),
+    "participants":   ("artifact", "conv_key", "handle", "handle_digits", "name"),
+    "messages":       ("artifact", "conv_key", "ts", "sender", "direction", "body", "attachment"),
+    "notes":          ("artifact", "note_id", "title", "snippet", "created_ts", "modified_ts"),
+    "events":         ("artifact", "event_id", "title", "start_ts", "end_ts", "all_day",
+                       "calendar", "location_id", "description"),
+    "browser_visits": ("artifact", "kind", "title", "url", "ts", "folder"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS artifacts (
+    name TEXT PRIMARY KEY, status TEXT NOT NULL, count INTEGER, error TEXT,
+    elapsed REAL, payload BLOB, updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS artifact_sources (
+    artifact TEXT NOT NULL, file_id TEXT, size INTEGER, mtime INTEGER
+);
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY, domain TEXT, rel_path TEXT,
+    size INTEGER, mtime INTEGER, birth INTEGER, trashed INTEGER
+);
+CREATE TABLE IF NOT EXISTS media (
+    file_id TEXT PRIMARY KEY, domain TEXT, rel_path TEXT, kind TEXT,
+    size INTEGER, mtime INTEGER, birth INTEGER, trashed INTEGER
+);
+""" + "".join(
+    f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(cols)});\n" for table, cols in TABLES.items()
+)
+
+# 대량 삽입 뒤에 만든다
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS ix_sources ON artifact_sources (artifact);
+CREATE INDEX IF NOT EXISTS ix_contacts_digits ON contacts (phone_digits);
+CREATE INDEX IF NOT EXISTS ix_calls_ts ON calls (ts);
+CREATE INDEX IF NOT EXISTS ix_calls_digits ON calls (phone_digits);
+CREATE INDEX IF NOT EXISTS ix_conversations ON conversations (artifact, conv_key);
+CREATE INDEX IF NOT EXISTS ix_participants_digits ON participants (handle_digits);
+CREATE INDEX IF NOT EXISTS ix_participants_conv ON participants (artifact, conv_key);
+CREATE INDEX IF NOT EXISTS ix_messages_conv ON messages (artifact, conv_key, ts);
+CREATE INDEX IF NOT EXISTS ix_messages_ts ON messages (ts);
+CREATE INDEX IF NOT EXISTS ix_notes_modified ON notes (modified_ts);
+CREATE INDEX IF NOT EXISTS ix_events_start ON events (start_ts);
+CREATE INDEX IF NOT EXISTS ix_browser_ts ON browser_visits (ts);
+CREATE INDEX IF NOT EXISTS ix_browser_url ON browser_visits (url);
+CREATE INDEX IF NOT EXISTS ix_files_path ON files (domain, rel_path);
+CREATE INDEX IF NOT EXISTS ix_media_kind ON media (kind, mtime);
+"""
+
+
+# ─────────────────────────────────────────────────────────────────
+# 스냅샷 코덱 (허용 목록 기반 JSON)
+# ─────────────────────────────────────────────────────────────────
+SNAPSHOT_CLASSES = frozenset((
+    "artifact_analyzer.addressbook.addressbook_analyzer:ContactContentAnalyzer",
+    "artifact_analyzer.addressbook.addressbook_analyzer:ContactRow",
+    "artifact_analyzer.call.call_history:CallHistoryAnalyzer",
+    "artifact_analyzer.call.call_history:CallRecord",
+    "artifact_analyzer.messenger.sms.sms_analyser:IMessageAnalyzer",
+    "artifact_analyzer.messenger.sms.sms_analyser:ChatRow",
+    "artifact_analyzer.messenger.line.line_analyzer:LineAnalyzer",
+    "artifact_analyzer.messenger.line.line_analyzer:ChatRow",
+    "artifact_analyzer.messenger.kakaotalk.kakaotalk_analyzer:KakaoTalkAnalyzer",
+    "artifact_analyzer.messenger.kakaotalk.kakaotalk_analyzer:BackupPathHelper",
+))
+
+
+def _object_state(obj: Any) -> Dict[str, Any]:
+    state = dict(getattr(obj, "__dict__", {}))
+    for klass in type(obj).__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if name not in state and hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
+
+
+def encode_value(value: Any) -> Any:
+    """Analyzer result → JSON-compatible tree (TypeError for anything not allowlisted)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [encode_value(v) for v in value]
+    if isinstance(value, tuple):
+        return {"$t": [encode_value(v) for v in value]}
+    if isinstance(value, dict):
+        if all(isinstance(k, str) and not k.startswith("$") for k in value):
+            return {k: encode_value(v) for k, v in value.items()}
+        return {"$map": [[encode_value(k), encode_value(v)] for k, v in value.items()]}
+    if type(value).__name__ == "NaTType":                                 # pandas.NaT
+        return None
+    if isinstance(value, _dt.datetime):                                   # pandas.Timestamp 포함
+        if hasattr(value, "to_pydatetime"):
+            value = value.to_pydatetime()
+        return {"$dt": value.isoformat()}
+    if isinstance(value, _dt.date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$b": base64.b64encode(bytes(value)).decode("ascii")}
+    if hasattr(value, "to_dict") and hasattr(value, "columns"):          # pandas.DataFrame
+        return {"$df": {
+            "columns": [str(c) for c in value.columns],
+            "data": [[encode_value(v) for v in row] for row in value.itertuples(index=False, name=None)],
+        }}
+    if hasattr(value, "item") and not hasattr(value, "__len__"):         # numpy scalar
+        return encode_value(value.item())
+    name = f"{type(value).__module__}:{type(value).__qualname__}"
+    if name not in SNAPSHOT_CLASSES:
+        raise TypeError(f"{name} cannot be stored in the case store")
+    return {"$obj": name, "state": {k: encode_value(v) for k, v in _object_state(value).items()}}
+
+
+def decode_value(data: Any, rebase: Optional[Tuple[str, str]] = None) -> Any:
+    """
+    Inverse of :func:`encode_value`; only allowlisted classes are instantiated.
+    *rebase* ``(old_root, new_root)`` moves paths recorded under another
+    backup folder (a previous case of the same device) to this one.
+    """
+    if isinstance(data, str):
+        if rebase is not None and data.startswith(rebase[0]):
+            rest = data[len(rebase[0]):]
+            if not rest or rest[0] in ("/", os.sep):
+                return rebase[1] + rest
+        return data
+    if isinstance(data, list):
+        return [decode_value(v, rebase) for v in data]
+    if not isinstance(data, dict):
+        return data
+    if "$t" in data:
+        return tuple(decode_value(v, rebase) for v in data["$t"])
+    if "$map" in data:
+        return {decode_value(k, rebase): decode_value(v, rebase) for k, v in data["$map"]}
+    if "$dt" in data:
+        return _dt.datetime.fromisoformat(data["$dt"])
+    if "$d" in data:
+        return _dt.date.fromisoformat(data["$d"])
+    if "$b" in data:
+        return base64.b64decode(data["$b"])
+    if "$df" in data:
+        import pandas as pd
+
+        frame = data["$df"]
+        return pd.DataFrame([[decode_value(v, rebase) for v in row] for row in frame["data"]],
+                            columns=frame["columns"])
+    if "$obj" in data:
+        name = data["$obj"]
+        if name not in SNAPSHOT_CLASSES:
+            raise ValueError(f"{name} is not an allowed case store class")
+        module, _, qualname = name.partition(":")
+        klass = getattr(importlib.import_module(module), qualname)
+        obj = klass.__new__(klass)
+        for key, value in data["state"].items():
+            object.__setattr__(obj, key, decode_value(value, rebase))
+        return obj
+    return {k: decode_value(v, rebase) for k, v in data.items()}
+
+
+def pack_payload(value: Any) -> bytes:
+    return zlib.compress(json.dumps(encode_value(value), ensure_ascii=False).encode("utf-8"), 6)
+
+
+def unpack_payload(blob: bytes, rebase: Optional[Tuple[str, str]] = None) -> Any:
+    return decode_value(json.loads(zlib.decompress(blob).decode("utf-8")), rebase)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 시간·번호 정규화
+# ─────────────────────────────────────────────────────────────────
+def phone_key(text: Any) -> str:
+    """Digits of a phone number with the +82 country code folded to the leading 0."""
+    digits = "".join(ch for ch in str(text or "") if ch.isdigit())
+    if digits.startswith("82") and len(digits) >= 11:
+        digits = "0" + digits[2:]
+    return digits
+
+
+def mac_ts(seconds: Any) -> Optional[float]:
+    """Apple absolute seconds → UTC epoch (0 / empty → None)."""
+    try:
+        seconds = float(seconds)
+    except (TypeError, ValueError):
+        return None
+    if seconds != seconds or not seconds:                                 # NaN / 0
+        return None
+    return seconds + MAC_EPOCH_OFFSET
+
+
+def text_ts(text: Any, tz: Optional[_dt.tzinfo]) -> Optional[float]:
+    """``YYYY-MM-DD HH:MM:SS`` in *tz* (None = local time) → UTC epoch."""
+    try:
+        parsed = _dt.datetime.strptime(str(text), _TEXT_TIME)
+    except (TypeError, ValueError):
+        return None
+    if tz is not None:
+        parsed = parsed.replace(tzinfo=tz)
+    return _safe_timestamp(parsed)
+
+
+def datetime_ts(value: Any, naive_utc: bool = False) -> Optional[float]:
+    """datetime / pandas.Timestamp → UTC epoch; naive values are local (or UTC)."""
+    if not isinstance(value, _dt.datetime) or type(value).__name__ == "NaTType":
+        return None
+    if hasattr(value, "to_pydatetime"):
+        value = value.to_pydatetime()
+    if value.tzinfo is None and naive_utc:
+        value = value.replace(tzinfo=_dt.timezone.utc)
+    return _safe_timestamp(value)
+
+
+def _safe_timestamp(value: _dt.datetime) -> Optional[float]:
+    try:
+        return value.timestamp()
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return str(value)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 아티팩트 → 정규화 행
+# ─────────────────────────────────────────────────────────────────
+Rows = Dict[str, List[tuple]]
+
+
+def _rows_device_info(info: Dict[str, Any]) -> Rows:
+    return {"device_info": [(key, _text(value)) for key, value in info.items()]}
+
+
+def _rows_contacts(analyzer) -> Rows:
+    return {"contacts": [
+        (c.rowid, c.full_name, c.first, c.last, c.org, c.phone, phone_key(c.phone),
+         mac_ts(c.created_raw), mac_ts(c.modified_raw))
+        for c in analyzer.contacts
+    ]}
+
+
+def _rows_call_history(analyzer) -> Rows:
+    return {"calls": [
+        (r.z_pk, r.phone_number, phone_key(r.phone_number), r.zname or r.caller_name,
+         r.direction, mac_ts(r.zdate), r.zduration, r.service)
+        for r in analyzer.call_records
+    ]}
+
+
+def _rows_imessage(analyzer) -> Rows:
+    rows: Rows = {"conversations": [], "participants": [], "messages": []}
+    for chat in analyzer.rows:
+        key = str(chat.chat_id)
+        messages = analyzer.message_cache.get(chat.chat_id) or []
+        stamps = [text_ts(m["datetime"], KST) for m in messages]
+        rows["conversations"].append((key, chat.name or chat.identifier,
+                                      max((s for s in stamps if s is not None), default=None)))
+        rows["participants"].append((key, chat.identifier, phone_key(chat.identifier), chat.name))
+        for m, ts in zip(messages, stamps):
+            outgoing = m["direction"] == "발신"
+            rows["messages"].append((
+                key, ts, "me" if outgoing else chat.identifier,
+                "out" if outgoing else "in", m["body"], m["attachment"] or None,
+            ))
+    return rows
+
+
+def _rows_line(analyzer) -> Rows:
+    rows: Rows = {"conversations": [], "participants": [], "messages": []}
+    for chat in analyzer.rows:
+        key = str(chat.chat_id)
+        messages = analyzer.message_cache.get(chat.chat_id) or []
+        rows["conversations"].append((key, chat.display_name, mac_ts(chat.last_send_raw)))
+        senders = {m["sender_id"]: m["sender_name"] for m in messages if m["sender_id"]}
+        rows["participants"].extend((key, str(uid), None, name) for uid, name in senders.items())
+        rows["messages"].extend(
+            (key, text_ts(m["send_time"], None), m["sender_name"],
+             "in" if m["sender_id"] else "out", m["message"], None)
+            for m in messages
+        )
+    return rows
+
+
+def _rows_kakaotalk(analyzer) -> Rows:
+    rows: Rows = {"conversations": [], "participants": [], "messages": []}
+    for conv in analyzer.conversation_cache or ():
+        key = str(conv["chatId"])
+        messages = analyzer.message_cache.get(conv["chatId"]) or []
+        stamps = [datetime_ts(m["sentAt"], naive_utc=True) for m in messages]
+        rows["conversations"].append((key, conv["formatted_id"],
+                                      max((s for s in stamps if s is not None), default=None)))
+        users = {m["userId"] for m in messages if not m["is_from_me"]}
+        rows["participants"].extend((key, str(uid), None, None) for uid in sorted(users, key=str))
+        rows["messages"].extend(
+            (key, ts, "me" if m["is_from_me"] else str(m["userId"]),
+             "out" if m["is_from_me"] else "in", m["message"],
+             "\n".join(p for p in m["attachment_list"] if p) or None)
+            for m, ts in zip(messages, stamps)
+        )
+    return rows
+
+
+def _rows_instagram_dm(value: Dict[str, Any]) -> Rows:
+    rows: Rows = {"conversations": [], "participants": [], "messages": []}
+    seen: Dict[str, set] = {}
+    for m in value["messages"]:
+        key = f"{m.get('db_name', '')}/{m['채팅방']}"
+        users = seen.get(key)
+        if users is None:
+            users = seen[key] = set()
+            rows["conversations"].append((key, m["채팅방"], None))
+        if m["사용자"] not in users:
+            users.add(m["사용자"])
+            rows["participants"].append((key, m["사용자"], None, m["사용자"]))
+        rows["messages"].append((key, text_ts(m["시간"], KST), m["사용자"], None, m["문자내용"], None))
+    return rows
+
+
+def _rows_notes(frame) -> Rows:
+    if frame is None or frame.empty:
+        return {"notes": []}
+    get = lambda rec, col: rec.get(col)                                   # noqa: E731
+    return {"notes": [
+        (_text(get(rec, "uuid")), _text(get(rec, "title")), _text(get(rec, "내용 미리보기")),
+         mac_ts(get(rec, "생성일(raw)")), mac_ts(get(rec, "수정일(raw)")))
+        for rec in frame.to_dict(orient="records")
+    ]}
+
+
+def _rows_calendar(frame) -> Rows:
+    if frame is None or frame.empty:
+        return {"events": []}
+    return {"events": [
+        (rec.get("event_id"), _text(rec.get("summary")), datetime_ts(rec.get("start_date")),
+         datetime_ts(rec.get("end_date")), rec.get("all_day"), _text(rec.get("calendar_title")),
+         rec.get("location_id"), _text(rec.get("description")))
+        for rec in frame.to_dict(orient="records")
+    ]}
+
+
+def _rows_safari(value: Dict[str, Any]) -> Rows:
+    visits = []
+    if not isinstance(value["history"], str):
+        visits.extend(("history", title, url, text_ts(when, _dt.timezone.utc), None)
+                      for title, url, when in value["history"])
+    if not isinstance(value["bookmarks"], str):
+        visits.extend(("bookmark", title, url, None, folder)
+                      for folder, title, url in value["bookmarks"])
+    return {"browser_visits": visits}
+
+
+def _rows_chrome(records) -> Rows:
+    return {"browser_visits": [
+        ("tab", title, url, datetime_ts(when, naive_utc=True), None) for title, url, when in records
+    ]}
+
+
+NORMALIZERS: Dict[str, Callable[[Any], Rows]] = {
+    "device_info": _rows_device_info,
+    "contacts": _rows_contacts,
+    "call_history": _rows_call_history,
+    "imessage": _rows_imessage,
+    "kakaotalk": _rows_kakaotalk,
+    "line": _rows_line,
+    "notes": _rows_notes,
+    "calendar": _rows_calendar,
+    "instagram_dm": _rows_instagram_dm,
+    "safari": _rows_safari,
+    "chrome": _rows_chrome,
+}
+
+
+def _manifest_rows(index: ManifestIndex) -> Tuple[Iterable[tuple], Iterable[tuple]]:
+    files, media = [], []
+    for row in range(len(index)):
+        if index.row_flags(row) != FLAG_FILE:
+            continue
+        domain, rel_path = index.row_domain(row), index.row_rel_path(row)
+        record = (index.row_file_id(row), domain, rel_path, index.row_size(row),
+                  index.row_mtime(row), index.row_birth(row), int(index.row_trashed(row)))
+        files.append(record)
+        lowered = rel_path.lower()
+        if "CameraRollDomain" in domain and "Media/DCIM" in rel_path:
+            kind = "image" if lowered.endswith(IMAGE_EXTS) else "video" if lowered.endswith(VIDEO_EXTS) else None
+            if kind:
+                media.append(record[:3] + (kind,) + record[3:])
+    return files, media
+
+
+Signature = List[Tuple[str, Optional[int], Optional[int]]]   # (fileID, size, mtime)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 저장된 결과 읽기
+# ─────────────────────────────────────────────────────────────────
+def _read_meta(path: str) -> Dict[str, str]:
+    try:
+        with contextlib.closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)) as conn:
+            return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+    except sqlite3.Error:
+        return {}
+
+
+def _as_rows(signature: Signature) -> List[tuple]:
+    return sorted(tuple(source) for source in signature)
+
+
+def _source_signatures(conn: sqlite3.Connection, names: Sequence[str]) -> Dict[str, List[tuple]]:
+    """Recorded source files of *names* (artifacts recorded without sources are left out)."""
+    recorded = {name for (name,) in conn.execute(
+        f"SELECT name FROM artifacts WHERE name IN ({', '.join('?' * len(names))})", list(names))}
+    out: Dict[str, List[tuple]] = {name: [] for name in recorded}
+    for name, file_id, size, mtime in conn.execute(
+        f"SELECT artifact, file_id, size, mtime FROM artifact_sources "
+        f"WHERE artifact IN ({', '.join('?' * len(names))})", list(names),
+    ):
+        out.setdefault(name, []).append((file_id, size, mtime))
+    return {name: sorted(rows) for name, rows in out.items()}
+
+
+def _stored_results(
+    conn: sqlite3.Connection, names: Sequence[str], rebase: Optional[Tuple[str, str]] = None,
+) -> Dict[str, JobResult]:
+    """``ok`` (with a snapshot) and ``missing`` results of *names* as published JobResults."""
+    if not names:
+        return {}
+    rows = conn.execute(
+        f"SELECT name, status, count, error, payload FROM artifacts "
+        f"WHERE name IN ({', '.join('?' * len(names))})", list(names),
+    ).fetchall()
+    results: Dict[str, JobResult] = {}
+    for name, status, count, error, payload in rows:
+        if status not in (STATUS_OK, STATUS_MISSING) or (status == STATUS_OK and payload is None):
+            continue
+        started = time.perf_counter()
+        result = JobResult(name, status)
+        result.count, result.error, result.cached = count or 0, error, True
+        if payload is not None:
+            try:
+                result.value = unpack_payload(payload, rebase)
+            except Exception as e:
+                print(f"[CaseStore] {name}: snapshot unreadable – {e}")
+                continue
+        result.elapsed = time.perf_counter() - started
+        results[name] = result
+    return results
+
+
+# ─────────────────────────────────────────────────────────────────
+# 저장소
+# ─────────────────────────────────────────────────────────────────
+class CaseStore:
+    """The ``.case_store.sqlite`` of one backup."""
+
+    __slots__ = ("backup_path", "path", "fingerprint", "device_id", "previous", "_lock")
+
+    def __init__(self, backup_path: str):
+        self.backup_path = backup_path
+        self.path = os.path.join(backup_path, CASE_STORE_FILE_NAME)
+        self.fingerprint = manifest_fingerprint(backup_path)
+        self.device_id = device_id(backup_path)
+        self.previous: Optional[str] = None        # load_previous() 가 재사용한 사례
+        self._lock = threading.Lock()
+
+    def _connect(self, path: Optional[str] = None) -> sqlite3.Connection:
+        conn = sqlite3.connect(path or self.path, timeout=30)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _expected_meta(self) -> Dict[str, str]:
+        return {
+            "version": str(CASE_STORE_VERSION),
+            "manifest": json.dumps(self.fingerprint),
+            "backup_path": _registry_key(self.backup_path),
+        }
+
+    def is_current(self) -> bool:
+        """True when the file exists and was written for this Manifest.db / location."""
+        if self.fingerprint is None or not os.path.exists(self.path):
+            return False
+        meta = _read_meta(self.path)
+        return all(meta.get(k) == v for k, v in self._expected_meta().items())
+
+    # ── 쓰기 ────────────────────────────────────────────────────
+    def write_results(
+        self,
+        results: Sequence[JobResult],
+        index: Optional[ManifestIndex] = None,
+        signatures: Optional[Dict[str, Signature]] = None,
+    ) -> int:
+        """
+        Replace the rows of every artifact in *results* in one transaction and
+        record the source files each was read from (*signatures*). A stale
+        store is rebuilt in a new file that replaces the old one on commit.
+        Returns the rows written.
+        """
+        if self.fingerprint is None:
+            return 0
+        started = time.perf_counter()
+        written = 0
+        signatures = signatures or {}
+        with self._lock:
+            fresh = not self.is_current()
+            target = self.path + ".new" if fresh else self.path
+            if fresh:
+                for suffix in ("", "-journal"):
+                    if os.path.exists(target + suffix):
+                        os.remove(target + suffix)
+            conn = self._connect(target)
+            try:
+                conn.executescript(_SCHEMA)
+                with conn:                                   # 하나의 트랜잭션
+                    if fresh and index is not None:
+                        files, media = _manifest_rows(index)
+                        conn.executemany("INSERT OR REPLACE INTO files VALUES (?,?,?,?,?,?,?)", files)
+                        conn.executemany("INSERT OR REPLACE INTO media VALUES (?,?,?,?,?,?,?,?)", media)
+                    for result in results:
+                        written += self._replace_artifact(conn, result, signatures.get(result.name))
+                    conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                        *self._expected_meta().items(),
+                        ("backup_root", os.path.abspath(self.backup_path)),
+                        ("device_id", self.device_id or ""),
+                    ])
+                conn.executescript(_INDEXES)
+            finally:
+                conn.close()
+            if fresh:
+                os.replace(target, self.path)
+        if self.device_id:
+            remember_case(self.device_id, self.path)
+        print(f"[CaseStore] {self.path}: {len(results)} artifacts, {written:,} rows "
+              f"in {time.perf_counter() - started:.2f}s")
+        return written
+
+    def _replace_artifact(
+        self, conn: sqlite3.Connection, result: JobResult, signature: Optional[Signature],
+    ) -> int:
+        for table in TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE artifact = ?", (result.name,))
+        conn.execute("DELETE FROM artifact_sources WHERE artifact = ?", (result.name,))
+        if signature is not None:
+            conn.executemany("INSERT INTO artifact_sources VALUES (?, ?, ?, ?)",
+                             ((result.name,) + tuple(source) for source in signature))
+        payload, written = None, 0
+        if result.ok:
+            try:
+                payload = pack_payload(result.value)
+            except (TypeError, ValueError) as e:
+                print(f"[CaseStore] {result.name}: snapshot skipped – {e}")
+            normalizer = NORMALIZERS.get(result.name)
+            if normalizer is not None:
+                for table, rows in normalizer(result.value).items():
+                    cols = TABLES[table]
+                    conn.executemany(
+                        f"INSERT INTO {table} VALUES ({', '.join('?' * len(cols))})",
+                        ((result.name,) + tuple(r) for r in rows),
+                    )
+                    written += len(rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (result.name, result.status, result.count, result.error, result.elapsed, payload, time.time()),
+        )
+        return written
+
+    # ── 읽기 ────────────────────────────────────────────────────
+    def load_results(self, names: Iterable[str]) -> Dict[str, JobResult]:
+        """
+        Stored results of *names* that need no re-run: ``ok`` with a snapshot,
+        or ``missing``. Failed artifacts are left out so they run again.
+        """
+        names = list(names)
+        if not names or not self.is_current():
+            return {}
+        with contextlib.closing(self._connect()) as conn:
+            return _stored_results(conn, names)
+
+    def load_previous(self, names: Iterable[str], signatures: Dict[str, Signature]) -> Dict[str, JobResult]:
+        """
+        Results of *names* carried over from the previous case of this device
+        (an older store in this folder or another backup of the same
+        UniqueDeviceID): an artifact is reused when the (fileID, size, mtime)
+        of every source file it read is unchanged. Paths inside the reused
+        snapshots are moved to this backup folder.
+        """
+        names = [n for n in names if n in signatures]
+        if not names or self.is_current():
+            return {}
+        for candidate in self._previous_candidates():
+            meta = _read_meta(candidate)
+            if meta.get("version") != str(CASE_STORE_VERSION) or meta.get("device_id") != self.device_id:
+                continue
+            old_root = meta.get("backup_root") or os.path.dirname(candidate)
+            rebase = (old_root, os.path.abspath(self.backup_path))
+            try:
+                with contextlib.closing(sqlite3.connect(f"file:{candidate}?mode=ro", uri=True)) as conn:
+                    previous = _source_signatures(conn, names)
+                    unchanged = [n for n in names if n in previous and previous[n] == _as_rows(signatures[n])]
+                    results = _stored_results(conn, unchanged, rebase)
+            except sqlite3.Error as e:
+                print(f"[CaseStore] previous case {candidate} unreadable: {e}")
+                continue
+            self.previous = candidate
+            print(f"[CaseStore] {self.backup_path}: reusing {len(results)}/{len(names)} artifacts "
+                  f"from previous case {candidate}")
+            return results
+        return {}
+
+    def _previous_candidates(self) -> List[str]:
+        candidates = [self.path] if os.path.exists(self.path) else []
+        if self.device_id:
+            own = _registry_key(self.path)
+            candidates.extend(p for p in known_cases(self.device_id) if _registry_key(p) != own)
+        return candidates
+
+    def statuses(self) -> Dict[str, str]:
+        """``artifact → status`` of everything recorded in the store."""
+        if not os.path.exists(self.path):
+            return {}
+        with contextlib.closing(self._connect()) as conn:
+            return dict(conn.execute("SELECT name, status FROM artifacts").fetchall())
+
+    def query(self, sql: str, params: Union[Sequence[Any], Dict[str, Any]] = ()) -> List[sqlite3.Row]:
+        """Run a read-only query against the store (positional or named parameters)."""
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute(sql, params if isinstance(params, dict) else tuple(params)).fetchall()
+        finally:
+            conn.close()
+
+    def timeline(
+        self, start: Optional[float] = None, end: Optional[float] = None, limit: int = 1000,
+    ) -> List[sqlite3.Row]:
+        """Messages, calls, browser visits, events and note edits merged by time (UTC epoch)."""
+        lo = start if start is not None else float("-inf")
+        hi = end if end is not None else float("inf")
+        return self.query(
+            """
+            SELECT * FROM (
+                SELECT ts, 'message' AS kind, artifact, sender AS title, body AS detail
+                  FROM messages WHERE ts BETWEEN :lo AND :hi
+                UNION ALL
+                SELECT ts, 'call', artifact, COALESCE(NULLIF(name, ''), phone), direction
+                  FROM calls WHERE ts BETWEEN :lo AND :hi
+                UNION ALL
+                SELECT ts, 'visit', artifact, title, url
+                  FROM browser_visits WHERE ts BETWEEN :lo AND :hi
+                UNION ALL
+                SELECT start_ts, 'event', artifact, title, calendar
+                  FROM events WHERE start_ts BETWEEN :lo AND :hi
+                UNION ALL
+                SELECT modified_ts, 'note', artifact, title, snippet
+                  FROM notes WHERE modified_ts BETWEEN :lo AND :hi
+            ) ORDER BY ts LIMIT :limit
+            """,
+            {"lo": lo, "hi": hi, "limit": limit},
+        )
+
+    def activity_for_number(self, number: str) -> Dict[str, List[sqlite3.Row]]:
+        """Contacts, calls and conversations that involve one phone number."""
+        digits = phone_key(number)
+        return {
+            "contacts": self.query("SELECT * FROM contacts WHERE phone_digits = ?", (digits,)),
+            "calls": self.query("SELECT * FROM calls WHERE phone_digits = ? ORDER BY ts", (digits,)),
+            "conversations": self.query(
+                """
+                SELECT p.artifact, p.conv_key, c.title, c.last_ts,
+                       (SELECT COUNT(*) FROM messages m
+                         WHERE m.artifact = p.artifact AND m.conv_key = p.conv_key) AS messages
+                FROM participants p
+                LEFT JOIN conversations c ON c.artifact = p.artifact AND c.conv_key = p.conv_key
+                WHERE p.handle_digits = ?
+                """,
+                (digits,),
+            ),
+        }
+
+
+# ─────────────────────────────────────────────────────────────────
+# 백업별 레지스트리
+# ─────────────────────────────────────────────────────────────────
+_STORES: Dict[str, CaseStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _registry_key(backup_path: str) -> str:
+    return os.path.normcase(os.path.abspath(backup_path))
+
+
+def get_case_store(backup_path: str, create: bool = False) -> Optional[CaseStore]:
+    """
+    The case store of *backup_path*: the existing, current one – or, with
+    *create*, a handle the orchestrator can write to. None otherwise.
+    """
+    if not backup_path:
+        return None
+    key = _registry_key(backup_path)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is not None and store.fingerprint != manifest_fingerprint(backup_path):
+            store = None
+        if store is None:
+            store = CaseStore(backup_path)
+            if store.fingerprint is None:
+                return None
+            _STORES[key] = store
+    return store if create or store.is_current() else None
+
+
+def drop_case_store(backup_path: str) -> None:
+    with _STORES_LOCK:
+        _STORES.pop(_registry_key(backup_path), None)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 기기별 사례 목록 (~/.ios_forensic/cases)
+# ─────────────────────────────────────────────────────────────────
+_CASES_ROOT = os.path.join(os.path.expanduser("~"), ".ios_forensic", "cases")
+_CASES_KEEP = 16
+_CASES_LOCK = threading.Lock()
+
+
+def device_id(backup_path: str) -> Optional[str]:
+    """UniqueDeviceID of the backup, as reported by ``show_device_info``."""
+    from artifact_analyzer.device.device_info import show_device_info
+
+    try:
+        info = show_device_info(backup_path, display_ui=False) or {}
+    except Exception:
+        return None
+    udid = info.get("UniqueIdentifier")
+    return str(udid) if udid else None
+
+
+def _cases_path(udid: str) -> str:
+    safe_udid = "".join(c for c in udid if c.isalnum() or c in "-_")
+    return os.path.join(_CASES_ROOT, f"{safe_udid}.json")
+
+
+def known_cases(udid: str) -> List[str]:
+    """Case stores written for *udid*, most recent first."""
+    try:
+        with open(_cases_path(udid), "r", encoding="utf-8") as fp:
+            paths = json.load(fp)
+    except (OSError, ValueError):
+        return []
+    return [p for p in paths if isinstance(p, str) and os.path.exists(p)]
+
+
+def remember_case(udid: str, store_path: str) -> None:
+    with _CASES_LOCK:
+        paths = [os.path.abspath(store_path)]
+        paths += [p for p in known_cases(udid) if _registry_key(p) != _registry_key(store_path)]
+        path = _cases_path(udid)
+        try:
+            os.makedirs(_CASES_ROOT, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as fp:
+                json.dump(paths[:_CASES_KEEP], fp, ensure_ascii=False, indent=1)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"[CaseStore] could not record case for {udid}: {e}")
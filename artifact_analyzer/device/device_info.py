@@ -1,6 +1,4 @@
 import os
-import tkinter as tk
-from tkinter import ttk, messagebox
 from backup_analyzer.manifest_utils import load_manifest_plist
 
 def show_device_info(backup_path, display_ui=True):
@@ -14,6 +12,11 @@ def show_device_info(backup_path, display_ui=True):
     Returns:
         dict: Device information if display_ui is False, None otherwise
     """
+    if display_ui:
+        # tkinter is only needed for the window (headless callers never load it)
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+
     if not backup_path or not os.path.isdir(backup_path):
         if display_ui:
             messagebox.showerror("Error", "Please select a valid Backup Directory.")
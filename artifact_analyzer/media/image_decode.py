@@ -0,0 +1,173 @@
+"""
+Image decoding at the resolution the caller is going to show.
+
+A 120 px tile or a preview pane never needs the full 12–48 MP picture, so
+``open_image(path, size)`` reads the cheapest source that still covers
+*size* and keeps the full decode as the fallback:
+
+* DNG  – the JPEG preview LibRaw finds embedded in the file
+  (``rawpy.extract_thumb``); failing that a half-size demosaic;
+* HEIC – the thumbnail item stored next to the primary image;
+* JPEG – DCT-domain scaling (``Image.draft``), 1/2 … 1/8 of the pixels.
+
+Anything else (PNG …) is opened as-is, and without *size* the full image
+is decoded, as before. Backup blobs have no extension, so the type comes
+from the caller (logical file name) or, failing that, from the JPEG / HEIF
+signature. rawpy and pillow_heif are imported on first use so callers that
+only ever see JPEG / PNG (Safari thumbnails) do not load them.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from PIL import Image, ImageOps
+
+from backup_analyzer.tracing import span
+
+Size = Tuple[int, int]
+PathLike = Union[str, os.PathLike]
+
+# LibRaw sizes.flip → PIL transpose (postprocess() 가 적용하는 방향과 같게)
+_RAW_FLIP = {
+    3: Image.Transpose.ROTATE_180,
+    5: Image.Transpose.ROTATE_90,
+    6: Image.Transpose.ROTATE_270,
+}
+
+_HEIF_BRANDS = (b"heic", b"heix", b"heim", b"heis", b"mif1", b"msf1")
+
+
+def _sniff(path: PathLike) -> str:
+    """Type of an extension-less blob from its first bytes ("" when unknown)."""
+    try:
+        with open(path, "rb") as fp:
+            head = fp.read(12)
+    except OSError:
+        return ""
+    if head[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if head[4:8] == b"ftyp" and head[8:12] in _HEIF_BRANDS:
+        return "heic"
+    return ""
+
+
+def _ext(path: PathLike, ext: Optional[str]) -> str:
+    ext = (ext if ext is not None else Path(path).suffix).lower().lstrip(".")
+    return ext or _sniff(path)
+
+
+def _covers(img_size: Size, size: Size) -> bool:
+    """
+    True when an image of *img_size* shrunk into *size* comes out as large as
+    the full picture would (same aspect ratio) – i.e. it is not upscaled.
+    """
+    return img_size[0] >= size[0] or img_size[1] >= size[1]
+
+
+def _register_heif() -> None:
+    if "HEIF" not in Image.OPEN:
+        try:
+            from pillow_heif import register_heif_opener
+            register_heif_opener()
+        except ModuleNotFoundError:
+            pass
+
+
+# ─────────────────────────────────────────────────────────────
+# 축소 디코딩
+# ─────────────────────────────────────────────────────────────
+def _dng_reduced(path: PathLike, size: Size) -> Optional[Image.Image]:
+    import rawpy
+
+    with rawpy.imread(str(path)) as raw:
+        try:
+            thumb = raw.extract_thumb()
+        except (rawpy.LibRawNoThumbnailError, rawpy.LibRawUnsupportedThumbnailError):
+            thumb = None
+        if thumb is not None:
+            if thumb.format == rawpy.ThumbFormat.JPEG:
+                img = Image.open(io.BytesIO(thumb.data))
+                img.draft(img.mode, size)
+            else:
+                img = Image.fromarray(thumb.data)
+            if _covers(img.size, size):
+                if img.getexif().get(0x0112, 1) != 1:
+                    return ImageOps.exif_transpose(img)
+                flip = _RAW_FLIP.get(raw.sizes.flip)
+                return img.transpose(flip) if flip is not None else img
+        # 미리보기가 없거나 너무 작음 → 2×2 비닝 디모자이크로 충분한지 확인
+        if _covers((raw.sizes.width // 2, raw.sizes.height // 2), size):
+            return Image.fromarray(raw.postprocess(half_size=True))
+    return None
+
+
+def _heic_reduced(path: PathLike, size: Size) -> Optional[Image.Image]:
+    import pillow_heif
+
+    heif = pillow_heif.open_heif(str(path), convert_hdr_to_8bit=True)
+    primary = next((im for im in heif if im.info.get("primary")), heif[0])
+    best = None
+    for i in range(len(primary.info.get("thumbnails", ()))):
+        thumb = primary.get_thumbnail(i)
+        if _covers(thumb.size, size) and (best is None or thumb.size[0] < best.size[0]):
+            best = thumb
+    return best.to_pillow() if best is not None else None
+
+
+def _jpeg_reduced(path: PathLike, size: Size) -> Image.Image:
+    img = Image.open(path)
+    img.draft(img.mode, size)               # 요청 크기 이상을 유지하는 최대 1/2^n 축소
+    return img
+
+
+_REDUCED = {
+    "dng": _dng_reduced,
+    "heic": _heic_reduced,
+    "heif": _heic_reduced,
+    "jpg": _jpeg_reduced,
+    "jpeg": _jpeg_reduced,
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# 진입점
+# ─────────────────────────────────────────────────────────────
+def open_full_image(path: PathLike, ext: Optional[str] = None) -> Image.Image:
+    """Full-resolution decode (DNG demosaic, HEIC primary image, anything PIL opens)."""
+    ext = _ext(path, ext)
+    if ext == "dng":
+        import rawpy
+
+        with rawpy.imread(str(path)) as raw:
+            return Image.fromarray(raw.postprocess())
+    if ext in ("heic", "heif"):
+        _register_heif()
+    return Image.open(path)
+
+
+def open_image(path: PathLike, size: Optional[Size] = None, ext: Optional[str] = None) -> Image.Image:
+    """
+    Image of *path* for display within *size* (width, height): the cheapest
+    reduced-resolution source that covers it, else the full decode. The
+    result may still be larger than *size* – callers shrink it with
+    ``thumbnail()`` as before. *ext* overrides the extension of *path* (blob
+    paths have none).
+    """
+    ext = _ext(path, ext)
+    reducer = _REDUCED.get(ext) if size is not None else None
+    with span("image.decode", "media", ext=ext) as s:
+        if reducer is not None:
+            try:
+                img = reducer(path, size)
+            except Exception:
+                img = None                  # 손상된 미리보기 등 → 전체 디코딩
+            if img is not None:
+                s.set(mode="reduced", size=list(img.size))
+                return img
+        img = open_full_image(path, ext)
+        s.set(mode="full", size=list(img.size))
+        return img
@@ -0,0 +1,264 @@
+"""
+Persistent thumbnail store: ``<backup>/.thumbnail_cache.sqlite``.
+
+Every decoded thumbnail of a backup is kept as one small encoded blob
+(WebP, or JPEG where Pillow lacks WebP) in a single SQLite file, keyed by
+fileID and thumbnail side. Re-opening the Camera Roll – in the same session
+or after a restart – reads a page of thumbnails with one indexed query
+instead of decoding HEIC / DNG / MOV files again.
+
+Blob paths are named by their fileID (the decrypted copies of an encrypted
+backup too), so entries are looked up by ``path.name``. Each entry records
+the byte size of the file it was made from; an entry whose source no longer
+has that size (backup updated in place) counts as a miss and is replaced.
+
+Writes are buffered and committed in batches (and at exit), so a thread
+pool generating thumbnails does not pay one transaction per image. A backup
+folder that cannot be written to (read-only evidence) simply runs without
+the cache.
+"""
+
+from __future__ import annotations
+
+import atexit
+import io
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image, features
+
+from backup_analyzer.tracing import span
+
+THUMB_CACHE_FILE_NAME = ".thumbnail_cache.sqlite"
+THUMB_CACHE_VERSION = 1
+
+FLUSH_ENTRIES = 64                     # 이만큼 쌓이면 커밋
+FLUSH_SECONDS = 2.0                    # 또는 마지막 커밋 후 이 시간이 지나면
+SELECT_CHUNK = 500                     # IN (...) 바인딩 개수 제한
+
+_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS thumbs (
+    file_id   TEXT    NOT NULL,
+    side      INTEGER NOT NULL,
+    src_size  INTEGER NOT NULL,
+    format    TEXT    NOT NULL,
+    data      BLOB    NOT NULL,
+    PRIMARY KEY (file_id, side)
+);
+"""
+
+# (file_id, side) → (src_size, format, data)
+Entry = Tuple[int, str, bytes]
+
+
+# ─────────────────────────────────────────────────────────────────
+# 인코딩
+# ─────────────────────────────────────────────────────────────────
+def encode_thumbnail(img: Image.Image) -> Tuple[str, bytes]:
+    """(format, bytes) of *img* as stored in the cache."""
+    has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    buf = io.BytesIO()
+    if _FORMAT == "WEBP":
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        img.save(buf, "WEBP", quality=80, method=4)
+    else:
+        if has_alpha:                       # JPEG 는 알파가 없으므로 흰 배경에 합성
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, "white")
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            img = img.convert("RGB")
+        img.save(buf, "JPEG", quality=85, optimize=True)
+    return _FORMAT, buf.getvalue()
+
+
+def decode_thumbnail(data: bytes) -> Image.Image:
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img
+
+
+def _source_size(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+# ─────────────────────────────────────────────────────────────────
+# 저장소
+# ─────────────────────────────────────────────────────────────────
+class ThumbnailCache:
+    """The ``.thumbnail_cache.sqlite`` of one backup (thread-safe)."""
+
+    __slots__ = ("backup_path", "path", "_conn", "_lock", "_pending", "_last_flush", "hits", "misses")
+
+    def __init__(self, backup_path: str):
+        self.backup_path = backup_path
+        self.path = os.path.join(backup_path, THUMB_CACHE_FILE_NAME)
+        self._conn = self._open()
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, int], Entry] = {}
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(THUMB_CACHE_VERSION):
+                with conn:
+                    conn.execute("DELETE FROM thumbs")
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(THUMB_CACHE_VERSION),))
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    # ── 조회 ────────────────────────────────────────────────────
+    def get(self, path: str, side: int) -> Optional[bytes]:
+        """Encoded thumbnail of blob *path* at *side*, or None."""
+        return self.get_many([path], side).get(path)
+
+    def get_many(self, paths: Iterable[str], side: int) -> Dict[str, bytes]:
+        """Encoded thumbnails of every blob path in *paths* the cache holds – one query per chunk."""
+        wanted: Dict[str, str] = {os.path.basename(str(p)): str(p) for p in paths}
+        found: Dict[str, Entry] = {}
+        with span("thumbnail.cache_get", "media") as s:
+            with self._lock:
+                for file_id in wanted:
+                    entry = self._pending.get((file_id, side))
+                    if entry is not None:
+                        found[file_id] = entry
+                ids = [f for f in wanted if f not in found]
+                try:
+                    for i in range(0, len(ids), SELECT_CHUNK):
+                        chunk = ids[i:i + SELECT_CHUNK]
+                        marks = ",".join("?" * len(chunk))
+                        for file_id, src_size, fmt, data in self._conn.execute(
+                            f"SELECT file_id, src_size, format, data FROM thumbs "
+                            f"WHERE side = ? AND file_id IN ({marks})", [side, *chunk],
+                        ):
+                            found[file_id] = (src_size, fmt, data)
+                except sqlite3.Error as e:
+                    print(f"[ThumbnailCache] read failed: {e}")
+            result = {
+                wanted[file_id]: data
+                for file_id, (src_size, _fmt, data) in found.items()
+                if _source_size(wanted[file_id]) == src_size
+            }
+            self.hits += len(result)
+            self.misses += len(wanted) - len(result)
+            if s:
+                s.add(rows=len(result), nbytes=sum(len(d) for d in result.values()))
+                s.set(requested=len(wanted))
+        return result
+
+    # ── 쓰기 ────────────────────────────────────────────────────
+    def put(self, path: str, side: int, fmt: str, data: bytes) -> None:
+        """Remember the encoded thumbnail of blob *path* (committed in batches)."""
+        src_size = _source_size(str(path))
+        if src_size is None:
+            return
+        with self._lock:
+            self._pending[(os.path.basename(str(path)), side)] = (src_size, fmt, data)
+            due = (len(self._pending) >= FLUSH_ENTRIES
+                   or time.monotonic() - self._last_flush >= FLUSH_SECONDS)
+        if due:
+            self.flush()
+
+    def put_image(self, path: str, side: int, img: Image.Image) -> bytes:
+        fmt, data = encode_thumbnail(img)
+        self.put(path, side, fmt, data)
+        return data
+
+    def flush(self) -> None:
+        """Commit buffered entries."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            if not pending:
+                return
+            with span("thumbnail.cache_flush", "media") as s:
+                try:
+                    with self._conn:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO thumbs (file_id, side, src_size, format, data) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            [(fid, side, *entry) for (fid, side), entry in pending.items()],
+                        )
+                except sqlite3.Error as e:
+                    print(f"[ThumbnailCache] write failed: {e}")
+                if s:
+                    s.add(rows=len(pending), nbytes=sum(len(e[2]) for e in pending.values()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            with self._conn:
+                self._conn.execute("DELETE FROM thumbs")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM thumbs").fetchone()
+        return {"entries": count, "bytes": total, "pending": len(self._pending),
+                "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+# ─────────────────────────────────────────────────────────────────
+# 백업별 레지스트리
+# ─────────────────────────────────────────────────────────────────
+_CACHES: Dict[str, Optional[ThumbnailCache]] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def _registry_key(backup_path: str) -> str:
+    return os.path.normcase(os.path.abspath(backup_path))
+
+
+def get_thumbnail_cache(backup_path: str) -> Optional[ThumbnailCache]:
+    """The thumbnail cache of *backup_path*, or None if its folder is not writable."""
+    if not backup_path:
+        return None
+    key = _registry_key(backup_path)
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            try:
+                _CACHES[key] = ThumbnailCache(backup_path)
+            except sqlite3.Error as e:
+                print(f"[ThumbnailCache] disabled for {backup_path}: {e}")
+                _CACHES[key] = None
+        return _CACHES[key]
+
+
+def drop_thumbnail_cache(backup_path: str) -> None:
+    with _CACHES_LOCK:
+        cache = _CACHES.pop(_registry_key(backup_path), None)
+    if cache is not None:
+        cache.close()
+
+
+@atexit.register
+def _flush_all() -> None:
+    with _CACHES_LOCK:
+        caches: List[ThumbnailCache] = [c for c in _CACHES.values() if c is not None]
+    for cache in caches:
+        try:
+            cache.flush()
+        except sqlite3.Error:
+            pass
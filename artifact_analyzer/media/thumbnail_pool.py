@@ -0,0 +1,224 @@
+"""
+Thumbnail decoding on a process pool.
+
+HEIC (pillow_heif), DNG (rawpy) and the PIL resize are CPU-bound and
+serialize on the GIL when run on threads, so decoding happens in worker
+processes that return the encoded thumbnail (a few KB of WebP / JPEG, see
+``thumbnail_cache.encode_thumbnail``) instead of the image. The parent
+stores the bytes in the thumbnail cache and hands them to ``on_ready``; the
+UI shows placeholders and swaps images in as they arrive.
+
+Requests are scheduled, not fired at the pool: at most ``2 × workers`` jobs
+are in flight and the rest wait in a queue where *urgent* requests (the page
+on screen) go ahead of background ones (neighbouring pages), and
+``cancel_pending()`` drops what a page flip made stale. One process pool is
+shared by every ``ThumbnailPool`` so re-opening the gallery does not pay for
+process start-up again.
+
+Requests name the raw ``<xx>/<fileID>`` blob. For an encrypted backup the
+pool carries its class keys and the worker decrypts the blob it was handed
+(``resolve_media_blob``), so only thumbnails that are asked for cost a
+decryption and the UI thread never does one.
+
+Videos are handed to a worker together: the first video taken off the
+queue pulls up to ``VIDEO_BATCH - 1`` more waiting videos into the same job,
+which extracts all of them with one ffmpeg run (``video_thumbnails``).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from artifact_analyzer.media.thumbnail_cache import ThumbnailCache
+from artifact_analyzer.media.thumbnails import (
+    THUMB_SIDE,
+    VIDEO_BATCH,
+    encode_thumbnail_file,
+    encode_video_thumbnail_files,
+    is_video,
+)
+
+# (blob path, encoded thumbnail or None when the file could not be decoded)
+ReadyCallback = Callable[[str, Optional[bytes]], None]
+
+VIDEO_SCAN = 4 * VIDEO_BATCH             # 동영상 묶음을 찾을 때 살펴보는 대기열 앞부분
+
+
+def default_thumbnail_workers() -> int:
+    """One decoder per core, leaving one for the UI."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 공유 프로세스 풀
+# ─────────────────────────────────────────────────────────────────
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_EXECUTOR_WORKERS = 0
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _shared_executor(workers: int) -> ProcessPoolExecutor:
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None or _EXECUTOR_WORKERS != workers:
+            if _EXECUTOR is not None:
+                _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            _EXECUTOR = ProcessPoolExecutor(max_workers=workers)
+            _EXECUTOR_WORKERS = workers
+        return _EXECUTOR
+
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    """Forget a pool whose worker died so the next request starts a fresh one."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is broken:
+            _EXECUTOR = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 스케줄러
+# ─────────────────────────────────────────────────────────────────
+class ThumbnailPool:
+    """Queues thumbnail requests of one view and feeds them to the shared process pool."""
+
+    __slots__ = ("on_ready", "side", "cache", "class_keys", "workers", "max_in_flight",
+                 "_pending", "_in_flight", "_jobs", "_lock", "_closed")
+
+    def __init__(
+        self,
+        on_ready: ReadyCallback,
+        side: int = THUMB_SIDE,
+        cache: Optional[ThumbnailCache] = None,
+        workers: Optional[int] = None,
+        class_keys: Optional[Dict[int, bytes]] = None,
+    ):
+        self.on_ready = on_ready
+        self.side = side
+        self.cache = cache
+        self.class_keys = class_keys                              # 암호화 백업: 워커가 복호화
+        self.workers = default_thumbnail_workers() if workers is None else max(1, workers)
+        self.max_in_flight = 2 * self.workers
+        self._pending: "OrderedDict[str, str]" = OrderedDict()   # path → file name, 앞쪽이 먼저
+        self._in_flight: Set[str] = set()
+        self._jobs = 0                                            # 제출했지만 끝나지 않은 작업 수
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def request(self, items: Iterable[Tuple[Path, str]], urgent: bool = True) -> int:
+        """
+        Queue (blob path, file name) pairs; *urgent* ones go ahead of
+        everything already waiting. Returns how many were newly queued.
+        """
+        items = [(str(p), fname) for p, fname in items]
+        if not items:
+            return 0
+        queued = 0
+        with self._lock:
+            if self._closed:
+                return 0
+            # 앞에 끼워 넣을 땐 역순으로 넣어야 요청 순서가 유지된다
+            for path, fname in (reversed(items) if urgent else items):
+                if path in self._in_flight:
+                    continue
+                if path not in self._pending:
+                    queued += 1
+                self._pending[path] = fname
+                self._pending.move_to_end(path, last=not urgent)
+        self._pump()
+        return queued
+
+    def cancel_pending(self) -> None:
+        """Drop every queued request (those already decoding still report back)."""
+        with self._lock:
+            self._pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return bool(self._pending or self._in_flight)
+
+    def _take_videos(self, path: str) -> List[str]:
+        """
+        *path* plus up to ``VIDEO_BATCH - 1`` further videos from the head of
+        the queue (lock held). Only the next ``VIDEO_SCAN`` entries are looked
+        at so far-off background videos do not jump ahead of nearer photos.
+        """
+        batch = [path]
+        for other, other_fname in list(islice(self._pending.items(), VIDEO_SCAN)):
+            if len(batch) >= VIDEO_BATCH:
+                break
+            if is_video(Path(other), other_fname):
+                del self._pending[other]
+                batch.append(other)
+        return batch
+
+    def _pump(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed or not self._pending or self._jobs >= self.max_in_flight:
+                    return
+                path, fname = self._pending.popitem(last=False)
+                batch = self._take_videos(path) if is_video(Path(path), fname) else None
+                self._in_flight.update(batch or (path,))
+                self._jobs += 1
+            executor = _shared_executor(self.workers)
+            try:
+                if batch is None:
+                    future = executor.submit(encode_thumbnail_file, path, fname, self.side, self.class_keys)
+                else:
+                    future = executor.submit(encode_video_thumbnail_files, batch, self.side, self.class_keys)
+            except RuntimeError:                     # 풀이 깨졌거나 종료됨
+                _discard_executor(executor)
+                self._job_done()
+                for p in batch or (path,):
+                    self._finish(p, None)
+                continue
+            future.add_done_callback(
+                lambda f, path=path, batch=batch, ex=executor: self._done(path, batch, f, ex))
+
+    def _done(self, path: str, batch: Optional[List[str]], future: Future, executor: ProcessPoolExecutor) -> None:
+        try:
+            result = future.result()
+        except Exception:                            # BrokenProcessPool, 취소 등
+            result = None
+            if not future.cancelled():
+                _discard_executor(executor)
+        paths = batch or [path]
+        if batch is None or result is None:
+            result = [result] * len(paths)
+        self._job_done()
+        for p, encoded in zip(paths, result):
+            data: Optional[bytes] = None
+            if encoded is not None:
+                fmt, data = encoded
+                if self.cache is not None:
+                    self.cache.put(p, self.side, fmt, data)
+            self._finish(p, data)
+
+    def _job_done(self) -> None:
+        with self._lock:
+            self._jobs -= 1
+
+    def _finish(self, path: str, data: Optional[bytes]) -> None:
+        with self._lock:
+            self._in_flight.discard(path)
+            closed = self._closed
+        if not closed:
+            try:
+                self.on_ready(path, data)
+            except Exception as e:
+                print(f"[ThumbnailPool] on_ready callback failed: {e}")
+        self._pump()
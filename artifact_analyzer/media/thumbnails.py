@@ -0,0 +1,354 @@
+"""
+Camera-roll media discovery and thumbnail decoding.
+
+Kept free of tkinter so the gallery panel, worker processes and the
+benchmark harness share one implementation: callers get a PIL image and
+turn it into whatever their UI needs.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import imageio_ffmpeg
+from PIL import Image
+
+from artifact_analyzer.media.image_decode import open_image
+from artifact_analyzer.media.thumbnail_cache import ThumbnailCache, decode_thumbnail, encode_thumbnail
+from backup_analyzer.path_search import get_path_search
+from backup_analyzer.tracing import span
+from backup_analyzer.virtual_backup import VirtualBackup
+
+os.environ["IMAGEIO_FFMPEG_EXE"] = imageio_ffmpeg.get_ffmpeg_exe()
+
+try:
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+except ModuleNotFoundError:
+    pass
+
+THUMB_SIDE = 120
+
+IMG_EXTS = {".png", ".jpg", ".jpeg", ".heic", ".dng"}
+VID_EXTS = {".mov", ".mp4"}
+
+
+# ─────────────────────────────────────────────────────────────
+# 백업 DB 탐색
+# ─────────────────────────────────────────────────────────────
+def enumerate_media_files(backup_root: Path) -> Iterator[Tuple[str, str, bool, Optional[int]]]:
+    """
+    (fileID, file name, trashed, manifest size) of every camera-roll photo /
+    video, straight from the manifest index (size None when unknown). Nothing is opened or decrypted
+    here: the blob is only resolved (:func:`resolve_media_blob`) for the
+    cells that are actually drawn or saved.
+    """
+    manifest = backup_root / "Manifest.db"
+    if not manifest.exists():
+        return
+
+    search = get_path_search(str(backup_root))
+    if search is None:
+        return
+    index = search.index
+    rows = search.find(
+        domain_contains="CameraRollDomain",
+        contains="Media/DCIM",
+        suffix=tuple(sorted(IMG_EXTS | VID_EXTS)),
+    )
+    for row in rows:
+        size = index.row_size(row)
+        if size == 0:
+            continue                            # 빈 파일은 blob 이 없음
+        yield index.row_file_id(row), Path(index.row_rel_path(row)).name, index.row_trashed(row), size
+
+
+def media_blob_key(backup_root: Path, file_id: str) -> Path:
+    """``<backup>/<xx>/<fileID>``: the key a media cell, the thumbnail pool and the cache share."""
+    return backup_root / file_id[:2] / file_id
+
+
+# 워커 프로세스의 복호화 뷰 (backup 경로 → VirtualBackup, 캐시 정리는 소유 프로세스 몫)
+_WORKER_VIEWS: Dict[str, VirtualBackup] = {}
+
+
+def resolve_media_blob(path: str, class_keys: Optional[Dict[int, bytes]] = None) -> Optional[str]:
+    """
+    Decodable copy of the blob at *path* (a :func:`media_blob_key`), or None.
+
+    Without *class_keys* the blob is plaintext and returned as is. With them
+    it goes through a non-owning ``VirtualBackup`` of this process, so a
+    thumbnail worker decrypts only the files it was asked for into the
+    shared ``.decrypt_cache``; the GUI adopts them afterwards.
+    """
+    if not class_keys:
+        return path if os.path.exists(path) else None
+    backup_path = os.path.dirname(os.path.dirname(path))
+    view = _WORKER_VIEWS.get(backup_path)
+    if view is None:
+        view = _WORKER_VIEWS.setdefault(backup_path, VirtualBackup(backup_path, class_keys, owner=False))
+    return view.path_for(os.path.basename(path))
+
+
+# ─────────────────────────────────────────────────────────────
+# 미디어 감지
+# ─────────────────────────────────────────────────────────────
+def is_video(path: Path, fname: str) -> bool:
+    ext_path = path.suffix.lower()
+    ext_name = Path(fname).suffix.lower()
+    return ext_path in VID_EXTS or ext_name in VID_EXTS
+
+
+def is_image(path: Path, fname: str) -> bool:
+    ext_path = path.suffix.lower()
+    ext_name = Path(fname).suffix.lower()
+    return ext_path in IMG_EXTS or ext_name in IMG_EXTS
+
+
+# ─────────────────────────────────────────────────────────────
+# 디코딩 / 썸네일
+# ─────────────────────────────────────────────────────────────
+def load_image(path: Path, fname: str = "", side: int | None = None) -> Image.Image:
+    """
+    Open a photo; with *side* through the reduced-resolution paths of
+    ``image_decode`` (embedded DNG preview, HEIC thumbnail item, JPEG draft).
+    Blob paths have no extension, so the type comes from *fname*.
+    """
+    ext = Path(fname).suffix or path.suffix
+    return open_image(path, (side, side) if side else None, ext=ext)
+
+
+def video_thumb_preview(path: Path) -> Image.Image | None:
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        return None
+    ret, frame = cap.read()
+    cap.release()
+    if not ret or frame is None:
+        return None
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return Image.fromarray(frame)
+
+
+def video_thumb_pipe(path: Path) -> Image.Image | None:
+    ffmpeg = os.environ["IMAGEIO_FFMPEG_EXE"]
+    cmd = [
+        ffmpeg,
+        "-loglevel",
+        "error",
+        "-nostdin",
+        "-ss",
+        "0.5",
+        "-i",
+        str(path),
+        "-frames:v",
+        "1",
+        "-f",
+        "image2",
+        "-c:v",
+        "mjpeg",
+        "pipe:1",
+    ]
+    try:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+            data = proc.stdout.read()
+        if data:
+            return Image.open(io.BytesIO(data))
+    except Exception:
+        return None
+    return None
+
+
+def video_thumb_temp(path: Path) -> Image.Image | None:
+    ffmpeg = os.environ["IMAGEIO_FFMPEG_EXE"]
+    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
+        tmp_name = tmp.name
+    cmd = [
+        ffmpeg,
+        "-loglevel",
+        "error",
+        "-nostdin",
+        "-ss",
+        "0.5",
+        "-i",
+        str(path),
+        "-frames:v",
+        "1",
+        "-q:v",
+        "2",
+        tmp_name,
+    ]
+    if subprocess.call(cmd) == 0 and Path(tmp_name).exists():
+        try:
+            img = Image.open(tmp_name)
+            img.load()
+            return img
+        finally:
+            os.unlink(tmp_name)
+    os.unlink(tmp_name)
+    return None
+
+
+def video_thumbnail(path: Path, side: int = THUMB_SIDE) -> Image.Image:
+    for extractor in (video_thumb_preview, video_thumb_pipe, video_thumb_temp):
+        try:
+            img = extractor(path)
+            if img is not None:
+                break
+        except Exception:
+            continue
+    else:
+        img = Image.new("RGB", (side, side), "black")
+    img.thumbnail((side, side))
+    return img
+
+
+# ─────────────────────────────────────────────────────────────
+# 동영상 일괄 추출
+# ─────────────────────────────────────────────────────────────
+VIDEO_SEEK = "0.5"
+VIDEO_BATCH = 16                         # ffmpeg 한 번에 넘기는 입력 수
+
+
+def _ffmpeg_batch(paths: Sequence[Path], side: int, out_dir: str, first: int = 0) -> Dict[int, Image.Image]:
+    """
+    One ffmpeg run for *paths*: decode only keyframes, seek to the one at or
+    before ``VIDEO_SEEK`` and scale to *side* inside the filter graph. An
+    input ffmpeg cannot open aborts the whole run, so a failed batch is split
+    in half until the broken files are isolated.
+    """
+    ffmpeg = os.environ["IMAGEIO_FFMPEG_EXE"]
+    cmd = [ffmpeg, "-loglevel", "error", "-nostdin", "-y"]
+    for path in paths:
+        # 한 프레임만 디코딩하므로 프레임 스레드는 지연만 늘린다
+        cmd += ["-threads", "1", "-skip_frame", "nokey", "-ss", VIDEO_SEEK, "-noaccurate_seek", "-i", str(path)]
+    outputs = []
+    for i in range(len(paths)):
+        out = os.path.join(out_dir, f"{first + i}.jpg")
+        outputs.append(out)
+        cmd += ["-map", f"{i}:v:0", "-frames:v", "1",
+                "-vf", f"scale={side}:{side}:force_original_aspect_ratio=decrease",
+                "-q:v", "3", out]
+    try:
+        ok = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+    except OSError:
+        return {}
+    if not ok and len(paths) > 1:
+        half = len(paths) // 2
+        found = _ffmpeg_batch(paths[:half], side, out_dir, first)
+        found.update(_ffmpeg_batch(paths[half:], side, out_dir, first + half))
+        return found
+    found: Dict[int, Image.Image] = {}
+    for i, out in enumerate(outputs):
+        # 0.5초보다 짧은 영상 등은 출력이 없음 → 호출자가 개별 추출로 처리
+        if os.path.exists(out) and os.path.getsize(out) > 0:
+            try:
+                img = Image.open(out)
+                img.load()
+                found[first + i] = img
+            except Exception:
+                pass
+    return found
+
+
+def video_thumbnails(paths: Sequence[Path], side: int = THUMB_SIDE) -> List[Image.Image]:
+    """
+    Thumbnails of many videos with one ffmpeg process per ``VIDEO_BATCH``
+    files instead of up to three per file. Files the batch cannot handle go
+    through :func:`video_thumbnail` (black tile as the last resort).
+    """
+    found: Dict[int, Image.Image] = {}
+    with span("thumbnail.video_batch", "media") as s, tempfile.TemporaryDirectory(prefix="thumbs-") as out_dir:
+        for start in range(0, len(paths), VIDEO_BATCH):
+            found.update(_ffmpeg_batch(paths[start:start + VIDEO_BATCH], side, out_dir, start))
+        s.add(rows=len(found))
+        s.set(files=len(paths))
+    result = []
+    for i, path in enumerate(paths):
+        img = found.get(i)
+        if img is None:
+            img = video_thumbnail(path, side)
+        else:
+            img.thumbnail((side, side))
+        result.append(img)
+    return result
+
+
+def decode_thumbnail_image(path: Path, fname: str, side: int = THUMB_SIDE) -> Image.Image:
+    """Decode *path* into a thumbnail of at most *side* × *side* (raises when it cannot)."""
+    if is_video(path, fname):
+        return video_thumbnail(path, side)
+    if is_image(path, fname):
+        pil_img = load_image(path, fname, side)
+        pil_img.thumbnail((side, side))
+        return pil_img
+    raise ValueError("Unsupported format")
+
+
+def generate_thumbnail_image(
+    path: Path, fname: str, side: int = THUMB_SIDE, cache: Optional[ThumbnailCache] = None,
+) -> Image.Image:
+    """
+    Thumbnail of at most *side* × *side* (a gray tile when the file cannot be
+    decoded). With *cache* the persistent thumbnail store is consulted first
+    and every successful decode is added to it.
+    """
+    if cache is not None:
+        data = cache.get(str(path), side)
+        if data is not None:
+            try:
+                return decode_thumbnail(data)
+            except Exception:
+                pass                            # 깨진 항목 → 다시 디코딩해 덮어씀
+    with span("thumbnail.decode", "media", file=fname) as s:
+        try:
+            pil_img = decode_thumbnail_image(path, fname, side)
+        except Exception:
+            s.set(error="decode failed")
+            return Image.new("RGB", (side, side), "gray")
+        if s:
+            try:
+                s.add(nbytes=os.path.getsize(path))
+            except OSError:
+                pass
+    if cache is not None:
+        cache.put_image(str(path), side, pil_img)
+    return pil_img
+
+
+def encode_thumbnail_file(
+    path: str, fname: str, side: int = THUMB_SIDE, class_keys: Optional[Dict[int, bytes]] = None,
+) -> Optional[Tuple[str, bytes]]:
+    """
+    Process-pool entry point: resolve the blob *path* (see
+    :func:`resolve_media_blob`), decode it and return the encoded thumbnail
+    as (format, bytes), or None when the file cannot be decrypted or decoded.
+    """
+    blob = resolve_media_blob(path, class_keys)
+    if blob is None:
+        return None
+    try:
+        img = decode_thumbnail_image(Path(blob), fname, side)
+    except Exception:
+        return None
+    return encode_thumbnail(img)
+
+
+def encode_video_thumbnail_files(
+    paths: Sequence[str], side: int = THUMB_SIDE, class_keys: Optional[Dict[int, bytes]] = None,
+) -> List[Optional[Tuple[str, bytes]]]:
+    """Process-pool entry point for a batch of videos (see :func:`video_thumbnails`)."""
+    blobs = [resolve_media_blob(p, class_keys) for p in paths]
+    found = [Path(b) for b in blobs if b is not None]
+    try:
+        images = video_thumbnails(found, side)
+    except Exception:                            # ffmpeg 자체가 없을 때 등 → 파일별 추출
+        images = [video_thumbnail(p, side) for p in found]
+    encoded = iter([encode_thumbnail(img) for img in images])
+    return [next(encoded) if b is not None else None for b in blobs]
@@ -1,4 +1,3 @@
-import sqlite3
 import os
 from biplist import readPlistFromString
 import datetime
@@ -6,6 +5,7 @@ import pytz
 import unicodedata  # 유니코드 정규화를 위한 모듈 추가
 from collections import defaultdict
 from backup_analyzer.backuphelper import BackupPathHelper
+from backup_analyzer import tracing
 
 class InstagramDMAnalyzer:
     """Instagram DM 분석을 위한 클래스"""
@@ -160,7 +160,7 @@ class InstagramDMAnalyzer:
             
             try:
                 # 데이터베이스 연결
-                conn = sqlite3.connect(db_path)
+                conn = tracing.connect(db_path)
                 cursor = conn.cursor()
                 
                 # 테이블 구조 확인
@@ -6,6 +6,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 import hashlib
 
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer import tracing
+
 # ikd의 decrypt_util.py에서 사용되는 복호화 함수들을 가져옵니다.
 # 실패하면 복호화되지 않은 원본 메시지를 반환합니다.
 try:
@@ -36,37 +39,22 @@ class BackupPathHelper:
         반환값:
           실제 파일 경로 (존재하지 않을 경우 None 반환)
         """
-        # Manifest.db 파일의 경로 생성
-        manifest_path = os.path.join(self.backup_path, "Manifest.db")
-        if not os.path.exists(manifest_path):
-            print(f"Manifest.db 파일이 존재하지 않습니다: {manifest_path}")
+        # 백업 로드 시 구축된 Manifest 인덱스에서 해시 파일명을 조회
+        index = get_manifest_index(self.backup_path)
+        if index is None:
+            print(f"Manifest.db 파일이 존재하지 않습니다: {os.path.join(self.backup_path, 'Manifest.db')}")
             return None
-            
-        try:
-            # SQLite를 통해 Manifest.db에 연결
-            conn = sqlite3.connect(manifest_path)
-            cursor = conn.cursor()
-            
-            # Files 테이블에서 지정한 상대 경로와 일치하는 파일ID(해시)를 검색
-            cursor.execute(
-                "SELECT fileID FROM Files WHERE domain = ? AND relativePath = ?",
-                (domain, relative_path,)
-            )
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                file_hash = result[0]
-                # 해시 파일명의 처음 두 글자를 하위 디렉토리로 사용하여 전체 파일 경로를 구성
-                file_path = os.path.join(self.backup_path, file_hash[:2], file_hash)
-                if os.path.exists(file_path):
-                    return file_path
-                else:
-                    print(f"Manifest에 등록되었으나 실제 파일이 존재하지 않습니다: {file_path}")
+
+        file_hash = index.file_id(domain, relative_path)
+        if file_hash:
+            # 해시 파일명의 처음 두 글자를 하위 디렉토리로 사용하여 전체 파일 경로를 구성
+            file_path = index.blob_path(file_hash)
+            if file_path and os.path.exists(file_path):
+                return file_path
             else:
-                print(f"Manifest에서 해당 상대 경로를 찾을 수 없습니다: {relative_path}")
-        except Exception as e:
-            print(f"Manifest.db 검색 오류: {str(e)}")
+                print(f"Manifest에 등록되었으나 실제 파일이 존재하지 않습니다: {file_path}")
+        else:
+            print(f"Manifest에서 해당 상대 경로를 찾을 수 없습니다: {relative_path}")
             
         return None
 
@@ -81,6 +69,8 @@ class KakaoTalkAnalyzer:
         self.conn_message_db = None # Message.sqlite 연결 객체
         self.conn_talk_db = None # Talk.sqlite 연결 객체
         self.my_id = None # My KakaoTalk ID (수신 메시지와 발신 메시지를 구분하기 위함)
+        self.conversation_cache = None # preload() 결과: get_conversations() 목록
+        self.message_cache = {} # preload() 결과: chatId -> get_conversation_messages() 목록
         # Manifest.db를 통해 경로를 검색하기 위한 BackupPathHelper 인스턴스 생성
         self.path_helper = BackupPathHelper(backup_path)
 
@@ -121,7 +111,7 @@ class KakaoTalkAnalyzer:
         if os.path.exists(message_db_path):
             try:
                 # SQLite 데이터베이스 연결 및 컬럼 이름 기반 접근을 위해 row_factory 설정
-                self.conn_message_db = sqlite3.connect(message_db_path)
+                self.conn_message_db = tracing.connect(message_db_path)
                 self.conn_message_db.row_factory = sqlite3.Row
                 print(f"Message.sqlite 데이터베이스 연결 성공: {message_db_path}")
                 return True
@@ -147,7 +137,7 @@ class KakaoTalkAnalyzer:
         if os.path.exists(talk_db_path):
             try:
                 # SQLite 데이터베이스 연결 및 컬럼 이름 기반 접근을 위해 row_factory 설정
-                self.conn_talk_db = sqlite3.connect(talk_db_path)
+                self.conn_talk_db = tracing.connect(talk_db_path)
                 self.conn_talk_db.row_factory = sqlite3.Row
                 print(f"Talk.sqlite 데이터베이스 연결 성공: {talk_db_path}")
                 return True
@@ -167,6 +157,24 @@ class KakaoTalkAnalyzer:
         """Talk.sqlite 데이터베이스 연결을 종료합니다."""
         if self.conn_talk_db:
             self.conn_talk_db.close()
+
+    def preload(self):
+        """대화 목록과 모든 대화의 메시지를 미리 읽어 캐시에 저장하고 DB 연결을 닫습니다."""
+        try:
+            if not (self.connect_to_message_db() and self.connect_to_talk_db()):
+                return False
+            conversations = self.get_conversations()
+            for conversation in conversations:
+                chat_id = conversation['chatId']
+                self.message_cache[chat_id] = self.get_conversation_messages(chat_id)
+            self.conversation_cache = conversations
+            return True
+        finally:
+            # 연결 객체는 프로세스 간에 넘길 수 없으므로 정리
+            self.close_connection_message_db()
+            self.close_connection_talk_db()
+            self.conn_message_db = None
+            self.conn_talk_db = None
     
     def format_phone_number(self, phone):
         """
@@ -224,6 +232,8 @@ class KakaoTalkAnalyzer:
     
     def get_conversations(self):
         """모든 대화 상대 목록을 가져옵니다."""
+        if self.conversation_cache is not None:
+            return self.conversation_cache
         if not self.conn_message_db:
             if not self.connect_to_message_db():
                 return []
@@ -269,6 +279,8 @@ class KakaoTalkAnalyzer:
     
     def get_conversation_messages(self, handle_rowid):
         """특정 채팅방의 모든 메시지를 가져옵니다."""
+        if handle_rowid in self.message_cache:
+            return self.message_cache[handle_rowid]
         if not self.conn_message_db:
             if not self.connect_to_message_db():
                 return []
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta  # Apple Absolute Time 변환을 위해
 from typing import List, Dict, Optional
 from typing import Tuple
 
+from backup_analyzer import tracing
+
 
 def format_time(ts: float) -> str:
     """
@@ -63,13 +65,14 @@ class LineAnalyzer:
 
         self.rows: List[ChatRow] = []
         self.users: Dict[int, str] = {}  # user_id -> user_name
+        self.message_cache: Dict[int, List[Dict]] = {}  # chat_id -> get_messages() 결과
 
     def _load_users(self) -> None:
         """
         ZUSER 테이블에서 Z_PK, ZNAME 컬럼을 읽어 self.users에 저장.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with tracing.connect(self.db_path) as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT Z_PK, ZNAME FROM ZUSER")
                 for pk, name in cur.fetchall():
@@ -88,7 +91,7 @@ class LineAnalyzer:
         :return: (성공여부, 메시지)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with tracing.connect(self.db_path) as conn:
                 cur = conn.cursor()
                 # ZCHAT: Z_PK(채팅방 고유 ID), ZLASTUPDATED(Apple Absolute Time)
                 cur.execute("SELECT Z_PK, ZLASTUPDATED FROM ZCHAT")
@@ -103,7 +106,7 @@ class LineAnalyzer:
             self._load_users()
 
             # ── 각 ChatRow에 대해 display_name(상대방 이름) 채워넣기 ─────────────────
-            with sqlite3.connect(self.db_path) as conn:
+            with tracing.connect(self.db_path) as conn:
                 cur = conn.cursor()
                 for r in self.rows:
                     # 상대방(sender_id != 0) 중 가장 최근 메시지를 보낸 user_id를 가져옴
@@ -144,42 +147,62 @@ class LineAnalyzer:
             }
         :param chat_id: ZCHAT의 Z_PK 값
         """
-        out: List[Dict] = []
+        cached = self.message_cache.get(chat_id)
+        if cached is not None:
+            return cached
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cur = conn.cursor()
-                # ZMESSAGE: ZCHAT 컬럼이 chat_id인 레코드 조회, ZTIMESTAMP(발신 시각) 기준 정렬
-                cur.execute(
-                    """
-                    SELECT ZTEXT, ZID, ZTIMESTAMP, ZSENDER, ZCHAT
-                    FROM ZMESSAGE
-                    WHERE ZCHAT = ?
-                    ORDER BY ZTIMESTAMP ASC
-                    """,
-                    (chat_id,),
-                )
-                for text, zid, zts, zsender, zchat in cur.fetchall():
-                    raw_ts = zts or 0
-                    send_time_str = format_time(raw_ts)
-                    # ZSENDER이 None 또는 0이면 사용자가 보낸 메시지로 간주
-                    sender_id: int = zsender or 0
-                    if sender_id == 0:
-                        sender_name = "Me"
-                    else:
-                        sender_name = self.users.get(sender_id, f"User_{sender_id}")
-                    out.append(
-                        {
-                            "message_id": zid,
-                            "message": text or "",
-                            "send_time": send_time_str,
-                            "sender_id": sender_id,
-                            "sender_name": sender_name,
-                            "chat_id": zchat,
-                        }
-                    )
+            with tracing.connect(self.db_path) as conn:
+                return self._read_messages(conn.cursor(), chat_id)
         except Exception:
             # 실패 시 빈 리스트 반환
+            return []
+
+    def preload_messages(self) -> int:
+        """
+        모든 채팅방(self.rows)의 메시지를 한 번의 DB 연결로 읽어 message_cache에 저장.
+        :return: 읽어 들인 메시지 수
+        """
+        try:
+            with tracing.connect(self.db_path) as conn:
+                cur = conn.cursor()
+                for r in self.rows:
+                    if r.chat_id not in self.message_cache:
+                        self.message_cache[r.chat_id] = self._read_messages(cur, r.chat_id)
+        except Exception:
             pass
+        return sum(len(v) for v in self.message_cache.values())
+
+    def _read_messages(self, cur: sqlite3.Cursor, chat_id: int) -> List[Dict]:
+        out: List[Dict] = []
+        # ZMESSAGE: ZCHAT 컬럼이 chat_id인 레코드 조회, ZTIMESTAMP(발신 시각) 기준 정렬
+        cur.execute(
+            """
+            SELECT ZTEXT, ZID, ZTIMESTAMP, ZSENDER, ZCHAT
+            FROM ZMESSAGE
+            WHERE ZCHAT = ?
+            ORDER BY ZTIMESTAMP ASC
+            """,
+            (chat_id,),
+        )
+        for text, zid, zts, zsender, zchat in cur.fetchall():
+            raw_ts = zts or 0
+            send_time_str = format_time(raw_ts)
+            # ZSENDER이 None 또는 0이면 사용자가 보낸 메시지로 간주
+            sender_id: int = zsender or 0
+            if sender_id == 0:
+                sender_name = "Me"
+            else:
+                sender_name = self.users.get(sender_id, f"User_{sender_id}")
+            out.append(
+                {
+                    "message_id": zid,
+                    "message": text or "",
+                    "send_time": send_time_str,
+                    "sender_id": sender_id,
+                    "sender_name": sender_name,
+                    "chat_id": zchat,
+                }
+            )
         return out
 
     def search(self, keyword: str) -> List[ChatRow]:
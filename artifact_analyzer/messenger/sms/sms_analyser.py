@@ -2,6 +2,9 @@ import os, re, sqlite3
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Tuple, Optional
 
+from artifact_analyzer.addressbook.addressbook_analyzer import get_phone_lookup
+from backup_analyzer import tracing
+
 
 MAC_EPOCH = datetime(2001, 1, 1, tzinfo=timezone.utc)
 PHONE_RE = re.compile(r"\d+")
@@ -62,11 +65,12 @@ class IMessageAnalyzer:
         if not os.path.exists(self.chat_db):
             raise FileNotFoundError("chat.db not found")
         self.rows: List[ChatRow] = []
+        self.message_cache: Dict[int, List[Dict]] = {}   # chat_id → get_messages() 결과
 
     # ─────────── 채팅 목록 로드 ───────────
     def load(self) -> Tuple[bool, str]:
         try:
-            with sqlite3.connect(self.chat_db) as conn:
+            with tracing.connect(self.chat_db) as conn:
                 cur = conn.cursor()
 
                 # 각 chat_id 의 최신 메시지 시간 맵
@@ -106,104 +110,99 @@ class IMessageAnalyzer:
 
     # ─────────── 전화번호 → 이름 보완 ───────────
     def _patch_names(self):
-        if not os.path.exists(self.ab_db):
+        lookup = get_phone_lookup(self.ab_db)
+        if lookup is None:
             return
-        try:
-            with sqlite3.connect(self.ab_db) as conn:
-                cur = conn.cursor()
-                for r in self.rows:
-                    digits = digits_only(r.identifier)
-                    if not digits:
-                        continue
-                    cur.execute(
-                        "SELECT docid FROM ABPersonFullTextSearch_content WHERE c16Phone LIKE ? LIMIT 1",
-                        (f"%{digits}%",),
-                    )
-                    row = cur.fetchone()
-                    if not row:
-                        continue
-                    cur.execute(
-                        "SELECT First, Last FROM ABPerson WHERE ROWID = ? LIMIT 1",
-                        (row[0],),
-                    )
-                    p = cur.fetchone()
-                    if p:
-                        r.name = " ".join(x for x in (p[1], p[0]) if x).strip()
-        except Exception:
-            pass
+        for r in self.rows:
+            name = lookup.name_for(digits_only(r.identifier))
+            if name:
+                r.name = name
 
     # ─────────── 채팅별 메시지 ───────────
     def get_messages(self, chat_id: int) -> List[Dict]:
         """
         반환: [{datetime, direction('발신'|'수신'|'?'), body(str), attachment(str)}...]
         """
-        out = []
-        with sqlite3.connect(self.chat_db) as conn:
+        cached = self.message_cache.get(chat_id)
+        if cached is not None:
+            return cached
+        with tracing.connect(self.chat_db) as conn:
+            return self._read_messages(conn.cursor(), chat_id)
+
+    def preload_messages(self) -> int:
+        """모든 채팅방 메시지를 한 번의 연결로 읽어 message_cache 에 보관 (메시지 수 반환)"""
+        with tracing.connect(self.chat_db) as conn:
             cur = conn.cursor()
+            for r in self.rows:
+                if r.chat_id not in self.message_cache:
+                    self.message_cache[r.chat_id] = self._read_messages(cur, r.chat_id)
+        return sum(len(v) for v in self.message_cache.values())
 
-            # chat_message_join → message_id, date
-            cur.execute(
-                """
-                SELECT m_id, m_date FROM (
-                  SELECT message_id AS m_id, message_date AS m_date
-                  FROM chat_message_join WHERE chat_id = ?
-                )
-                ORDER BY m_date
-                """,
-                (chat_id,),
+    def _read_messages(self, cur: sqlite3.Cursor, chat_id: int) -> List[Dict]:
+        out = []
+        # chat_message_join → message_id, date
+        cur.execute(
+            """
+            SELECT m_id, m_date FROM (
+              SELECT message_id AS m_id, message_date AS m_date
+              FROM chat_message_join WHERE chat_id = ?
             )
-            id_ts_pairs = cur.fetchall()
+            ORDER BY m_date
+            """,
+            (chat_id,),
+        )
+        id_ts_pairs = cur.fetchall()
 
-            for mid, ts in id_ts_pairs:
-                # 1) message 테이블 존재?
-                cur.execute(
-                    "SELECT text, is_from_me, guid FROM message WHERE ROWID = ?",
-                    (mid,),
-                )
-                m = cur.fetchone()
-                if m:
-                    text, from_me, guid = m
-                    body = text or ""
-                    # 첨부가 필요하면
-                    if not body:
-                        cur.execute(
-                            """
-                            SELECT attachment.filename
-                            FROM attachment
-                            JOIN message_attachment_join maj ON attachment.ROWID = maj.attachment_id
-                            WHERE maj.message_id = ? LIMIT 1
-                            """,
-                            (mid,),
-                        )
-                        a = cur.fetchone()
-                        attach = a[0] if a else ""
-                    else:
-                        attach = ""
-                    out.append(
-                        {
-                            "datetime": ts_to_kst(ts),
-                            "direction": "발신" if from_me else "수신",
-                            "body": body,
-                            "attachment": attach,
-                        }
+        for mid, ts in id_ts_pairs:
+            # 1) message 테이블 존재?
+            cur.execute(
+                "SELECT text, is_from_me, guid FROM message WHERE ROWID = ?",
+                (mid,),
+            )
+            m = cur.fetchone()
+            if m:
+                text, from_me, guid = m
+                body = text or ""
+                # 첨부가 필요하면
+                if not body:
+                    cur.execute(
+                        """
+                        SELECT attachment.filename
+                        FROM attachment
+                        JOIN message_attachment_join maj ON attachment.ROWID = maj.attachment_id
+                        WHERE maj.message_id = ? LIMIT 1
+                        """,
+                        (mid,),
                     )
-                    continue  # 다음 id
+                    a = cur.fetchone()
+                    attach = a[0] if a else ""
+                else:
+                    attach = ""
+                out.append(
+                    {
+                        "datetime": ts_to_kst(ts),
+                        "direction": "발신" if from_me else "수신",
+                        "body": body,
+                        "attachment": attach,
+                    }
+                )
+                continue  # 다음 id
 
-                # 2) message 가 없다면 attachment ROWID 매칭
-                cur.execute(
-                    "SELECT filename FROM attachment WHERE ROWID = ?",
-                    (mid,),
+            # 2) message 가 없다면 attachment ROWID 매칭
+            cur.execute(
+                "SELECT filename FROM attachment WHERE ROWID = ?",
+                (mid,),
+            )
+            a = cur.fetchone()
+            if a:
+                out.append(
+                    {
+                        "datetime": ts_to_kst(ts),
+                        "direction": "수신",
+                        "body": "",
+                        "attachment": a[0],
+                    }
                 )
-                a = cur.fetchone()
-                if a:
-                    out.append(
-                        {
-                            "datetime": ts_to_kst(ts),
-                            "direction": "수신",
-                            "body": "",
-                            "attachment": a[0],
-                        }
-                    )
         return out
 
     # ─────────── 검색 ───────────
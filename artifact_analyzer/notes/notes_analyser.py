@@ -10,6 +10,10 @@ from typing import List, Dict, Optional
 
 import pandas as pd
 
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer.path_search import get_path_search
+from backup_analyzer import tracing
+
 
 # ────────────────────────────────────────────────────────────────────────────
 # Manifest 경로 매핑 헬퍼
@@ -19,30 +23,19 @@ class BackupPathHelper:
         self.backup_path = backup_path
 
     def get_file_path_from_manifest(self, relative_path: str) -> Optional[str]:
-        manifest = os.path.join(self.backup_path, "Manifest.db")
-        if not os.path.exists(manifest):
-            print(f"[!] Manifest.db 없음: {manifest}")
+        index = get_manifest_index(self.backup_path)
+        if index is None:
+            print(f"[!] Manifest.db 없음: {os.path.join(self.backup_path, 'Manifest.db')}")
             return None
 
-        try:
-            with sqlite3.connect(manifest) as conn:
-                cur = conn.cursor()
-                cur.execute(
-                    "SELECT fileID FROM Files WHERE relativePath = ?",
-                    (relative_path,),
-                )
-                row = cur.fetchone()
-            if not row:
-                print(f"[!] Manifest에 상대 경로 없음: {relative_path}")
-                return None
-
-            file_id = row[0]
-            path = os.path.join(self.backup_path, file_id[:2], file_id)
-            return path if os.path.exists(path) else None
-        except Exception as e:
-            print(f"[!] Manifest 검색 오류: {e}")
+        file_id = index.file_id_by_rel_path(relative_path)
+        if not file_id:
+            print(f"[!] Manifest에 상대 경로 없음: {relative_path}")
             return None
 
+        path = index.blob_path(file_id)
+        return path if path and os.path.exists(path) else None
+
 
 # ────────────────────────────────────────────────────────────────────────────
 # 노트 분석기
@@ -196,18 +189,14 @@ class NotesAnalyser:
     def connect_to_db(self) -> bool:
         relative = None
         try:
-            manifest = os.path.join(self.backup_path, "Manifest.db")
-            with sqlite3.connect(manifest) as conn:
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT relativePath
-                    FROM Files
-                    WHERE domain LIKE 'AppDomainGroup-group.com.apple.notes%'
-                      AND relativePath LIKE '%NoteStore.sqlite'
-                """)
-                row = cur.fetchone()
-                if row:
-                    relative = row[0]
+            search = get_path_search(self.backup_path)
+            if search is not None:
+                row = search.first(
+                    domain_prefix="AppDomainGroup-group.com.apple.notes",
+                    suffix="NoteStore.sqlite",
+                )
+                if row is not None:
+                    relative = search.index.row_rel_path(row)
         except Exception as e:
             print(f"[!] Manifest 접근 오류: {e}")
 
@@ -218,7 +207,7 @@ class NotesAnalyser:
         )
         if db_path and os.path.exists(db_path):
             try:
-                self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+                self.conn = tracing.connect(f"file:{db_path}?mode=ro", uri=True)
                 self.conn.row_factory = sqlite3.Row
                 print(f"[+] 노트 DB 연결 성공: {db_path}")
                 return True
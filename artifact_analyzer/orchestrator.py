@@ -0,0 +1,597 @@
+"""
+Background extraction of every artifact category.
+
+As soon as a backup is loaded the ``ArtifactOrchestrator`` runs each
+analyzer as an independent job on a process pool and publishes the results
+as they complete; panels (and the headless CLI) then open against the
+precomputed data instead of re-running their queries on the GUI thread.
+
+* ``workers`` bounds the pool (0 runs the jobs one after another on the
+  orchestrator thread);
+* ``memory_budget`` bounds the *estimated* memory of the jobs in flight –
+  each job's estimate comes from the Manifest sizes of the databases it
+  reads, and the largest jobs are started first;
+* dependencies several analyzers share are prepared once in the parent and
+  shipped to the workers: the ManifestIndex (written to its sidecar cache so
+  workers load it instead of re-reading Manifest.db), the AddressBook
+  phone → name lookup and, for encrypted backups, the unlocked class keys;
+* results are written to the backup's case store (``case_store.py``) once
+  the run finishes, and a re-opened case publishes the stored results
+  straight away – only artifacts the store does not hold are re-run;
+* with ``incremental`` a new backup of an already analysed device re-runs
+  only the analyzers whose source files (fileID, size, mtime) changed since
+  the previous case;
+* while tracing is on (``backup_analyzer.tracing``) every job is an
+  ``analyzer:<name>`` span and the workers hand their spans back with the
+  result, so one trace covers the whole run.
+
+Must stay importable without tkinter (worker processes and the headless CLI
+import it).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from backup_analyzer import tracing
+from backup_analyzer.manifest_index import ManifestIndex, get_manifest_index
+from backup_analyzer.mbfile_decoder import default_decode_workers
+from backup_analyzer.path_search import get_path_search
+from backup_analyzer.virtual_backup import get_virtual_backup, register_virtual_backup
+
+DEFAULT_MEMORY_BUDGET = 2 * 1024 ** 3
+JOB_BASE_BYTES = 32 * 1024 ** 2        # 인터프리터 + 분석기 모듈
+JOB_MEMORY_FACTOR = 4                  # 원본 DB 크기 대비 결과 객체 배율
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"             # 백업에 해당 아티팩트가 없음
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+ADDRESSBOOK_FILE_ID = "31bb7ba8914766d4ba40d6dfb6113c8b614be442"
+
+# fileID 문자열 또는 PathSearch.find() 조건
+Source = Union[str, Dict[str, Any]]
+
+
+class ArtifactMissing(Exception):
+    """The artifact's database is not present in this backup."""
+
+
+class ArtifactJob:
+    """One analyzer run: ``extract(backup_path)`` plus the files it reads."""
+
+    __slots__ = ("name", "extract", "sources", "count")
+
+    def __init__(
+        self,
+        name: str,
+        extract: Callable[[str], Any],
+        sources: Sequence[Source] = (),
+        count: Optional[Callable[[Any], int]] = None,
+    ):
+        self.name = name
+        self.extract = extract
+        self.sources = tuple(sources)
+        self.count = count or _default_count
+
+
+class JobResult:
+    """Outcome of one job, as published to listeners and the result store."""
+
+    __slots__ = ("name", "status", "value", "count", "error", "trace", "elapsed", "estimate", "cached", "spans")
+
+    def __init__(self, name: str, status: str = STATUS_OK):
+        self.name = name
+        self.status = status
+        self.value: Any = None
+        self.count = 0
+        self.error: Optional[str] = None
+        self.trace: Optional[str] = None
+        self.elapsed = 0.0
+        self.estimate = 0
+        self.cached = False                # case store 에서 복원됨
+        self.spans: Optional[Dict[str, Any]] = None   # worker 가 기록한 tracing span
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+
+def _default_count(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, dict):
+        return 1
+    try:
+        return len(value)
+    except TypeError:
+        return 1
+
+
+# ─────────────────────────────────────────────────────────────────
+# 작업 정의 (worker 프로세스에서 실행 – 결과는 pickle 가능해야 함)
+# ─────────────────────────────────────────────────────────────────
+def _extract_device_info(backup_path: str):
+    from artifact_analyzer.device.device_info import show_device_info
+
+    info = show_device_info(backup_path, display_ui=False)
+    if info is None:
+        raise ArtifactMissing("Manifest.plist not found")
+    return info
+
+
+def _extract_contacts(backup_path: str):
+    from artifact_analyzer.addressbook.addressbook_analyzer import ContactContentAnalyzer
+
+    analyzer = ContactContentAnalyzer(backup_path)
+    if not os.path.exists(analyzer.db_path):
+        raise ArtifactMissing("AddressBook.sqlitedb not found")
+    ok, msg = analyzer.load_contacts()
+    if not ok:
+        raise RuntimeError(msg)
+    return analyzer
+
+
+def _extract_call_history(backup_path: str):
+    from artifact_analyzer.call.call_history import CallHistoryAnalyzer
+
+    analyzer = CallHistoryAnalyzer(backup_path)
+    ok, msg = analyzer._resolve_db_path()
+    if not ok:
+        raise ArtifactMissing(msg)
+    ok, msg = analyzer.load_call_records()
+    if not ok:
+        raise RuntimeError(msg)
+    return analyzer
+
+
+def _extract_imessage(backup_path: str):
+    from artifact_analyzer.messenger.sms.sms_analyser import IMessageAnalyzer
+
+    try:
+        analyzer = IMessageAnalyzer(backup_path)
+    except FileNotFoundError as e:
+        raise ArtifactMissing(str(e)) from None
+    ok, msg = analyzer.load()
+    if not ok:
+        raise RuntimeError(msg)
+    analyzer.preload_messages()
+    return analyzer
+
+
+def _extract_kakaotalk(backup_path: str):
+    from artifact_analyzer.messenger.kakaotalk.kakaotalk_analyzer import KakaoTalkAnalyzer
+
+    analyzer = KakaoTalkAnalyzer(backup_path)
+    if not analyzer.preload():
+        raise ArtifactMissing("KakaoTalk Message.sqlite / Talk.sqlite not found")
+    return analyzer
+
+
+def _extract_line(backup_path: str):
+    from artifact_analyzer.messenger.line.line_analyzer import LineAnalyzer
+
+    try:
+        analyzer = LineAnalyzer(backup_path)
+    except FileNotFoundError as e:
+        raise ArtifactMissing(str(e)) from None
+    ok, msg = analyzer.load()
+    if not ok:
+        raise RuntimeError(msg)
+    analyzer.preload_messages()
+    return analyzer
+
+
+def _extract_notes(backup_path: str):
+    from artifact_analyzer.notes.notes_analyser import NotesAnalyser
+
+    analyzer = NotesAnalyser(backup_path)
+    if not analyzer.connect_to_db():
+        raise ArtifactMissing("NoteStore.sqlite not found")
+    try:
+        return analyzer.get_all_notes()
+    finally:
+        analyzer.close()
+
+
+def _extract_calendar(backup_path: str):
+    from artifact_analyzer.calendar.calendar_analyzer import CalendarAnalyser
+
+    analyzer = CalendarAnalyser(backup_path)
+    if not analyzer.connect_to_db():
+        raise ArtifactMissing("Calendar.sqlitedb not found")
+    try:
+        return analyzer.get_all_events()
+    finally:
+        analyzer.close_connection()
+
+
+def _extract_instagram_dm(backup_path: str):
+    from artifact_analyzer.messenger.instagram.dm import InstagramDMAnalyzer
+
+    analyzer = InstagramDMAnalyzer(backup_path)
+    if not analyzer.get_db_hash_paths():
+        raise ArtifactMissing("Instagram DM databases not found")
+    return {"databases": analyzer.get_db_paths(), "messages": analyzer.get_chat_list()}
+
+
+def _extract_safari(backup_path: str):
+    from artifact_analyzer.browser.safari.bookmark import get_safari_bookmarks
+    from artifact_analyzer.browser.safari.history import get_safari_history
+
+    # Safari 파서는 실패/미존재를 안내 문자열로 돌려준다
+    history = get_safari_history(backup_path)
+    bookmarks = get_safari_bookmarks(backup_path)
+    if isinstance(history, str) and isinstance(bookmarks, str):
+        raise ArtifactMissing(f"{history} / {bookmarks}")
+    return {"history": history, "bookmarks": bookmarks}
+
+
+def _extract_chrome(backup_path: str):
+    from artifact_analyzer.browser.chrome.history import CHROME_SESSION_FILE_IDS, get_chrome_history
+
+    index = get_manifest_index(backup_path)
+    if index is not None and not any(index.lookup_file_id(f) for f in CHROME_SESSION_FILE_IDS):
+        raise ArtifactMissing("Chrome history databases not found")
+    return get_chrome_history(backup_path)
+
+
+def _count_safari(value: Dict[str, Any]) -> int:
+    return sum(len(v) for v in value.values() if not isinstance(v, str))
+
+
+JOBS: Dict[str, ArtifactJob] = {job.name: job for job in (
+    ArtifactJob("device_info", _extract_device_info),
+    ArtifactJob("contacts", _extract_contacts, [ADDRESSBOOK_FILE_ID],
+                count=lambda a: len(a.contacts)),
+    ArtifactJob("call_history", _extract_call_history,
+                ["5a4935c78a5255723f707230a451d79c540d2741", ADDRESSBOOK_FILE_ID],
+                count=lambda a: len(a.call_records)),
+    ArtifactJob("imessage", _extract_imessage,
+                ["3d0d7e5fb2ce288813306e4d4636395e047a3d28", ADDRESSBOOK_FILE_ID],
+                count=lambda a: len(a.rows)),
+    ArtifactJob("kakaotalk", _extract_kakaotalk,
+                [{"domain": "AppDomain-com.iwilab.KakaoTalk",
+                  "suffix": ("PrivateDocuments/Message.sqlite", "PrivateDocuments/Talk.sqlite")}],
+                count=lambda a: len(a.conversation_cache or ())),
+    ArtifactJob("line", _extract_line, ["ce21064ca3ffd3ee7a90147bf2d24b91ee9ba8c9"],
+                count=lambda a: len(a.rows)),
+    ArtifactJob("notes", _extract_notes,
+                [{"domain_prefix": "AppDomainGroup-group.com.apple.notes", "suffix": "NoteStore.sqlite"}]),
+    ArtifactJob("calendar", _extract_calendar, [{"suffix": "Calendar/Calendar.sqlitedb"}]),
+    ArtifactJob("instagram_dm", _extract_instagram_dm,
+                [{"contains": "DirectSQLiteDatabase", "suffix": (".db", ".sqlite", ".sqlite3")}],
+                count=lambda v: len(v["messages"])),
+    ArtifactJob("safari", _extract_safari,
+                [{"suffix": ("Safari/History.db", "Safari/Bookmarks.db")}], count=_count_safari),
+    ArtifactJob("chrome", _extract_chrome,
+                ["fe90cf53890f383fb2b28ec36ac2b5d8a678eaec", "27598ef0cedfcb929996cc6f9112a95ad1cd0fd7"]),
+)}
+
+
+def source_rows(index: ManifestIndex, job: ArtifactJob) -> List[int]:
+    """Manifest rows of the files *job* reads (fileIDs and search criteria)."""
+    rows: List[int] = []
+    search = None
+    for source in job.sources:
+        if isinstance(source, str):
+            located = index.lookup_file_id(source)
+            row = index.row(*located) if located else None
+            if row is not None:
+                rows.append(row)
+        else:
+            search = search or get_path_search(index.backup_path)
+            if search is not None:
+                rows.extend(search.find(**source))
+    return sorted(set(rows))
+
+
+def source_signature(index: ManifestIndex, job: ArtifactJob) -> List[Tuple[str, Optional[int], Optional[int]]]:
+    """(fileID, size, mtime) of every file *job* reads – compared across backups."""
+    signature = [(index.row_file_id(r), index.row_size(r), index.row_mtime(r)) for r in source_rows(index, job)]
+    listed = {file_id for file_id, _, _ in signature}
+    for source in job.sources:
+        # Manifest 에 없는 고정 fileID 는 분석기가 원본 경로를 직접 열므로 파일 자체로 비교
+        if isinstance(source, str) and source not in listed:
+            try:
+                st = os.stat(os.path.join(index.backup_path, source[:2], source))
+            except OSError:
+                continue
+            signature.append((source, st.st_size, int(st.st_mtime)))
+    return signature
+
+
+def estimate_job_bytes(index: Optional[ManifestIndex], job: ArtifactJob) -> int:
+    if index is None:
+        return JOB_BASE_BYTES
+    source_bytes = sum(index.row_size(r) or 0 for r in source_rows(index, job))
+    return JOB_BASE_BYTES + JOB_MEMORY_FACTOR * source_bytes
+
+
+def run_job(name: str, backup_path: str) -> JobResult:
+    """Run one job and capture its outcome (never raises)."""
+    result = JobResult(name)
+    job = JOBS[name]
+    started = time.perf_counter()
+    with tracing.span(f"analyzer:{name}", "analyzer") as s:
+        try:
+            result.value = job.extract(backup_path)
+            result.count = job.count(result.value)
+        except ArtifactMissing as e:
+            result.status, result.error = STATUS_MISSING, str(e)
+        except Exception as e:
+            result.status, result.error = STATUS_FAILED, f"{type(e).__name__}: {e}"
+            result.trace = traceback.format_exc()
+        s.add(rows=result.count)
+        s.set(status=result.status)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _run_pool_job(name: str, backup_path: str) -> JobResult:
+    """:func:`run_job` in a pool worker; the spans it recorded travel back with the result."""
+    result = run_job(name, backup_path)
+    if tracing.is_enabled():
+        result.spans = tracing.drain()
+    return result
+
+
+def _init_worker(
+    backup_path: str, class_keys: Optional[Dict[int, bytes]], phone_lookup, trace: bool = False,
+) -> None:
+    """Pool initializer: install the dependencies prepared by the parent."""
+    tracing.reset()                     # fork 로 물려받은 부모 span 은 버림
+    tracing.enable(trace)
+    if class_keys:
+        # 캐시 정리·LRU 예산은 부모 프로세스 몫 (다른 워커가 쓰는 임시 파일을 지우지 않도록)
+        register_virtual_backup(backup_path, class_keys, owner=False)
+    if phone_lookup is not None:
+        from artifact_analyzer.addressbook.addressbook_analyzer import register_phone_lookup
+
+        register_phone_lookup(phone_lookup)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 오케스트레이터
+# ─────────────────────────────────────────────────────────────────
+class ArtifactOrchestrator:
+    """Schedules :data:`JOBS` for one backup and keeps their results."""
+
+    def __init__(
+        self,
+        backup_path: str,
+        jobs: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        on_result: Optional[Callable[[JobResult], None]] = None,
+        case_store: bool = True,
+        incremental: bool = True,
+    ):
+        self.backup_path = backup_path
+        self.job_names = list(jobs) if jobs is not None else list(JOBS)
+        unknown = [n for n in self.job_names if n not in JOBS]
+        if unknown:
+            raise KeyError(f"unknown artifact job(s): {', '.join(unknown)}")
+        self.workers = default_decode_workers() if workers is None else max(0, workers)
+        self.memory_budget = memory_budget
+        self.on_result = on_result
+        self.use_case_store = case_store
+        self.incremental = incremental
+        self.results: Dict[str, JobResult] = {}
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    # ── 실행 ────────────────────────────────────────────────────
+    def start(self) -> "ArtifactOrchestrator":
+        """Run in a background thread; results are published as they complete."""
+        self._thread = threading.Thread(target=self.run, name="artifact-orchestrator", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def run(self) -> Dict[str, JobResult]:
+        """Run every job (blocking) and return the results by name."""
+        started = time.perf_counter()
+        try:
+            index = get_manifest_index(self.backup_path)
+            store, reused, signatures = self._publish_stored(index) if self.use_case_store else (None, [], None)
+            pending = [name for name in self.job_names if name not in self.results]
+            if pending:
+                phone_lookup = self._prepare(index)
+                plan = sorted(
+                    ((name, estimate_job_bytes(index, JOBS[name])) for name in pending),
+                    key=lambda item: item[1], reverse=True,
+                )
+                if self.workers <= 0:
+                    self._run_inline(plan)
+                else:
+                    self._run_pool(plan, phone_lookup)
+            if store is not None and (pending or reused) and not self.cancel_event.is_set():
+                if signatures is None:
+                    signatures = self._signatures(index)
+                self._store_results(store, index, pending + reused, signatures)
+        finally:
+            for name in self.job_names:
+                if name not in self.results:
+                    self._publish(JobResult(name, STATUS_CANCELLED))
+            self.done_event.set()
+        ok = sum(r.ok for r in self.results.values())
+        print(f"[Orchestrator] {self.backup_path}: {ok}/{len(self.job_names)} artifacts "
+              f"in {time.perf_counter() - started:.2f}s (workers={self.workers})")
+        return self.results
+
+    def _prepare(self, index: Optional[ManifestIndex]):
+        """Shared dependencies, built once in this process."""
+        from artifact_analyzer.addressbook.addressbook_analyzer import get_phone_lookup
+        from backup_analyzer.manifest_cache import save_manifest_cache
+
+        if index is not None and not index.from_cache and self.workers > 0:
+            save_manifest_cache(index)          # worker 는 sidecar 에서 바로 로드
+        # 연락처·통화기록·iMessage 분석기가 쓰는 것과 같은 경로로 등록
+        ab_path = os.path.join(self.backup_path, ADDRESSBOOK_FILE_ID[:2], ADDRESSBOOK_FILE_ID)
+        return get_phone_lookup(ab_path)
+
+    def _signatures(self, index: Optional[ManifestIndex]) -> Dict[str, List[Tuple[str, Optional[int], Optional[int]]]]:
+        """Source files of every job that reads any (jobs without sources always re-run)."""
+        if index is None:
+            return {}
+        return {name: source_signature(index, JOBS[name]) for name in self.job_names if JOBS[name].sources}
+
+    def _publish_stored(self, index: Optional[ManifestIndex]):
+        """
+        Publish what the case store already holds – or, for a new backup, what
+        the previous case of the device still covers. Returns the store to
+        write to, the names taken over from the previous case and the source
+        signatures if they had to be computed.
+        """
+        from artifact_analyzer.case_store import get_case_store
+
+        reused: List[str] = []
+        signatures = None
+        try:
+            store = get_case_store(self.backup_path, create=True)
+            stored = store.load_results(self.job_names) if store is not None else {}
+            if store is not None and self.incremental and not stored:
+                signatures = self._signatures(index)
+                stored = store.load_previous(self.job_names, signatures)
+                reused = list(stored)
+        except Exception as e:
+            print(f"[Orchestrator] case store unavailable: {e}")
+            return None, [], None
+        for name in self.job_names:
+            if name in stored:
+                self._publish(stored[name])
+        return store, reused, signatures
+
+    def _store_results(self, store, index: Optional[ManifestIndex], names: Sequence[str], signatures) -> None:
+        results = [self.results[n] for n in names if n in self.results]
+        try:
+            store.write_results(results, index, signatures)
+        except Exception as e:
+            print(f"[Orchestrator] case store write failed: {e}")
+
+    def _run_inline(self, plan: List[Tuple[str, int]]) -> None:
+        for name, estimate in plan:
+            if self.cancel_event.is_set():
+                return
+            result = run_job(name, self.backup_path)
+            result.estimate = estimate
+            self._publish(result)
+
+    def _run_pool(self, plan: List[Tuple[str, int]], phone_lookup) -> None:
+        virtual = get_virtual_backup(self.backup_path)
+        class_keys = virtual.class_keys if virtual is not None else None
+        pending = list(plan)
+        in_flight: Dict[Any, Tuple[str, int]] = {}
+        used = 0
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(plan)) or 1,
+            initializer=_init_worker,
+            initargs=(self.backup_path, class_keys, phone_lookup, tracing.is_enabled()),
+        ) as pool:
+            while pending or in_flight:
+                if self.cancel_event.is_set():
+                    for future in in_flight:
+                        future.cancel()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return
+                # 예산 안에서 큰 작업부터 투입 (아무것도 안 돌면 하나는 무조건)
+                i = 0
+                while i < len(pending) and len(in_flight) < self.workers:
+                    name, estimate = pending[i]
+                    if in_flight and used + estimate > self.memory_budget:
+                        i += 1
+                        continue
+                    in_flight[pool.submit(_run_pool_job, name, self.backup_path)] = pending.pop(i)
+                    used += estimate
+                done, _ = wait(list(in_flight), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, estimate = in_flight.pop(future)
+                    used -= estimate
+                    try:
+                        result = future.result()
+                    except Exception as e:              # worker 비정상 종료 등
+                        result = JobResult(name, STATUS_FAILED)
+                        result.error = f"{type(e).__name__}: {e}"
+                    if result.spans is not None:
+                        tracing.merge(result.spans)
+                        result.spans = None
+                    result.estimate = estimate
+                    self._publish(result)
+        if virtual is not None:
+            virtual.adopt_cache()                # 워커가 복호화한 파일을 LRU·예산에 반영
+
+    def _publish(self, result: JobResult) -> None:
+        with self._cond:
+            self.results[result.name] = result
+            self._cond.notify_all()
+        if result.status != STATUS_CANCELLED:
+            print(f"[Orchestrator] {result.name}: {result.status} "
+                  f"({result.count} records, {result.elapsed:.2f}s"
+                  + (", case store)" if result.cached else ")")
+                  + (f" – {result.error}" if result.status == STATUS_FAILED else ""))
+        if self.on_result is not None:
+            try:
+                self.on_result(result)
+            except Exception as e:
+                print(f"[Orchestrator] on_result callback failed: {e}")
+
+    # ── 조회 ────────────────────────────────────────────────────
+    def result(self, name: str, wait: bool = False, timeout: Optional[float] = None) -> Optional[JobResult]:
+        """Published result of *name*; with *wait* block until it is available."""
+        with self._cond:
+            if wait:
+                self._cond.wait_for(lambda: name in self.results or self.done_event.is_set(), timeout)
+            return self.results.get(name)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 백업별 레지스트리 (GUI 패널용)
+# ─────────────────────────────────────────────────────────────────
+_RUNS: Dict[str, ArtifactOrchestrator] = {}
+_RUNS_LOCK = threading.Lock()
+
+
+def _registry_key(backup_path: str) -> str:
+    return os.path.normcase(os.path.abspath(backup_path))
+
+
+def start_artifact_extraction(backup_path: str, **kwargs) -> ArtifactOrchestrator:
+    """Start a background run for *backup_path*, replacing any earlier run."""
+    orchestrator = ArtifactOrchestrator(backup_path, **kwargs)
+    with _RUNS_LOCK:
+        for previous in _RUNS.values():
+            previous.cancel()
+        _RUNS.clear()
+        _RUNS[_registry_key(backup_path)] = orchestrator
+    return orchestrator.start()
+
+
+def get_artifact_orchestrator(backup_path: str) -> Optional[ArtifactOrchestrator]:
+    if not backup_path:
+        return None
+    return _RUNS.get(_registry_key(backup_path))
+
+
+def get_artifact_result(backup_path: str, name: str) -> Any:
+    """Precomputed value of artifact *name*, or None if it is not (yet) available."""
+    orchestrator = get_artifact_orchestrator(backup_path)
+    result = orchestrator.result(name) if orchestrator is not None else None
+    return result.value if result is not None and result.ok else None
+
+
+def drop_artifact_results(backup_path: str) -> None:
+    with _RUNS_LOCK:
+        orchestrator = _RUNS.pop(_registry_key(backup_path), None)
+    if orchestrator is not None:
+        orchestrator.cancel()
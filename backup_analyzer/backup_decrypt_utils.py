@@ -1,24 +1,18 @@
 import os
-import stat
 import sqlite3
-import shutil
 import time
 import threading
 import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
-from uuid import uuid4
-from iphone_backup_decrypt import EncryptedBackup
 
-_SQLITE_MAGIC_HEX = "53514c69746520666f726d6174203300"
-
-def is_backup_encrypted(backup_path: str) -> bool:
-    path = os.path.join(backup_path, "Manifest.db")
-    try:
-        with open(path, "rb") as fp:
-            return fp.read(16).hex() != _SQLITE_MAGIC_HEX
-    except FileNotFoundError:
-        return True
+from backup_analyzer.backup_unlock import is_backup_encrypted, safe_remove, unlock_backup
+from backup_analyzer.decrypt_engine import (
+    DecryptionJournal,
+    decrypt_files_parallel,
+    verify_decrypted,
+)
+from backup_analyzer.virtual_backup import get_virtual_backup, register_virtual_backup
 
 def _center_window(win: tk.Toplevel | tk.Tk, parent: tk.Toplevel | tk.Tk | None = None):
     win.update_idletasks()
@@ -41,37 +35,35 @@ def _popup(msg: str, title: str = "Notice", parent: tk.Toplevel | tk.Tk | None =
     win.focus_force()
     win.wait_window()
 
-def _safe_remove(path: str):
-    try:
-        if os.path.exists(path):
-            os.chmod(path, stat.S_IWRITE)
-            os.remove(path)
-    except PermissionError:
-        pass
-
-def _atomic_replace(src: str, dst: str):
-    try:
-        os.replace(src, dst)
-        return
-    except PermissionError:
-        if os.path.exists(dst):
-            os.chmod(dst, stat.S_IWRITE)
-            try:
-                os.replace(src, dst)
-                return
-            except PermissionError:
-                pass
-    try:
-        shutil.copyfile(src, dst)
-        os.chmod(dst, stat.S_IWRITE)
-        _safe_remove(src)
-    except Exception as exc:
-        raise PermissionError(f"Failed to overwrite '{dst}' → {exc}") from exc
+def open_encrypted_backup(
+    passphrase: str,
+    backup_path: str,
+    parent: tk.Toplevel | tk.Tk | None = None,
+    use_key_cache: bool = False,
+) -> bool:
+    """
+    Decrypt only Manifest.db and register the decrypt-on-read layer so the
+    backup can be browsed immediately; file blobs are decrypted on first
+    access (see ``backup_analyzer.virtual_backup``).
+    """
+    if not passphrase:
+        _popup("🔑 Please enter the backup password.", "Missing Password", parent)
+        return False
+
+    class_keys, err = unlock_backup(passphrase, backup_path, use_key_cache)
+    if err:
+        _popup(err, "Error", parent)
+        return False
+    register_virtual_backup(backup_path, class_keys)
+    return True
+
 
 def decrypt_iphone_backup(
     passphrase: str,
     backup_path: str,
     parent: tk.Toplevel | tk.Tk | None = None,
+    verify: bool = False,
+    use_key_cache: bool = False,
 ) -> bool:
     """
     • 복호화 작업이 시작되면 `<backup>/.decrypting` 플래그를 만들고,
@@ -81,6 +73,14 @@ def decrypt_iphone_backup(
     • 사용자가 X 버튼을 눌러 프로그레스 창을 닫으면 `cancel_event`
       플래그를 세워 워커 스레드를 중단시키고,
       `.decrypting` 파일을 남겨 Load 를 차단한다.
+    • 완료된 fileID 는 `<backup>/.decryption_journal` 에 기록되므로
+      다시 실행하면 남은 파일부터 이어서 복호화한다.
+      `verify=True` 이면 저널에 있는 파일이 실제 평문인지 먼저 확인한다.
+      크기가 MBFile.Size 와 다른 파일은 다시 복호화하고, 크기는 맞지만
+      SQLite·plist·JPEG·PNG·HEIC·MP4 헤더 시그니처가 틀린 파일은 원본
+      암호문이 이미 없으므로 끝난 뒤 알리기만 한다. 그 밖의 형식은 크기만 본다.
+    • `use_key_cache=True` 이면 키 캐시(backup_analyzer.key_cache)를 사용해
+      같은 케이스를 다시 열 때 PBKDF2 를 건너뛴다.
     """
     if not passphrase:
         _popup("🔑 Please enter the backup password.", "Missing Password", parent)
@@ -89,7 +89,7 @@ def decrypt_iphone_backup(
     # ── 플래그 파일 준비 ──────────────────────────────────────
     decrypting_flag      = os.path.join(backup_path, ".decrypting")
     completed_flag       = os.path.join(backup_path, ".decryption_complete")
-    _safe_remove(completed_flag)                 # 이전 기록 제거
+    safe_remove(completed_flag)                  # 이전 기록 제거
     with open(decrypting_flag, "w") as fp:       # 진행 중 표시
         fp.write(time.strftime("%Y-%m-%d %H:%M:%S"))
 
@@ -138,75 +138,89 @@ def decrypt_iphone_backup(
 
     # ── 워커 스레드 ───────────────────────────────────────────
     def worker():
-        manifest_tmp = os.path.join(backup_path, f"_manifest_{uuid4().hex}.dec")
         manifest_dst = os.path.join(backup_path, "Manifest.db")
         start_time = time.time()
+        journal = DecryptionJournal(backup_path)
 
-        try:
-            backup = EncryptedBackup(backup_directory=backup_path, passphrase=passphrase)
-            backup.save_manifest_file(manifest_tmp)
-            with open(manifest_tmp, "rb") as fp:
-                if fp.read(16).hex() != _SQLITE_MAGIC_HEX:
-                    _safe_remove(manifest_tmp)
-                    q.put(("error", "Incorrect password. Please try again."))
-                    return
-            _atomic_replace(manifest_tmp, manifest_dst)
-        except Exception as e:
-            _safe_remove(manifest_tmp)
-            q.put(("error", f"Error decrypting Manifest.db\n{e}"))
+        was_encrypted = is_backup_encrypted(backup_path)
+        class_keys, err = unlock_backup(passphrase, backup_path, use_key_cache)
+        if err:
+            q.put(("error", err))
             return
+        if was_encrypted:
+            journal.discard()                    # 새 작업 → 이전 저널 무효
+        # else: 이전 실행에서 Manifest.db 는 이미 평문 → 저널로 이어서 진행
 
-        # ── 파일 목록 취득 ───────────────────────────────────
+        # ── 파일 목록 취득(blob 은 풀에 넘기면서 스트리밍) ───────────
+        where = "WHERE Flags != 2 AND relativePath != ''"
         try:
             conn = sqlite3.connect(manifest_dst)
-            cur = conn.cursor()
-            cur.execute("SELECT fileID, relativePath FROM Files WHERE Flags != 2")
-            files = cur.fetchall()
-            conn.close()
+            done_ids = journal.load()
+            corrupt = set()
+            if verify and done_ids:
+                stale, corrupt = verify_decrypted(
+                    backup_path, conn.execute(f"SELECT fileID, relativePath, file FROM Files {where}"), done_ids
+                )
+                if stale:
+                    done_ids -= stale
+                    journal.rewrite(sorted(done_ids))
+                for fid in sorted(corrupt):
+                    print(f"[Decrypt] header check failed (not recoverable from this backup): {fid}")
+            total = skipped = 0
+            for (fid,) in conn.execute(f"SELECT fileID FROM Files {where}"):
+                total += 1
+                skipped += fid in done_ids
         except Exception as e:
             q.put(("error", f"Error reading Manifest.db\n{e}"))
             return
 
-        q.put(("total", len(files), start_time))
-        success_cnt = fail_cnt = 0
+        def iter_files():
+            cur = conn.execute(f"SELECT fileID, file FROM Files {where} ORDER BY fileID")
+            while True:
+                rows = cur.fetchmany(1000)
+                if not rows:
+                    return
+                yield from (row for row in rows if row[0] not in done_ids)
 
-        for idx, (fid, rel) in enumerate(files, 1):
-            # 취소 감지
-            if cancel_event.is_set():
-                q.put(("cancelled",))
-                return
+        q.put(("total", total, skipped, start_time))
 
-            if not rel:
-                q.put(("progress", idx, success_cnt, fail_cnt, start_time))
-                continue
-
-            enc = os.path.join(backup_path, fid[:2], fid)
-            tmp = enc + "_temp"
-            if not os.path.exists(enc):
-                fail_cnt += 1
-                q.put(("progress", idx, success_cnt, fail_cnt, start_time))
-                continue
-
-            try:
-                backup.extract_file(relative_path=rel, output_filename=tmp)
-                os.remove(enc)
-                os.rename(tmp, enc)
-                success_cnt += 1
-            except Exception:
-                # 복구 실패 시에도 취소 플래그 우선 확인
-                if cancel_event.is_set():
-                    q.put(("cancelled",))
-                    return
-                fail_cnt += 1
-            finally:
-                q.put(("progress", idx, success_cnt, fail_cnt, start_time))
+        # ── 프로세스 풀로 병렬 복호화 ─────────────────────────────
+        def report(succ: int, fail: int):
+            q.put(("progress", skipped + succ + fail, succ, fail, start_time))
+
+        try:
+            # decrypt-on-read 가 열려 있으면 blob 교체는 그 계층을 거쳐서 (읽는 중인 파일과 경합 방지)
+            virtual = get_virtual_backup(backup_path)
+            result = decrypt_files_parallel(
+                backup_path, class_keys, iter_files(),
+                progress=report, cancel_event=cancel_event, journal=journal,
+                replace=virtual.replace_in_place if virtual is not None else None,
+            )
+        except Exception as e:
+            q.put(("error", f"Error decrypting backup files\n{e}"))
+            return
+        finally:
+            journal.close()
+            conn.close()
+        if result is None:
+            q.put(("cancelled",))
+            return
+        success_cnt, fail_cnt = result
+
+        # ── 완료 플래그 ───────────────────────────────────────────
+        if not fail_cnt:
+            journal.discard()                    # 실패가 있으면 재시도용으로 보존
+        safe_remove(decrypting_flag)
+        with open(completed_flag, "w") as fp:
+            fp.write(time.strftime("%Y-%m-%d %H:%M:%S"))
 
-        q.put(("done", success_cnt, fail_cnt))
+        q.put(("done", skipped + success_cnt, fail_cnt, len(corrupt)))
 
     threading.Thread(target=worker, daemon=True).start()
 
     # ── GUI 폴링 루프 ────────────────────────────────────────
     total_files = 0
+    resumed_from = 0
     start_time_ref = None
 
     def _sec_to_hms(sec: float) -> str:
@@ -217,7 +231,7 @@ def decrypt_iphone_backup(
         return f"{h:d}:{m:02d}:{s:02d}" if h else f"{m:d}:{s:02d}"
 
     def _poll():
-        nonlocal total_files, start_time_ref, result_success
+        nonlocal total_files, resumed_from, start_time_ref, result_success
         while not q.empty():
             tag, *payload = q.get()
             if tag == "error":
@@ -226,19 +240,31 @@ def decrypt_iphone_backup(
                 return
             if tag == "cancelled":
                 _popup("Decryption cancelled by user.\n"
-                       "Load will be disabled until you restart decryption.",
+                       "Load will be disabled until you restart decryption;\n"
+                       "already decrypted files will be skipped.",
                        "Cancelled", gui_root)
                 return                                   # .decrypting 그대로 둠
+            if tag == "done":
+                result_success = True
+                if prog.winfo_exists():
+                    prog.destroy()
+                if payload[2]:
+                    _popup(f"{payload[2]} previously decrypted files failed the header check\n"
+                           "and cannot be recovered from this backup (see the log).",
+                           "Verification", gui_root)
+                return
             if tag == "total":
-                total_files, start_time_ref = payload
+                total_files, resumed_from, start_time_ref = payload
                 bar.config(maximum=total_files)
-                counter_lbl.config(text=f"0/{total_files} files")
+                bar["value"] = resumed_from
+                counter_lbl.config(text=f"{resumed_from}/{total_files} files")
             elif tag == "progress":
                 current, succ, fail, st = payload
                 bar["value"] = current
                 counter_lbl.config(text=f"{current}/{total_files} files")
                 elapsed = time.time() - st
-                remaining = (elapsed / current * (total_files - current)) if current else float("inf")
+                processed = current - resumed_from
+                remaining = (elapsed / processed * (total_files - current)) if processed else float("inf")
                 elapsed_val.config(text=_sec_to_hms(elapsed))
                 eta_val.config(text=_sec_to_hms(remaining))
         prog.after(100, _poll)
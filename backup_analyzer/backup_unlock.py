@@ -0,0 +1,113 @@
+"""
+Unlocking an encrypted backup without any GUI.
+
+Shared by the Tk front end (``backup_decrypt_utils``) and the headless batch
+runner, so it must never import tkinter.
+"""
+
+import os
+import stat
+import shutil
+from uuid import uuid4
+
+from iphone_backup_decrypt import EncryptedBackup
+
+from backup_analyzer.decrypt_engine import class_keys_from_backup, decrypt_manifest_db
+from backup_analyzer.key_cache import load_class_keys, store_class_keys
+
+_SQLITE_MAGIC_HEX = "53514c69746520666f726d6174203300"
+
+
+def is_backup_encrypted(backup_path: str) -> bool:
+    path = os.path.join(backup_path, "Manifest.db")
+    try:
+        with open(path, "rb") as fp:
+            return fp.read(16).hex() != _SQLITE_MAGIC_HEX
+    except FileNotFoundError:
+        return True
+
+
+def safe_remove(path: str):
+    try:
+        if os.path.exists(path):
+            os.chmod(path, stat.S_IWRITE)
+            os.remove(path)
+    except PermissionError:
+        pass
+
+
+def atomic_replace(src: str, dst: str):
+    try:
+        os.replace(src, dst)
+        return
+    except PermissionError:
+        if os.path.exists(dst):
+            os.chmod(dst, stat.S_IWRITE)
+            try:
+                os.replace(src, dst)
+                return
+            except PermissionError:
+                pass
+    try:
+        shutil.copyfile(src, dst)
+        os.chmod(dst, stat.S_IWRITE)
+        safe_remove(src)
+    except Exception as exc:
+        raise PermissionError(f"Failed to overwrite '{dst}' → {exc}") from exc
+
+
+def unlock_backup(
+    passphrase: str,
+    backup_path: str,
+    use_key_cache: bool = False,
+) -> tuple[dict | None, str | None]:
+    """
+    Decrypt Manifest.db in place (if still encrypted) and unlock the keybag.
+    Returns (class keys, None) or (None, error message).
+
+    With *use_key_cache* the class keys are taken from / stored to the
+    per-case key cache, so repeated opens skip PBKDF2.
+    """
+    manifest_tmp = os.path.join(backup_path, f"_manifest_{uuid4().hex}.dec")
+    manifest_dst = os.path.join(backup_path, "Manifest.db")
+
+    def _install_manifest() -> bool:
+        with open(manifest_tmp, "rb") as fp:
+            if fp.read(16).hex() != _SQLITE_MAGIC_HEX:
+                safe_remove(manifest_tmp)
+                return False
+        atomic_replace(manifest_tmp, manifest_dst)
+        return True
+
+    # ── 키 캐시 적중 → PBKDF2 생략 ───────────────────────────────
+    cached = load_class_keys(backup_path, passphrase) if use_key_cache else None
+    if cached is not None:
+        try:
+            if not is_backup_encrypted(backup_path):
+                return cached, None
+            decrypt_manifest_db(backup_path, cached, manifest_tmp)
+            if _install_manifest():
+                return cached, None
+        except Exception:
+            safe_remove(manifest_tmp)       # 오래된 캐시 → 정상 경로로
+
+    try:
+        backup = EncryptedBackup(backup_directory=backup_path, passphrase=passphrase)
+        if is_backup_encrypted(backup_path):
+            backup.save_manifest_file(manifest_tmp)
+            if not _install_manifest():
+                return None, "Incorrect password. Please try again."
+    except Exception as e:
+        safe_remove(manifest_tmp)
+        return None, f"Error decrypting Manifest.db\n{e}"
+
+    # ── 클래스 키 추출(PBKDF2 는 여기서 한 번만) ────────────────
+    try:
+        class_keys = class_keys_from_backup(backup)
+    except ValueError:
+        return None, "Incorrect password. Please try again."
+    except Exception as e:
+        return None, f"Error unlocking keybag\n{e}"
+    if use_key_cache:
+        store_class_keys(backup_path, passphrase, class_keys)
+    return class_keys, None
@@ -1,5 +1,11 @@
+import glob
 import os
-import sqlite3
+import re
+
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer.path_search import get_path_search
+
+_LIKE_TO_GLOB = {"%": "*", "_": "?"}
 
 class BackupPathHelper:
     """iOS 백업 파일 경로를 찾는 도우미 클래스"""
@@ -24,27 +30,21 @@ class BackupPathHelper:
                 return []
                 
             try:
-                conn = sqlite3.connect(manifest_path)
-                cursor = conn.cursor()
+                search = get_path_search(self.backup_path)
+                if search is None:
+                    print(f"[ERROR] Manifest 인덱스를 만들 수 없습니다: {manifest_path}")
+                    return []
                 
-                # SQL 쿼리 구성
-                if file_type:
-                    query = f"""
-                    SELECT fileID, relativePath
-                    FROM Files
-                    WHERE relativePath LIKE '%{keyword}%' AND relativePath LIKE '%{file_type}';
-                    """
+                # 경로 인덱스 검색 (LIKE '%keyword%' [AND LIKE '%file_type'] 과 동일)
+                if "%" in keyword or "_" in keyword:
+                    # 키워드 안의 LIKE 와일드카드('%', '_')는 glob '*', '?' 로 변환
+                    pattern = "".join(
+                        _LIKE_TO_GLOB.get(part) or glob.escape(part) for part in re.split(r"([%_])", keyword)
+                    )
+                    rows = search.find(glob=f"*{pattern}*", suffix=file_type or None)
                 else:
-                    query = f"""
-                    SELECT fileID, relativePath
-                    FROM Files
-                    WHERE relativePath LIKE '%{keyword}%';
-                    """
-                    
-                print(f"[DEBUG] SQL 쿼리 실행: {query.strip()}")
-                cursor.execute(query)
-                results = cursor.fetchall()
-                conn.close()
+                    rows = search.find(contains=keyword, suffix=file_type or None)
+                results = search.file_pairs(rows)
                 
                 if results:
                     print(f"[INFO] '{keyword}' 키워드로 {len(results)}개 파일을 찾았습니다.")
@@ -54,7 +54,7 @@ class BackupPathHelper:
                     return []
                     
             except Exception as e:
-                print(f"[ERROR] SQL 쿼리 실행 중 오류: {str(e)}")
+                print(f"[ERROR] 경로 검색 중 오류: {str(e)}")
                 return []
         
     def get_full_paths(self, search_results):
@@ -68,9 +68,13 @@ class BackupPathHelper:
             list: (full_path, relative_path) 튜플의 리스트
         """
         full_paths = []
+        index = get_manifest_index(self.backup_path)
         for file_id, relative_path in search_results:
-            full_path = os.path.join(self.backup_path, file_id[:2], file_id)
-            if os.path.exists(full_path):
+            if index is not None:
+                full_path = index.blob_path(file_id)
+            else:
+                full_path = os.path.join(self.backup_path, file_id[:2], file_id)
+            if full_path and os.path.exists(full_path):
                 full_paths.append((full_path, relative_path))
             else:
                 print(f"[WARNING] 파일이 존재하지 않습니다: {full_path}")
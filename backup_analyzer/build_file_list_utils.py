@@ -7,11 +7,15 @@ from __future__ import annotations
 
 import os
 import sqlite3
-import plistlib
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 from tkinter import ttk, PhotoImage, Widget
 
+from backup_analyzer.manifest_index import get_manifest_index, split_tree_path
+from backup_analyzer.mbfile_decoder import decode_mbfile_columns
+from backup_analyzer.tracing import span
+
 # ────────────────────────────────────────────────────────────────
 # 1) 아이콘 (lazy‑load)
 # ────────────────────────────────────────────────────────────────
@@ -65,40 +69,61 @@ def fmt_ts(ts: int | None) -> str:
     return datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
 
 
-def parse_bplist_metadata(blob: bytes | None) -> Tuple[int | None, str, str, str]:
-    """bplist00 → (size, mdate, cdate, perm)"""
-    if not blob:
-        return None, "", "", ""
-    try:
-        plist = plistlib.loads(blob)
-        root = plist["$objects"][plist["$top"]["root"].data]
-        size = root.get("Size")
-        mdate = fmt_ts(root.get("LastModified"))
-        cdate = fmt_ts(root.get("Birth"))
-        perm = mode_to_rwx(root.get("Mode")) if root.get("Mode") else ""
-        return f"{size:,}" if size is not None else None, mdate, cdate, perm
-    except Exception as e:
-        print(f"[bplist parse error] {e}")
-        return None, "", "", ""
+def format_metadata(
+    size: int | None, mtime: int | None, birth: int | None, mode: int | None
+) -> Tuple[str | None, str, str, str]:
+    """MBFile 값 → (size, mdate, cdate, perm) 표시 문자열"""
+    return (
+        f"{size:,}" if size is not None else None,
+        fmt_ts(mtime),
+        fmt_ts(birth),
+        mode_to_rwx(mode) if mode else "",
+    )
+
+
+def _present(value: int) -> int | None:
+    return None if value < 0 else value
 
 
 # ────────────────────────────────────────────────────────────────
 # 3) Manifest.db 조회
 # ────────────────────────────────────────────────────────────────
 
-def get_flags_and_file(backup_path: str, domain: str, rel_path: str):
+_SQL_IN_CHUNK = 500  # SQLITE_MAX_VARIABLE_NUMBER 여유분
+
+
+def get_flags_and_files(backup_path: str, domain: str, rel_paths: List[str]) -> Dict[str, Tuple[int | None, bytes | None]]:
+    """한 번의 연결로 여러 relativePath 의 (flags, file) 을 조회한다."""
+    found: Dict[str, Tuple[int | None, bytes | None]] = {}
+    if not rel_paths:
+        return found
     db_path = os.path.join(backup_path, "Manifest.db")
     try:
-        with sqlite3.connect(db_path) as conn:
+        with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
             cur = conn.cursor()
-            cur.execute(
-                "SELECT flags, file FROM Files WHERE domain=? AND relativePath=?",
-                (domain, rel_path),
-            )
-            return cur.fetchone() or (None, None)
+            for i in range(0, len(rel_paths), _SQL_IN_CHUNK):
+                chunk = rel_paths[i:i + _SQL_IN_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                cur.execute(
+                    f"SELECT relativePath, flags, file FROM Files "
+                    f"WHERE domain=? AND relativePath IN ({marks})",
+                    (domain, *chunk),
+                )
+                for rel_path, flags, blob in cur.fetchall():
+                    found[rel_path] = (flags, blob)
     except Exception as e:
         print(f"[DB Error] {e}")
-        return None, None
+    return found
+
+
+def decode_metadata_batch(blobs: Dict[str, bytes | None]) -> Dict[str, Tuple[str | None, str, str, str]]:
+    """{key: blob} → {key: (size, mdate, cdate, perm)} 를 한 번에 디코딩한다."""
+    keys = list(blobs)
+    cols = decode_mbfile_columns([blobs[key] for key in keys])
+    return {
+        key: format_metadata(*map(_present, values))
+        for key, *values in zip(keys, cols.sizes, cols.mtimes, cols.births, cols.modes)
+    }
 
 
 # ────────────────────────────────────────────────────────────────
@@ -106,27 +131,22 @@ def get_flags_and_file(backup_path: str, domain: str, rel_path: str):
 # ────────────────────────────────────────────────────────────────
 
 def _sum_first_level_file_sizes(child_dict: Dict[str, Any], dir_full_path: str, backup_path: str) -> int:
-    """하위 1‑계층에 존재하는 파일들의 Size 총합을 반환한다."""
+    """하위 1‑계층에 존재하는 파일들의 Size 총합을 반환한다 (Manifest 인덱스 사용)."""
     total = 0
     if not child_dict:
         return total
 
+    index = get_manifest_index(backup_path, build=False)
+    if index is None:
+        return total
+
     for fname in child_dict.keys():
         if not fname:
             continue
-        child_full_path = f"{dir_full_path}/{fname}".strip("/")
-        try:
-            domain, _, rel_path = child_full_path.split("/", 2)
-        except ValueError:
-            domain, rel_path = child_full_path, ""
-        flags, blob = get_flags_and_file(backup_path, domain, rel_path)
-        if flags == 1:  # File
-            size_str, *_ = parse_bplist_metadata(blob)
-            if size_str:
-                try:
-                    total += int(str(size_str).replace(",", ""))
-                except ValueError:
-                    pass
+        domain, rel_path = split_tree_path(f"{dir_full_path}/{fname}".strip("/"))
+        row = index.row(domain, rel_path)
+        if row is not None and index.row_flags(row) == 1:  # File
+            total += index.row_size(row) or 0
     return total
 
 
@@ -142,11 +162,15 @@ def build_file_list_tree(
     current_depth: int = 0,
     max_depth: int = 1,
     backup_path: str = "",
+    dir_stats: Dict[str, Any] | None = None,
 ) -> None:
     """
     #0(text)  : 마지막 경로 요소
     values[0] : 전체 경로 (숨김)
     values[1‑] : Size / Type / mdate / cdate / perm
+
+    dir_stats 가 주어지면 (load_backup 시 계산된 재귀 합계) 디렉터리 Size 는
+    하위 전체 크기로 표시된다.
     """
     # Tk root 가 이미 생성된 시점 → 아이콘 준비
     _ensure_icons(file_list_tree)
@@ -159,46 +183,74 @@ def build_file_list_tree(
     if not sub_dict:
         return
 
+    # Manifest.db 메타 – 자식 전체를 한 번에 조회 후 일괄 디코딩
+    children = []
     for name, child in sorted(sub_dict.items()):
         if not name:
             continue
-
         node_full = f"{full_path}/{name}" if full_path else name
-
-        # Manifest.db 메타
-        try:
-            domain, _, rel_path = node_full.split("/", 2)
-        except ValueError:
-            domain, rel_path = node_full, ""
-        flags, blob = get_flags_and_file(backup_path, domain, rel_path)
-        size_str, mdate, cdate, perm = parse_bplist_metadata(blob)
-
-        file_type = "Directory" if flags != 1 else "File"
-        icon_key = "folder" if file_type == "Directory" else get_file_icon(name)
-
-        # ── Directory Size 보정 (1‑계층 파일 합산) ───────────────
-        if file_type == "Directory":
-            agg_size = _sum_first_level_file_sizes(child, node_full, backup_path)
-            if agg_size:  # 0 인 경우 표시 생략
-                size_str = f"{agg_size:,}"
-
-        values = (node_full, size_str or "", file_type, mdate, cdate, perm)
-        node_id = file_list_tree.insert(
-            parent,
-            "end",
-            text=name,
-            values=values,
-            image=_ICON_DICT[icon_key],
-        )
-
-        # 하위 디렉터리 재귀 (max_depth 제한)
-        if isinstance(child, dict) and current_depth + 1 < max_depth:
-            build_file_list_tree(
-                file_list_tree,
-                child,
-                parent=node_id,
-                full_path=node_full,
-                current_depth=current_depth + 1,
-                max_depth=max_depth,
-                backup_path=backup_path,
+        domain, rel_path = split_tree_path(node_full)
+        children.append((name, child, node_full, domain, rel_path))
+
+    index = get_manifest_index(backup_path, build=False)
+    rows: Dict[Tuple[str, str], Tuple[int | None, bytes | None]] = {}
+    metas: Dict[Tuple[str, str], Tuple[str | None, str, str, str]] = {}
+    if index is not None:
+        # 인덱스에 이미 디코딩된 MBFile 컬럼 사용 (SQLite / bplist 재파싱 없음)
+        for _name, _child, _full, domain, rel_path in children:
+            row = index.row(domain, rel_path)
+            if row is None:
+                continue
+            rows[(domain, rel_path)] = (index.row_flags(row), None)
+            metas[(domain, rel_path)] = format_metadata(
+                index.row_size(row), index.row_mtime(row), index.row_birth(row), index.row_mode(row)
             )
+    else:
+        by_domain: Dict[str, List[str]] = {}
+        for _name, _child, _full, domain, rel_path in children:
+            by_domain.setdefault(domain, []).append(rel_path)
+        for domain, rel_paths in by_domain.items():
+            for rel_path, row in get_flags_and_files(backup_path, domain, rel_paths).items():
+                rows[(domain, rel_path)] = row
+        metas = decode_metadata_batch({key: blob for key, (_f, blob) in rows.items()})
+
+    with span("treeview.file_list", "treeview", path=full_path) as sp:
+        for name, child, node_full, domain, rel_path in children:
+            flags = rows.get((domain, rel_path), (None, None))[0]
+            size_str, mdate, cdate, perm = metas.get((domain, rel_path), (None, "", "", ""))
+
+            file_type = "Directory" if flags != 1 else "File"
+            icon_key = "folder" if file_type == "Directory" else get_file_icon(name)
+
+            # ── Directory Size 보정 (재귀 합계, 없으면 1‑계층 파일 합산) ──
+            if file_type == "Directory":
+                stats = dir_stats.get(node_full) if dir_stats is not None else None
+                if stats is not None:
+                    agg_size = stats.total_bytes
+                else:
+                    agg_size = _sum_first_level_file_sizes(child, node_full, backup_path)
+                if agg_size:  # 0 인 경우 표시 생략
+                    size_str = f"{agg_size:,}"
+
+            values = (node_full, size_str or "", file_type, mdate, cdate, perm)
+            node_id = file_list_tree.insert(
+                parent,
+                "end",
+                text=name,
+                values=values,
+                image=_ICON_DICT[icon_key],
+            )
+
+            # 하위 디렉터리 재귀 (max_depth 제한)
+            if isinstance(child, Mapping) and current_depth + 1 < max_depth:
+                build_file_list_tree(
+                    file_list_tree,
+                    child,
+                    parent=node_id,
+                    full_path=node_full,
+                    current_depth=current_depth + 1,
+                    max_depth=max_depth,
+                    backup_path=backup_path,
+                    dir_stats=dir_stats,
+                )
+        sp.add(rows=len(children))
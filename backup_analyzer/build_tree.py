@@ -1,25 +1,411 @@
-from collections import defaultdict
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Optional, Tuple
+
+from backup_analyzer.manifest_index import FLAG_FILE, ManifestIndex
+from backup_analyzer.tracing import span
+
+
+class DirStats:
+    """Recursive totals of one directory node."""
+
+    __slots__ = ("total_bytes", "file_count", "newest_mtime")
+
+    def __init__(self, total_bytes: int = 0, file_count: int = 0, newest_mtime: Optional[int] = None):
+        self.total_bytes = total_bytes
+        self.file_count = file_count
+        self.newest_mtime = newest_mtime
+
+    def add(self, size: int, count: int, mtime: Optional[int]) -> None:
+        self.total_bytes += size
+        self.file_count += count
+        if mtime is not None and (self.newest_mtime is None or mtime > self.newest_mtime):
+            self.newest_mtime = mtime
+
+
+# ────────────────────────────────────────────────────────────────
+# Compact path trie
+# ────────────────────────────────────────────────────────────────
+class PathTrie(Mapping):
+    """
+    Array-backed trie of every Manifest path.
+
+    Node 0 is a virtual root whose children are the domains. Each node keeps
+    parent / first-child / next-sibling links (siblings are linked in name
+    order) and the number of its Manifest row, which maps the node to its
+    fileID and flags. Names of nodes that have a row are not copied: they are
+    slices of the row's relativePath, addressed by offset. Only domains and
+    implicit directories (no row of their own) use the interned ``names``
+    table. The trie and every node expose a read-only ``Mapping`` view
+    (name → child node), so code written against the former nested-dict tree
+    keeps working.
+    """
+
+    def __init__(self, source=None, rel_paths=None):
+        self.names: List[str] = [""]
+        # >= 0 : index into ``names``; < 0 : name starts at offset (-v - 1) of the row's relativePath
+        self.node_name = array("i", [0])
+        self.parent = array("i", [-1])
+        self.first_child = array("i", [-1])
+        self.next_sibling = array("i", [-1])
+        self.rows = array("i", [-1])
+        # ManifestIndex or row sequence that ``rows`` refer to
+        self._source = source
+        self._rel_paths = rel_paths if rel_paths is not None else []
+
+    # ── 구축 ────────────────────────────────────────────────────
+    @classmethod
+    def from_rows(cls, domains, rel_paths, source=None) -> "PathTrie":
+        """
+        Build from a domain iterable and a parallel relativePath list; the
+        position of an entry becomes the node's row number.
+        """
+        trie = cls(source, rel_paths)
+        names, node_name, parent_arr, rows = trie.names, trie.node_name, trie.parent, trie.rows
+        name_ids: Dict[str, int] = {"": 0}           # build only
+        domain_dirs: Dict[str, Dict[str, int]] = {}  # domain → {relativePath: node}, build only
+
+        def implicit_dir(dirs: Dict[str, int], path: str) -> int:
+            node = dirs.get(path)
+            if node is None:
+                head, _, name = path.rpartition("/")
+                parent = implicit_dir(dirs, head)
+                name_id = name_ids.get(name)
+                if name_id is None:
+                    name_id = name_ids[name] = len(names)
+                    names.append(name)
+                node = dirs[path] = len(node_name)
+                node_name.append(name_id)
+                parent_arr.append(parent)
+                rows.append(-1)
+            return node
+
+        name_append, parent_append, row_append = node_name.append, parent_arr.append, rows.append
+        dirs, last_domain = None, None
+        for row, domain in enumerate(domains):
+            if domain is not last_domain:
+                dirs = domain_dirs.get(domain)
+                if dirs is None:
+                    name_id = name_ids.get(domain)
+                    if name_id is None:
+                        name_id = name_ids[domain] = len(names)
+                        names.append(domain)
+                    dirs = domain_dirs[domain] = {"": len(node_name)}
+                    name_append(name_id)
+                    parent_append(0)
+                    row_append(-1)
+                last_domain = domain
+
+            rel_path = rel_paths[row]
+            node = dirs.get(rel_path)
+            if node is not None:            # created earlier as an implicit parent
+                rows[node] = row
+                if node_name[node] >= 0 and rel_path:
+                    node_name[node] = -(rel_path.rfind("/") + 2)
+                continue
+            if rel_path[:1] == "/" or rel_path[-1:] == "/":
+                rows[implicit_dir(dirs, rel_path.strip("/"))] = row
+                continue
+            cut = rel_path.rfind("/")
+            parent = dirs.get(rel_path[:cut]) if cut >= 0 else dirs[""]
+            if parent is None:
+                parent = implicit_dir(dirs, rel_path[:cut])
+            dirs[rel_path] = len(node_name)
+            name_append(-(cut + 2))
+            parent_append(parent)
+            row_append(row)
+
+        del name_ids, domain_dirs
+        trie._link_sorted()
+        return trie
+
+    def _link_sorted(self) -> None:
+        """Build first-child / next-sibling links with siblings in name order."""
+        count = len(self.node_name)
+        self.first_child = array("i", [-1]) * count
+        self.next_sibling = array("i", [-1]) * count
+        # Siblings share their parent's path prefix, so ordering by the full
+        # relativePath (already stored, no slicing) equals ordering by name.
+        rel_paths, rows, parent = self._rel_paths, self.rows, self.parent
+        keys = [rel_paths[r] if r >= 0 else "" for r in rows]  # temporary
+        for node in range(1, count):
+            key = keys[node]
+            if rows[node] < 0 or parent[node] == 0 or key[:1] == "/" or key[-1:] == "/":
+                keys[node] = self._node_path(node)
+        order = sorted(range(1, count), key=keys.__getitem__)
+        del keys
+        order.sort(key=self.parent.__getitem__)  # stable → name order per parent
+        first_child, next_sibling = self.first_child, self.next_sibling
+        prev_parent, prev = -1, -1
+        for node in order:
+            par = parent[node]
+            if par != prev_parent:
+                first_child[par] = node
+                prev_parent = par
+            else:
+                next_sibling[prev] = node
+            prev = node
+
+    def _node_path(self, node: int) -> str:
+        """relativePath of *node* (domain name for domain nodes)."""
+        if self.parent[node] == 0:
+            return self.node_label(node)
+        parts = []
+        while self.parent[node] > 0:
+            parts.append(self.node_label(node))
+            node = self.parent[node]
+        return "/".join(reversed(parts))
+
+    # ── 노드 접근 ────────────────────────────────────────────────
+    def node_count(self) -> int:
+        return len(self.node_name)
+
+    def node_label(self, node: int) -> str:
+        ref = self.node_name[node]
+        if ref >= 0:
+            return self.names[ref]
+        return self._rel_paths[self.rows[node]][-ref - 1:]
+
+    def iter_children(self, node: int):
+        child = self.first_child[node]
+        next_sibling = self.next_sibling
+        while child != -1:
+            yield child
+            child = next_sibling[child]
+
+    def find_child(self, node: int, name: str) -> int:
+        label = self.node_label
+        for child in self.iter_children(node):
+            if label(child) == name:
+                return child
+        return -1
+
+    def find(self, domain: str, rel_path: str = "") -> int:
+        """Node id of (domain, relativePath) or -1."""
+        node = self.find_child(0, domain)
+        for part in rel_path.strip("/").split("/") if rel_path else ():
+            if node == -1:
+                break
+            if part:
+                node = self.find_child(node, part)
+        return node
+
+    def node_file_id(self, node: int) -> Optional[str]:
+        row = self.rows[node]
+        if row < 0 or self._source is None:
+            return None
+        if isinstance(self._source, ManifestIndex):
+            return self._source.row_file_id(row)
+        return self._source[row][0]
+
+    def node_flags(self, node: int) -> Optional[int]:
+        row = self.rows[node]
+        if row < 0 or self._source is None:
+            return None
+        if isinstance(self._source, ManifestIndex):
+            return self._source.row_flags(row)
+        return self._source[row][3]
+
+    def view(self, node: int) -> "TrieNode":
+        return TrieNode(self, node)
+
+    # ── Mapping (domain → TrieNode) ─────────────────────────────
+    def __getitem__(self, domain):
+        node = self.find_child(0, domain)
+        if node == -1:
+            raise KeyError(domain)
+        return TrieNode(self, node)
+
+    def __iter__(self):
+        for child in self.iter_children(0):
+            yield self.node_label(child)
+
+    def __len__(self):
+        return sum(1 for _ in self.iter_children(0))
+
+
+class TrieNode(Mapping):
+    """Read-only ``Mapping`` view of one :class:`PathTrie` node."""
+
+    __slots__ = ("trie", "node")
+
+    def __init__(self, trie: PathTrie, node: int):
+        self.trie = trie
+        self.node = node
+
+    @property
+    def name(self) -> str:
+        return self.trie.node_label(self.node)
+
+    @property
+    def flags(self) -> Optional[int]:
+        return self.trie.node_flags(self.node)
+
+    @property
+    def file_id(self) -> Optional[str]:
+        return self.trie.node_file_id(self.node)
+
+    def __getitem__(self, name):
+        child = self.trie.find_child(self.node, name)
+        if child == -1:
+            raise KeyError(name)
+        return TrieNode(self.trie, child)
+
+    def __iter__(self):
+        trie = self.trie
+        for child in trie.iter_children(self.node):
+            yield trie.node_label(child)
+
+    def items(self):
+        trie = self.trie
+        for child in trie.iter_children(self.node):
+            yield trie.node_label(child), TrieNode(trie, child)
+
+    def values(self):
+        trie = self.trie
+        for child in trie.iter_children(self.node):
+            yield TrieNode(trie, child)
+
+    def __len__(self):
+        return sum(1 for _ in self.trie.iter_children(self.node))
+
+    def __bool__(self):
+        return self.trie.first_child[self.node] != -1
+
+    def __eq__(self, other):
+        if isinstance(other, TrieNode):
+            return self.trie is other.trie and self.node == other.node
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((id(self.trie), self.node))
+
+    def __repr__(self):
+        return f"<TrieNode {self.name!r} children={len(self)}>"
 
 
 def build_tree(file_info_list):
-    """ Converts the backup file list into a tree structure. """
-    tree = defaultdict(dict)
+    """ Converts the backup file list (or a ManifestIndex) into a :class:`PathTrie`. """
     path_map = {}
+    with span("tree.build", "tree") as s:
+        if isinstance(file_info_list, ManifestIndex):
+            index = file_info_list
+            trie = index.path_trie
+            if trie is None:
+                trie = index.path_trie = PathTrie.from_rows(index.row_domains(), index.rel_paths(), source=index)
+            s.add(rows=len(index))
+        else:
+            rows = file_info_list if isinstance(file_info_list, Sequence) else list(file_info_list)
+            trie = PathTrie.from_rows((r[1] for r in rows), [r[2] or "" for r in rows], source=rows)
+            s.add(rows=len(rows))
+    return trie, path_map
+
+
+def compute_dir_stats(file_tree, manifest_index) -> Dict[str, DirStats]:
+    """
+    Single bottom-up pass over *file_tree* that rolls file sizes, counts and
+    newest mtimes up into every directory node.
+
+    Keys are backup-tree paths (``<domain>/<domain>/<relativePath>``) so the
+    result can be looked up with the same strings stored in the Treeviews.
+    """
+    stats: Dict[str, DirStats] = {}
+    if manifest_index is None:
+        return stats
+    with span("tree.dir_stats", "tree") as s:
+        if file_tree._source is not manifest_index:       # 노드의 행 번호는 이 인덱스 기준이어야 한다
+            file_tree, _ = build_tree(manifest_index)
+        stats = _trie_dir_stats(file_tree, manifest_index)
+        s.add(rows=len(stats))
+    return stats
+
+
+def _trie_dir_stats(trie: "PathTrie", manifest_index) -> Dict[str, DirStats]:
+    """Bottom-up rollup over the trie arrays; parents always precede children."""
+    count = trie.node_count()
+    totals = array("q", [0]) * count
+    counts = array("q", [0]) * count
+    newest = array("q", [-1]) * count
+    parent, rows, first_child = trie.parent, trie.rows, trie.first_child
+    for node in range(count - 1, 0, -1):
+        row = rows[node]
+        if first_child[node] == -1:
+            if row < 0 or manifest_index.row_flags(row) != FLAG_FILE:
+                continue
+            totals[node] = manifest_index.row_size(row) or 0
+            counts[node] = 1
+            mtime = manifest_index.row_mtime(row)
+            newest[node] = -1 if mtime is None else mtime
+        par = parent[node]
+        if par > 0:
+            totals[par] += totals[node]
+            counts[par] += counts[node]
+            if newest[node] > newest[par]:
+                newest[par] = newest[node]
+
+    stats: Dict[str, DirStats] = {}
+    for node in range(1, count):
+        row = rows[node]
+        if first_child[node] == -1 and parent[node] != 0 and row >= 0 \
+                and manifest_index.row_flags(row) == FLAG_FILE:
+            continue
+        top = node
+        while parent[top] > 0:
+            top = parent[top]
+        domain = trie.node_label(top)
+        rel = trie._node_path(node) if node != top else ""
+        tree_path = f"{domain}/{domain}/{rel}" if rel else f"{domain}/{domain}"
+        stats[tree_path] = DirStats(totals[node], counts[node], newest[node] if newest[node] >= 0 else None)
+    return stats
+
+
+def largest_directories(dir_stats: Dict[str, DirStats], limit: int = 20) -> List[Tuple[str, DirStats]]:
+    """Return the *limit* directories with the largest recursive size."""
+    return sorted(dir_stats.items(), key=lambda kv: kv[1].total_bytes, reverse=True)[:limit]
 
-    for fileID, domain, rel_path, flags in file_info_list:
-        parts = rel_path.strip("/").split("/")
-        current_level = tree[domain]
-        for i, part in enumerate(parts):
-            if i < len(parts) - 1:
-                current_level = current_level.setdefault(part, {})
-            else:
-                current_level[part] = {}
 
-    return dict(tree), path_map
+def format_dir_size(dir_stats: Optional[Dict[str, DirStats]], tree_path: str) -> str:
+    st = dir_stats.get(tree_path) if dir_stats else None
+    return f"{st.total_bytes:,}" if st and st.total_bytes else ""
 
 
-def build_backup_tree(tree_widget, file_tree, icon_dict=None):
-    """ Builds the backup file tree structure in the UI, excluding the last leaf nodes. """
+def _create_category_roots(tree_widget, icon_dict=None):
+    """Insert the four top-level category nodes and return them by key."""
+    folder = icon_dict['folder'] if icon_dict else ""
+    return {
+        "system": tree_widget.insert("", "end", text=" System Files", image=folder),
+        "user_app": tree_widget.insert("", "end", text=" User App Files", image=folder),
+        "app_group": tree_widget.insert("", "end", text=" App Group Files", image=folder),
+        "app_plugin": tree_widget.insert("", "end", text=" App Plugin Files", image=folder),
+    }
+
+
+def _domain_category(domain):
+    if "AppDomainGroup" in domain:
+        return "app_group"
+    if "AppDomainPlugin" in domain:
+        return "app_plugin"
+    if "HomeDomain" in domain or "AppDomain-" in domain:
+        return "user_app"
+    return "system"
+
+
+def build_backup_tree(tree_widget, file_tree, icon_dict=None, dir_stats=None, lazy=False):
+    """ Builds the backup file tree structure in the UI, excluding the last leaf nodes. 
+
+    With ``lazy=True`` only the domain roots are inserted and deeper levels are
+    materialised on ``<<TreeviewOpen>>`` (see :class:`LazyBackupTree`).
+    """
+    if lazy:
+        lazy_tree = LazyBackupTree(tree_widget, file_tree, icon_dict, dir_stats)
+        return lazy_tree.path_dict, lazy_tree.backup_tree_nodes
+    with span("treeview.backup_tree", "treeview") as s:
+        path_dict, backup_tree_nodes = _build_backup_tree_eager(tree_widget, file_tree, icon_dict, dir_stats)
+        s.add(rows=len(backup_tree_nodes))
+    return path_dict, backup_tree_nodes
+
+
+def _build_backup_tree_eager(tree_widget, file_tree, icon_dict, dir_stats):
     path_dict = {}
     backup_tree_nodes = {}
 
@@ -27,14 +413,7 @@ def build_backup_tree(tree_widget, file_tree, icon_dict=None):
     tree_widget.delete(*tree_widget.get_children())
 
     # Create root nodes for different file categories (아이콘 추가)
-    system_node = tree_widget.insert("", "end", text=" System Files", 
-                                    image=icon_dict['folder'] if icon_dict else "")
-    user_app_node = tree_widget.insert("", "end", text=" User App Files", 
-                                     image=icon_dict['folder'] if icon_dict else "")
-    app_group_node = tree_widget.insert("", "end", text=" App Group Files", 
-                                      image=icon_dict['folder'] if icon_dict else "")
-    app_plugin_node = tree_widget.insert("", "end", text=" App Plugin Files", 
-                                       image=icon_dict['folder'] if icon_dict else "")
+    category_nodes = _create_category_roots(tree_widget, icon_dict)
     
     
     def get_file_icon(name):
@@ -55,35 +434,160 @@ def build_backup_tree(tree_widget, file_tree, icon_dict=None):
                 continue
             
             # Check if the child is a dict and contains further subdirectories
-            subdirs = {k: v for k, v in child_obj.items() if k and isinstance(v, dict)}
+            subdirs = {k: v for k, v in child_obj.items() if k and isinstance(v, Mapping)}
             
             # Only insert if there are subdirectories or the path is not a final leaf node
-            if subdirs or (current_path and not all(isinstance(v, dict) and not v for v in child_obj.values())):
+            if subdirs or (current_path and not all(isinstance(v, Mapping) and not v for v in child_obj.values())):
                 new_path = (current_path + "/" + name).strip("/")
                 
                 # Insert as a folder if it has subdirectories
                 if subdirs:
                     node_id = tree_widget.insert(parent, "end", text=" " + name, 
-                                               values=(new_path,), 
+                                               values=(new_path, format_dir_size(dir_stats, new_path)), 
                                                image=icon_dict['folder'] if icon_dict else "")
                     backup_tree_nodes[new_path] = node_id
                     insert_tree(node_id, child_obj, new_path)
                 # If no subdirs, but not a final leaf, insert as a node
                 else:
                     node_id = tree_widget.insert(parent, "end", text=" " + name, 
-                                              values=(new_path,), 
+                                              values=(new_path, format_dir_size(dir_stats, new_path)), 
                                               image=get_file_icon(name))
                     backup_tree_nodes[new_path] = node_id
 
     # Categorize and insert file domains into the respective nodes
     for domain, sub_dict in sorted(file_tree.items()):
-        if "AppDomainGroup" in domain:
-            insert_tree(app_group_node, {domain: sub_dict}, domain)
-        elif "AppDomainPlugin" in domain:
-            insert_tree(app_plugin_node, {domain: sub_dict}, domain)
-        elif "HomeDomain" in domain or "AppDomain-" in domain:
-            insert_tree(user_app_node, {domain: sub_dict}, domain)
-        else:
-            insert_tree(system_node, {domain: sub_dict}, domain)
+        insert_tree(category_nodes[_domain_category(domain)], {domain: sub_dict}, domain)
+
+    return path_dict, backup_tree_nodes
+
+
+# ────────────────────────────────────────────────────────────────
+# Lazy (on-expand) backup tree
+# ────────────────────────────────────────────────────────────────
+_PLACEHOLDER_TEXT = " …"
+
+
+class _LazyPathDict:
+    """``path_dict`` replacement that walks *file_tree* on demand."""
+
+    def __init__(self, file_tree):
+        self._file_tree = file_tree
+
+    def get(self, path, default=None):
+        parts = path.split("/") if path else []
+        if not parts or parts[0] not in self._file_tree:
+            return default
+        domain = parts[0]
+        if len(parts) == 1:
+            return {domain: self._file_tree[domain]}
+        if parts[1] != domain:
+            return default
+        node = self._file_tree[domain]
+        for part in parts[2:]:
+            node = node.get(part)
+            if node is None:
+                return default
+        return node
+
+    def __getitem__(self, path):
+        node = self.get(path)
+        if node is None:
+            raise KeyError(path)
+        return node
+
+    def __contains__(self, path):
+        return self.get(path) is not None
+
+
+class _LazyNodeMap:
+    """``backup_tree_nodes`` replacement; ``get`` expands ancestors as needed."""
+
+    def __init__(self, owner):
+        self._owner = owner
+
+    def get(self, path, default=None):
+        node_id = self._owner.ensure_node(path)
+        return default if node_id is None else node_id
+
+    def __getitem__(self, path):
+        node_id = self._owner.ensure_node(path)
+        if node_id is None:
+            raise KeyError(path)
+        return node_id
+
+    def __contains__(self, path):
+        return self._owner.ensure_node(path) is not None
+
+
+class LazyBackupTree:
+    """
+    Inserts domain roots with a placeholder child and materialises one level
+    of children each time a node is opened. Node visibility rules are the same
+    as the eager :func:`build_backup_tree` (leaf entries are not shown).
+    """
+
+    def __init__(self, tree_widget, file_tree, icon_dict=None, dir_stats=None):
+        self.tree = tree_widget
+        self.file_tree = file_tree
+        self.icon_dict = icon_dict
+        self.dir_stats = dir_stats
+        self.nodes = {}      # tree path → node id (materialised only)
+        self._pending = {}   # node id → (child dict, tree path) awaiting expansion
+        self.path_dict = _LazyPathDict(file_tree)
+        self.backup_tree_nodes = _LazyNodeMap(self)
+
+        tree_widget.delete(*tree_widget.get_children())
+        category_nodes = _create_category_roots(tree_widget, icon_dict)
+        for domain, sub_dict in sorted(file_tree.items()):
+            self._insert_level(category_nodes[_domain_category(domain)], {domain: sub_dict}, domain)
+
+        tree_widget.bind("<<TreeviewOpen>>", self._on_open)
+
+    def _folder_icon(self):
+        return self.icon_dict['folder'] if self.icon_dict else ""
+
+    def _insert_level(self, parent, current_dict, current_path):
+        with span("treeview.insert_level", "treeview", path=current_path) as s:
+            inserted = 0
+            for name, child_obj in sorted(current_dict.items()):
+                if not name or not any(child_obj):
+                    continue  # 마지막 leaf 노드는 표시하지 않음
+                new_path = (current_path + "/" + name).strip("/")
+                node_id = self.tree.insert(parent, "end", text=" " + name,
+                                           values=(new_path, format_dir_size(self.dir_stats, new_path)),
+                                           image=self._folder_icon())
+                self.nodes[new_path] = node_id
+                inserted += 1
+                if any(k and v for k, v in child_obj.items()):
+                    self.tree.insert(node_id, "end", text=_PLACEHOLDER_TEXT)
+                    self._pending[node_id] = (child_obj, new_path)
+            s.add(rows=inserted)
+
+    def expand(self, node_id):
+        """Replace the placeholder of *node_id* with its real children."""
+        pending = self._pending.pop(node_id, None)
+        if pending is None:
+            return
+        self.tree.delete(*self.tree.get_children(node_id))
+        child_obj, path = pending
+        self._insert_level(node_id, child_obj, path)
+
+    def _on_open(self, _event=None):
+        node_id = self.tree.focus()
+        if node_id:
+            self.expand(node_id)
 
-    return path_dict, backup_tree_nodes
\ No newline at end of file
+    def ensure_node(self, path):
+        """Materialise every ancestor of *path* and return its node id."""
+        node_id = self.nodes.get(path)
+        if node_id is not None:
+            return node_id
+        parts = path.split("/")
+        if len(parts) < 2:
+            return None
+        for depth in range(2, len(parts)):
+            ancestor = self.nodes.get("/".join(parts[:depth]))
+            if ancestor is None:
+                return None
+            self.expand(ancestor)
+        return self.nodes.get(path)
@@ -0,0 +1,482 @@
+"""
+Process-pool decryption of an encrypted iTunes/Finder backup.
+
+The keybag is unlocked once in the parent (``EncryptedBackup``); only the
+unwrapped class keys are shipped to the workers. Every worker then unwraps
+the per-file key from the ``Files.file`` blob and decrypts the hashed blob in
+place with large sequential reads/writes — no per-file Manifest queries.
+While a decrypt-on-read view is open the workers only stage the plaintext
+and the parent swaps it in through ``VirtualBackup.replace_in_place``.
+
+This module must stay importable without tkinter: worker processes import it
+on Windows (spawn start method).
+"""
+
+from __future__ import annotations
+
+import os
+import plistlib
+import struct
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from Crypto.Cipher import AES
+
+from backup_analyzer.mbfile_decoder import read_mbfile_encryption
+
+_CHUNK_SIZE = 8 * 1024 * 1024      # multiple of the AES block size
+_BATCH_FILES = 32                  # files per pool task (amortises IPC)
+_AES_KW_IV = 0xA6A6A6A6A6A6A6A6
+
+# worker-process state, set by _init_worker
+_CLASS_KEYS: Dict[int, bytes] = {}
+_BACKUP_PATH = ""
+_STAGE_ONLY = False
+
+# (fileID, plaintext written next to the blob) → True once swapped in,
+# False to retry later; raises OSError if the swap failed
+ReplaceCallback = Callable[[str, str], bool]
+
+
+# ─────────────────────────────────────────────────────────────────
+# 키 처리
+# ─────────────────────────────────────────────────────────────────
+def class_keys_from_backup(backup) -> Dict[int, bytes]:
+    """
+    Unlock the keybag of an ``EncryptedBackup`` (PBKDF2 runs here, once)
+    and return {protection class: unwrapped class key}.
+    """
+    backup._read_and_unlock_keybag()
+    return {
+        int(clas): bytes(ck[b"KEY"])
+        for clas, ck in backup._keybag.classKeys.items()
+        if b"KEY" in ck
+    }
+
+
+def aes_unwrap(kek: bytes, wrapped: bytes) -> Optional[bytes]:
+    """RFC 3394 AES key unwrap; None if the integrity check fails."""
+    n = len(wrapped) // 8 - 1
+    if n < 1:
+        return None
+    ecb = AES.new(kek, AES.MODE_ECB)
+    a = struct.unpack_from(">Q", wrapped, 0)[0]
+    r = [struct.unpack_from(">Q", wrapped, 8 * i)[0] for i in range(n + 1)]
+    for j in range(5, -1, -1):
+        for i in range(n, 0, -1):
+            b = ecb.decrypt(struct.pack(">QQ", a ^ (n * j + i), r[i]))
+            a, r[i] = struct.unpack(">QQ", b)
+    if a != _AES_KW_IV:
+        return None
+    return b"".join(struct.pack(">Q", v) for v in r[1:])
+
+
+def unwrap_file_key(class_keys: Dict[int, bytes], blob: bytes) -> Tuple[Optional[bytes], int]:
+    """
+    Return (per-file AES key, expected plaintext size) for a ``Files.file``
+    blob. The key is None for records without an ``EncryptionKey``.
+    """
+    info = read_mbfile_encryption(blob)
+    if info is None:
+        return None, -1
+    protection_class, wrapped, size = info
+    kek = class_keys.get(protection_class)
+    if kek is None or len(wrapped) != 0x28:
+        raise ValueError(f"no class key for protection class {protection_class}")
+    key = aes_unwrap(kek, wrapped)
+    if key is None:
+        raise ValueError("per-file key unwrap failed")
+    return key, size
+
+
+def decrypt_manifest_db(backup_path: str, class_keys: Dict[int, bytes], out_path: str) -> None:
+    """
+    Decrypt ``Manifest.db`` with already unlocked class keys (no PBKDF2).
+    Raises ValueError if the ManifestKey cannot be unwrapped.
+    """
+    with open(os.path.join(backup_path, "Manifest.plist"), "rb") as fp:
+        manifest_key = plistlib.load(fp)["ManifestKey"]
+    protection_class = struct.unpack("<l", manifest_key[:4])[0]
+    kek = class_keys.get(protection_class)
+    key = aes_unwrap(kek, manifest_key[4:]) if kek else None
+    if key is None:
+        raise ValueError("ManifestKey unwrap failed")
+    cipher = AES.new(key, AES.MODE_CBC, iv=b"\x00" * 16)
+    with open(os.path.join(backup_path, "Manifest.db"), "rb") as fin, open(out_path, "wb") as fout:
+        while chunk := fin.read(_CHUNK_SIZE):
+            fout.write(cipher.decrypt(chunk))
+
+
+# ─────────────────────────────────────────────────────────────────
+# 파일 복호화
+# ─────────────────────────────────────────────────────────────────
+def decrypt_blob_file(src: str, dst: str, key: bytes, expected_size: int = -1) -> int:
+    """
+    AES-CBC decrypt *src* into *dst* (streamed, padding stripped).
+    Returns the plaintext size; raises ValueError on malformed input.
+    """
+    enc_size = os.path.getsize(src)
+    if enc_size % 16:
+        raise ValueError("ciphertext length is not a multiple of 16")
+    cipher = AES.new(key, AES.MODE_CBC, iv=b"\x00" * 16)
+    written = 0
+    with open(src, "rb", buffering=0) as fin, open(dst, "wb") as fout:
+        remaining = enc_size
+        while remaining:
+            chunk = fin.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise ValueError("unexpected end of ciphertext")
+            remaining -= len(chunk)
+            plain = cipher.decrypt(chunk)
+            if not remaining:
+                pad = plain[-1]
+                if not 0 < pad <= 16:
+                    raise ValueError("invalid CBC padding")
+                plain = plain[:-pad]
+            fout.write(plain)
+            written += len(plain)
+    if expected_size >= 0 and written != expected_size:
+        raise ValueError(f"decrypted {written} bytes, expected {expected_size}")
+    return written
+
+
+def stage_plaintext(backup_path: str, file_id: str, blob: bytes,
+                    class_keys: Dict[int, bytes]) -> Tuple[bool, Optional[str]]:
+    """
+    Decrypt ``<backup>/<xx>/<fileID>`` into ``<fileID>_temp`` next to it.
+    Returns (ok, temp path); the path is None when there is nothing to swap
+    in (already plaintext or stored without encryption), ok is False if the
+    blob is missing or could not be decrypted.
+    """
+    enc = os.path.join(backup_path, file_id[:2], file_id)
+    if not os.path.exists(enc):
+        return False, None
+    tmp = enc + "_temp"
+    try:
+        if is_plaintext_size(enc, blob):
+            return True, None                 # replaced by an earlier run
+        key, size = unwrap_file_key(class_keys, blob)
+        if key is None:
+            return True, None                 # stored without encryption
+        decrypt_blob_file(enc, tmp, key, size)
+        return True, tmp
+    except (OSError, ValueError):
+        discard_staged(tmp)
+        return False, None
+
+
+def discard_staged(tmp: str) -> None:
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+
+
+def decrypt_in_place(backup_path: str, file_id: str, blob: bytes,
+                     class_keys: Dict[int, bytes]) -> bool:
+    """
+    Replace ``<backup>/<xx>/<fileID>`` with its plaintext.
+    Returns False if the blob is missing or could not be decrypted.
+    """
+    ok, tmp = stage_plaintext(backup_path, file_id, blob, class_keys)
+    if tmp is None:
+        return ok
+    try:
+        os.replace(tmp, os.path.join(backup_path, file_id[:2], file_id))
+        return True
+    except OSError:
+        discard_staged(tmp)
+        return False
+
+
+def is_plaintext_size(path: str, blob: bytes) -> bool:
+    """
+    True if *path* already holds the plaintext of an encrypted record.
+
+    CBC padding always adds 1–16 bytes, so a ciphertext is never exactly
+    ``MBFile.Size`` long; a blob of that size has been decrypted.
+    """
+    info = read_mbfile_encryption(blob)
+    if info is None or info[2] < 0:
+        return False
+    return os.path.getsize(path) == info[2]
+
+
+def _init_worker(backup_path: str, class_keys: Dict[int, bytes], stage_only: bool = False) -> None:
+    global _BACKUP_PATH, _CLASS_KEYS, _STAGE_ONLY
+    _BACKUP_PATH, _CLASS_KEYS, _STAGE_ONLY = backup_path, class_keys, stage_only
+
+
+def _decrypt_batch(batch: Sequence[Tuple[str, bytes]]) -> Tuple[List[str], int, List[Tuple[str, str]]]:
+    """(fileIDs done, failures, (fileID, temp path) left for the parent to swap in)."""
+    done: List[str] = []
+    staged: List[Tuple[str, str]] = []
+    fail = 0
+    for file_id, blob in batch:
+        if _STAGE_ONLY:
+            ok, tmp = stage_plaintext(_BACKUP_PATH, file_id, blob, _CLASS_KEYS)
+            if ok and tmp is not None:
+                staged.append((file_id, tmp))
+                continue
+        else:
+            ok = decrypt_in_place(_BACKUP_PATH, file_id, blob, _CLASS_KEYS)
+        if ok:
+            done.append(file_id)
+        else:
+            fail += 1
+    return done, fail, staged
+
+
+def _batches(files: Iterable[Tuple[str, bytes]], size: int) -> Iterable[List[Tuple[str, bytes]]]:
+    batch: List[Tuple[str, bytes]] = []
+    for item in files:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _swap_staged(
+    staged: Sequence[Tuple[str, str]], replace: ReplaceCallback,
+) -> Tuple[List[str], int, List[Tuple[str, str]]]:
+    """Hand staged plaintexts to *replace*: (swapped fileIDs, failures, still waiting)."""
+    done: List[str] = []
+    waiting: List[Tuple[str, str]] = []
+    fail = 0
+    for file_id, tmp in staged:
+        try:
+            swapped = replace(file_id, tmp)
+        except OSError:
+            discard_staged(tmp)
+            fail += 1
+            continue
+        if swapped:
+            done.append(file_id)
+        else:
+            waiting.append((file_id, tmp))
+    return done, fail, waiting
+
+
+def decrypt_files_parallel(
+    backup_path: str,
+    class_keys: Dict[int, bytes],
+    files: Iterable[Tuple[str, bytes]],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    journal: Optional["DecryptionJournal"] = None,
+    replace: Optional[ReplaceCallback] = None,
+) -> Optional[Tuple[int, int]]:
+    """
+    Decrypt every (fileID, Files.file blob) in place using a process pool.
+
+    ``progress(success, fail)`` is called from the calling thread after each
+    finished batch with running totals; finished fileIDs are appended to
+    *journal*. Returns (success, fail), or None if *cancel_event* was set
+    (already finished files stay decrypted).
+
+    With *replace* the workers only write each plaintext next to its blob and
+    the swap is done by ``replace(file_id, tmp)`` on the calling thread, so
+    readers in this process (``VirtualBackup``) can keep it from happening
+    while they decrypt the same blob; a swap it declines is retried.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    success = fail = 0
+    waiting: List[Tuple[str, str]] = []
+
+    def finished(ids: List[str], bad: int) -> None:
+        nonlocal success, fail
+        success += len(ids)
+        fail += bad
+        if journal is not None:
+            journal.record(ids)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backup_path, class_keys, replace is not None)) as pool:
+        pending = set()
+        batches = iter(_batches(files, _BATCH_FILES))
+        exhausted = False
+        while pending or not exhausted or waiting:
+            if cancel_event is not None and cancel_event.is_set():
+                for fut in pending:
+                    fut.cancel()
+                pool.shutdown(wait=True, cancel_futures=True)
+                for fut in pending:
+                    if fut.done() and not fut.cancelled():
+                        waiting.extend(fut.result()[2])
+                for _file_id, tmp in waiting:
+                    discard_staged(tmp)
+                return None
+            while not exhausted and len(pending) < max_in_flight:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_decrypt_batch, batch))
+            done = set()
+            if pending:
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            elif waiting:
+                time.sleep(0.05)                 # 읽는 중인 파일만 남음 → 잠시 후 재시도
+            for fut in done:
+                ids, bad, staged = fut.result()
+                finished(ids, bad)
+                waiting.extend(staged)
+            changed = bool(done)
+            if waiting:
+                ids, bad, waiting = _swap_staged(waiting, replace)
+                finished(ids, bad)
+                changed = changed or bool(ids or bad)
+            if changed and progress is not None:
+                progress(success, fail)
+    return success, fail
+
+
+# ─────────────────────────────────────────────────────────────────
+# 재개용 저널
+# ─────────────────────────────────────────────────────────────────
+class DecryptionJournal:
+    """
+    Append-only list of fileIDs already decrypted in place
+    (``<backup>/.decryption_journal``, one fileID per line).
+
+    Appends are buffered and written/fsynced at most every ``sync_interval``
+    seconds or ``sync_every`` entries, so a crash loses at most that window;
+    files in the lost window are recognised by size on the next run.
+    """
+
+    FILE_NAME = ".decryption_journal"
+
+    def __init__(self, backup_path: str, sync_every: int = 4096, sync_interval: float = 1.0):
+        self.path = os.path.join(backup_path, self.FILE_NAME)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._buffer: List[str] = []
+        self._fp = None
+        self._last_sync = time.monotonic()
+
+    def load(self) -> Set[str]:
+        """Return the fileIDs recorded so far (a torn last line is ignored)."""
+        done: Set[str] = set()
+        try:
+            with open(self.path, "r", encoding="ascii", errors="ignore") as fp:
+                for line in fp:
+                    line = line.strip()
+                    if len(line) == 40:
+                        done.add(line)
+        except FileNotFoundError:
+            pass
+        return done
+
+    def record(self, file_ids: Iterable[str]) -> None:
+        self._buffer.extend(file_ids)
+        if (len(self._buffer) >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._fp is None:
+            self._fp = open(self.path, "a", encoding="ascii")
+        self._fp.write("\n".join(self._buffer) + "\n")
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._buffer.clear()
+        self._last_sync = time.monotonic()
+
+    def rewrite(self, file_ids: Iterable[str]) -> None:
+        """Replace the journal contents (used after verification)."""
+        self.close()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="ascii") as fp:
+            for file_id in file_ids:
+                fp.write(file_id + "\n")
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, self.path)
+
+    def close(self) -> None:
+        self.flush()
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def discard(self) -> None:
+        self._buffer.clear()
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+# 확장자로 형식을 알 수 있는 파일의 평문 시그니처 (offset, 허용 접두사들)
+_HEADER_PROBES: Dict[str, Tuple[int, Tuple[bytes, ...]]] = {
+    ".db": (0, (b"SQLite format 3\x00",)),
+    ".sqlite": (0, (b"SQLite format 3\x00",)),
+    ".sqlitedb": (0, (b"SQLite format 3\x00",)),
+    ".storedata": (0, (b"SQLite format 3\x00",)),
+    ".plist": (0, (b"bplist", b"<?xml", b"\xef\xbb\xbf<?xml", b"<!DOCTYPE", b"<plist")),
+    ".jpg": (0, (b"\xff\xd8\xff",)),
+    ".jpeg": (0, (b"\xff\xd8\xff",)),
+    ".png": (0, (b"\x89PNG\r\n\x1a\n",)),
+    ".heic": (4, (b"ftyp",)),
+    ".mp4": (4, (b"ftyp",)),
+}
+
+
+def header_matches(path: str, rel_path: str) -> bool:
+    """
+    False if *rel_path* names a type with a known signature (SQLite, plist,
+    JPEG, PNG, HEIC/MP4) and the file at *path* does not start with it.
+    Decrypting with the wrong key or a torn write yields the right size but
+    random bytes, which the size check alone cannot see.
+    """
+    probe = _HEADER_PROBES.get(os.path.splitext(rel_path)[1].lower())
+    if probe is None:
+        return True
+    offset, magics = probe
+    with open(path, "rb") as fp:
+        head = fp.read(offset + 16)
+    if not head:
+        return True                              # 빈 파일은 판단할 헤더가 없음
+    return any(head.startswith(magic, offset) for magic in magics)
+
+
+def verify_decrypted(backup_path: str, rows: Iterable[Tuple[str, str, bytes]],
+                     file_ids: Set[str]) -> Tuple[Set[str], Set[str]]:
+    """
+    Check journaled files against the manifest. *rows* are
+    (fileID, relativePath, file). Returns (stale, corrupt):
+
+    * stale – missing or still ciphertext (size differs from MBFile.Size);
+      drop these from the journal and decrypt them again.
+    * corrupt – plaintext size, but a SQLite / plist / JPEG / PNG / HEIC /
+      MP4 file whose header is not that format's signature. The ciphertext
+      was already replaced, so these can only be reported.
+
+    Files of other types are checked by size only; a size match cannot
+    prove their content was decrypted correctly.
+    """
+    stale: Set[str] = set()
+    corrupt: Set[str] = set()
+    for file_id, rel_path, blob in rows:
+        if file_id not in file_ids:
+            continue
+        path = os.path.join(backup_path, file_id[:2], file_id)
+        try:
+            if read_mbfile_encryption(blob) is None:
+                continue
+            if not is_plaintext_size(path, blob):
+                stale.add(file_id)
+            elif not header_matches(path, rel_path or ""):
+                corrupt.add(file_id)
+        except OSError:
+            stale.add(file_id)
+    return stale, corrupt
@@ -0,0 +1,235 @@
+"""
+Whole-backup integrity verification.
+
+Checks, in one pass over the ``ManifestIndex``:
+
+* every row's fileID against ``SHA1(domain + "-" + relativePath)``;
+* that every file row (flags == 1) has its blob under ``<xx>/<fileID>``;
+* which blobs in the ``xx/`` buckets are not referenced by the manifest
+  (orphans), including ``<fileID>_temp`` leftovers of an interrupted
+  in-place decryption.
+
+Presence is established with one ``os.scandir`` per bucket (256 directory
+reads on a thread pool) instead of one ``os.path.exists`` per file, and the
+SHA-1 recomputation is split across a process pool on large manifests.
+Sidecars at the backup root (``.decrypt_cache``, ``.manifest_index.cache``,
+the decryption journal and flag files) are never looked at.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from backup_analyzer.manifest_index import FLAG_FILE, ManifestIndex, get_manifest_index
+from backup_analyzer.mbfile_decoder import default_decode_workers
+
+BUCKETS = tuple(f"{i:02x}" for i in range(256))
+TEMP_SUFFIX = "_temp"                  # decrypt_in_place 의 임시 파일
+_HASH_CHUNK = 100_000
+_SAMPLE = 20
+
+
+class IntegrityReport:
+    """Structured result of :func:`verify_backup`."""
+
+    __slots__ = (
+        "backup_path", "rows", "files_expected", "files_present",
+        "hash_mismatches", "missing", "orphans", "stale_temps",
+        "unreadable_buckets", "elapsed",
+    )
+
+    def __init__(self, backup_path: str):
+        self.backup_path = backup_path
+        self.rows = 0
+        self.files_expected = 0
+        self.files_present = 0
+        self.hash_mismatches: List[int] = []      # Manifest rows
+        self.missing: List[str] = []              # fileIDs without a blob
+        self.orphans: List[str] = []              # "xx/name" not in the manifest
+        self.stale_temps: List[str] = []          # "xx/<fileID>_temp"
+        self.unreadable_buckets: List[str] = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.hash_mismatches or self.missing or self.orphans
+                    or self.stale_temps or self.unreadable_buckets)
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly counts plus the first few offenders of each kind."""
+        return {
+            "backup_path": self.backup_path,
+            "ok": self.ok,
+            "rows": self.rows,
+            "files_expected": self.files_expected,
+            "files_present": self.files_present,
+            "hash_mismatches": len(self.hash_mismatches),
+            "missing": len(self.missing),
+            "orphans": len(self.orphans),
+            "stale_temps": len(self.stale_temps),
+            "unreadable_buckets": list(self.unreadable_buckets),
+            "elapsed_sec": round(self.elapsed, 3),
+            "samples": {
+                "hash_mismatches": self.hash_mismatches[:_SAMPLE],
+                "missing": self.missing[:_SAMPLE],
+                "orphans": self.orphans[:_SAMPLE],
+                "stale_temps": self.stale_temps[:_SAMPLE],
+            },
+        }
+
+    def describe(self) -> str:
+        """Short multi-line text for dialogs and logs."""
+        lines = [
+            f"Rows: {self.rows:,}  Files: {self.files_present:,}/{self.files_expected:,} present",
+            f"fileID hash mismatches: {len(self.hash_mismatches):,}",
+            f"Missing blobs: {len(self.missing):,}",
+            f"Orphan blobs: {len(self.orphans):,}",
+        ]
+        if self.stale_temps:
+            lines.append(f"Interrupted decryption leftovers: {len(self.stale_temps):,}")
+        if self.unreadable_buckets:
+            lines.append(f"Unreadable folders: {', '.join(self.unreadable_buckets)}")
+        return "\n".join(lines)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 작업 단위 (프로세스/스레드 풀)
+# ─────────────────────────────────────────────────────────────────
+def hash_mismatch_rows(
+    domains: Sequence[str], row_domain: bytes, rel_paths: Sequence[str], file_ids: bytes, base: int
+) -> List[int]:
+    """Rows (offset by *base*) whose fileID is not SHA1(domain-relativePath)."""
+    sha1 = hashlib.sha1
+    prefixes = [(d + "-").encode("utf-8", "surrogatepass") for d in domains]
+    dom_ids = array("I")
+    dom_ids.frombytes(row_domain)
+    bad = []
+    for i, (dom_id, rel_path) in enumerate(zip(dom_ids, rel_paths)):
+        digest = sha1(prefixes[dom_id] + rel_path.encode("utf-8", "surrogatepass")).digest()
+        if digest != file_ids[i * 20:(i + 1) * 20]:
+            bad.append(base + i)
+    return bad
+
+
+def _scan_bucket(backup_path: str, bucket: str) -> Optional[List[str]]:
+    try:
+        with os.scandir(os.path.join(backup_path, bucket)) as it:
+            return [entry.name for entry in it]
+    except FileNotFoundError:
+        return []
+    except OSError:
+        return None
+
+
+# ─────────────────────────────────────────────────────────────────
+# 검증
+# ─────────────────────────────────────────────────────────────────
+def _ids_by_bucket(index: ManifestIndex) -> tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """({bucket: file-row fileIDs}, {bucket: every manifest fileID})."""
+    expected: Dict[str, Set[str]] = {bucket: set() for bucket in BUCKETS}
+    known: Dict[str, Set[str]] = {bucket: set() for bucket in BUCKETS}
+    ids, flags = index._file_ids, index._flags
+    for row in range(len(index)):
+        file_id = ids[row * 20:(row + 1) * 20].hex()
+        known[file_id[:2]].add(file_id)
+        if flags[row] == FLAG_FILE:
+            expected[file_id[:2]].add(file_id)
+    return expected, known
+
+
+def _cancelled(cancel_event: Optional[threading.Event]) -> bool:
+    return cancel_event is not None and cancel_event.is_set()
+
+
+def _check_hashes(
+    index: ManifestIndex, workers: int, cancel_event: Optional[threading.Event] = None
+) -> Optional[List[int]]:
+    """Mismatching rows, or None if *cancel_event* was set between chunks."""
+    rows = len(index)
+    chunks = [
+        (index._domains, index._row_domain[lo:lo + _HASH_CHUNK].tobytes(),
+         index._rel_paths[lo:lo + _HASH_CHUNK], bytes(index._file_ids[lo * 20:(lo + _HASH_CHUNK) * 20]), lo)
+        for lo in range(0, rows, _HASH_CHUNK)
+    ]
+    bad: List[int] = []
+    if workers <= 0 or len(chunks) < 2:
+        for chunk in chunks:
+            if _cancelled(cancel_event):
+                return None
+            bad.extend(hash_mismatch_rows(*chunk))
+        return bad
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(hash_mismatch_rows, *chunk) for chunk in chunks]
+        for future in futures:
+            if _cancelled(cancel_event):
+                pool.shutdown(wait=False, cancel_futures=True)
+                return None
+            bad.extend(future.result())
+    return bad
+
+
+def verify_backup(
+    backup_path: str,
+    index: Optional[ManifestIndex] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Optional[IntegrityReport]:
+    """
+    Verify *backup_path* and return an :class:`IntegrityReport` (None if the
+    manifest cannot be read or *cancel_event* was set). ``progress(done,
+    256)`` is called as bucket scans complete.
+    """
+    started = time.perf_counter()
+    if index is None:
+        index = get_manifest_index(backup_path)
+    if index is None:
+        return None
+    workers = default_decode_workers() if workers is None else workers
+    report = IntegrityReport(backup_path)
+    report.rows = len(index)
+
+    with ThreadPoolExecutor(max_workers=16) as scanners:
+        listings = {bucket: scanners.submit(_scan_bucket, backup_path, bucket) for bucket in BUCKETS}
+        # 디렉터리 스캔이 도는 동안 해시 검증과 기대 목록 구성
+        hash_mismatches = _check_hashes(index, workers, cancel_event)
+        if hash_mismatches is None:
+            for future in listings.values():
+                future.cancel()
+            return None
+        report.hash_mismatches = hash_mismatches
+        expected, known = _ids_by_bucket(index)
+
+        for done, bucket in enumerate(BUCKETS, 1):
+            if _cancelled(cancel_event):
+                for future in listings.values():
+                    future.cancel()
+                return None
+            names = listings[bucket].result()
+            wanted, referenced = expected[bucket], known[bucket]
+            report.files_expected += len(wanted)
+            if names is None:
+                report.unreadable_buckets.append(bucket)
+                continue
+            present = set(names)
+            found = wanted & present
+            report.files_present += len(found)
+            report.missing.extend(sorted(wanted - found))
+            # 디렉터리 등 파일이 아닌 행의 fileID 도 manifest 에 있으므로 고아가 아니다
+            for name in sorted(present - referenced):
+                if name.endswith(TEMP_SUFFIX) and name[:-len(TEMP_SUFFIX)] in referenced:
+                    report.stale_temps.append(f"{bucket}/{name}")
+                else:
+                    report.orphans.append(f"{bucket}/{name}")
+            if progress is not None:
+                progress(done, len(BUCKETS))
+
+    report.elapsed = time.perf_counter() - started
+    print(f"[Integrity] {backup_path}: " + report.describe().replace("\n", " | "))
+    return report
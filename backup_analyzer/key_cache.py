@@ -0,0 +1,161 @@
+"""
+Opt-in cache of unwrapped keybag class keys.
+
+Unlocking a backup keybag costs two PBKDF2 rounds (seconds to tens of
+seconds). With the cache enabled, the class keys of a case are stored after
+the first successful unlock and later opens skip the KDF entirely.
+
+Entries live under ``~/.ios_forensic/keycache`` (never inside the evidence
+folder), one file per ``UniqueDeviceID`` + ``Manifest.plist`` hash, and are
+AES-GCM encrypted with a key derived by scrypt (per-entry salt, ~128 MiB,
+a fraction of a second) from the backup passphrase and a random per-user
+session secret. A wrong passphrase simply misses the cache. The derived
+entry key is kept for the life of the process, so only the first cache hit
+of a process pays for scrypt; every later one (re-opening the case, the
+full in-place decryption after decrypt-on-read) costs a file read and an
+AES-GCM check.
+
+The session secret sits next to the entries, so it only keeps a lone
+entry file from being attacked; whoever copies the whole
+``~/.ios_forensic`` folder can test passphrase guesses, but each guess
+costs a memory-hard scrypt run. That is cheaper on a CPU than the keybag's
+own PBKDF2, but far more expensive to run in bulk on GPUs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import plistlib
+import struct
+from typing import Dict, Optional, Tuple
+
+from Crypto.Cipher import AES
+
+_MAGIC = b"IFKC2"                       # IFKC1 (HMAC 키) 항목은 캐시 미스로 처리
+_SALT_SIZE = 16
+# scrypt 비용: N=2^17, r=8 → 128 MiB, 일반 PC 에서 0.3–0.6 s
+_SCRYPT_N = 2 ** 17
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+_SCRYPT_MAXMEM = 256 * 1024 ** 2
+_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".ios_forensic")
+
+# 프로세스 수명 동안 유지하는 파생 키: (cache id, 세션 비밀값, salt, 암호 digest) → 항목 키
+# 암호 자체는 남기지 않고 프로세스마다 새로 뽑은 값으로 HMAC 한 digest 만 보관
+_DERIVED: Dict[Tuple[str, bytes, bytes, bytes], bytes] = {}
+_PROCESS_PEPPER = os.urandom(32)
+
+
+def _private_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as fp:
+        fp.write(data)
+    os.replace(tmp, path)
+
+
+def _session_secret() -> bytes:
+    path = os.path.join(_CACHE_ROOT, "session.key")
+    try:
+        with open(path, "rb") as fp:
+            secret = fp.read()
+        if len(secret) == 32:
+            return secret
+    except FileNotFoundError:
+        pass
+    secret = os.urandom(32)
+    _private_write(path, secret)
+    return secret
+
+
+def cache_id(backup_path: str) -> Optional[str]:
+    """``<UniqueDeviceID>-<sha256(Manifest.plist)[:16]>`` or None."""
+    try:
+        with open(os.path.join(backup_path, "Manifest.plist"), "rb") as fp:
+            raw = fp.read()
+        udid = plistlib.loads(raw).get("Lockdown", {}).get("UniqueDeviceID") or "unknown"
+    except (OSError, plistlib.InvalidFileException, ValueError):
+        return None
+    safe_udid = "".join(c for c in str(udid) if c.isalnum() or c in "-_")
+    return f"{safe_udid}-{hashlib.sha256(raw).hexdigest()[:16]}"
+
+
+def _entry_path(cid: str) -> str:
+    return os.path.join(_CACHE_ROOT, "keycache", cid + ".bin")
+
+
+def _entry_key(cid: str, passphrase: str | bytes, salt: bytes) -> bytes:
+    """scrypt key of one entry, derived at most once per process."""
+    if isinstance(passphrase, str):
+        passphrase = passphrase.encode("utf-8")
+    secret = _session_secret()
+    memo = (cid, secret, salt, hmac.new(_PROCESS_PEPPER, passphrase, hashlib.sha256).digest())
+    key = _DERIVED.get(memo)
+    if key is None:
+        key = _DERIVED[memo] = hashlib.scrypt(
+            passphrase,
+            salt=secret + salt + cid.encode(),
+            n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P, maxmem=_SCRYPT_MAXMEM, dklen=32,
+        )
+    return key
+
+
+def load_class_keys(backup_path: str, passphrase: str | bytes) -> Optional[Dict[int, bytes]]:
+    """Cached class keys for this backup/passphrase, or None on a miss."""
+    cid = cache_id(backup_path)
+    if cid is None:
+        return None
+    try:
+        with open(_entry_path(cid), "rb") as fp:
+            data = fp.read()
+    except OSError:
+        return None
+    if not data.startswith(_MAGIC) or len(data) < len(_MAGIC) + _SALT_SIZE + 28:
+        return None
+    body = data[len(_MAGIC):]
+    salt, body = body[:_SALT_SIZE], body[_SALT_SIZE:]
+    nonce, tag, ciphertext = body[:12], body[12:28], body[28:]
+    cipher = AES.new(_entry_key(cid, passphrase, salt), AES.MODE_GCM, nonce=nonce)
+    cipher.update(cid.encode())
+    try:
+        plain = cipher.decrypt_and_verify(ciphertext, tag)
+    except ValueError:                      # wrong passphrase / other session
+        return None
+    keys: Dict[int, bytes] = {}
+    for off in range(0, len(plain) - 35, 36):
+        clas = struct.unpack_from(">I", plain, off)[0]
+        keys[clas] = plain[off + 4:off + 36]
+    return keys or None
+
+
+def store_class_keys(backup_path: str, passphrase: str | bytes, class_keys: Dict[int, bytes]) -> None:
+    cid = cache_id(backup_path)
+    if cid is None or not class_keys:
+        return
+    plain = b"".join(
+        struct.pack(">I", clas) + key for clas, key in sorted(class_keys.items()) if len(key) == 32
+    )
+    salt = os.urandom(_SALT_SIZE)
+    nonce = os.urandom(12)
+    cipher = AES.new(_entry_key(cid, passphrase, salt), AES.MODE_GCM, nonce=nonce)
+    cipher.update(cid.encode())
+    ciphertext, tag = cipher.encrypt_and_digest(plain)
+    try:
+        _private_write(_entry_path(cid), _MAGIC + salt + nonce + tag + ciphertext)
+    except OSError as e:
+        print(f"[KeyCache] could not store keys: {e}")
+
+
+def forget_class_keys(backup_path: str) -> None:
+    cid = cache_id(backup_path)
+    if cid is None:
+        return
+    for memo in [m for m in _DERIVED if m[0] == cid]:
+        _DERIVED.pop(memo, None)
+    try:
+        os.remove(_entry_path(cid))
+    except OSError:
+        pass
@@ -0,0 +1,191 @@
+"""
+Versioned sidecar cache of a parsed ``Manifest.db``.
+
+``<backup>/.manifest_index.cache`` holds every ``ManifestIndex`` column
+(fileIDs, domains, relativePaths, flags and the decoded MBFile size / mtime /
+birth / mode / inode / protection class / trashed values) plus the
+``PathTrie`` arrays, so re-opening a case skips both the SQLite scan and
+the bplist decoding.
+
+Layout::
+
+    magic "IFMC" | u32 header length | JSON header | 8-byte aligned columns
+
+The header records the format version, the byte order, the Manifest.db
+signature and ``name → [typecode, offset, length]`` for each column. Columns
+are raw ``array`` bytes (strings: UTF-8 joined with NUL), so the file can be
+mapped and sliced straight into arrays.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from backup_analyzer.build_tree import PathTrie, build_tree
+from backup_analyzer.manifest_index import ManifestIndex, _manifest_signature
+from backup_analyzer.tracing import traced
+
+CACHE_FILE_NAME = ".manifest_index.cache"
+CACHE_VERSION = 2
+_MAGIC = b"IFMC"
+_SAMPLE = 1 << 20
+
+
+def manifest_fingerprint(backup_path: str) -> Optional[List]:
+    """
+    (size, mtime_ns, sha1 of the first and last MiB) of Manifest.db.
+
+    Hashing samples rather than the whole database keeps validation O(1);
+    size + mtime catch ordinary rewrites, the sample hash catches a copy
+    that preserved timestamps.
+    """
+    db_path = os.path.join(backup_path, "Manifest.db")
+    size, mtime_ns = _manifest_signature(db_path)
+    if not size:
+        return None
+    digest = hashlib.sha1()
+    try:
+        with open(db_path, "rb") as fp:
+            digest.update(fp.read(_SAMPLE))
+            if size > _SAMPLE:
+                fp.seek(max(_SAMPLE, size - _SAMPLE))
+                digest.update(fp.read(_SAMPLE))
+    except OSError:
+        return None
+    return [size, mtime_ns, digest.hexdigest()]
+
+
+def _cache_path(backup_path: str) -> str:
+    return os.path.join(backup_path, CACHE_FILE_NAME)
+
+
+def _index_columns(index: ManifestIndex, trie: PathTrie) -> Dict[str, Tuple[str, bytes]]:
+    return {
+        "row_domain": ("I", index._row_domain.tobytes()),
+        "rel_paths": ("s", "\0".join(index._rel_paths).encode("utf-8", "surrogatepass")),
+        "file_ids": ("B", bytes(index._file_ids)),
+        "flags": ("B", index._flags.tobytes()),
+        "sizes": ("q", index._sizes.tobytes()),
+        "mtimes": ("q", index._mtimes.tobytes()),
+        "births": ("q", index._births.tobytes()),
+        "modes": ("i", index._modes.tobytes()),
+        "trashed": ("B", index._trashed.tobytes()),
+        "inodes": ("q", index._inodes.tobytes()),
+        "protection": ("b", index._protection.tobytes()),
+        "trie_names": ("s", "\0".join(trie.names).encode("utf-8", "surrogatepass")),
+        "trie_node_name": ("i", trie.node_name.tobytes()),
+        "trie_parent": ("i", trie.parent.tobytes()),
+        "trie_first_child": ("i", trie.first_child.tobytes()),
+        "trie_next_sibling": ("i", trie.next_sibling.tobytes()),
+        "trie_rows": ("i", trie.rows.tobytes()),
+    }
+
+
+@traced("manifest.cache_save", "manifest")
+def save_manifest_cache(index: ManifestIndex) -> bool:
+    """Write the sidecar for *index* (builds its PathTrie if needed)."""
+    fingerprint = manifest_fingerprint(index.backup_path)
+    if fingerprint is None:
+        return False
+    trie, _ = build_tree(index)
+    columns = _index_columns(index, trie)
+
+    layout: Dict[str, List] = {}
+    offset = 0
+    for name, (typecode, data) in columns.items():
+        layout[name] = [typecode, offset, len(data)]
+        offset += (len(data) + 7) & ~7
+    header = json.dumps({
+        "version": CACHE_VERSION,
+        "byteorder": sys.byteorder,
+        "manifest": fingerprint,
+        "rows": len(index),
+        "domains": index._domains,
+        "columns": layout,
+    }).encode("utf-8")
+    header += b" " * (-(len(_MAGIC) + 4 + len(header)) % 8)
+
+    path = _cache_path(index.backup_path)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as fp:
+            fp.write(_MAGIC + struct.pack("<I", len(header)) + header)
+            for _, data in columns.values():
+                fp.write(data)
+                fp.write(b"\0" * (-len(data) % 8))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[ManifestCache] write failed: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+@traced("manifest.cache_load", "manifest")
+def load_manifest_cache(backup_path: str) -> Optional[ManifestIndex]:
+    """Return the cached index (with ``path_trie`` set) or None if stale/absent."""
+    path = _cache_path(backup_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:4] != _MAGIC:
+                return None
+            header_len = struct.unpack_from("<I", mm, 4)[0]
+            base = 8 + header_len
+            header = json.loads(mm[8:base].decode("utf-8"))
+            if (header.get("version") != CACHE_VERSION
+                    or header.get("byteorder") != sys.byteorder
+                    or header.get("manifest") != manifest_fingerprint(backup_path)):
+                return None
+
+            def column(name: str):
+                typecode, offset, length = header["columns"][name]
+                raw = mm[base + offset:base + offset + length]
+                if typecode == "s":
+                    text = raw.decode("utf-8", "surrogatepass")
+                    return text.split("\0")
+                values = array(typecode)
+                values.frombytes(raw)
+                return values
+
+            index = ManifestIndex(backup_path)
+            index.signature = _manifest_signature(os.path.join(backup_path, "Manifest.db"))
+            index._domains = header["domains"]
+            index._domain_ids = {d: i for i, d in enumerate(index._domains)}
+            index._row_domain = column("row_domain")
+            index._rel_paths = column("rel_paths")[:header["rows"]]
+            index._file_ids = bytearray(column("file_ids"))
+            for name in ("flags", "sizes", "mtimes", "births", "modes", "trashed",
+                         "inodes", "protection"):
+                setattr(index, "_" + name, column(name))
+
+            by_domain: Dict[str, Dict[str, int]] = {d: {} for d in index._domains}
+            tables = [by_domain[d] for d in index._domains]
+            for row, (dom_id, rel_path) in enumerate(zip(index._row_domain, index._rel_paths)):
+                tables[dom_id][rel_path] = row
+            index._by_domain = by_domain
+
+            trie = PathTrie(index, index._rel_paths)
+            trie.names = column("trie_names")
+            for name in ("node_name", "parent", "first_child", "next_sibling", "rows"):
+                setattr(trie, name, column("trie_" + name))
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"[ManifestCache] ignoring unreadable cache: {e}")
+        return None
+
+    if len(index._rel_paths) != header["rows"] or len(index._file_ids) != 20 * header["rows"]:
+        return None
+    index.path_trie = trie
+    index.from_cache = True
+    return index
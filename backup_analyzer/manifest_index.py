@@ -0,0 +1,435 @@
+"""
+Backup-scoped, in-memory index of ``Manifest.db``.
+
+The index is built once per backup (``load_backup``) and then shared by the
+file browser, the preview pane and every artifact analyzer, so resolving a
+(domain, relativePath) pair to its hashed blob never opens SQLite again.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from backup_analyzer.mbfile_decoder import (
+    POOL_MIN_ROWS,
+    MBFileColumns,
+    decode_mbfile_batch,
+    decode_mbfile_columns,
+    default_decode_workers,
+)
+from backup_analyzer.tracing import is_enabled as tracing_enabled, span
+from backup_analyzer.virtual_backup import get_virtual_backup
+
+FLAG_FILE = 1
+FLAG_DIRECTORY = 2
+
+
+def split_tree_path(full_path: str) -> Tuple[str, str]:
+    """
+    Split a backup-tree path into (domain, relativePath).
+
+    Tree paths repeat the domain once (``<domain>/<domain>/<relativePath>``)
+    because every domain is inserted under its own name.
+    """
+    parts = full_path.split("/", 2)
+    if len(parts) == 3:
+        return parts[0], parts[2]
+    return parts[0], ""
+
+
+def join_tree_path(domain: str, rel_path: str) -> str:
+    """Inverse of :func:`split_tree_path`."""
+    return f"{domain}/{domain}/{rel_path}" if rel_path else f"{domain}/{domain}"
+
+
+class ManifestIndex:
+    """
+    (domain, relativePath) → fileID / flags / size / mtime lookup table.
+
+    Rows are stored column-wise: fileIDs as packed 20-byte digests; flags,
+    sizes, mtimes, births, modes and the Photos trashed flag in ``array``
+    columns; domains interned once. Per-domain dicts map the relativePath
+    string (shared with the row column) to the row number.
+    """
+
+    def __init__(self, backup_path: str):
+        self.backup_path = backup_path
+        self.signature: Tuple[int, int] = (0, 0)
+        self._domains: List[str] = []
+        self._domain_ids: Dict[str, int] = {}
+        self._by_domain: Dict[str, Dict[str, int]] = {}
+        self._row_domain = array("I")
+        self._rel_paths: List[str] = []
+        self._file_ids = bytearray()
+        self._flags = array("B")
+        self._sizes = array("q")
+        self._mtimes = array("q")
+        self._births = array("q")
+        self._modes = array("i")
+        self._trashed = array("B")
+        self._inodes = array("q")
+        self._protection = array("b")
+        # PathTrie over this index (set by build_tree / the sidecar cache)
+        self.path_trie = None
+        # PathSearch over this index (set by path_search.get_path_search)
+        self.path_search = None
+        self.from_cache = False
+        # secondary indexes, built on first use
+        self._by_rel_path: Optional[Dict[str, int]] = None
+        self._by_rel_path_nocase: Optional[Dict[str, int]] = None
+        self._by_file_id: Optional[Dict[bytes, int]] = None
+
+    # ─────────────────────────────────────────────────────────────
+    # 구축
+    # ─────────────────────────────────────────────────────────────
+    @classmethod
+    def build(
+        cls,
+        backup_path: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        workers: Optional[int] = None,
+    ) -> Optional["ManifestIndex"]:
+        """
+        Read ``Manifest.db`` once and return the index (None if unreadable
+        or cancelled). ``progress(rows_done, rows_total)`` is called after
+        every fetched batch.
+
+        MBFile blobs are decoded per fetched batch by the bulk decoder; with
+        *workers* > 0 (default: ``default_decode_workers()``) large backups
+        hand their batches to a process pool while the next batch is read
+        from SQLite.
+        """
+        db_path = os.path.join(backup_path, "Manifest.db")
+        if not os.path.exists(db_path):
+            return None
+
+        index = cls(backup_path)
+        index.signature = _manifest_signature(db_path)
+        workers = default_decode_workers() if workers is None else workers
+        pool: Optional[ProcessPoolExecutor] = None
+        pending = []
+        with span("manifest.build", "manifest", workers=workers) as build_span:
+            try:
+                with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+                    total = conn.execute("SELECT COUNT(*) FROM Files").fetchone()[0] if progress else 0
+                    cur = conn.execute("SELECT fileID, domain, relativePath, flags, file FROM Files")
+                    while True:
+                        if cancel_event is not None and cancel_event.is_set():
+                            return None
+                        with span("manifest.fetch", "manifest") as s:
+                            batch = cur.fetchmany(10000)
+                            s.add(rows=len(batch))
+                        if not batch:
+                            break
+                        blobs = []
+                        for file_id, domain, rel_path, flags, blob in batch:
+                            index._append(file_id, domain or "", rel_path or "", flags)
+                            blobs.append(blob)
+                        if pool is None and workers > 0 and len(index) >= POOL_MIN_ROWS:
+                            pool = ProcessPoolExecutor(max_workers=workers)   # large backups only
+                        if pool is not None:
+                            pending.append(pool.submit(decode_mbfile_batch, blobs))
+                        else:
+                            with span("mbfile.decode", "plist") as s:
+                                index._extend_records(decode_mbfile_columns(blobs))
+                                if s:
+                                    s.add(rows=len(blobs), nbytes=sum(len(b) for b in blobs if b))
+                        if progress is not None:
+                            progress(len(index), total)
+                for future in pending:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return None
+                    with span("mbfile.decode.collect", "plist"):
+                        index._extend_records(MBFileColumns.from_bytes(future.result()))
+            except sqlite3.Error as e:
+                print(f"[ManifestIndex] Manifest.db read error: {e}")
+                return None
+            finally:
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+            if build_span:
+                build_span.add(rows=len(index), nbytes=index.signature[0])
+        return index
+
+    def _append(self, file_id: str, domain: str, rel_path: str, flags) -> None:
+        dom_id = self._domain_ids.get(domain)
+        if dom_id is None:
+            dom_id = len(self._domains)
+            self._domains.append(domain)
+            self._domain_ids[domain] = dom_id
+            self._by_domain[domain] = {}
+
+        row = len(self._rel_paths)
+        self._row_domain.append(dom_id)
+        self._rel_paths.append(rel_path)
+        self._by_domain[domain][rel_path] = row
+        try:
+            self._file_ids += bytes.fromhex(file_id)
+        except (TypeError, ValueError):
+            self._file_ids += bytes(20)
+        flags = flags or 0
+        self._flags.append(flags & 0xFF)
+
+    def _extend_records(self, cols: MBFileColumns) -> None:
+        """Append decoded MBFile columns (rows in Manifest order)."""
+        self._sizes.extend(cols.sizes)
+        self._mtimes.extend(cols.mtimes)
+        self._births.extend(cols.births)
+        self._modes.extend(cols.modes)
+        self._trashed.extend(cols.trashed)
+        self._inodes.extend(cols.inodes)
+        self._protection.extend(cols.protection)
+
+    # ─────────────────────────────────────────────────────────────
+    # 행 단위 접근
+    # ─────────────────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._rel_paths)
+
+    def __contains__(self, full_path: str) -> bool:
+        return self.row(*split_tree_path(full_path)) is not None
+
+    def row(self, domain: str, rel_path: str) -> Optional[int]:
+        rows = self._by_domain.get(domain)
+        return rows.get(rel_path) if rows is not None else None
+
+    def row_file_id(self, row: int) -> str:
+        return self._file_ids[row * 20:(row + 1) * 20].hex()
+
+    def row_domain(self, row: int) -> str:
+        return self._domains[self._row_domain[row]]
+
+    def row_rel_path(self, row: int) -> str:
+        return self._rel_paths[row]
+
+    def row_flags(self, row: int) -> int:
+        return self._flags[row]
+
+    def row_size(self, row: int) -> Optional[int]:
+        size = self._sizes[row]
+        return None if size < 0 else size
+
+    def row_mtime(self, row: int) -> Optional[int]:
+        mtime = self._mtimes[row]
+        return None if mtime < 0 else mtime
+
+    def row_birth(self, row: int) -> Optional[int]:
+        birth = self._births[row]
+        return None if birth < 0 else birth
+
+    def row_mode(self, row: int) -> Optional[int]:
+        mode = self._modes[row]
+        return None if mode < 0 else mode
+
+    def row_trashed(self, row: int) -> bool:
+        return bool(self._trashed[row])
+
+    def row_inode(self, row: int) -> Optional[int]:
+        inode = self._inodes[row]
+        return None if inode < 0 else inode
+
+    def row_protection_class(self, row: int) -> Optional[int]:
+        prot = self._protection[row]
+        return None if prot < 0 else prot
+
+    def iter_rows(self) -> Iterator[Tuple[str, str, str, int]]:
+        """Yield (fileID, domain, relativePath, flags) like ``load_manifest_db``."""
+        for row, rel_path in enumerate(self._rel_paths):
+            yield self.row_file_id(row), self.row_domain(row), rel_path, self._flags[row]
+
+    @property
+    def domains(self) -> List[str]:
+        return list(self._domains)
+
+    def row_domains(self) -> Iterator[str]:
+        """Domain of every row, in row order (strings are shared, not copied)."""
+        domains = self._domains
+        return (domains[d] for d in self._row_domain)
+
+    def rel_paths(self) -> List[str]:
+        """relativePath column (read-only; do not mutate)."""
+        return self._rel_paths
+
+    # ─────────────────────────────────────────────────────────────
+    # 경로 조회
+    # ─────────────────────────────────────────────────────────────
+    def file_id(self, domain: str, rel_path: str) -> Optional[str]:
+        if tracing_enabled():
+            with span("manifest.lookup", "manifest") as s:
+                row = self.row(domain, rel_path)
+                s.add(rows=row is not None)
+        else:
+            row = self.row(domain, rel_path)
+        return None if row is None else self.row_file_id(row)
+
+    def flags(self, domain: str, rel_path: str) -> Optional[int]:
+        row = self.row(domain, rel_path)
+        return None if row is None else self._flags[row]
+
+    def size(self, domain: str, rel_path: str) -> Optional[int]:
+        row = self.row(domain, rel_path)
+        return None if row is None else self.row_size(row)
+
+    def mtime(self, domain: str, rel_path: str) -> Optional[int]:
+        row = self.row(domain, rel_path)
+        return None if row is None else self.row_mtime(row)
+
+    def file_id_by_rel_path(self, rel_path: str, nocase: bool = False) -> Optional[str]:
+        """First fileID whose relativePath matches, regardless of domain."""
+        if not tracing_enabled():
+            return self._file_id_by_rel_path(rel_path, nocase)
+        with span("manifest.lookup_rel_path", "manifest") as s:
+            file_id = self._file_id_by_rel_path(rel_path, nocase)
+            s.add(rows=file_id is not None)
+            return file_id
+
+    def _file_id_by_rel_path(self, rel_path: str, nocase: bool) -> Optional[str]:
+        if nocase:
+            if self._by_rel_path_nocase is None:
+                table: Dict[str, int] = {}
+                for row, rp in enumerate(self._rel_paths):
+                    table.setdefault(rp.lower(), row)
+                self._by_rel_path_nocase = table
+            row = self._by_rel_path_nocase.get(rel_path.lower())
+        else:
+            if self._by_rel_path is None:
+                table = {}
+                for row, rp in enumerate(self._rel_paths):
+                    table.setdefault(rp, row)
+                self._by_rel_path = table
+            row = self._by_rel_path.get(rel_path)
+        return None if row is None else self.row_file_id(row)
+
+    def lookup_file_id(self, file_id: str) -> Optional[Tuple[str, str]]:
+        """Reverse lookup: fileID → (domain, relativePath)."""
+        if not tracing_enabled():
+            return self._lookup_file_id(file_id)
+        with span("manifest.lookup_file_id", "manifest") as s:
+            located = self._lookup_file_id(file_id)
+            s.add(rows=located is not None)
+            return located
+
+    def _lookup_file_id(self, file_id: str) -> Optional[Tuple[str, str]]:
+        if self._by_file_id is None:
+            ids = self._file_ids
+            self._by_file_id = {bytes(ids[r * 20:(r + 1) * 20]): r for r in range(len(self))}
+        try:
+            row = self._by_file_id.get(bytes.fromhex(file_id))
+        except ValueError:
+            return None
+        return None if row is None else (self.row_domain(row), self._rel_paths[row])
+
+    def blob_path(self, file_id: str) -> Optional[str]:
+        """
+        On-disk location of a hashed backup file.
+
+        For an encrypted backup opened with a password this is the plaintext
+        copy served by the decrypt-on-read layer, and None when that copy
+        cannot be produced: the raw ``<xx>/<fileID>`` blob is AES-CBC
+        ciphertext and must never be handed to a parser.
+        """
+        virtual = get_virtual_backup(self.backup_path)
+        if virtual is not None:
+            return virtual.path_for(file_id)
+        return os.path.join(self.backup_path, file_id[:2], file_id)
+
+    def resolve(self, domain: str, rel_path: str) -> Optional[str]:
+        """Absolute path of (domain, relativePath) if present on disk."""
+        file_id = self.file_id(domain, rel_path)
+        if not file_id:
+            return None
+        path = self.blob_path(file_id)
+        return path if path and os.path.exists(path) else None
+
+    def resolve_rel_path(self, rel_path: str, nocase: bool = False) -> Optional[str]:
+        """Absolute path of the first file with *rel_path* in any domain."""
+        file_id = self.file_id_by_rel_path(rel_path, nocase=nocase)
+        if not file_id:
+            return None
+        path = self.blob_path(file_id)
+        return path if path and os.path.exists(path) else None
+
+
+# ─────────────────────────────────────────────────────────────────
+# 백업별 레지스트리
+# ─────────────────────────────────────────────────────────────────
+_INDEXES: Dict[str, ManifestIndex] = {}
+_BUILDING: Dict[str, threading.Event] = {}     # 구축 중인 백업 → 완료 시 set
+_INDEX_LOCK = threading.Lock()
+
+
+def _registry_key(backup_path: str) -> str:
+    return os.path.normcase(os.path.abspath(backup_path))
+
+
+def _manifest_signature(db_path: str) -> Tuple[int, int]:
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return 0, 0
+    return st.st_size, st.st_mtime_ns
+
+
+def get_manifest_index(
+    backup_path: str,
+    build: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Optional[ManifestIndex]:
+    """
+    Return the shared index for *backup_path*, building it on first use.
+
+    A cached index is discarded if ``Manifest.db`` changed on disk
+    (e.g. it was replaced by the decrypted copy). Before scanning the
+    database the on-disk sidecar (``manifest_cache``) is tried. *progress*
+    and *cancel_event* are forwarded to :meth:`ManifestIndex.build`.
+
+    The registry lock is only held for the lookup: the build itself runs
+    unlocked and concurrent callers for the same backup wait for it, so
+    callers on the Tk thread should pass ``build=False`` and treat None as
+    "not loaded yet" instead of blocking on a running load.
+    """
+    from backup_analyzer.manifest_cache import load_manifest_cache  # 순환 import 회피
+
+    if not backup_path:
+        return None
+    key = _registry_key(backup_path)
+    while True:
+        sig = _manifest_signature(os.path.join(backup_path, "Manifest.db"))
+        with _INDEX_LOCK:
+            index = _INDEXES.get(key)
+            if index is not None and index.signature == sig:
+                return index
+            if not build:
+                return None
+            building = _BUILDING.get(key)
+            if building is None:
+                building = _BUILDING[key] = threading.Event()
+                break
+        building.wait()                          # 다른 스레드의 구축 결과를 다시 확인
+
+    index = None
+    try:
+        index = load_manifest_cache(backup_path)
+        if index is None:
+            index = ManifestIndex.build(backup_path, progress, cancel_event)
+    finally:
+        with _INDEX_LOCK:
+            if index is None:
+                _INDEXES.pop(key, None)
+            else:
+                _INDEXES[key] = index
+            del _BUILDING[key]
+        building.set()
+    return index
+
+
+def drop_manifest_index(backup_path: str) -> None:
+    with _INDEX_LOCK:
+        _INDEXES.pop(_registry_key(backup_path), None)
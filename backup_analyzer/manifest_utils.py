@@ -2,13 +2,17 @@ import plistlib
 import sqlite3
 import os
 
+from backup_analyzer.tracing import span
+
 def load_manifest_plist(backup_dir: str) -> dict:
     """ Load Manifest.plist file. """
     path = os.path.join(backup_dir, "Manifest.plist")
     if not os.path.exists(path):
         return {}
-    with open(path, "rb") as f:
-        return plistlib.load(f)
+    with span("plist.load", "plist", file="Manifest.plist") as s, open(path, "rb") as f:
+        data = plistlib.load(f)
+        s.add(nbytes=f.tell())
+        return data
 
 def load_manifest_db(backup_dir: str):
     """ Load the file list from Manifest.db file. """
@@ -18,8 +22,10 @@ def load_manifest_db(backup_dir: str):
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     try:
-        cursor.execute("SELECT fileID, domain, relativePath, flags FROM Files")
-        rows = cursor.fetchall()
+        with span("manifest.load_db", "manifest") as s:
+            cursor.execute("SELECT fileID, domain, relativePath, flags FROM Files")
+            rows = cursor.fetchall()
+            s.add(rows=len(rows))
     except sqlite3.OperationalError:
         conn.close()
         return []
@@ -0,0 +1,204 @@
+"""
+Substring / suffix / glob search over Manifest paths.
+
+Replaces the ``LIKE '%kw%'`` full-table scans that every panel used to run
+against ``Manifest.db``. All relativePaths of a backup are packed once into a
+single newline-delimited corpus (plus an ASCII-lowercased twin for the
+case-insensitive matching ``LIKE`` does), and queries run as C-level
+``str.find`` / ``re`` scans over that corpus, mapped back to Manifest rows by
+binary search over the line offsets. Domains are filtered per distinct
+domain, not per row.
+
+Typical use::
+
+    search = get_path_search(backup_path)
+    rows = search.find(contains="bookmarks", suffix=".db")
+    pairs = search.file_pairs(rows)            # [(fileID, relativePath)]
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+from backup_analyzer.manifest_index import ManifestIndex, get_manifest_index
+from backup_analyzer.tracing import span
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _fold(text: str) -> str:
+    """ASCII-only lowercase (same rule as SQLite LIKE, keeps string length)."""
+    return text.translate(_ASCII_LOWER)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """``*`` / ``?`` / ``[...]`` glob → regex body confined to one line."""
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            out.append("[^\n]*")
+        elif c == "?":
+            out.append("[^\n]")
+        elif c == "[":
+            j = pattern.find("]", i + 1 if pattern[i:i + 1] in ("!", "]") else i)
+            if j < 0:
+                out.append(re.escape(c))
+                continue
+            body = pattern[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+class PathSearch:
+    """Read-only search view over a :class:`ManifestIndex`."""
+
+    def __init__(self, index: ManifestIndex):
+        self.index = index
+        rel_paths = index.rel_paths()
+        # corpus = "\n" + path0 + "\n" + path1 + ... + "\n"; row r spans
+        # [starts[r], starts[r + 1] - 1)
+        self._text = "\n" + "\n".join(p.replace("\n", "\0") for p in rel_paths) + "\n"
+        self._starts = array("q", accumulate((len(p) + 1 for p in rel_paths), initial=1))
+        self._folded: Optional[str] = None
+
+    # ── 내부 ────────────────────────────────────────────────────
+    def _corpus(self, nocase: bool) -> str:
+        if not nocase:
+            return self._text
+        if self._folded is None:
+            self._folded = _fold(self._text)
+        return self._folded
+
+    def _row_at(self, pos: int) -> int:
+        return bisect_right(self._starts, pos) - 1
+
+    def _scan(self, needle: str, nocase: bool, skip: int = 0) -> Iterable[int]:
+        """Rows whose line contains *needle*; *skip* chars of the match precede the row."""
+        text = self._corpus(nocase)
+        find, starts = text.find, self._starts
+        pos = find(needle)
+        while pos >= 0:
+            row = self._row_at(pos + skip)
+            yield row
+            pos = find(needle, starts[row + 1] - skip)
+
+    def _domain_ids(self, domain, domain_prefix, domain_contains, nocase) -> Optional[Set[int]]:
+        if domain is None and domain_prefix is None and domain_contains is None:
+            return None
+        norm = _fold if nocase else (lambda s: s)
+        ids = set()
+        for dom_id, name in enumerate(self.index._domains):
+            value = norm(name)
+            if domain is not None and value != norm(domain):
+                continue
+            if domain_prefix is not None and not value.startswith(norm(domain_prefix)):
+                continue
+            if domain_contains is not None and norm(domain_contains) not in value:
+                continue
+            ids.add(dom_id)
+        return ids
+
+    # ── 질의 API ────────────────────────────────────────────────
+    def find(
+        self,
+        *,
+        contains: Optional[str] = None,
+        suffix: Optional[str | Sequence[str]] = None,
+        prefix: Optional[str] = None,
+        glob: Optional[str] = None,
+        domain: Optional[str] = None,
+        domain_prefix: Optional[str] = None,
+        domain_contains: Optional[str] = None,
+        nocase: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Manifest row numbers (ascending) matching every given criterion.
+
+        ``contains`` / ``prefix`` / ``suffix`` (one string or several, OR-ed)
+        are literal; ``glob`` matches the whole relativePath. Empty
+        ``contains`` / ``prefix`` / ``suffix`` strings match every row (like
+        ``LIKE '%%'``). Matching is ASCII case-insensitive by default, like
+        SQLite ``LIKE``.
+        """
+        with span("manifest.search", "manifest") as sp:
+            result = self._match(contains, suffix, prefix, glob, domain, domain_prefix, domain_contains, nocase)
+            sp.add(rows=len(result))
+        return result[:limit] if limit is not None else result
+
+    def _match(self, contains, suffix, prefix, glob, domain, domain_prefix, domain_contains, nocase) -> List[int]:
+        if not len(self.index):
+            return []
+        fold = _fold if nocase else (lambda s: s)
+        text = self._corpus(nocase)
+        candidates: Optional[Set[int]] = None
+
+        def narrow(rows: Iterable[int]) -> None:
+            nonlocal candidates
+            found = set(rows)
+            candidates = found if candidates is None else candidates & found
+
+        # 빈 문자열 조건은 모든 행과 일치하므로 걸러내지 않는다
+        suffixes = (suffix,) if isinstance(suffix, str) else tuple(suffix or ())
+        if suffix is not None and "" not in suffixes:
+            rows: Set[int] = set()
+            for s in suffixes:
+                rows.update(self._scan(fold(s) + "\n", nocase))
+            narrow(rows)
+        if prefix:
+            narrow(self._scan("\n" + fold(prefix), nocase, skip=1))
+        if contains and (candidates is None or candidates):
+            needle = fold(contains)
+            if candidates is not None and len(candidates) < 256:
+                starts = self._starts
+                narrow(r for r in candidates if text.find(needle, starts[r], starts[r + 1] - 1) >= 0)
+            else:
+                narrow(self._scan(needle, nocase))
+        if glob is not None and (candidates is None or candidates):
+            regex = re.compile("(?m)^" + _glob_to_regex(fold(glob)) + "$")
+            # 맨 앞 "\n" 과 맨 끝 "\n" 뒤의 빈 줄은 행이 아니다
+            narrow(self._row_at(m.start()) for m in regex.finditer(text, 1, len(text) - 1))
+
+        if candidates is None:
+            candidates = set(range(len(self.index)))
+        domain_ids = self._domain_ids(domain, domain_prefix, domain_contains, nocase)
+        if domain_ids is not None:
+            row_domain = self.index._row_domain
+            candidates = {r for r in candidates if row_domain[r] in domain_ids}
+
+        return sorted(candidates)
+
+    def first(self, **criteria) -> Optional[int]:
+        rows = self.find(limit=1, **criteria)
+        return rows[0] if rows else None
+
+    # ── 결과 변환 ───────────────────────────────────────────────
+    def file_pairs(self, rows: Iterable[int]) -> List[Tuple[str, str]]:
+        """[(fileID, relativePath)] like the old ``SELECT fileID, relativePath``."""
+        index = self.index
+        return [(index.row_file_id(r), index.row_rel_path(r)) for r in rows]
+
+
+def get_path_search(backup_path: str, build: bool = True) -> Optional[PathSearch]:
+    """
+    Shared :class:`PathSearch` of a backup (built once per ManifestIndex).
+    *build* is forwarded to :func:`get_manifest_index`.
+    """
+    index = get_manifest_index(backup_path, build=build)
+    if index is None:
+        return None
+    search = index.path_search
+    if search is None:
+        search = index.path_search = PathSearch(index)
+    return search
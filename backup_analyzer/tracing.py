@@ -0,0 +1,334 @@
+"""
+Lightweight span tracing for the hot paths.
+
+    with span("manifest.lookup", "manifest", rel=path) as s:
+        ...
+        s.add(rows=1, nbytes=size)
+
+Spans record wall time plus optional row / byte counts and end up in one
+process-wide buffer that can be exported as Chrome trace-event JSON
+(``chrome://tracing`` / Perfetto) or rolled up into a per-span summary
+table.
+
+Tracing is off unless ``IOS_FORENSIC_TRACE`` is set or :func:`enable` is
+called; while off, :func:`span` returns a shared no-op object, so an
+instrumented call costs one global lookup and two empty method calls. The
+no-op is falsy, so arguments that cost something to compute are guarded
+with ``if s: s.add(...)``.
+
+Worker processes (artifact orchestrator) record into their own buffer;
+:func:`drain` hands those events to the parent, which :func:`merge` s them.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+TRACE_ENV = "IOS_FORENSIC_TRACE"
+MAX_EVENTS = 500_000                  # 이후 이벤트는 요약에만 반영
+
+_ENABLED = os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+# (name, cat, start_ns, dur_ns, pid, tid, args)
+Event = Tuple[str, str, int, int, int, int, Dict[str, Any]]
+
+_EVENTS: List[Event] = []
+_STATS: Dict[str, List[float]] = {}   # name → [calls, total_ns, max_ns, rows, bytes]
+_THREAD_NAMES: Dict[Tuple[int, int], str] = {}
+_LOCK = threading.Lock()
+_dropped = 0
+
+
+# ─────────────────────────────────────────────────────────────────
+# 켜기 / 끄기
+# ─────────────────────────────────────────────────────────────────
+def enable(on: bool = True) -> None:
+    global _ENABLED
+    _ENABLED = bool(on)
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset() -> None:
+    """Forget every recorded span."""
+    global _dropped
+    with _LOCK:
+        _EVENTS.clear()
+        _STATS.clear()
+        _THREAD_NAMES.clear()
+        _dropped = 0
+
+
+# ─────────────────────────────────────────────────────────────────
+# Span
+# ─────────────────────────────────────────────────────────────────
+class Span:
+    """One timed region; ``add()`` accumulates rows / bytes, ``set()`` other args."""
+
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name: str, cat: str, args: Dict[str, Any]):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter_ns() - self.start
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _record(self.name, self.cat, self.start, duration, self.args)
+        return False
+
+    def add(self, rows: int = 0, nbytes: int = 0) -> None:
+        args = self.args
+        if rows:
+            args["rows"] = args.get("rows", 0) + rows
+        if nbytes:
+            args["bytes"] = args.get("bytes", 0) + nbytes
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+
+class _NullSpan:
+    """Falsy stand-in while tracing is off (``if s:`` guards costly arguments)."""
+
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def add(self, rows: int = 0, nbytes: int = 0) -> None:
+        pass
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+def span(name: str, cat: str = "app", **args: Any):
+    """Context manager timing one region (a no-op while tracing is off)."""
+    if not _ENABLED:
+        return NULL_SPAN
+    return Span(name, cat, args)
+
+
+def traced(name: Optional[str] = None, cat: str = "app") -> Callable:
+    """Decorator form of :func:`span` (span name defaults to the qualified function name)."""
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            with Span(label, cat, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _record(name: str, cat: str, start: int, duration: int, args: Dict[str, Any]) -> None:
+    global _dropped
+    pid = os.getpid()
+    tid = threading.get_ident()
+    with _LOCK:
+        if (pid, tid) not in _THREAD_NAMES:
+            _THREAD_NAMES[(pid, tid)] = threading.current_thread().name
+        if len(_EVENTS) < MAX_EVENTS:
+            _EVENTS.append((name, cat, start, duration, pid, tid, args))
+        else:
+            _dropped += 1
+        _account(name, duration, args)
+
+
+def _account(name: str, duration: int, args: Dict[str, Any]) -> None:
+    st = _STATS.get(name)
+    if st is None:
+        st = _STATS[name] = [0, 0, 0, 0, 0]
+    st[0] += 1
+    st[1] += duration
+    if duration > st[2]:
+        st[2] = duration
+    st[3] += args.get("rows", 0) or 0
+    st[4] += args.get("bytes", 0) or 0
+
+
+# ─────────────────────────────────────────────────────────────────
+# 프로세스 간 전달
+# ─────────────────────────────────────────────────────────────────
+def drain() -> Dict[str, Any]:
+    """Take (and clear) everything recorded in this process – picklable."""
+    global _dropped
+    with _LOCK:
+        payload = {"events": list(_EVENTS), "threads": dict(_THREAD_NAMES), "dropped": _dropped}
+        _EVENTS.clear()
+        _STATS.clear()
+        _dropped = 0
+    return payload
+
+
+def merge(payload: Optional[Dict[str, Any]]) -> None:
+    """Add events drained from another process."""
+    global _dropped
+    if not payload:
+        return
+    with _LOCK:
+        _THREAD_NAMES.update(payload.get("threads", {}))
+        _dropped += payload.get("dropped", 0)
+        for event in payload.get("events", ()):
+            if len(_EVENTS) < MAX_EVENTS:
+                _EVENTS.append(event)
+            else:
+                _dropped += 1
+            _account(event[0], event[3], event[6])
+
+
+# ─────────────────────────────────────────────────────────────────
+# 내보내기
+# ─────────────────────────────────────────────────────────────────
+def chrome_trace() -> Dict[str, Any]:
+    """Recorded spans as a Chrome trace-event document (complete ``X`` events, µs)."""
+    with _LOCK:
+        events = list(_EVENTS)
+        threads = dict(_THREAD_NAMES)
+        dropped = _dropped
+    base = min((e[2] for e in events), default=0)
+    trace: List[Dict[str, Any]] = []
+    for pid in sorted({pid for pid, _ in threads}):
+        trace.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                      "args": {"name": "main" if pid == os.getpid() else f"worker {pid}"}})
+    for (pid, tid), name in threads.items():
+        trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+    for name, cat, start, duration, pid, tid, args in events:
+        trace.append({
+            "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+            "ts": (start - base) / 1000.0, "dur": duration / 1000.0, "args": args,
+        })
+    return {"traceEvents": trace, "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": dropped, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")}}
+
+
+def write_chrome_trace(path: str) -> int:
+    """Write :func:`chrome_trace` to *path*; returns the number of span events."""
+    doc = chrome_trace()
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(doc, fp, ensure_ascii=False, default=str)
+    os.replace(tmp, path)
+    return sum(1 for e in doc["traceEvents"] if e["ph"] == "X")
+
+
+def summary() -> List[Dict[str, Any]]:
+    """Per-span-name totals, slowest first."""
+    with _LOCK:
+        stats = {name: list(st) for name, st in _STATS.items()}
+    rows = [{
+        "name": name,
+        "calls": int(calls),
+        "total_ms": round(total / 1e6, 3),
+        "mean_ms": round(total / calls / 1e6, 3) if calls else 0.0,
+        "max_ms": round(peak / 1e6, 3),
+        "rows": int(nrows),
+        "bytes": int(nbytes),
+    } for name, (calls, total, peak, nrows, nbytes) in stats.items()]
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def format_summary(rows: Optional[Sequence[Dict[str, Any]]] = None, limit: int = 40) -> str:
+    """:func:`summary` as a fixed-width text table."""
+    rows = summary() if rows is None else rows
+    if not rows:
+        return "(no spans recorded)"
+    width = max(24, min(60, max(len(r["name"]) for r in rows[:limit])))
+    lines = [f"{'span':<{width}} {'calls':>8} {'total ms':>11} {'mean ms':>9} {'max ms':>9} {'rows':>10} {'bytes':>13}"]
+    for r in rows[:limit]:
+        lines.append(f"{r['name'][:width]:<{width}} {r['calls']:>8} {r['total_ms']:>11.1f} {r['mean_ms']:>9.3f} "
+                     f"{r['max_ms']:>9.1f} {r['rows']:>10} {r['bytes']:>13}")
+    if len(rows) > limit:
+        lines.append(f"… {len(rows) - limit} more")
+    return "\n".join(lines)
+
+
+# ─────────────────────────────────────────────────────────────────
+# SQLite
+# ─────────────────────────────────────────────────────────────────
+def _short_sql(sql: str) -> str:
+    text = " ".join(sql.split())
+    return text if len(text) <= 120 else text[:117] + "..."
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor whose execute / fetch calls are recorded as ``sqlite`` spans."""
+
+    def execute(self, sql, parameters=()):
+        with span("sqlite.execute", "sqlite", db=self.connection.trace_label, sql=_short_sql(sql)):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        with span("sqlite.executemany", "sqlite", db=self.connection.trace_label, sql=_short_sql(sql)):
+            return super().executemany(sql, seq_of_parameters)
+
+    def fetchall(self):
+        with span("sqlite.fetch", "sqlite", db=self.connection.trace_label) as s:
+            rows = super().fetchall()
+            s.add(rows=len(rows))
+            return rows
+
+    def fetchmany(self, size=None):
+        with span("sqlite.fetch", "sqlite", db=self.connection.trace_label) as s:
+            rows = super().fetchmany(self.arraysize if size is None else size)
+            s.add(rows=len(rows))
+            return rows
+
+
+class TracedConnection(sqlite3.Connection):
+    trace_label = ""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connect(database, *args, **kwargs) -> sqlite3.Connection:
+    """``sqlite3.connect`` whose queries are traced while tracing is on."""
+    if not _ENABLED or "factory" in kwargs:
+        return sqlite3.connect(database, *args, **kwargs)
+    path = str(database)
+    if path.startswith("file:"):
+        path = path[5:].split("?", 1)[0]
+    with span("sqlite.connect", "sqlite", db=os.path.basename(path)) as s:
+        conn = sqlite3.connect(database, *args, factory=TracedConnection, **kwargs)
+        try:
+            s.add(nbytes=os.path.getsize(path))
+        except OSError:
+            pass
+    conn.trace_label = os.path.basename(path)
+    return conn
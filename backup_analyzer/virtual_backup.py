@@ -0,0 +1,257 @@
+"""
+Decrypt-on-read access to an encrypted backup.
+
+Once ``Manifest.db`` is decrypted and the class keys are unlocked, a
+``VirtualBackup`` is registered for the backup. ``ManifestIndex.blob_path``
+then hands out plaintext paths: a blob already decrypted in place is
+returned as is, anything else is decrypted on first access into a bounded
+on-disk cache (``<backup>/.decrypt_cache``) with LRU eviction.
+
+Analyzers therefore only pay for the handful of files they actually read;
+full in-place decryption (``decrypt_iphone_backup``) becomes optional. When
+it runs, every blob is swapped to plaintext through :meth:`replace_in_place`,
+which waits for readers of this process that are still decrypting the same
+blob and retires its cached copy.
+
+Artifact worker processes open their own view on the same cache directory
+with ``owner=False``: they reuse and add cache files but never sweep temp
+files or evict. Only the owning (GUI / CLI) process keeps the LRU and the
+byte budget; it picks up what the workers decrypted with :meth:`adopt_cache`.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+from uuid import uuid4
+
+from backup_analyzer.decrypt_engine import decrypt_blob_file, is_plaintext_size, unwrap_file_key
+
+CACHE_DIR_NAME = ".decrypt_cache"
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3
+
+
+class VirtualBackup:
+    """Per-backup plaintext view keyed by fileID."""
+
+    def __init__(self, backup_path: str, class_keys: Dict[int, bytes],
+                 cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_CACHE_BYTES,
+                 owner: bool = True):
+        self.backup_path = backup_path
+        self.class_keys = class_keys
+        self.cache_dir = cache_dir or os.path.join(backup_path, CACHE_DIR_NAME)
+        self.max_bytes = max_bytes
+        self.owner = owner
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, int]" = OrderedDict()   # fileID → cached size
+        self._cached_bytes = 0
+        self._in_place: Set[str] = set()                       # plaintext in the backup itself
+        self._reading: Dict[str, int] = {}                     # fileID → 원본 blob 을 읽는 중인 스레드 수
+        self._local = threading.local()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if owner:
+            self._scan_cache(sweep=True)
+
+    # ─────────────────────────────────────────────────────────────
+    # 캐시 관리
+    # ─────────────────────────────────────────────────────────────
+    def _scan_cache(self, sweep: bool = False) -> None:
+        """
+        Add the cache files the LRU does not know yet (oldest access first)
+        and evict down to the budget. *sweep* also deletes leftover temp
+        files – only safe before any other process uses the cache.
+        """
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                if len(entry.name) != 40:          # temp file
+                    if sweep:
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+                    continue
+                if entry.name in self._lru:
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, entry.name, st.st_size))
+        with self._lock:
+            for _, file_id, size in sorted(entries):
+                if file_id not in self._lru:
+                    self._lru[file_id] = size
+                    self._cached_bytes += size
+            self._evict(self.max_bytes)
+
+    def adopt_cache(self) -> None:
+        """Take over the cache files worker processes added (owner only)."""
+        if self.owner:
+            self._scan_cache()
+
+    def _cache_path(self, file_id: str) -> str:
+        return os.path.join(self.cache_dir, file_id)
+
+    def _evict(self, budget: int, keep: Optional[str] = None) -> None:
+        """Drop least recently used entries until within *budget* (lock held, owner only)."""
+        if not self.owner:
+            return
+        for file_id in list(self._lru):
+            if self._cached_bytes <= budget:
+                break
+            if file_id == keep:
+                continue
+            try:
+                os.remove(self._cache_path(file_id))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue                                # still open (Windows)
+            self._cached_bytes -= self._lru.pop(file_id)
+
+    def cached_bytes(self) -> int:
+        return self._cached_bytes
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._evict(0)
+
+    # ─────────────────────────────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────────────────────────────
+    def _file_blob(self, file_id: str) -> Optional[bytes]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            db_path = os.path.join(self.backup_path, "Manifest.db")
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        row = conn.execute("SELECT file FROM Files WHERE fileID = ?", (file_id,)).fetchone()
+        return row[0] if row else None
+
+    def path_for(self, file_id: str) -> Optional[str]:
+        """
+        Plaintext path of *file_id*, decrypting it into the cache on first
+        access. None if the blob is missing or cannot be decrypted.
+        """
+        raw = os.path.join(self.backup_path, file_id[:2], file_id)
+        with self._lock:
+            if file_id in self._in_place:
+                return raw
+            cached = self._cache_path(file_id)
+            if file_id not in self._lru:
+                # 다른 프로세스(분석 워커 / 소유 프로세스)가 이미 복호화해 둔 파일
+                try:
+                    self._lru[file_id] = os.path.getsize(cached)
+                    self._cached_bytes += self._lru[file_id]
+                except OSError:
+                    pass
+            if file_id in self._lru:
+                self._lru.move_to_end(file_id)
+                try:
+                    os.utime(cached)                    # LRU order survives restarts
+                except OSError:
+                    pass
+                return cached
+            # 읽는 동안 replace_in_place 가 blob 을 바꾸지 못하게 표시
+            self._reading[file_id] = self._reading.get(file_id, 0) + 1
+        try:
+            return self._decrypt_to_cache(file_id, raw)
+        finally:
+            with self._lock:
+                if self._reading[file_id] > 1:
+                    self._reading[file_id] -= 1
+                else:
+                    del self._reading[file_id]
+
+    def _decrypt_to_cache(self, file_id: str, raw: str) -> Optional[str]:
+        if not os.path.exists(raw):
+            return None
+        try:
+            blob = self._file_blob(file_id)
+            if blob is None:
+                return None
+            key, size = unwrap_file_key(self.class_keys, blob)
+            if key is None or is_plaintext_size(raw, blob):
+                with self._lock:
+                    self._in_place.add(file_id)
+                return raw
+            dst = self._cache_path(file_id)
+            tmp = f"{dst}.{uuid4().hex[:8]}.tmp"
+            try:
+                size = decrypt_blob_file(raw, tmp, key, size)
+                os.replace(tmp, dst)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"[VirtualBackup] decrypt failed for {file_id}: {e}")
+            return None
+
+        with self._lock:
+            if file_id not in self._lru:
+                self._lru[file_id] = size
+                self._cached_bytes += size
+            self._lru.move_to_end(file_id)
+            self._evict(self.max_bytes, keep=file_id)
+        return dst
+
+    # ─────────────────────────────────────────────────────────────
+    # 전체 복호화 연동
+    # ─────────────────────────────────────────────────────────────
+    def replace_in_place(self, file_id: str, tmp: str) -> bool:
+        """
+        Swap the staged plaintext *tmp* in for the encrypted blob of
+        *file_id* (``decrypt_files_parallel(replace=...)``). Returns False
+        while a thread of this process is decrypting that blob – the caller
+        retries later; raises OSError if the swap fails. The blob is served
+        as is from then on and its cached copy is dropped.
+        """
+        raw = os.path.join(self.backup_path, file_id[:2], file_id)
+        with self._lock:
+            if self._reading.get(file_id):
+                return False
+            os.replace(tmp, raw)
+            self._in_place.add(file_id)
+            size = self._lru.pop(file_id, None)
+            if size is not None:
+                self._cached_bytes -= size
+                try:
+                    os.remove(self._cache_path(file_id))
+                except OSError:
+                    pass                                # 열려 있음 (Windows) → 다음 세션 LRU 가 정리
+        return True
+
+
+# ─────────────────────────────────────────────────────────────────
+# 백업별 레지스트리
+# ─────────────────────────────────────────────────────────────────
+_VIRTUAL: Dict[str, VirtualBackup] = {}
+_VIRTUAL_LOCK = threading.Lock()
+
+
+def _registry_key(backup_path: str) -> str:
+    return os.path.normcase(os.path.abspath(backup_path))
+
+
+def register_virtual_backup(backup_path: str, class_keys: Dict[int, bytes], **kwargs) -> VirtualBackup:
+    vb = VirtualBackup(backup_path, class_keys, **kwargs)
+    with _VIRTUAL_LOCK:
+        _VIRTUAL[_registry_key(backup_path)] = vb
+    return vb
+
+
+def get_virtual_backup(backup_path: str) -> Optional[VirtualBackup]:
+    if not backup_path:
+        return None
+    return _VIRTUAL.get(_registry_key(backup_path))
+
+
+def drop_virtual_backup(backup_path: str) -> None:
+    with _VIRTUAL_LOCK:
+        _VIRTUAL.pop(_registry_key(backup_path), None)
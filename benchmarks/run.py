@@ -0,0 +1,418 @@
+"""
+End-to-end benchmark: ``python -m benchmarks.run --sizes 10000,100000,1000000 --out report.json``.
+
+For every size a synthetic backup (``benchmarks.synthetic_backup``) is
+generated and the load path is timed stage by stage, the way the GUI and
+the headless CLI drive it:
+
+* ``load_manifest_db``        – raw Files rows;
+* ``manifest_index``          – cold ``get_manifest_index`` (no sidecar);
+* ``build_tree`` (rows / index), ``manifest_cache_save`` /
+  ``manifest_cache_load`` for the sidecar round trip, ``compute_dir_stats``;
+* ``build_backup_tree`` (lazy, as on load) and ``build_file_list_tree`` for
+  the largest folder – into real Treeviews of a withdrawn Tk root;
+* ``analyzer:<job>``          – every :data:`JOBS` entry via ``run_job``, then
+  ``orchestrator`` – all of them concurrently, case store off;
+* ``thumbnails``              – ``generate_thumbnail_image`` over the camera roll,
+  then ``thumbnails:cached`` – the same items again from the thumbnail cache –
+  and ``thumbnails:pool`` – decoded afresh on the thumbnail process pool.
+
+With ``--trace DIR`` every size also records hot-path spans
+(``backup_analyzer.tracing``): ``DIR/trace-<rows>.json`` is a Chrome trace
+of the run (each stage is a ``bench:<stage>`` span) and the report entry
+carries the per-span totals. Tracing adds its own overhead, so compare
+stage times only between runs with the same setting.
+
+Each size runs in its own interpreter, so registries start empty and the
+peak RSS is that size's own. Stages whose dependencies are unavailable (no
+display for Tk, no imaging libraries) are reported as ``skipped`` with the
+reason instead of failing the run. The JSON report carries the environment
+(Python, platform, CPUs, git commit) so numbers can be compared across
+releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from backup_analyzer import tracing
+from backup_analyzer.tracing import span
+
+REPORT_VERSION = 1
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATUS_OK = "ok"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+class StageSkipped(Exception):
+    """Raised by a stage whose dependency (display, imaging library …) is unavailable."""
+
+
+# ─────────────────────────────────────────────────────────────────
+# 환경 정보
+# ─────────────────────────────────────────────────────────────────
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if out.returncode != 0:
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+
+def peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:                     # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ─────────────────────────────────────────────────────────────────
+# 단계 실행
+# ─────────────────────────────────────────────────────────────────
+class _Stages:
+    """Runs timed stages and collects their report entries."""
+
+    __slots__ = ("entries", "verbose")
+
+    def __init__(self, verbose: bool = True):
+        self.entries: List[Dict[str, Any]] = []
+        self.verbose = verbose
+
+    def run(self, name: str, fn: Callable[[], Any], count: Optional[Callable[[Any], int]] = None) -> Any:
+        """Time ``fn()``; *count* turns its return value into the entry's record count."""
+        entry: Dict[str, Any] = {"stage": name, "status": STATUS_OK, "seconds": None, "count": None, "error": None}
+        value = None
+        started = time.perf_counter()
+        try:
+            with span(f"bench:{name}", "bench"):
+                value = fn()
+            entry["seconds"] = round(time.perf_counter() - started, 4)
+            if count is not None:
+                entry["count"] = count(value)
+        except StageSkipped as e:
+            entry.update(status=STATUS_SKIPPED, error=str(e))
+        except Exception as e:
+            entry.update(status=STATUS_FAILED, error=f"{type(e).__name__}: {e}",
+                         seconds=round(time.perf_counter() - started, 4))
+            entry["traceback"] = traceback.format_exc()
+        self.entries.append(entry)
+        if self.verbose:
+            took = f" {entry['seconds']:.3f}s" if entry["seconds"] is not None else ""
+            extra = f" ({entry['count']})" if entry["count"] is not None else ""
+            reason = f" – {entry['error']}" if entry["error"] else ""
+            print(f"[Bench] {name}: {entry['status']}{took}{extra}{reason}", flush=True)
+        return value
+
+
+def _tk_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:              # ImportError / TclError (no display)
+        raise StageSkipped(f"Tk unavailable: {e}") from None
+    root.withdraw()
+    return root
+
+
+def _largest_folder(path_dict: Dict[str, Any]) -> str:
+    return max(path_dict, key=lambda p: len(path_dict[p]) if hasattr(path_dict[p], "__len__") else 0)
+
+
+def _bench_size(rows: int, backup_path: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """All stages for one backup size (runs inside the per-size interpreter)."""
+    from benchmarks.synthetic_backup import generate_backup
+
+    stages = _Stages()
+    facts = stages.run("generate", lambda: generate_backup(
+        backup_path, rows, seed=args.seed, filler_files=not args.no_filler_files,
+    ), count=lambda f: f["rows"])
+    if facts is None:
+        return {"rows": rows, "backup": None, "stages": stages.entries, "peak_rss_bytes": peak_rss_bytes()}
+    if args.trace:
+        tracing.enable()                    # 생성 단계는 제외
+
+    from backup_analyzer.build_tree import build_tree, compute_dir_stats
+    from backup_analyzer.manifest_cache import CACHE_FILE_NAME, load_manifest_cache, save_manifest_cache
+    from backup_analyzer.manifest_index import drop_manifest_index, get_manifest_index
+    from backup_analyzer.manifest_utils import load_manifest_db
+
+    manifest_rows = stages.run("load_manifest_db", lambda: load_manifest_db(backup_path), count=len)
+
+    sidecar = os.path.join(backup_path, CACHE_FILE_NAME)
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+    drop_manifest_index(backup_path)
+    index = stages.run("manifest_index", lambda: get_manifest_index(backup_path), count=len)
+
+    if manifest_rows:
+        stages.run("build_tree:rows", lambda: build_tree(manifest_rows)[0], count=len)
+    del manifest_rows
+    file_tree = dir_stats = None
+    if index is not None:
+        # sidecar 저장은 PathTrie 를 만들어 두므로 build_tree 를 먼저 잰다
+        file_tree = stages.run("build_tree:index", lambda: build_tree(index)[0], count=len)
+        stages.run("manifest_cache_save", lambda: save_manifest_cache(index))
+        stages.run("manifest_cache_load", lambda: load_manifest_cache(backup_path), count=len)
+    if file_tree is not None:
+        dir_stats = stages.run("compute_dir_stats", lambda: compute_dir_stats(file_tree, index), count=len)
+
+    if file_tree is not None:
+        _bench_tk(stages, backup_path, file_tree, dir_stats)
+    _bench_analyzers(stages, backup_path, args)
+    _bench_thumbnails(stages, backup_path, args.thumbnails)
+
+    entry = {"rows": rows, "backup": facts, "stages": stages.entries, "peak_rss_bytes": peak_rss_bytes()}
+    if args.trace:
+        os.makedirs(args.trace, exist_ok=True)
+        trace_path = os.path.abspath(os.path.join(args.trace, f"trace-{rows}.json"))
+        count = tracing.write_chrome_trace(trace_path)
+        entry["trace"] = {"file": trace_path, "events": count, "spans": tracing.summary()}
+        print(f"[Bench] {count} spans → {trace_path}", flush=True)
+    return entry
+
+
+def _bench_tk(stages: _Stages, backup_path: str, file_tree, dir_stats) -> None:
+    state: Dict[str, Any] = {}
+
+    def backup_tree():
+        from tkinter import ttk
+        from backup_analyzer.build_tree import build_backup_tree
+
+        state["root"] = root = _tk_root()
+        state["tree"] = tree = ttk.Treeview(root, columns=("path",))
+        path_dict, _nodes = build_backup_tree(tree, file_tree, dir_stats=dir_stats, lazy=True)
+        root.update_idletasks()
+        state["path_dict"] = path_dict
+        return path_dict
+
+    def file_list():
+        from tkinter import ttk
+        from backup_analyzer.build_file_list_utils import build_file_list_tree
+
+        path_dict = state.get("path_dict")
+        if not path_dict:
+            raise StageSkipped("backup tree was not built")
+        folder = _largest_folder(path_dict)
+        file_list_tree = ttk.Treeview(state["root"], columns=("path", "size", "type", "mdate", "cdate", "perm"))
+        build_file_list_tree(file_list_tree, path_dict[folder], parent="", full_path=folder,
+                             backup_path=backup_path, dir_stats=dir_stats)
+        state["root"].update_idletasks()
+        return file_list_tree
+
+    try:
+        stages.run("build_backup_tree", backup_tree, count=len)
+        stages.run("build_file_list_tree", file_list, count=lambda t: len(t.get_children()))
+    finally:
+        if "root" in state:
+            state["root"].destroy()
+
+
+def _bench_analyzers(stages: _Stages, backup_path: str, args: argparse.Namespace) -> None:
+    from artifact_analyzer.orchestrator import JOBS, ArtifactOrchestrator, run_job
+
+    for name in JOBS:
+        def job(name=name):
+            result = run_job(name, backup_path)
+            if result.status == STATUS_FAILED:
+                raise RuntimeError(result.error)
+            if not result.ok:
+                raise StageSkipped(f"{result.status}: {result.error}")
+            return result
+        stages.run(f"analyzer:{name}", job, count=lambda r: r.count)
+
+    def orchestrate():
+        results = ArtifactOrchestrator(backup_path, workers=args.workers, case_store=False).run()
+        return sum(r.ok for r in results.values())
+    stages.run("orchestrator", orchestrate, count=int)
+
+
+def _bench_thumbnails(stages: _Stages, backup_path: str, limit: int) -> None:
+    def thumbnails(cached: bool):
+        try:
+            from artifact_analyzer.media.thumbnail_cache import get_thumbnail_cache
+            from artifact_analyzer.media.thumbnails import (
+                enumerate_media_files, generate_thumbnail_image, media_blob_key, resolve_media_blob,
+            )
+        except ImportError as e:
+            raise StageSkipped(f"imaging libraries unavailable: {e}") from None
+        from itertools import islice
+        from pathlib import Path
+
+        cache = get_thumbnail_cache(backup_path)
+        if cache is None:
+            raise StageSkipped("thumbnail cache unavailable")
+        if not cached:
+            cache.clear()
+        done = 0
+        root = Path(backup_path)
+        for file_id, fname, _trashed, _size in islice(enumerate_media_files(root), limit):
+            # 합성 백업은 평문 → 클래스 키 없이 원본 blob 그대로
+            blob = resolve_media_blob(str(media_blob_key(root, file_id)))
+            if blob is not None:
+                generate_thumbnail_image(Path(blob), fname, cache=cache)
+                done += 1
+        cache.flush()
+        return done
+    def pooled():
+        import threading
+        from itertools import islice
+        from pathlib import Path
+
+        from artifact_analyzer.media.thumbnail_cache import get_thumbnail_cache
+        from artifact_analyzer.media.thumbnail_pool import ThumbnailPool
+        from artifact_analyzer.media.thumbnails import enumerate_media_files, media_blob_key
+
+        root = Path(backup_path)
+        items = [(media_blob_key(root, fid), fname)
+                 for fid, fname, _trashed, _size in islice(enumerate_media_files(root), limit)]
+        cache = get_thumbnail_cache(backup_path)
+        cache.clear()
+        finished = threading.Event()
+        decoded = []
+
+        def ready(_path, data):
+            decoded.append(data is not None)
+            if len(decoded) == len(items):
+                finished.set()
+        ThumbnailPool(ready, cache=cache).request(items)
+        if items:
+            finished.wait()
+        cache.flush()
+        return sum(decoded)
+    # 첫 통과는 디코딩 + 캐시 기록, 두 번째는 .thumbnail_cache.sqlite 에서 읽기
+    stages.run("thumbnails", lambda: thumbnails(False), count=int)
+    stages.run("thumbnails:cached", lambda: thumbnails(True), count=int)
+    if stages.entries[-1]["status"] == STATUS_OK:
+        stages.run("thumbnails:pool", pooled, count=int)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 드라이버
+# ─────────────────────────────────────────────────────────────────
+def _run_size(rows: int, work_dir: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Benchmark one size in a fresh interpreter and return its report entry."""
+    backup_path = os.path.join(work_dir, f"backup-{rows}")
+    if os.path.exists(backup_path):
+        shutil.rmtree(backup_path)
+    fd, result_path = tempfile.mkstemp(prefix=f"bench-{rows}-", suffix=".json", dir=work_dir)
+    os.close(fd)
+    cmd = [sys.executable, "-m", "benchmarks.run", "--size-worker", str(rows), "--work-dir", work_dir,
+           "--result", result_path, "--seed", str(args.seed), "--thumbnails", str(args.thumbnails)]
+    if args.workers is not None:
+        cmd += ["--workers", str(args.workers)]
+    if args.no_filler_files:
+        cmd.append("--no-filler-files")
+    if args.trace:
+        cmd += ["--trace", os.path.abspath(args.trace)]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    started = time.perf_counter()
+    try:
+        code = subprocess.run(cmd, cwd=REPO_ROOT, env=env).returncode
+        try:
+            with open(result_path, "r", encoding="utf-8") as fp:
+                entry = json.load(fp)
+        except (OSError, ValueError) as e:
+            entry = {"rows": rows, "backup": None, "stages": [], "peak_rss_bytes": None,
+                     "error": f"size worker failed (exit {code}): {e}"}
+    finally:
+        if os.path.exists(result_path):
+            os.remove(result_path)
+        if not args.keep and os.path.exists(backup_path):
+            shutil.rmtree(backup_path, ignore_errors=True)
+    entry["wall_seconds"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Time the backup load path and every analyzer on synthetic backups.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated Manifest row counts (default: 10000,100000,1000000)")
+    parser.add_argument("--out", default="benchmark-report.json", help="JSON report path")
+    parser.add_argument("--work-dir", default=None, help="where the synthetic backups go (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated backups")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="analyzer worker processes for the orchestrator stage (default: by CPU count)")
+    parser.add_argument("--thumbnails", type=int, default=200, help="camera-roll items to thumbnail per size")
+    parser.add_argument("--no-filler-files", action="store_true",
+                        help="skip xx/ payloads of filler rows (faster generation of huge manifests)")
+    parser.add_argument("--trace", default=None, metavar="DIR",
+                        help="record hot-path spans and write DIR/trace-<rows>.json (Chrome trace) per size")
+    parser.add_argument("--size-worker", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--result", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.size_worker is not None:                    # 크기별 하위 프로세스
+        entry = _bench_size(args.size_worker, os.path.join(args.work_dir, f"backup-{args.size_worker}"), args)
+        with open(args.result, "w", encoding="utf-8") as fp:
+            json.dump(entry, fp, ensure_ascii=False, default=str)
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="ios-forensic-bench-")
+    os.makedirs(work_dir, exist_ok=True)
+    report: Dict[str, Any] = {
+        "version": REPORT_VERSION,
+        "started_at": _dt.datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "options": {"sizes": sizes, "seed": args.seed, "workers": args.workers,
+                    "thumbnails": args.thumbnails, "filler_files": not args.no_filler_files,
+                    "trace": args.trace is not None},
+        "runs": [],
+    }
+    try:
+        for rows in sizes:
+            print(f"[Bench] ── {rows} rows ──", flush=True)
+            report["runs"].append(_run_size(rows, work_dir, args))
+    finally:
+        if args.work_dir is None and not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    failed = [f"{run['rows']}:{s['stage']}" for run in report["runs"] for s in run["stages"]
+              if s["status"] == STATUS_FAILED] + [str(run["rows"]) for run in report["runs"] if run.get("error")]
+    report["failed"] = failed
+    tmp = f"{args.out}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(report, fp, ensure_ascii=False, indent=1, default=str)
+    os.replace(tmp, args.out)
+    print(f"[Bench] report → {os.path.abspath(args.out)}" + (f" (failed: {', '.join(failed)})" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
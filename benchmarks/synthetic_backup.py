@@ -0,0 +1,546 @@
+"""
+Synthetic iOS backup generator: ``python -m benchmarks.synthetic_backup <out> --rows N``.
+
+Writes a folder that every loader and analyzer of this tool accepts as an
+unencrypted iTunes / Finder backup:
+
+* ``Manifest.plist`` – Lockdown device facts (``UniqueDeviceID`` etc.);
+* ``Manifest.db``    – ``Files`` table with *rows* rows in total (files plus
+  the directory rows their paths imply), each carrying an NSKeyedArchiver
+  ``MBFile`` blob (Size, LastModified, Birth, Mode, InodeNumber,
+  ProtectionClass; trashed camera-roll items get the assetsd xattr);
+* ``xx/<fileID>``    – the file payloads in their hashed buckets: fake
+  ``sms.db``, ``AddressBook.sqlitedb``, ``CallHistory.storedata``, KakaoTalk
+  ``Message.sqlite`` / ``Talk.sqlite``, ``NoteStore.sqlite``,
+  ``Calendar.sqlitedb``, camera-roll PNG stills and (sparse) filler files.
+
+Output is deterministic for a given ``seed`` so benchmark numbers of
+different releases are measured on the same data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import plistlib
+import random
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+from contextlib import closing
+from plistlib import UID
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+MAC_EPOCH_OFFSET = 978307200          # 1970-01-01 → 2001-01-01 (초)
+BASE_TIME = 1_700_000_000             # 생성 데이터의 기준 시각 (unix)
+SPAN = 365 * 24 * 3600                # 타임스탬프 분포 구간
+
+FLAG_FILE = 1
+FLAG_DIRECTORY = 2
+
+# (domain, relativePath) 고정 아티팩트 – 분석기가 찾는 위치 그대로
+SMS_DB = ("HomeDomain", "Library/SMS/sms.db")
+ADDRESSBOOK_DB = ("HomeDomain", "Library/AddressBook/AddressBook.sqlitedb")
+CALLHISTORY_DB = ("HomeDomain", "Library/CallHistoryDB/CallHistory.storedata")
+KAKAO_DOMAIN = "AppDomain-com.iwilab.KakaoTalk"
+KAKAO_MESSAGE_DB = (KAKAO_DOMAIN, "Library/PrivateDocuments/Message.sqlite")
+KAKAO_TALK_DB = (KAKAO_DOMAIN, "Library/PrivateDocuments/Talk.sqlite")
+NOTES_DB = ("AppDomainGroup-group.com.apple.notes", "NoteStore.sqlite")
+CALENDAR_DB = ("HomeDomain", "Library/Calendar/Calendar.sqlitedb")
+CAMERA_ROLL = ("CameraRollDomain", "Media/DCIM")
+
+FILLER_DOMAINS = (
+    "HomeDomain", "MediaDomain", "RootDomain", "KeychainDomain", "WirelessDomain",
+    "SystemPreferencesDomain", "DatabaseDomain", "ManagedPreferencesDomain", "HealthDomain",
+    "AppDomain-com.apple.mobilesafari", "AppDomain-com.burbn.instagram",
+    "AppDomain-jp.naver.line", "AppDomain-com.google.chrome.ios",
+    "AppDomain-com.spotify.client", "AppDomain-net.whatsapp.WhatsApp",
+    "AppDomainGroup-group.com.apple.notes", "AppDomainGroup-group.net.whatsapp.WhatsApp.shared",
+    "AppDomainPlugin-com.apple.mobilesafari.ShareExtension",
+    "SysContainerDomain-com.apple.geod", "SysSharedContainerDomain-systemgroup.com.apple.configurationprofiles",
+)
+FILLER_DIRS = (
+    "Library/Caches", "Library/Preferences", "Library/Application Support", "Documents",
+    "Library/Cookies", "tmp", "Library/WebKit/WebsiteData/IndexedDB", "Media/Downloads",
+)
+FILLER_EXTS = (".plist", ".db", ".sqlite", ".json", ".jpg", ".dat", ".log", "")
+
+NAMES = ("김민준", "이서연", "박지호", "최하은", "정도윤", "강서아", "조예준", "윤지우", "장시우", "임수아",
+         "Alex Kim", "Jamie Park", "Morgan Lee", "Taylor Choi", "Jordan Yoon")
+WORDS = ("meeting", "lunch", "ok", "see you", "thanks", "회의", "점심", "확인했습니다", "내일 봐요",
+         "사진 보냈어", "how about 7pm?", "도착했어", "send me the file", "ㅋㅋㅋ", "call me")
+
+
+# ─────────────────────────────────────────────────────────────────
+# Manifest.db 레코드
+# ─────────────────────────────────────────────────────────────────
+def file_id(domain: str, rel_path: str) -> str:
+    return hashlib.sha1(f"{domain}-{rel_path}".encode("utf-8")).hexdigest()
+
+
+def _mbfile_plist(rel_path: str, size: int, mtime: int, birth: int, inode: int,
+                  directory: bool, trashed: bool) -> bytes:
+    mbfile = {
+        "$class": UID(3),
+        "Size": size,
+        "LastModified": mtime,
+        "LastStatusChange": mtime,
+        "Birth": birth,
+        "Mode": 0o40755 if directory else 0o100644,
+        "InodeNumber": inode,
+        "UserID": 501,
+        "GroupID": 501,
+        "ProtectionClass": 0 if directory else 3,
+        "Flags": 0,
+        "RelativePath": UID(2),
+    }
+    objects = ["$null", mbfile, rel_path, {"$classname": "MBFile", "$classes": ["MBFile", "NSObject"]}]
+    if trashed:
+        mbfile["ExtendedAttributes"] = UID(4)
+        objects.append(plistlib.dumps({"com.apple.assetsd.trashed": b"\x01"}, fmt=plistlib.FMT_BINARY))
+    return plistlib.dumps(
+        {"$version": 100000, "$archiver": "NSKeyedArchiver", "$top": {"root": UID(1)}, "$objects": objects},
+        fmt=plistlib.FMT_BINARY,
+    )
+
+
+# plistlib 직렬화가 생성 시간의 대부분 → 경로 길이·종류별로 한 번 직렬화한 뒤 값만 덮어쓴다.
+# 자리표시 정수는 2**40 이상이라 8바이트 int 로 인코딩되어 실제 값이 같은 자리에 들어간다.
+# (LastStatusChange 는 LastModified 와 같은 값 → plistlib 이 한 객체로 공유)
+_PLACEHOLDERS = tuple(2 ** 40 + i for i in range(4))      # Size, LastModified, Birth, InodeNumber
+_TEMPLATES: Dict[Tuple[int, bool, bool], Tuple[bytes, Tuple[int, ...], int]] = {}
+
+
+def _template(length: int, directory: bool, trashed: bool) -> Tuple[bytes, Tuple[int, ...], int]:
+    key = (length, directory, trashed)
+    cached = _TEMPLATES.get(key)
+    if cached is None:
+        blob = _mbfile_plist("~" * length, *_PLACEHOLDERS, directory=directory, trashed=trashed)
+        offsets = tuple(blob.index(b"\x13" + struct.pack(">q", ph)) + 1 for ph in _PLACEHOLDERS)
+        cached = _TEMPLATES[key] = (blob, offsets, blob.index(b"~" * length))
+    return cached
+
+
+def mbfile_blob(rel_path: str, size: int, mtime: int, birth: int, inode: int,
+                directory: bool = False, trashed: bool = False) -> bytes:
+    """NSKeyedArchiver ``MBFile`` as stored in ``Files.file``."""
+    try:
+        encoded = rel_path.encode("ascii")
+    except UnicodeEncodeError:
+        return _mbfile_plist(rel_path, size, mtime, birth, inode, directory, trashed)
+    blob, offsets, text_at = _template(len(encoded), directory, trashed)
+    buf = bytearray(blob)
+    for offset, value in zip(offsets, (size, mtime, birth, inode)):
+        struct.pack_into(">q", buf, offset, value)
+    buf[text_at:text_at + len(encoded)] = encoded
+    return bytes(buf)
+
+
+class _Manifest:
+    """Accumulates Files rows (plus the directory rows their paths imply) and payloads."""
+
+    __slots__ = ("root", "rng", "conn", "dirs", "rows", "files", "inode", "pending")
+
+    def __init__(self, root: str, rng: random.Random):
+        self.root = root
+        self.rng = rng
+        db_path = os.path.join(root, "Manifest.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE Files (fileID TEXT PRIMARY KEY, domain TEXT, relativePath TEXT, flags INTEGER, file BLOB)"
+        )
+        self.conn.execute(
+            "CREATE TABLE Properties (key TEXT PRIMARY KEY, value BLOB)"
+        )
+        self.dirs: Set[Tuple[str, str]] = set()
+        self.rows = 0
+        self.files = 0
+        self.inode = 1000
+        self.pending: List[tuple] = []
+
+    def _timestamps(self) -> Tuple[int, int]:
+        birth = BASE_TIME - self.rng.randrange(SPAN)
+        return BASE_TIME - self.rng.randrange(BASE_TIME - birth + 1), birth
+
+    def _row(self, domain: str, rel: str, flags: int, blob: bytes) -> None:
+        self.pending.append((file_id(domain, rel), domain, rel, flags, blob))
+        self.rows += 1
+        if len(self.pending) >= 20000:
+            self.flush()
+
+    def _parents(self, domain: str, rel: str) -> None:
+        parts = rel.split("/")
+        for depth in range(1, len(parts)):
+            key = (domain, "/".join(parts[:depth]))
+            if key in self.dirs:
+                continue
+            self.dirs.add(key)
+            self.inode += 1
+            mtime, birth = self._timestamps()
+            self._row(domain, key[1], FLAG_DIRECTORY, mbfile_blob(key[1], 0, mtime, birth, self.inode, directory=True))
+
+    def add_file(self, domain: str, rel: str, payload: Optional[bytes] = None, size: Optional[int] = None,
+                 trashed: bool = False, write: bool = True) -> str:
+        """Add one file row; *payload* (or a sparse file of *size*) goes to its ``xx/`` bucket."""
+        self._parents(domain, rel)
+        fid = file_id(domain, rel)
+        if size is None:
+            size = len(payload or b"")
+        self.inode += 1
+        mtime, birth = self._timestamps()
+        self._row(domain, rel, FLAG_FILE, mbfile_blob(rel, size, mtime, birth, self.inode, trashed=trashed))
+        self.files += 1
+        if write:
+            bucket = os.path.join(self.root, fid[:2])
+            os.makedirs(bucket, exist_ok=True)
+            dest = os.path.join(bucket, fid)
+            with open(dest, "wb") as fp:
+                if payload is not None:
+                    fp.write(payload)
+                else:
+                    fp.truncate(size)                 # sparse – 디스크 사용 없이 크기만 맞춤
+            os.utime(dest, (mtime, mtime))
+        return fid
+
+    def flush(self) -> None:
+        if self.pending:
+            self.conn.executemany("INSERT OR IGNORE INTO Files VALUES (?,?,?,?,?)", self.pending)
+            self.pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.commit()
+        self.conn.close()
+
+
+# ─────────────────────────────────────────────────────────────────
+# 아티팩트 DB
+# ─────────────────────────────────────────────────────────────────
+def _sqlite_bytes(build: Callable[[sqlite3.Connection], None]) -> bytes:
+    """Build a database in memory and return its file image."""
+    with closing(sqlite3.connect(":memory:")) as conn:
+        build(conn)
+        conn.commit()
+        return conn.serialize()
+
+
+def _phone(rng: random.Random) -> str:
+    return f"010{rng.randrange(10_000_000, 100_000_000)}"
+
+
+def _text(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6)))
+
+
+def _mac_time(rng: random.Random) -> int:
+    return BASE_TIME - rng.randrange(SPAN) - MAC_EPOCH_OFFSET
+
+
+def _addressbook(rng: random.Random, phones: List[str]) -> bytes:
+    def build(conn):
+        conn.execute("CREATE TABLE ABPerson (ROWID INTEGER PRIMARY KEY, First TEXT, Last TEXT, Organization TEXT, "
+                     "CreationDate REAL, ModificationDate REAL)")
+        conn.execute("CREATE TABLE ABPersonFullTextSearch_content (docid INTEGER PRIMARY KEY, c16Phone TEXT)")
+        people, search = [], []
+        for rowid, phone in enumerate(phones, 1):
+            name = rng.choice(NAMES)
+            last, first = (name[:1], name[1:]) if " " not in name else name.split(" ", 1)[::-1]
+            created = _mac_time(rng)
+            people.append((rowid, first, last, rng.choice(("", "", "ACME", "삼성전자")), created,
+                           created + rng.randrange(SPAN // 4)))
+            search.append((rowid, f"{phone} +82{phone[1:]} {phone[3:]}"))
+        conn.executemany("INSERT INTO ABPerson VALUES (?,?,?,?,?,?)", people)
+        conn.executemany("INSERT INTO ABPersonFullTextSearch_content VALUES (?,?)", search)
+    return _sqlite_bytes(build)
+
+
+def _sms(rng: random.Random, phones: List[str], messages: int) -> bytes:
+    def build(conn):
+        conn.executescript("""
+            CREATE TABLE chat (ROWID INTEGER PRIMARY KEY, guid TEXT, chat_identifier TEXT,
+                               service_name TEXT, last_read_message_timestamp INTEGER);
+            CREATE TABLE message (ROWID INTEGER PRIMARY KEY, guid TEXT, text TEXT, date INTEGER,
+                                  is_from_me INTEGER, cache_has_attachments INTEGER);
+            CREATE TABLE chat_message_join (chat_id INTEGER, message_id INTEGER, message_date INTEGER,
+                                            PRIMARY KEY (chat_id, message_id));
+            CREATE TABLE attachment (ROWID INTEGER PRIMARY KEY, guid TEXT, filename TEXT, mime_type TEXT);
+            CREATE TABLE message_attachment_join (message_id INTEGER, attachment_id INTEGER,
+                                                  PRIMARY KEY (message_id, attachment_id));
+        """)
+        chats = max(1, min(len(phones), messages // 40 or 1))
+        conn.executemany("INSERT INTO chat VALUES (?,?,?,?,?)", [
+            (cid, f"SMS;-;+82{phones[cid - 1][1:]}", f"+82{phones[cid - 1][1:]}", "SMS", 0)
+            for cid in range(1, chats + 1)
+        ])
+        msgs, joins, attachments, att_joins = [], [], [], []
+        last_read: Dict[int, int] = {}
+        for mid in range(1, messages + 1):
+            cid = rng.randint(1, chats)
+            date = _mac_time(rng) * 1_000_000_000          # iOS 11+ : 나노초
+            body = _text(rng)
+            if rng.random() < 0.05:
+                body = None
+                attachments.append((mid, f"att-{mid}", f"~/Library/SMS/Attachments/{mid % 256:02x}/IMG_{mid}.jpeg",
+                                    "image/jpeg"))
+                att_joins.append((mid, mid))
+            from_me = rng.random() < 0.5
+            msgs.append((mid, f"msg-{mid}", body, date, int(from_me), int(body is None)))
+            joins.append((cid, mid, date))
+            if not from_me:
+                last_read[cid] = max(last_read.get(cid, 0), date)
+        conn.executemany("INSERT INTO message VALUES (?,?,?,?,?,?)", msgs)
+        conn.executemany("INSERT INTO chat_message_join VALUES (?,?,?)", joins)
+        conn.executemany("INSERT INTO attachment VALUES (?,?,?,?)", attachments)
+        conn.executemany("INSERT INTO message_attachment_join VALUES (?,?)", att_joins)
+        conn.executemany("UPDATE chat SET last_read_message_timestamp = ? WHERE ROWID = ?",
+                         [(ts, cid) for cid, ts in last_read.items()])
+    return _sqlite_bytes(build)
+
+
+def _callhistory(rng: random.Random, phones: List[str], calls: int) -> bytes:
+    def build(conn):
+        conn.executescript("""
+            CREATE TABLE ZHANDLE (Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER,
+                                  ZTYPE INTEGER, ZNORMALIZEDVALUE TEXT, ZVALUE TEXT);
+            CREATE TABLE ZCALLRECORD (Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER,
+                                      ZANSWERED INTEGER, ZCALLTYPE INTEGER, ZORIGINATED INTEGER,
+                                      ZDATE TIMESTAMP, ZDURATION FLOAT, ZADDRESS VARCHAR, ZNAME VARCHAR,
+                                      ZSERVICE_PROVIDER VARCHAR);
+            CREATE TABLE Z_PRIMARYKEY (Z_ENT INTEGER PRIMARY KEY, Z_NAME VARCHAR, Z_SUPER INTEGER, Z_MAX INTEGER);
+        """)
+        handles, records = [], []
+        for pk in range(1, calls + 1):
+            phone = rng.choice(phones) if phones else _phone(rng)
+            originated = int(rng.random() < 0.5)
+            answered = int(rng.random() < 0.8)
+            handles.append((pk, 3, 1, 2, f"+82{phone[1:]}", phone))
+            records.append((pk, 2, 2 - originated, answered, 1, originated, float(_mac_time(rng)),
+                            float(rng.randrange(600)) if answered else 0.0, phone, None,
+                            rng.choice(("com.apple.Telephony", "com.apple.FaceTime"))))
+        conn.executemany("INSERT INTO ZHANDLE VALUES (?,?,?,?,?,?)", handles)
+        conn.executemany("INSERT INTO ZCALLRECORD VALUES (?,?,?,?,?,?,?,?,?,?,?)", records)
+        conn.executemany("INSERT INTO Z_PRIMARYKEY VALUES (?,?,?,?)",
+                         [(2, "CallRecord", 0, calls), (3, "Handle", 0, calls)])
+    return _sqlite_bytes(build)
+
+
+def _kakao(rng: random.Random, messages: int) -> Tuple[bytes, bytes]:
+    users = [(1, "나", 1)] + [(uid, rng.choice(NAMES), 2) for uid in range(100, 100 + max(2, messages // 200))]
+
+    def build_talk(conn):
+        conn.execute("CREATE TABLE ZUSER (Z_PK INTEGER PRIMARY KEY, ZID INTEGER, ZNAME TEXT, ZFRIENDTYPE INTEGER)")
+        conn.executemany("INSERT INTO ZUSER (ZID, ZNAME, ZFRIENDTYPE) VALUES (?,?,?)", users)
+
+    def build_message(conn):
+        conn.execute("CREATE TABLE Message (id INTEGER PRIMARY KEY, chatId INTEGER, userId INTEGER, "
+                     "sentAt INTEGER, readAt INTEGER, message TEXT, attachment TEXT, serverLogId INTEGER, "
+                     "type INTEGER, prevId INTEGER)")
+        chats = max(1, messages // 50)
+        rows = []
+        for mid in range(1, messages + 1):
+            chat = 10_000 + rng.randrange(chats)
+            sender = 1 if rng.random() < 0.4 else rng.choice(users[1:])[0]
+            sent = _mac_time(rng)
+            rows.append((mid, chat, sender, sent, sent + rng.randrange(3600), _text(rng), None,
+                         3_000_000 + mid, 1, mid - 1))
+        conn.executemany("INSERT INTO Message VALUES (?,?,?,?,?,?,?,?,?,?)", rows)
+
+    return _sqlite_bytes(build_message), _sqlite_bytes(build_talk)
+
+
+def _notes(rng: random.Random, notes: int) -> bytes:
+    def build(conn):
+        conn.executescript("""
+            CREATE TABLE ZICCLOUDSYNCINGOBJECT (Z_PK INTEGER PRIMARY KEY, ZSNIPPET TEXT, ZTITLE1 TEXT,
+                                                ZCREATIONDATE3 TIMESTAMP, ZMODIFICATIONDATE1 TIMESTAMP,
+                                                ZIDENTIFIER TEXT);
+            CREATE TABLE ZICNOTEDATA (Z_PK INTEGER PRIMARY KEY, ZNOTE INTEGER, ZDATA BLOB);
+        """)
+        objects, data = [], []
+        for pk in range(1, notes + 1):
+            body = "\n".join(_text(rng) for _ in range(rng.randint(1, 8)))
+            created = float(_mac_time(rng))
+            objects.append((pk, body[:80], _text(rng), created, created + rng.randrange(SPAN // 4),
+                            f"{rng.getrandbits(128):032X}"))
+            data.append((pk, pk, zlib.compress(body.encode("utf-8"))))
+        conn.executemany("INSERT INTO ZICCLOUDSYNCINGOBJECT VALUES (?,?,?,?,?,?)", objects)
+        conn.executemany("INSERT INTO ZICNOTEDATA VALUES (?,?,?)", data)
+    return _sqlite_bytes(build)
+
+
+def _calendar(rng: random.Random, events: int) -> bytes:
+    def build(conn):
+        conn.executescript("""
+            CREATE TABLE Calendar (ROWID INTEGER PRIMARY KEY, title TEXT, color TEXT, symbolic_color_name TEXT);
+            CREATE TABLE CalendarItem (ROWID INTEGER PRIMARY KEY, summary TEXT, start_date REAL, end_date REAL,
+                                       all_day INTEGER, location_id INTEGER, description TEXT, calendar_id INTEGER);
+            CREATE TABLE Location (ROWID INTEGER PRIMARY KEY, title TEXT);
+            CREATE TABLE EventAction (ROWID INTEGER PRIMARY KEY, event_id INTEGER);
+            CREATE TABLE ExceptionDate (ROWID INTEGER PRIMARY KEY, owner_id INTEGER, date REAL);
+            CREATE TABLE Recurrence (ROWID INTEGER PRIMARY KEY, owner_id INTEGER, frequency INTEGER);
+            CREATE TABLE Participant (ROWID INTEGER PRIMARY KEY, owner_id INTEGER, email TEXT);
+            CREATE TABLE Alarm (ROWID INTEGER PRIMARY KEY, trigger_interval INTEGER);
+            CREATE TABLE AlarmCache (ROWID INTEGER PRIMARY KEY, alarm_id INTEGER, event_id INTEGER);
+            CREATE TABLE Attachment (ROWID INTEGER PRIMARY KEY, owner_id INTEGER, filename TEXT);
+        """)
+        conn.executemany("INSERT INTO Calendar VALUES (?,?,?,?)",
+                         [(1, "Home", "#1BADF8", "blue"), (2, "Work", "#FF2968", "red")])
+        rows = []
+        for rowid in range(1, events + 1):
+            start = float(_mac_time(rng))
+            all_day = int(rng.random() < 0.2)
+            rows.append((rowid, _text(rng), start, start + (86400 if all_day else 3600 * rng.randint(1, 3)),
+                         all_day, None, _text(rng) if rng.random() < 0.3 else None, rng.randint(1, 2)))
+        conn.executemany("INSERT INTO CalendarItem VALUES (?,?,?,?,?,?,?,?)", rows)
+    return _sqlite_bytes(build)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 카메라 롤
+# ─────────────────────────────────────────────────────────────────
+def png_bytes(width: int, height: int, seed: int) -> bytes:
+    """RGB gradient PNG (pure Python – no imaging library needed)."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    r0, g0, b0 = (seed * 37) % 256, (seed * 91) % 256, (seed * 53) % 256
+    line = bytes(v for x in range(width) for v in ((r0 + x) % 256, g0, (b0 + x // 2) % 256))
+    raw = b"".join(b"\x00" + line[y % 3:] + line[:y % 3] for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+# ─────────────────────────────────────────────────────────────────
+# 생성
+# ─────────────────────────────────────────────────────────────────
+def _manifest_plist(root: str, rng: random.Random, rows: int) -> str:
+    udid = hashlib.sha1(f"synthetic-{rng.random()}".encode()).hexdigest()
+    info = {
+        "IsEncrypted": False,
+        "Version": "10.0",
+        "Date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(BASE_TIME)),
+        "SystemDomainsVersion": "24.0",
+        "WasPasscodeSet": True,
+        "Lockdown": {
+            "UniqueDeviceID": udid,
+            "DeviceName": f"Synthetic iPhone ({rows} rows)",
+            "ProductType": "iPhone15,2",
+            "ProductVersion": "17.4",
+            "BuildVersion": "21E219",
+            "SerialNumber": f"SYN{rng.randrange(10 ** 9):09d}",
+        },
+        "Applications": {},
+    }
+    with open(os.path.join(root, "Manifest.plist"), "wb") as fp:
+        plistlib.dump(info, fp)
+    return udid
+
+
+def _filler_paths(rng: random.Random) -> Iterator[Tuple[str, str, int]]:
+    serial = 0
+    while True:
+        serial += 1
+        domain = rng.choice(FILLER_DOMAINS)
+        depth = rng.choice((0, 1, 1, 2, 2, 3))
+        parts = [rng.choice(FILLER_DIRS)] + [f"d{rng.randrange(8 ** (level + 1)):03d}" for level in range(depth)]
+        name = f"f{serial:07d}{rng.choice(FILLER_EXTS)}"
+        yield domain, "/".join(parts + [name]), int(rng.paretovariate(1.2) * 2048) % (64 * 1024 * 1024)
+
+
+def generate_backup(
+    root: str,
+    rows: int = 10_000,
+    seed: int = 0,
+    messages: Optional[int] = None,
+    media: Optional[int] = None,
+    filler_files: bool = True,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, object]:
+    """
+    Write a synthetic backup with *rows* Manifest rows into *root*.
+
+    *messages* / *media* default to sizes that scale with *rows*. With
+    ``filler_files=False`` only the artifact DBs and media get payloads in
+    ``xx/`` (fast for very large manifests – the filler rows then point at
+    missing files, as in a partially copied backup). Returns the facts of the
+    generated backup.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    log = progress or (lambda msg: None)
+    os.makedirs(root, exist_ok=True)
+    if messages is None:
+        messages = max(200, min(rows // 10, 200_000))
+    if media is None:
+        media = max(10, min(rows // 500, 500))
+
+    udid = _manifest_plist(root, rng, rows)
+    manifest = _Manifest(root, rng)
+
+    contacts = max(20, min(rows // 500, 5_000))
+    phones = [_phone(rng) for _ in range(contacts)]
+    log(f"artifacts (contacts={contacts}, messages={messages})")
+    manifest.add_file(*ADDRESSBOOK_DB, payload=_addressbook(rng, phones))
+    manifest.add_file(*SMS_DB, payload=_sms(rng, phones, messages))
+    manifest.add_file(*CALLHISTORY_DB, payload=_callhistory(rng, phones, max(50, messages // 4)))
+    kakao_message, kakao_talk = _kakao(rng, max(50, messages // 2))
+    manifest.add_file(*KAKAO_MESSAGE_DB, payload=kakao_message)
+    manifest.add_file(*KAKAO_TALK_DB, payload=kakao_talk)
+    manifest.add_file(*NOTES_DB, payload=_notes(rng, max(10, rows // 1000)))
+    manifest.add_file(*CALENDAR_DB, payload=_calendar(rng, max(10, rows // 500)))
+
+    log(f"camera roll ({media} images)")
+    for n in range(media):
+        rel = f"{CAMERA_ROLL[1]}/{100 + n // 1000}APPLE/IMG_{n % 10000:04d}.PNG"
+        width, height = rng.choice(((640, 480), (480, 640), (800, 600)))
+        manifest.add_file(CAMERA_ROLL[0], rel, payload=png_bytes(width, height, n), trashed=rng.random() < 0.05)
+
+    log("filler rows")
+    for domain, rel, size in _filler_paths(rng):
+        if manifest.rows >= rows:
+            break
+        manifest.add_file(domain, rel, size=size, write=filler_files)
+    manifest.close()
+
+    facts = {
+        "path": os.path.abspath(root),
+        "udid": udid,
+        "seed": seed,
+        "rows": manifest.rows,
+        "files": manifest.files,
+        "directories": len(manifest.dirs),
+        "messages": messages,
+        "media": media,
+        "filler_files": filler_files,
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+    }
+    log(f"done: {manifest.rows} rows in {facts['elapsed_sec']}s")
+    return facts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic_backup",
+                                     description="Write a synthetic iOS backup for benchmarking.")
+    parser.add_argument("out", help="output folder (created if missing)")
+    parser.add_argument("--rows", type=int, default=10_000, help="Manifest.db Files rows (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--messages", type=int, default=None, help="sms.db messages (default: scales with --rows)")
+    parser.add_argument("--media", type=int, default=None, help="camera-roll images (default: scales with --rows)")
+    parser.add_argument("--no-filler-files", action="store_true",
+                        help="write Manifest rows for filler files without their xx/ payloads")
+    args = parser.parse_args(argv)
+
+    facts = generate_backup(args.out, args.rows, args.seed, args.messages, args.media,
+                            filler_files=not args.no_filler_files,
+                            progress=lambda msg: print(f"[Synthetic] {msg}"))
+    print(f"[Synthetic] {facts['rows']} rows ({facts['files']} files) → {facts['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,8 @@ from datetime import datetime
 
 # Safari 기존 함수
 from artifact_analyzer.browser.safari.history import get_safari_history as get_history
-from artifact_analyzer.browser.chrome.snss_parser import parse_snss_session
+from artifact_analyzer.browser.chrome.history import get_chrome_history
+from artifact_analyzer.orchestrator import get_artifact_result
 
 # ────────────────────────────────────────────────
 # 공통: 타임스탬프 문자열 포매팅
@@ -32,55 +33,6 @@ def _format_timestamp(ts):
     return f"{dt.strftime('%Y-%m-%d')} {ampm} {hour}:{dt.strftime('%M:%S')}"
 
 
-# ────────────────────────────────────────────────
-# Chrome SNSS-탭 → (title, url, timestamp) 리스트
-# ────────────────────────────────────────────────
-
-def _is_valid_web_url(url: str) -> bool:
-    """http/https 로 시작하고 chrome:// 등 내부 페이지·북마크·썸네일 제외"""
-    if not url:
-        return False
-    lowered = url.lower()
-    if not lowered.startswith(("http://", "https://")):
-        return False
-    if lowered.startswith((
-        "http://chrome://",
-        "https://chrome://",
-        "http://chrome-native://",
-        "https://chrome-native://",
-        "http://edge://",
-        "https://edge://",
-    )):
-        return False
-    if any(keyword in lowered for keyword in ("thumbnail", "썸네일", "bookmarks", "북마크")):
-        return False
-    return True
-
-
-def get_chrome_history(backup_path: str | Path):
-    """Chrome ‘현재 탭’·‘최종 탭’ 기록을 파싱해 (title, url, timestamp) 반환."""
-    backup_path = Path(backup_path)
-
-    now_file = backup_path / "fe" / "fe90cf53890f383fb2b28ec36ac2b5d8a678eaec"
-    last_file = backup_path / "27" / "27598ef0cedfcb929996cc6f9112a95ad1cd0fd7"
-
-    records: list[tuple[str, str, int | float | str | datetime]] = []
-
-    def _append_records(snss_file: Path):
-        if not snss_file.exists():
-            return
-        for rec in parse_snss_session(snss_file):
-            url = rec.get("url", "")
-            if not _is_valid_web_url(url):
-                continue
-            title = rec.get("title") or ""
-            records.append((title, url, rec.get("timestamp")))
-
-    _append_records(now_file)
-    _append_records(last_file)
-    return records
-
-
 # (선택) 다른 브라우저용 더미 함수 – 오류 방지용
 
 def get_firefox_history(_):
@@ -125,10 +77,14 @@ def fetch_history(browser_name: str, history_tree: ttk.Treeview, backup_path: st
     history_tree.delete(*history_tree.get_children())
 
     try:
+        # 백그라운드 추출 결과가 있으면 그대로 사용
         if browser_name == "Safari":
-            history = get_history(backup_path)
+            precomputed = get_artifact_result(str(backup_path), "safari")
+            history = precomputed["history"] if precomputed is not None else get_history(backup_path)
         elif browser_name == "Chrome":
-            history = get_chrome_history(backup_path)
+            history = get_artifact_result(str(backup_path), "chrome")
+            if history is None:
+                history = get_chrome_history(backup_path)
         else:
             history = f"{browser_name} 브라우저 기록 로드 기능이 아직 구현되지 않았습니다."
 
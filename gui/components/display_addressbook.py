@@ -1,17 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from artifact_analyzer.addressbook.addressbook_analyzer import ContactContentAnalyzer  
+from artifact_analyzer.orchestrator import get_artifact_result
 
 def display_contact_content(parent_frame, backup_path: str):
     # 기존 위젯 제거
     for w in parent_frame.winfo_children():
         w.destroy()
 
-    analyzer = ContactContentAnalyzer(backup_path)
-    ok, msg = analyzer.load_contacts()
-    if not ok:
-        messagebox.showerror("Error", msg)
-        return
+    # 백그라운드 추출 결과가 있으면 그대로 사용
+    analyzer = get_artifact_result(backup_path, "contacts")
+    if analyzer is None:
+        analyzer = ContactContentAnalyzer(backup_path)
+        ok, msg = analyzer.load_contacts()
+        if not ok:
+            messagebox.showerror("Error", msg)
+            return
 
     # ── 최상위 프레임 ───────────────────────────
     root = ttk.Frame(parent_frame)           # ★ padding 제거
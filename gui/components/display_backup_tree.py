@@ -14,13 +14,20 @@ def create_backup_tree_frame(parent,colors):
     tree_scrollbar.pack(side="right", fill="y")
 
     # 백업 구조 트리뷰
+    # values[0] : 전체 경로 (숨김), values[1] : 하위 전체 크기
     backup_tree = ttk.Treeview(
-        tree_frame, selectmode="browse", yscrollcommand=tree_scrollbar.set
+        tree_frame,
+        columns=("__fullpath", "size"),
+        displaycolumns=("size",),
+        selectmode="browse",
+        yscrollcommand=tree_scrollbar.set,
     )
     backup_tree.pack(side="left", fill="both", expand=True)
 
     # 트리뷰 헤더 설정
     backup_tree.heading("#0", text="Directory Tree", anchor="w")
+    backup_tree.heading("size", text="Size", anchor="e")
+    backup_tree.column("size", width=110, stretch=False, anchor="e")
 
     folder_icon = tk.PhotoImage(file="gui/icon/folder.png").subsample(30, 30) 
     file_icon = tk.PhotoImage(file="gui/icon/file.png").subsample(30,30)  
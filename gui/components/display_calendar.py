@@ -6,6 +6,7 @@ import pandas as pd
 
 # Backend – forensic calendar DB handler
 from artifact_analyzer.calendar.calendar_analyzer import CalendarAnalyser
+from artifact_analyzer.orchestrator import get_artifact_result
 
 
 def display_calendar(parent_frame, backup_path):
@@ -272,10 +273,20 @@ def display_calendar(parent_frame, backup_path):
     # 🗄  Data loaders
     # ────────────────────────────────────────────────────────────────
 
+    all_events = get_artifact_result(backup_path, "calendar")   # 백그라운드 추출 결과
+
     def _load_month_events() -> dict[int, list[dict]]:
         key = f"{state.year}-{state.month}"
         if key not in state.month_events_cache:
-            state.month_events_cache[key] = analyser.get_events_for_month(state.year, state.month)
+            if all_events is None:
+                state.month_events_cache[key] = analyser.get_events_for_month(state.year, state.month)
+            elif all_events.empty:
+                state.month_events_cache[key] = all_events
+            else:
+                in_month = all_events["start_date"].apply(
+                    lambda d: d is not None and d.year == state.year and d.month == state.month
+                )
+                state.month_events_cache[key] = all_events[in_month]
         df = state.month_events_cache[key]
         out: dict[int, list[dict]] = {}
         for _, ev in df.iterrows():
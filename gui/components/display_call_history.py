@@ -1,6 +1,7 @@
 from tkinter import ttk, messagebox
 import tkinter as tk
 from artifact_analyzer.call.call_history import CallHistoryAnalyzer
+from artifact_analyzer.orchestrator import get_artifact_result
 
 
 def display_call_history(parent_frame, backup_path: str):
@@ -8,11 +9,14 @@ def display_call_history(parent_frame, backup_path: str):
     for w in parent_frame.winfo_children():
         w.destroy()
 
-    analyzer = CallHistoryAnalyzer(backup_path)
-    ok, msg = analyzer.load_call_records()
-    if not ok:
-        messagebox.showerror("오류", msg)
-        return
+    # 백그라운드 추출 결과가 있으면 그대로 사용
+    analyzer = get_artifact_result(backup_path, "call_history")
+    if analyzer is None:
+        analyzer = CallHistoryAnalyzer(backup_path)
+        ok, msg = analyzer.load_call_records()
+        if not ok:
+            messagebox.showerror("오류", msg)
+            return
 
     # ── 레이아웃 ──────────────────────────────
     root = ttk.Frame(parent_frame, padding=10)
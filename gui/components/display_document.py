@@ -1,5 +1,3 @@
-import sqlite3
-import plistlib
 import unicodedata
 from pathlib import Path
 import tkinter as tk
@@ -7,6 +5,10 @@ from tkinter import ttk
 from datetime import datetime
 
 from gui.components.document_ui.document_utils import render_preview
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer.path_search import get_path_search
+
+DOCUMENT_EXTS = (".pdf", ".xlsx", ".pptx", ".docx", ".csv", ".txt")
 
 LEADS = ['ㄱ','ㄲ','ㄴ','ㄷ','ㄸ','ㄹ','ㅁ','ㅂ','ㅃ','ㅅ','ㅆ','ㅇ','ㅈ','ㅉ','ㅊ','ㅋ','ㅌ','ㅍ','ㅎ']
 VOWELS = ['ㅏ','ㅐ','ㅑ','ㅒ','ㅓ','ㅔ','ㅕ','ㅖ','ㅗ','ㅘ','ㅙ','ㅚ','ㅛ','ㅜ','ㅝ','ㅞ','ㅟ','ㅠ','ㅡ','ㅢ','ㅣ']
@@ -34,27 +36,24 @@ def compose_jamo(text: str) -> str:
     return ''.join(result)
 
 def fetch_files(backup_path: str):
+    """(relativePath, domain, fileID, size, birth) of every document in the backup."""
     db_path = Path(backup_path) / "Manifest.db"
     if not db_path.exists():
-        return [("ERROR", f"DB not found: {db_path}", "", b"")]
+        return [("ERROR", f"DB not found: {db_path}", "", None, None)]
 
     rows = []
     try:
-        with sqlite3.connect(str(db_path)) as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT relativePath, domain, fileID, file
-                FROM Files
-                WHERE LOWER(relativePath) LIKE '%.pdf'
-                   OR LOWER(relativePath) LIKE '%.xlsx'
-                   OR LOWER(relativePath) LIKE '%.pptx'
-                   OR LOWER(relativePath) LIKE '%.docx'
-                   OR LOWER(relativePath) LIKE '%.csv'
-                   OR LOWER(relativePath) LIKE '%.txt'
-            """)
-            rows = cur.fetchall()
+        search = get_path_search(backup_path, build=False)
+        if search is None:
+            return [("ERROR", f"Manifest index unavailable: {db_path}", "", None, None)]
+        index = search.index
+        for r in search.find(suffix=DOCUMENT_EXTS):
+            rows.append((
+                index.row_rel_path(r), index.row_domain(r), index.row_file_id(r),
+                index.row_size(r), index.row_birth(r),
+            ))
     except Exception as e:
-        rows.append(("ERROR", str(e), "", b""))
+        rows.append(("ERROR", str(e), "", None, None))
     return rows
 
 def display_document(content_frame, backup_path: str):
@@ -96,22 +95,10 @@ def display_document(content_frame, backup_path: str):
 
     raw_data = fetch_files(backup_path)
     parsed = []
-    for rel_path, domain, file_id, file_blob in raw_data:
-        birth_ts = 0
-        birth_str = ""
-        if rel_path != "ERROR":
-            try:
-                info = plistlib.loads(file_blob)
-                objects = info.get("$objects", [])
-                if isinstance(objects, list) and len(objects) > 1:
-                    entry = objects[1]
-                    bval = entry.get("Birth", None)
-                    if bval is not None:
-                        birth_ts = int(bval)
-                        birth_str = datetime.utcfromtimestamp(birth_ts).strftime("%Y-%m-%d %H:%M:%S")
-            except Exception:
-                birth_ts = 0
-        parsed.append((rel_path, domain, file_id, file_blob, birth_ts, birth_str))
+    for rel_path, domain, file_id, size, birth in raw_data:
+        birth_ts = birth or 0
+        birth_str = datetime.utcfromtimestamp(birth_ts).strftime("%Y-%m-%d %H:%M:%S") if birth is not None else ""
+        parsed.append((rel_path, domain, file_id, size, birth_ts, birth_str))
 
     parsed.sort(key=lambda x: x[4], reverse=True)
 
@@ -120,7 +107,7 @@ def display_document(content_frame, backup_path: str):
     def populate():
         tree.delete(*tree.get_children())
         item_to_fileid.clear()
-        for i, (rel_path, domain, file_id, file_blob, birth_ts, birth_str) in enumerate(parsed):
+        for i, (rel_path, domain, file_id, size, birth_ts, birth_str) in enumerate(parsed):
             tag = ("stripe",) if i % 2 else ()
             if rel_path == "ERROR":
                 tree.insert("", "end", values=(domain, "", "", ""), tags=tag)
@@ -130,17 +117,7 @@ def display_document(content_frame, backup_path: str):
             filename = compose_jamo(unicodedata.normalize("NFC", raw_filename))
             combined = f"{domain}/{rel_path}" if domain else rel_path
             filepath = compose_jamo(unicodedata.normalize("NFC", combined))
-
-            filesize = ""
-            try:
-                info = plistlib.loads(file_blob)
-                objects = info.get("$objects", [])
-                if isinstance(objects, list) and len(objects) > 1:
-                    entry = objects[1]
-                    size_val = entry.get("Size", None)
-                    filesize = str(size_val) if size_val is not None else ""
-            except Exception:
-                filesize = ""
+            filesize = str(size) if size is not None else ""
 
             item = tree.insert("", "end", values=(filename, filepath, filesize, birth_str), tags=tag)
             item_to_fileid[item] = file_id
@@ -159,12 +136,16 @@ def display_document(content_frame, backup_path: str):
         if not file_id:
             return
 
-        subdir = file_id[:2]
-        file_path = Path(backup_path) / subdir / file_id
+        index = get_manifest_index(backup_path, build=False)
+        blob = index.blob_path(file_id) if index else str(Path(backup_path) / file_id[:2] / file_id)
 
         for w in right.winfo_children():
             w.destroy()
 
+        if blob is None:
+            ttk.Label(right, text=f"❌  File could not be decrypted:\n{file_id}").pack(expand=True)
+            return
+        file_path = Path(blob)
         if not file_path.exists():
             ttk.Label(right, text=f"❌  File not found:\n{file_path}").pack(expand=True)
             return
@@ -174,17 +155,9 @@ def display_document(content_frame, backup_path: str):
         preview_frame = ttk.Frame(right)
         preview_frame.grid(row=0, column=0, sticky="nsew")
         def get_relative_path(backup_path, file_path):
-            import os
-            db_path = os.path.join(backup_path, 'Manifest.db')
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT relativePath FROM Files WHERE fileID = ?", (file_id,))
-            result = cursor.fetchone()
-            
-            conn.close()
-            
-            return Path(result[0]).suffix.lower()
+            index = get_manifest_index(backup_path, build=False)
+            found = index.lookup_file_id(file_id) if index else None
+            return Path(found[1]).suffix.lower() if found else ""
 
         ext = get_relative_path(backup_path, file_path)
         render_preview(preview_frame, file_path, ext)
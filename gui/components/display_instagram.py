@@ -8,6 +8,7 @@ from tkinter import messagebox
 from artifact_analyzer.messenger.instagram.follow import get_instagram_following
 from artifact_analyzer.messenger.instagram.account import get_instagram_account_info
 from artifact_analyzer.messenger.instagram.dm import *
+from artifact_analyzer.orchestrator import get_artifact_result
 
 class display_instagram:
     def __init__(self, root, backup_path):
@@ -763,8 +764,9 @@ class display_instagram:
         if not selected_account:
             return
         
-        # 분석기에서 채팅 데이터 가져오기
-        messages_list = self.instagram_dm_analyzer.get_chat_list()
+        # 분석기에서 채팅 데이터 가져오기 (백그라운드 추출 결과가 있으면 그대로 사용)
+        precomputed = get_artifact_result(self.backup_path, "instagram_dm")
+        messages_list = precomputed["messages"] if precomputed is not None else self.instagram_dm_analyzer.get_chat_list()
         
         # 채팅방 목록이 없으면 안내 메시지 표시
         if not messages_list:
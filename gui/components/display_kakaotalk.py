@@ -12,6 +12,7 @@ import pandas as pd
 
 # 백엔드 모듈(KakaoTalk 분석 기능)을 임포트합니다.
 from artifact_analyzer.messenger.kakaotalk.kakaotalk_analyzer import KakaoTalkAnalyzer
+from artifact_analyzer.orchestrator import get_artifact_result
 
 
 def display_kakaotalk(parent_frame, backup_path):
@@ -31,7 +32,8 @@ def display_kakaotalk(parent_frame, backup_path):
     
     # 백엔드의 KakaoTalkAnalyser 클래스를 이용해 KakaoTalk 분석기를 초기화합니다.
     try:
-        kakaotalk_analyzer = KakaoTalkAnalyzer(backup_path)
+        # 백그라운드 추출 결과(대화 목록 + 메시지)가 있으면 그대로 사용합니다.
+        kakaotalk_analyzer = get_artifact_result(backup_path, "kakaotalk") or KakaoTalkAnalyzer(backup_path)
         # 카카오톡 데이터베이스에 연결 시도. 실패할 경우 에러 메시지 출력 후 함수 종료.
         if not kakaotalk_analyzer.connect_to_message_db():
             messagebox.showerror("오류", "KakaoTalk Message.sqlite 데이터베이스를 찾을 수 없거나 연결할 수 없습니다.")
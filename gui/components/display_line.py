@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from artifact_analyzer.messenger.line.line_analyzer import LineAnalyzer
+from artifact_analyzer.orchestrator import get_artifact_result
 
 
 def k_format(raw: str) -> str:
@@ -27,12 +28,14 @@ def display_line(parent: tk.Misc, backup_path: str) -> None:
     for w in parent.winfo_children():
         w.destroy()
 
-    # Analyzer 초기화 및 로드
-    ana = LineAnalyzer(backup_path)
-    ok, err = ana.load()
-    if not ok:
-        messagebox.showerror("오류", err)
-        return
+    # Analyzer 초기화 및 로드 (백그라운드 추출 결과가 있으면 그대로 사용)
+    ana = get_artifact_result(backup_path, "line")
+    if ana is None:
+        ana = LineAnalyzer(backup_path)
+        ok, err = ana.load()
+        if not ok:
+            messagebox.showerror("오류", err)
+            return
 
     # ── 스타일 설정 ─────────────────────────────────────────────────────────────
     style = ttk.Style()
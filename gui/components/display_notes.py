@@ -2,12 +2,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel
 from pathlib import Path
 import os
+import glob
 import subprocess
 
 import pygame          # 오디오 재생
 from PIL import Image, ImageTk  # 이미지 (향후 확장 대비)
 
 from artifact_analyzer.notes.notes_analyser import NotesAnalyser
+from artifact_analyzer.orchestrator import get_artifact_result
+from backup_analyzer.path_search import get_path_search
 
 
 # ────────────────────────────────────────────────────────────────────────────
@@ -187,7 +190,9 @@ def display_notes(content_frame: ttk.Frame, backup_path: str):
     # 데이터 준비
     # ────────────────────────────────────────────────────────────────
     analyser = NotesAnalyser(backup_path)
-    all_df = analyser.get_all_notes()
+    all_df = get_artifact_result(backup_path, "notes")   # 백그라운드 추출 결과
+    if all_df is None:
+        all_df = analyser.get_all_notes()
 
     # ── 트리뷰 채우기 ───────────────────────────
     def populate(df):
@@ -234,28 +239,21 @@ def display_notes(content_frame: ttk.Frame, backup_path: str):
 
     # ── Manifest → 실제 파일 경로 ───────────────
     def _manifest_lookup(uuid: str, filename: str) -> str | None:
-        import sqlite3
         manifest = Path(backup_path) / "Manifest.db"
         if not manifest.exists():
             return None
         try:
-            with sqlite3.connect(str(manifest)) as conn:
-                cur = conn.cursor()
-                like = f"%{uuid}%{filename}%"
-                cur.execute(
-                    """
-                    SELECT fileID FROM Files
-                    WHERE domain='AppDomainGroup-group.com.apple.notes'
-                      AND relativePath LIKE ?
-                    """,
-                    (like,),
-                )
-                row = cur.fetchone()
-            if not row:
+            search = get_path_search(backup_path, build=False)
+            if search is None:
                 return None
-            file_id = row[0]
-            path = Path(backup_path) / file_id[:2] / file_id
-            return str(path) if path.exists() else None
+            row = search.first(
+                domain="AppDomainGroup-group.com.apple.notes",
+                glob=f"*{glob.escape(uuid)}*{glob.escape(filename)}*",
+            )
+            if row is None:
+                return None
+            path = search.index.blob_path(search.index.row_file_id(row))
+            return path if path and os.path.exists(path) else None
         except Exception:
             return None
 
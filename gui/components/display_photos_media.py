@@ -1,84 +1,56 @@
 from __future__ import annotations
 
-import io
 import os
-import sqlite3
-import subprocess
-import tempfile
 import threading
-import concurrent.futures
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Tuple, Dict, Any
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-import cv2
-import rawpy
-import imageio_ffmpeg
 from PIL import Image, ImageTk
 
-os.environ["IMAGEIO_FFMPEG_EXE"] = imageio_ffmpeg.get_ffmpeg_exe()
-
-try:
-    from pillow_heif import register_heif_opener
-    register_heif_opener()
-except ModuleNotFoundError:
-    pass
-
-COLS, ROWS = 9, 4
-PAGE_SIZE = COLS * ROWS
-THUMB_SIDE = 120
-
-IMG_EXTS = {".png", ".jpg", ".jpeg", ".heic", ".dng"}
-VID_EXTS = {".mov", ".mp4"}
-
-# ─────────────────────────────────────────────────────────────
-# Deleted-flag 판정 (MBFile ▸ ExtendedAttributes)
-# ─────────────────────────────────────────────────────────────
-import plistlib
-
-
-def _get_uid(obj):
-    return obj.data if isinstance(obj, plistlib.UID) else obj
-
-
-def _trashed_val_true(val: Any) -> bool:
-    if isinstance(val, bool):
-        return val
-    if isinstance(val, (int, float)):
-        return val != 0
-    if isinstance(val, (bytes, bytearray, memoryview)):
-        return len(val) > 0 and val[0] == 1
-    return False
-
-
-def _is_trashed_blob(blob: bytes) -> bool:
-    try:
-        outer = plistlib.loads(blob)
-    except Exception:
-        return False
-    objs = outer.get("$objects")
-    if not objs:
-        return False
-    root_uid = _get_uid(outer["$top"]["root"])
-    if not isinstance(root_uid, int) or root_uid >= len(objs):
-        return False
-    root = objs[root_uid]
-    ext_attr = root.get("ExtendedAttributes")
-    if ext_attr is None:
-        return False
-    ext_uid = _get_uid(ext_attr)
-    if not isinstance(ext_uid, int) or ext_uid >= len(objs):
-        return False
-    ext_blob = objs[ext_uid]
-    if not isinstance(ext_blob, (bytes, bytearray)):
-        return False
-    try:
-        attrs = plistlib.loads(ext_blob)
-    except Exception:
-        return False
-    return _trashed_val_true(attrs.get("com.apple.assetsd.trashed"))
+from artifact_analyzer.media.thumbnail_cache import decode_thumbnail, get_thumbnail_cache
+from artifact_analyzer.media.thumbnail_pool import ThumbnailPool
+from artifact_analyzer.media.thumbnails import (
+    IMG_EXTS, THUMB_SIDE, VID_EXTS, enumerate_media_files, media_blob_key,
+)
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer.virtual_backup import get_virtual_backup
+
+CELL_W = THUMB_SIDE + 12         # 셀 하나의 크기 (썸네일 + 여백 + 두 줄 캡션)
+CELL_H = THUMB_SIDE + 48
+THUMB_MEMORY = 2000              # 메모리에 두는 PhotoImage 수
+PRELOAD_SCREENS = 1              # 화면 위/아래로 미리 불러올 분량 (화면 수)
+LOAD_DELAY_MS = 60               # 스크롤이 이만큼 멈추면 로드
+WHEEL_UNITS = 2                  # 휠 한 칸 = yscrollincrement × 이 값
+
+
+class _GridRow:
+    """One recycled row of the media grid: a canvas window holding *cols* cells."""
+
+    __slots__ = ("frame", "window", "cells", "labels", "index", "paths")
+
+    def __init__(self, canvas: tk.Canvas, cols: int):
+        self.frame = tk.Frame(canvas, bg="white", width=cols * CELL_W, height=CELL_H)
+        self.window = canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+        self.cells: List[Tuple[tk.Label, tk.Label]] = []
+        for _ in range(cols):
+            cell = tk.Frame(self.frame, bg="white", width=CELL_W, height=CELL_H)
+            cell.pack_propagate(False)
+            cell.pack(side="left")
+            thumb_box = tk.Frame(cell, width=THUMB_SIDE, height=THUMB_SIDE, bg="white")
+            thumb_box.pack_propagate(False)
+            thumb_box.pack(pady=(6, 0))
+            img_lbl = tk.Label(thumb_box, bg="white")
+            img_lbl.pack(expand=True, anchor="center")
+            cap_lbl = tk.Label(cell, bg="white", wraplength=THUMB_SIDE, justify="center", height=2)
+            cap_lbl.pack(pady=(2, 0))
+            self.cells.append((img_lbl, cap_lbl))
+        self.labels = {img_lbl for img_lbl, _ in self.cells}
+        self.index = -1                   # 묶인 데이터 행 (-1: 숨김)
+        self.paths: List[Path] = []
 
 
 # ─────────────────────────────────────────────────────────────
@@ -116,51 +88,24 @@ def display_photos_media(parent: tk.Widget, backup_path: str) -> None:
 
     canvas_frame = ttk.Frame(parent)
     canvas_frame.pack(fill="both", expand=True)
-    canvas = tk.Canvas(canvas_frame, highlightthickness=0, bg="white")
+    canvas = tk.Canvas(canvas_frame, highlightthickness=0, bg="white", yscrollincrement=CELL_H // 4)
     vsb = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-    canvas.configure(yscrollcommand=vsb.set)
     canvas.pack(side="left", fill="both", expand=True)
     vsb.pack(side="right", fill="y")
 
-    grid_frame = tk.Frame(canvas, bg="white")
-    grid_window = canvas.create_window((0, 0), window=grid_frame, anchor="nw")
-
-    def _center_grid(_=None):
-        cw, ch = canvas.winfo_width(), canvas.winfo_height()
-        gw = grid_frame.winfo_reqwidth()
-        gh = grid_frame.winfo_reqheight()
-
-        x = max((cw - gw) // 2, 0)
-        y = max((ch - gh) // 2, 0)
-        canvas.coords(grid_window, x, y)
-
-    grid_frame.bind(
-        "<Configure>",
-        lambda e: (
-            canvas.configure(
-                scrollregion=(0, 0, grid_frame.winfo_reqwidth(), grid_frame.winfo_reqheight())
-            ),
-            _center_grid(),
-        ),
-    )
-
-    canvas.bind("<Configure>", _center_grid)
-
-    nav_frame = ttk.Frame(parent)
-    nav_frame.pack(fill="x", pady=(6, 4))
-    nav_prev = ttk.Button(nav_frame, text="← Previous")
-    nav_label = ttk.Label(nav_frame, text="0 / 0", style="InfoLabel.TLabel")
-    nav_next = ttk.Button(nav_frame, text="Next →")
-    nav_prev.pack(side="left", padx=10)
-    nav_label.pack(side="left", expand=True)
-    nav_next.pack(side="right", padx=10)
+    info_label = ttk.Label(parent, text="0 / 0", style="InfoLabel.TLabel", anchor="center")
+    info_label.pack(fill="x", pady=(6, 4))
 
     state: Dict[str, Any] = {
         "items_total": [],
         "items_deleted": [],
         "items": [],
-        "page": 0,
-        "thumbs": {},
+        "thumbs": OrderedDict(),  # path → PhotoImage, 최근 사용 순 (THUMB_MEMORY 개까지)
+        "cells": {},            # 화면에 묶인 셀: path → 썸네일 Label (도착 시 교체)
+        "rows": [],             # 재사용하는 행 위젯 (_GridRow)
+        "cols": 0,
+        "origin": (0, 0),       # 그리드 좌상단 (가운데 정렬)
+        "load_job": None,
         "empty_lbl": None
     }
 
@@ -186,155 +131,93 @@ def display_photos_media(parent: tk.Widget, backup_path: str) -> None:
         if lbl:
             lbl.place_forget()
 
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+    # 디코딩한 썸네일은 백업 폴더의 .thumbnail_cache.sqlite 에 남김 (쓰기 불가면 None)
+    thumb_cache = get_thumbnail_cache(backup_path)
+    placeholder = ImageTk.PhotoImage(Image.new("RGB", (THUMB_SIDE, THUMB_SIDE), "#ececec"))
+    failed_thumb = Image.new("RGB", (THUMB_SIDE, THUMB_SIDE), "gray")
 
-    # ─────────────────────────── 미디어 감지 ───────────────────────────
-    def _is_video(path: Path, fname: str) -> bool:
-        ext_path = path.suffix.lower()
-        ext_name = Path(fname).suffix.lower()
-        return ext_path in VID_EXTS or ext_name in VID_EXTS
+    def _on_thumb_ready(path_str: str, data):
+        # 디코딩 프로세스 풀의 콜백 스레드 → Tk 스레드로 넘김
+        try:
+            parent.after(0, _swap_in, Path(path_str), data)
+        except (RuntimeError, tk.TclError):
+            pass                                  # 패널이 이미 닫힘
+
+    # 암호화 백업이면 요청된 셀만 워커가 복호화 (.decrypt_cache 공유)
+    virtual = get_virtual_backup(backup_path)
+    thumb_pool = ThumbnailPool(_on_thumb_ready, THUMB_SIDE, cache=thumb_cache,
+                               class_keys=virtual.class_keys if virtual is not None else None)
+
+    def _close_pool(event):
+        if event.widget is not canvas_frame:
+            return
+        thumb_pool.close()
+        if virtual is not None:
+            virtual.adopt_cache()                 # 워커가 복호화한 파일을 LRU·예산에 반영
 
-    def _is_image(path: Path, fname: str) -> bool:
-        ext_path = path.suffix.lower()
-        ext_name = Path(fname).suffix.lower()
-        return ext_path in IMG_EXTS or ext_name in IMG_EXTS
+    canvas_frame.bind("<Destroy>", _close_pool)
 
     # ─────────────────────────── 스캐닝 스레드 ─────────────────────────
     def _scan():
-        items = list(_enumerate_media_files(Path(backup_path)))
+        # 셀 키는 원본 blob 위치 – 여기서는 아무것도 열거나 복호화하지 않음
+        root = Path(backup_path)
+        items = [(media_blob_key(root, fid), fname, trashed)
+                 for fid, fname, trashed, _size in enumerate_media_files(root)]
         state["items_total"] = [(p, f) for p, f, _del in items]
         state["items_deleted"] = [(p, f) for p, f, _del in items if _del]
-        parent.after(0, _apply_filter)
+        try:
+            parent.after(0, _apply_filter)
+        except (RuntimeError, tk.TclError):
+            pass                                  # 패널이 이미 닫힘
 
-    threading.Thread(target=_scan, daemon=True).start()
+    def _store_photoimage(path: Path, pil_img: Image.Image):
+        thumbs = state["thumbs"]
+        if path in thumbs:
+            thumbs.move_to_end(path)
+            return
+        thumbs[path] = ImageTk.PhotoImage(pil_img)
+        # 화면에 걸린 이미지는 Label 이 참조를 갖고 있으므로 버려도 안전
+        while len(thumbs) > THUMB_MEMORY:
+            thumbs.popitem(last=False)
+
+    def _photo_for(path: Path) -> ImageTk.PhotoImage:
+        photo = state["thumbs"].get(path)
+        if photo is None:
+            return placeholder
+        state["thumbs"].move_to_end(path)
+        return photo
 
-    # ─────────────────────────── 디코딩 / 썸네일 ─────────────────────
-    def _load_image(path: Path) -> Image.Image:
-        ext = path.suffix.lower()
-        if ext == ".dng":
-            with rawpy.imread(str(path)) as raw:
-                return Image.fromarray(raw.postprocess())
-        if ext == ".heic":
-            if "heif" not in Image.OPEN:
-                try:
-                    from pillow_heif import register_heif_opener
-                    register_heif_opener()
-                except ModuleNotFoundError:
-                    pass
-        return Image.open(path)
-
-    def _video_thumb_preview(path: Path) -> Image.Image | None:
-        cap = cv2.VideoCapture(str(path))
-        if not cap.isOpened():
-            return None
-        ret, frame = cap.read()
-        cap.release()
-        if not ret or frame is None:
-            return None
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return Image.fromarray(frame)
-
-    def _video_thumb_pipe(path: Path) -> Image.Image | None:
-        ffmpeg = os.environ["IMAGEIO_FFMPEG_EXE"]
-        cmd = [
-            ffmpeg,
-            "-loglevel",
-            "error",
-            "-nostdin",
-            "-ss",
-            "0.5",
-            "-i",
-            str(path),
-            "-frames:v",
-            "1",
-            "-f",
-            "image2",
-            "-c:v",
-            "mjpeg",
-            "pipe:1",
-        ]
+    def _swap_in(path: Path, data):
         try:
-            with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
-                data = proc.stdout.read()
-            if data:
-                return Image.open(io.BytesIO(data))
+            img = decode_thumbnail(data) if data is not None else failed_thumb
         except Exception:
-            return None
-        return None
-
-    def _video_thumb_temp(path: Path) -> Image.Image | None:
-        ffmpeg = os.environ["IMAGEIO_FFMPEG_EXE"]
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-            tmp_name = tmp.name
-        cmd = [
-            ffmpeg,
-            "-loglevel",
-            "error",
-            "-nostdin",
-            "-ss",
-            "0.5",
-            "-i",
-            str(path),
-            "-frames:v",
-            "1",
-            "-q:v",
-            "2",
-            tmp_name,
-        ]
-        if subprocess.call(cmd) == 0 and Path(tmp_name).exists():
-            try:
-                img = Image.open(tmp_name)
-                img.load()
-                return img
-            finally:
-                os.unlink(tmp_name)
-        os.unlink(tmp_name)
-        return None
-
-    def _video_thumbnail(path: Path) -> Image.Image:
-        for extractor in (_video_thumb_preview, _video_thumb_pipe, _video_thumb_temp):
+            img = failed_thumb
+        _store_photoimage(path, img)
+        lbl = state["cells"].get(path)
+        if lbl is not None and lbl.winfo_exists():
+            photo = state["thumbs"][path]
+            lbl.configure(image=photo)
+            lbl.image = photo
+
+    def _load_cached(items: List[Tuple[Path, str]]):
+        """Fill state["thumbs"] for *items* from the on-disk cache (one query)."""
+        if thumb_cache is None:
+            return
+        missing = [p for p, _ in items if p not in state["thumbs"]]
+        if not missing:
+            return
+        for path_str, data in thumb_cache.get_many(missing, THUMB_SIDE).items():
             try:
-                img = extractor(path)
-                if img is not None:
-                    break
+                _store_photoimage(Path(path_str), decode_thumbnail(data))
             except Exception:
-                continue
-        else:
-            img = Image.new("RGB", (THUMB_SIDE, THUMB_SIDE), "black")
-        img.thumbnail((THUMB_SIDE, THUMB_SIDE))
-        return img
-
-    def _generate_thumbnail_image(path: Path, fname: str) -> Image.Image:
-        try:
-            if _is_video(path, fname):
-                pil_img = _video_thumbnail(path)
-            elif _is_image(path, fname):
-                pil_img = _load_image(path)
-                pil_img.thumbnail((THUMB_SIDE, THUMB_SIDE))
-            else:
-                raise ValueError("Unsupported format")
-        except Exception:
-            pil_img = Image.new("RGB", (THUMB_SIDE, THUMB_SIDE), "gray")
-        return pil_img
-
-    def _store_photoimage(path: Path, pil_img: Image.Image):
-        if path not in state["thumbs"]:
-            state["thumbs"][path] = ImageTk.PhotoImage(pil_img)
-
-    def _preload_task(path: Path, fname: str):
-        img = _generate_thumbnail_image(path, fname)
-        parent.after(0, lambda: _store_photoimage(path, img))
-
-    def _thumb(path: Path, fname: str):
-        cache = state["thumbs"]
-        if path in cache:
-            return cache[path]
-        img = _generate_thumbnail_image(path, fname)
-        photo = ImageTk.PhotoImage(img)
-        cache[path] = photo
-        return photo
+                pass
 
-    def _save_file(src: Path, save_name: str):
+    def _save_file(key: Path, save_name: str):
+        index = get_manifest_index(backup_path)
+        src = index.blob_path(key.name) if index is not None else None
+        if src is None:
+            messagebox.showerror("Save error", f"{save_name} could not be decrypted.")
+            return
         dest = filedialog.asksaveasfilename(initialfile=save_name)
         if dest:
             try:
@@ -344,92 +227,186 @@ def display_photos_media(parent: tk.Widget, backup_path: str) -> None:
             except Exception as e:
                 messagebox.showerror("Save error", str(e))
 
-    def _clear_grid():
-        for child in grid_frame.grid_slaves():
-            child.destroy()
-
-    def _render_page():
-        total_items = len(state["items"])
-
-        if total_items == 0:
-            _clear_grid()
-            _show_empty_msg()
-
-            nav_label.config(text="0 / 0")
-            nav_prev.config(state="disabled")
-            nav_next.config(state="disabled")
+    # ─────────────────────────── 가상 그리드 ─────────────────────────
+    def _on_save_click(row: _GridRow, col: int):
+        idx = row.index * state["cols"] + col
+        if row.index >= 0 and idx < len(state["items"]):
+            _save_file(*state["items"][idx])
+
+    def _build_rows(count: int, cols: int):
+        """Replace the row pool (only when the canvas size changes the grid shape)."""
+        for row in state["rows"]:
+            canvas.delete(row.window)
+            row.frame.destroy()
+        state["rows"] = []
+        state["cells"] = {}
+        for _ in range(count):
+            row = _GridRow(canvas, cols)
+            for col, (img_lbl, _cap) in enumerate(row.cells):
+                img_lbl.bind("<Button-3>", lambda e, row=row, col=col: _on_save_click(row, col))
+            state["rows"].append(row)
+
+    def _unbind_row(row: _GridRow, hide: bool = True):
+        cells = state["cells"]
+        for p in row.paths:
+            if cells.get(p) in row.labels:
+                del cells[p]
+        row.paths = []
+        row.index = -1
+        if hide:
+            canvas.itemconfigure(row.window, state="hidden")
+
+    def _bind_row(row: _GridRow, index: int):
+        """Show data row *index* in *row* (recycled widgets: only images and captions change)."""
+        cols = state["cols"]
+        items = state["items"]
+        cells = state["cells"]
+        _unbind_row(row, hide=False)
+        row.index = index
+        x0, y0 = state["origin"]
+        canvas.coords(row.window, x0, y0 + index * CELL_H)
+        canvas.itemconfigure(row.window, state="normal")
+        for col, (img_lbl, cap_lbl) in enumerate(row.cells):
+            idx = index * cols + col
+            if idx < len(items):
+                p, fname = items[idx]
+                photo = _photo_for(p)
+                cells[p] = img_lbl
+                row.paths.append(p)
+            else:
+                photo, fname = "", ""
+            img_lbl.configure(image=photo)
+            img_lbl.image = photo
+            cap_lbl.configure(text=fname)
+
+    def _visible_rows() -> Tuple[int, int]:
+        """[first, last) data rows that intersect the viewport."""
+        total_rows = -(-len(state["items"]) // max(state["cols"], 1))
+        top = canvas.canvasy(0) - state["origin"][1]
+        first = max(0, int(top // CELL_H))
+        last = min(total_rows, int((top + canvas.winfo_height()) // CELL_H) + 1)
+        return first, max(first, last)
+
+    def _layout():
+        """Recycle rows that scrolled out of view onto the rows that scrolled in."""
+        if not state["cols"]:
             return
-        else:
-            _hide_empty_msg()
-
-        total_pages = (total_items + PAGE_SIZE - 1) // PAGE_SIZE
-        state["page"] = max(0, min(state["page"], total_pages - 1))
-        start = state["page"] * PAGE_SIZE
-        end = min(start + PAGE_SIZE, total_items)
-
-        _clear_grid()
-        for idx, (p, fname) in enumerate(state["items"][start:end]):
-            r, c = divmod(idx, COLS)
-            cell = tk.Frame(grid_frame, bg="white", padx=2, pady=2)
-            cell.grid(row=r, column=c, padx=4, pady=4, sticky="nw")
-            thumb_box = tk.Frame(cell, width=THUMB_SIDE, height=THUMB_SIDE, bg="white")
-            thumb_box.pack_propagate(False)
-            thumb_box.pack()
-            photo = _thumb(p, fname)
-            lbl = tk.Label(thumb_box, image=photo, bg="white")
-            lbl.image = photo
-            lbl.pack(expand=True, anchor="center")
-            lbl.bind("<Button-3>", lambda e, src=p, name=fname: _save_file(src, name))
-            tk.Label(
-                cell,
-                text=fname,
-                bg="white",
-                wraplength=THUMB_SIDE,
-                justify="center",
-            ).pack(pady=(2, 0))
-
-        nav_label.config(text=f"{state['page'] + 1} / {total_pages}")
-        nav_prev.config(state="normal" if state["page"] > 0 else "disabled")
-        nav_next.config(
-            state="normal" if state["page"] < total_pages - 1 else "disabled"
-        )
-        parent.after(100, _preload_adjacent_pages)
-
-    def _set_page(new_page: int):
-        state["page"] = new_page
-        _render_page()
-
-    nav_prev.config(command=lambda: _set_page(state["page"] - 1))
-    nav_next.config(command=lambda: _set_page(state["page"] + 1))
-
-    # 인접 페이지 미리 로드
-    def _preload_adjacent_pages():
-        total_items = len(state["items"])
-        total_pages = (total_items + PAGE_SIZE - 1) // PAGE_SIZE
-        if total_pages <= 5:
+        first, last = _visible_rows()
+        wanted = set(range(first, last))
+        free = []
+        for row in state["rows"]:
+            if row.index in wanted:
+                wanted.discard(row.index)
+            else:
+                free.append(row)
+        for index in sorted(wanted):
+            if not free:
+                break
+            _bind_row(free.pop(), index)
+        for row in free:
+            if row.index != -1:
+                _unbind_row(row)
+        total = len(state["items"])
+        if total:
+            cols = state["cols"]
+            info_label.config(text=f"{first * cols + 1:,} – {min(last * cols, total):,} / {total:,}")
+        _schedule_load()
+
+    def _on_yscroll(first, last):
+        vsb.set(first, last)
+        _layout()
+
+    canvas.configure(yscrollcommand=_on_yscroll)
+
+    def _relayout(_=None):
+        """Fit the row pool and the scroll region to the canvas size and the item count."""
+        cw, ch = canvas.winfo_width(), canvas.winfo_height()
+        if cw <= 1:
+            return                                  # 아직 배치 전
+        cols = max(1, cw // CELL_W)
+        count = ch // CELL_H + 2                    # 부분적으로 보이는 위/아래 행 포함
+        if cols != state["cols"] or count != len(state["rows"]):
+            state["cols"] = cols
+            _build_rows(count, cols)
+        total_rows = -(-len(state["items"]) // cols)
+        grid_w, grid_h = cols * CELL_W, total_rows * CELL_H
+        state["origin"] = (max((cw - grid_w) // 2, 0), max((ch - grid_h) // 2, 0))
+        canvas.configure(scrollregion=(0, 0, cw, max(grid_h, ch)))
+        for row in state["rows"]:
+            _unbind_row(row)                        # 전부 다시 묶음
+        _layout()
+
+    canvas.bind("<Configure>", _relayout)
+
+    # 가까운 행을 미리 로드 (스크롤이 멈춘 뒤 한 번)
+    def _schedule_load():
+        if state["load_job"] is not None:
+            canvas.after_cancel(state["load_job"])
+        state["load_job"] = canvas.after(LOAD_DELAY_MS, _load_near_rows)
+
+    def _load_near_rows():
+        state["load_job"] = None
+        cols = state["cols"]
+        items = state["items"]
+        if not cols or not items or not canvas.winfo_exists():
             return
-        preload_range = 5
-        current = state["page"]
-        start_p = max(0, current - preload_range)
-        end_p = min(total_pages, current + preload_range + 1)
-        for page in range(start_p, end_p):
-            if page == current:
-                continue
-            page_start = page * PAGE_SIZE
-            page_end = min(page_start + PAGE_SIZE, total_items)
-            for p, fname in state["items"][page_start:page_end]:
-                if p not in state["thumbs"]:
-                    executor.submit(_preload_task, p, fname)
-
-    def _apply_filter(reset_page: bool = True):
+        first, last = _visible_rows()
+        span_rows = max(last - first, 1) * PRELOAD_SCREENS
+        visible = items[first * cols:last * cols]
+        _load_cached(visible)
+        for p, lbl in state["cells"].items():
+            photo = state["thumbs"].get(p)
+            if photo is not None and lbl.image is not photo:
+                lbl.configure(image=photo)
+                lbl.image = photo
+        # 지난 위치의 요청은 버리고 화면에 보이는 것부터 디코딩
+        thumb_pool.cancel_pending()
+        thumb_pool.request([(p, f) for p, f in visible if p not in state["thumbs"]], urgent=True)
+        # 가까운 행부터 (뒤에 넣은 요청이 나중에 디코딩됨)
+        near: List[Tuple[Path, str]] = []
+        for distance in range(1, span_rows + 1):
+            for index in (last - 1 + distance, first - distance):
+                if 0 <= index * cols < len(items):
+                    near.extend(items[index * cols:(index + 1) * cols])
+        _load_cached(near)
+        thumb_pool.request([(p, f) for p, f in near if p not in state["thumbs"]], urgent=False)
+
+    def _on_mousewheel(event):
+        if event.num == 4 or event.delta > 0:
+            canvas.yview_scroll(-WHEEL_UNITS, "units")
+        elif event.num == 5 or event.delta < 0:
+            canvas.yview_scroll(WHEEL_UNITS, "units")
+
+    def _bind_wheel(_=None):
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            canvas.bind_all(seq, _on_mousewheel)
+
+    def _unbind_wheel(event=None):
+        # 셀 위로 들어갈 때도 캔버스의 <Leave> 가 오므로 포인터가 정말 나갔는지 확인
+        if event is not None:
+            under = canvas.winfo_containing(event.x_root, event.y_root)
+            if under is not None and (under is canvas or str(under).startswith(str(canvas) + ".")):
+                return
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            canvas.unbind_all(seq)
+
+    canvas.bind("<Enter>", _bind_wheel)
+    canvas.bind("<Leave>", _unbind_wheel)
+    canvas.bind("<Destroy>", lambda e: _unbind_wheel() if e.widget is canvas else None)
+
+    def _apply_filter(reset_scroll: bool = True):
         mode = filter_state["mode"]
         state["items"] = state["items_total"] if mode == "total" else state["items_deleted"]
 
-        if reset_page:
-            state["page"] = 0
+        if reset_scroll:
             canvas.yview_moveto(0)
 
-        _render_page()
+        if state["items"]:
+            _hide_empty_msg()
+        else:
+            _show_empty_msg()
+            info_label.config(text="0 / 0")
+        _relayout()
 
         # 상태 토글 → pressed 가 적용되면 배경색도 자동 변경
         btn_total.state(["pressed"]  if mode == "total"  else ["!pressed"])
@@ -446,31 +423,4 @@ def display_photos_media(parent: tk.Widget, backup_path: str) -> None:
     btn_total.config(command=_choose_total)
     btn_deleted.config(command=_choose_deleted)
 
-    _scan()
-
-
-# ─────────────────────────────────────────────────────────────
-# 백업 DB 탐색
-# ─────────────────────────────────────────────────────────────
-def _enumerate_media_files(backup_root: Path):
-    manifest = backup_root / "Manifest.db"
-    if not manifest.exists():
-        return
-
-    conn = sqlite3.connect(manifest)
-    cur = conn.cursor()
-    query = (
-        "SELECT fileID, relativePath, file FROM Files "
-        "WHERE domain LIKE '%CameraRollDomain%' "
-        "AND relativePath LIKE '%Media/DCIM%' AND ("
-        "relativePath LIKE '%.png'  COLLATE NOCASE OR relativePath LIKE '%.jpg'  COLLATE NOCASE OR "
-        "relativePath LIKE '%.jpeg' COLLATE NOCASE OR relativePath LIKE '%.heic' COLLATE NOCASE OR "
-        "relativePath LIKE '%.dng'  COLLATE NOCASE OR relativePath LIKE '%.mov'  COLLATE NOCASE OR "
-        "relativePath LIKE '%.mp4'  COLLATE NOCASE)"
-    )
-    for file_id, rel, blob in cur.execute(query):
-        real_path = backup_root / file_id[:2] / file_id
-        if real_path.exists():
-            is_deleted = _is_trashed_blob(blob) if blob else False
-            yield real_path, Path(rel).name, is_deleted
-    conn.close()
+    threading.Thread(target=_scan, daemon=True).start()
@@ -12,15 +12,18 @@ PreviewManager
 - Offset, Hex 값, Decoded Text 헤더 표시
 """
 from __future__ import annotations
-import os, sqlite3, xml.etree.ElementTree as ET
+import os, xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, Optional
 
 import tkinter as tk
 import tkinter.ttk as ttk
-import cv2, rawpy, imageio_ffmpeg
+import cv2, imageio_ffmpeg
 from PIL import Image, ImageTk
 
+from artifact_analyzer.media.image_decode import open_image
+from backup_analyzer.manifest_index import get_manifest_index
+
 class PreviewManager:
     # AAE 제거 -> aae는 Hex 뷰어로 표시
     IMG_EXTS = {"png", "jpg", "jpeg", "heic", "dng"}  
@@ -67,15 +70,9 @@ class PreviewManager:
             self._video_state["cap"] = None
 
     @staticmethod
-    def _load_image(path: Path, ext: str):
-        if ext == "heic":
-            from pillow_heif import register_heif_opener
-            register_heif_opener()
-            return Image.open(path)
-        if ext == "dng":
-            with rawpy.imread(str(path)) as raw:
-                return Image.fromarray(raw.postprocess())
-        return Image.open(path)
+    def _load_image(path: Path, ext: str, size=None):
+        # 미리보기 크기만큼만 디코딩 (DNG 내장 미리보기, HEIC 썸네일, JPEG draft)
+        return open_image(path, size, ext=ext)
 
     # ────────────────────────── Hex View 관련 ──────────────────────────
     def _show_hexview(self, real_path: Path) -> None:
@@ -149,23 +146,20 @@ class PreviewManager:
             return
 
         backup_path = Path(self.backup_path_var.get())
-        mdb = backup_path / "Manifest.db"
-        if not mdb.exists():
+        index = get_manifest_index(str(backup_path), build=False)
+        if index is None:
             return
-        conn = sqlite3.connect(mdb)
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT fileID FROM Files WHERE domain=? AND relativePath=?",
-            (domain, rel),
-        )
-        row = cur.fetchone()
-        conn.close()
-        if not row:
+        file_id = index.file_id(domain, rel)
+        if not file_id:
             return
-        real_path = backup_path / row[0][:2] / row[0]
+        blob = index.blob_path(file_id)
 
         # Hex View 중이었다면 우선 숨긴다
         self._hide_hexview()
+        if blob is None:
+            self.preview_label.config(text="(File could not be decrypted.)", image="")
+            return
+        real_path = Path(blob)
 
         if ext in self.IMG_EXTS:
             self._show_image(real_path, ext)
@@ -178,9 +172,9 @@ class PreviewManager:
     # ─── 이미지 처리 ────────────────────────────────────────────
     def _show_image(self, real_path: Path, ext: str):
         try:
-            img = self._load_image(real_path, ext)
             w = self.preview_label.winfo_width() or 400
             h = self.preview_label.winfo_height() or 300
+            img = self._load_image(real_path, ext, (w, h))
             img.thumbnail((w, h))
             tk_img = ImageTk.PhotoImage(img)
             self.preview_label.config(image=tk_img, text="")
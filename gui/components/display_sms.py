@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import os
-import sqlite3
 import datetime as dt
 import tkinter as tk
 from tkinter import ttk, messagebox
 
 from artifact_analyzer.messenger.sms.sms_analyser import IMessageAnalyzer
+from artifact_analyzer.orchestrator import get_artifact_result
+from backup_analyzer.manifest_index import get_manifest_index
 
 try:
     from PIL import Image, ImageTk  # noqa: F401
@@ -22,16 +23,12 @@ def backup_file(root: str, rel: str) -> str:
 
     rel = rel.lstrip("~")
     rel = rel[1:] if rel.startswith("/") else rel
-    mdb = os.path.join(root, "Manifest.db")
+    index = get_manifest_index(root, build=False)
 
-    if os.path.exists(mdb):
-        with sqlite3.connect(mdb) as conn:
-            row = conn.execute(
-                "SELECT fileID FROM Files WHERE relativePath=? COLLATE NOCASE LIMIT 1",
-                (rel,),
-            ).fetchone()
-            if row:
-                return row[0]  # Only return fileID if found
+    if index is not None:
+        file_id = index.file_id_by_rel_path(rel, nocase=True)
+        if file_id:
+            return file_id  # Only return fileID if found
 
     return ""  # Return empty string if not found
 
@@ -55,11 +52,14 @@ def display_imessage(parent: tk.Misc, backup_path: str) -> None:
     for w in parent.winfo_children():
         w.destroy()
 
-    ana = IMessageAnalyzer(backup_path)
-    ok, err = ana.load()
-    if not ok:
-        messagebox.showerror("오류", err)
-        return
+    # 백그라운드 추출 결과(채팅 목록 + 메시지)가 있으면 그대로 사용
+    ana = get_artifact_result(backup_path, "imessage")
+    if ana is None:
+        ana = IMessageAnalyzer(backup_path)
+        ok, err = ana.load()
+        if not ok:
+            messagebox.showerror("오류", err)
+            return
 
     # ── styles ────────────────────────────────────────────────────────
     style = ttk.Style()
@@ -177,11 +177,20 @@ def display_imessage(parent: tk.Misc, backup_path: str) -> None:
                 ttk.Label(bubble, text=body_text, wraplength=wrap_len, justify="left", style=text_style).pack()
             else:
                 fid = backup_file(backup_path, attachment_rel)
-                full_path = backup_path + "/" + fid[:2]  + "/" + fid
+                index = get_manifest_index(backup_path, build=False)
+                full_path = index.blob_path(fid) if index and fid else backup_path + "/" + fid[:2]  + "/" + fid
                 ext = os.path.splitext(attachment_rel)[1].lstrip(".")
                 print(full_path, ext) # 해당 부분 아래를 수정해서, 이미지가 View되게 해줘
                 # ── attachment renderer ────────────────────────────────────────
-                if Image and ext.lower() in ("jpg", "jpeg", "png", "heic"):
+                if full_path is None:
+                    # 암호화 백업에서 복호화하지 못한 첨부파일
+                    ttk.Label(
+                        bubble,
+                        text=f"{attachment_rel} (could not be decrypted)",
+                        wraplength=wrap_len,
+                        style=text_style,
+                    ).pack()
+                elif Image and ext.lower() in ("jpg", "jpeg", "png", "heic"):
                     try:
                         # HEIC는 pillow-heif(또는 pyheif) 플러그인이 있을 때만 동작
                         img = None
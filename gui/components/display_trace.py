@@ -0,0 +1,103 @@
+"""
+Profile window: per-span totals of the hot-path tracer and Chrome trace export.
+
+Recording can be switched on before loading a backup; the table then shows
+where the load and the artifact extraction spent their time, and the whole
+timeline can be saved for ``chrome://tracing`` / Perfetto.
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from backup_analyzer import tracing
+
+_COLUMNS = (
+    ("name", "Span", 260, "w"),
+    ("calls", "Calls", 70, "e"),
+    ("total_ms", "Total (ms)", 90, "e"),
+    ("mean_ms", "Mean (ms)", 80, "e"),
+    ("max_ms", "Max (ms)", 80, "e"),
+    ("rows", "Rows", 90, "e"),
+    ("bytes", "Bytes", 110, "e"),
+)
+
+_window = None
+
+
+def open_trace_window(master) -> None:
+    """Show the profile window (raises the existing one if it is already open)."""
+    global _window
+    if _window is not None and _window.win.winfo_exists():
+        _window.win.deiconify()
+        _window.win.lift()
+        _window.refresh()
+        return
+    _window = _TraceWindow(master)
+
+
+class _TraceWindow:
+    def __init__(self, master):
+        self.win = tk.Toplevel(master)
+        self.win.title("Profile")
+        self.win.geometry("860x460")
+
+        bar = ttk.Frame(self.win, padding=(10, 8))
+        bar.pack(fill="x")
+        self.enabled_var = tk.IntVar(value=1 if tracing.is_enabled() else 0)
+        ttk.Checkbutton(
+            bar, text="Record spans", variable=self.enabled_var, command=self._toggle
+        ).pack(side="left")
+        ttk.Button(bar, text="Export Chrome trace…", command=self.export).pack(side="right", padx=2)
+        ttk.Button(bar, text="Reset", command=self.reset).pack(side="right", padx=2)
+        ttk.Button(bar, text="Refresh", command=self.refresh).pack(side="right", padx=2)
+
+        body = ttk.Frame(self.win, padding=(10, 0, 10, 10))
+        body.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(body, columns=[c[0] for c in _COLUMNS], show="headings")
+        for key, title, width, anchor in _COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor=anchor, stretch=(key == "name"))
+        vsb = ttk.Scrollbar(body, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        vsb.pack(side="right", fill="y")
+
+        self.status_lbl = ttk.Label(self.win, anchor="w", padding=(10, 0, 10, 8))
+        self.status_lbl.pack(fill="x")
+        self.refresh()
+
+    def _toggle(self) -> None:
+        tracing.enable(self.enabled_var.get() == 1)
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.tree.delete(*self.tree.get_children())
+        rows = tracing.summary()
+        for r in rows:
+            self.tree.insert("", "end", values=(
+                r["name"], r["calls"], f"{r['total_ms']:.1f}", f"{r['mean_ms']:.3f}",
+                f"{r['max_ms']:.1f}", r["rows"] or "", r["bytes"] or "",
+            ))
+        state = "recording" if tracing.is_enabled() else "off"
+        self.status_lbl.config(text=f"Tracing {state} – {len(rows)} span names")
+
+    def reset(self) -> None:
+        tracing.reset()
+        self.refresh()
+
+    def export(self) -> None:
+        path = filedialog.asksaveasfilename(
+            parent=self.win,
+            title="Export Chrome trace",
+            defaultextension=".json",
+            initialfile="ios-forensic-trace.json",
+            filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            count = tracing.write_chrome_trace(path)
+        except OSError as e:
+            messagebox.showerror("Export failed", str(e), parent=self.win)
+            return
+        self.status_lbl.config(text=f"{count} spans → {path}")
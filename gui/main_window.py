@@ -1,6 +1,6 @@
 # main_window.py
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import sys
 import os
 from PIL import Image, ImageTk
@@ -11,10 +11,13 @@ from gui.components.display_file_list import create_file_list_frame
 from gui.components.artifact_panel import create_artifact_analysis_options
 from gui.components.display_device_info import *
 from gui.components.toggle import *
-from gui.utils.load_backup import load_backup
+from gui.utils.load_backup import is_backup_loading, load_backup
 from gui.components.display_preview import PreviewManager
+from gui.components.display_trace import open_trace_window
 from gui.utils.events import *
-from backup_analyzer.backup_decrypt_utils import decrypt_iphone_backup
+from backup_analyzer.backup_decrypt_utils import decrypt_iphone_backup, open_encrypted_backup
+from backup_analyzer.decrypt_engine import DecryptionJournal
+from artifact_analyzer.orchestrator import start_artifact_extraction
 
 def start_gui() -> None:
     """GUI 애플리케이션을 초기화하고 시작합니다."""
@@ -59,6 +62,7 @@ def setup_gui(rootWindow: tk.Tk, colors: dict[str, str]) -> dict:
     # ─── 변수 ───────────────────────────────────────────────────
     backup_path_var = tk.StringVar()
     enable_pw_var = tk.IntVar(value=0)
+    cache_keys_var = tk.IntVar(value=0)
     password_var = tk.StringVar()
     backup_loaded_flag: dict[str, bool] = {"loaded": False}
 
@@ -94,6 +98,12 @@ def setup_gui(rootWindow: tk.Tk, colors: dict[str, str]) -> dict:
     load_backup_button = ttk.Button(btn_frame, text="Load", style="Accent.TButton", width=12)
     load_backup_button.pack(side="left", padx=2)
 
+    # span 기록 / Chrome trace 내보내기 (backup_analyzer.tracing)
+    profile_button = ttk.Button(
+        btn_frame, text="Profile", width=8, command=lambda: open_trace_window(rootWindow)
+    )
+    profile_button.pack(side="left", padx=2)
+
     # --- 비밀번호 프레임 ---------------------------------------
     pw_frame = ttk.Frame(
         control_frame, style="Card.TFrame", padding=10, height=uniform_height
@@ -116,6 +126,10 @@ def setup_gui(rootWindow: tk.Tk, colors: dict[str, str]) -> dict:
     pw_toggle_btn = ttk.Button(pw_grid, text="👁", width=3, style="Icon.TButton")
     pw_toggle_btn.pack(side="right", padx=5)
 
+    # 복호화 키 캐시(옵트인) → 같은 케이스 재오픈 시 PBKDF2 생략
+    cache_keys_check = ttk.Checkbutton(pw_grid, text="Remember keys", variable=cache_keys_var)
+    cache_keys_check.pack(side="right", padx=5)
+
     enable_pw_check.configure(
         command=lambda: toggle_password_entry(enable_pw_var, password_entry, password_var)
     )
@@ -172,16 +186,54 @@ def setup_gui(rootWindow: tk.Tk, colors: dict[str, str]) -> dict:
         backup_path = backup_path_var.get()
         password = password_var.get()
         is_encrypted = enable_pw_var.get() == 1
+        use_key_cache = cache_keys_var.get() == 1
 
-        if is_encrypted:
+        # 로드가 진행 중이면 load_backup 이 거절하므로 그 전에 키를 다시 풀지 않는다
+        if is_encrypted and not is_backup_loading():
             try:
-                # print("🔐 암호화된 백업이 감지되었습니다. 복호화를 시도합니다...")
-                decrypt_iphone_backup(password, backup_path)
+                # Manifest.db 만 복호화하고 나머지는 읽을 때 복호화(decrypt-on-read)
+                if not open_encrypted_backup(password, backup_path, use_key_cache=use_key_cache):
+                    return
             except Exception as e:
                 # print(f"❌ 복호화 중 오류 발생: {e}")
                 return  # 복호화 실패 시 더 이상 진행하지 않음
 
-        # 기존 load_backup 로직
+        def on_loaded():
+            notebook.tab(artifact_tab, state="normal")
+
+            # 모든 아티팩트를 백그라운드에서 미리 추출 → 패널은 결과를 바로 사용
+            orchestrator = start_artifact_extraction(backup_path)
+
+            # 전체 복호화는 선택 사항(백그라운드 진행, 중단 후 재개 가능)
+            if is_encrypted and not os.path.exists(os.path.join(backup_path, ".decryption_complete")):
+                if messagebox.askyesno(
+                    "Decrypt Backup",
+                    "The backup is readable now; files are decrypted on demand.\n"
+                    "Decrypt all remaining files in place in the background\n"
+                    "once artifact extraction has finished?",
+                ):
+                    # 중단된 이전 작업을 이어갈 때는 이미 끝난 파일을 먼저 검사할지 묻는다
+                    verify = os.path.exists(os.path.join(backup_path, DecryptionJournal.FILE_NAME)) and \
+                        messagebox.askyesno(
+                            "Resume Decryption",
+                            "An earlier decryption run was interrupted.\n"
+                            "Verify the files it already decrypted (size and file header)\n"
+                            "before resuming? Files still encrypted are decrypted again,\n"
+                            "damaged ones are reported.",
+                        )
+
+                    # 추출 워커 프로세스가 같은 blob 을 읽는 동안 교체하지 않도록 끝난 뒤 시작
+                    # (이 프로세스의 패널 읽기는 VirtualBackup.replace_in_place 가 조율)
+                    def _decrypt_when_extracted():
+                        if not orchestrator.done_event.is_set():
+                            rootWindow.after(500, _decrypt_when_extracted)
+                            return
+                        decrypt_iphone_backup(password, backup_path, verify=verify,
+                                              use_key_cache=use_key_cache)
+
+                    _decrypt_when_extracted()
+
+        # load_backup 은 백그라운드로 진행되고 완료 시 on_loaded 호출
         load_backup(
             backup_path,
             password,
@@ -192,11 +244,9 @@ def setup_gui(rootWindow: tk.Tk, colors: dict[str, str]) -> dict:
             file_list_widgets["file_list_tree"],
             icon_dict=icon_dict,
             flag_container=backup_loaded_flag,
+            on_complete=on_loaded,
         )
 
-        if backup_loaded_flag.get("loaded"):
-            notebook.tab(artifact_tab, state="normal")
-
     load_backup_button.configure(command=on_load_backup)
 
     backup_tree.bind(
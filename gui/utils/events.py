@@ -74,6 +74,7 @@ def update_file_list_from_backup_tree_click(event, file_list_tree, tree_widget,
         parent="",
         full_path=full_path,
         backup_path=backup_path,
+        dir_stats=getattr(tree_widget, "dir_stats", None),
     )
 
 
@@ -96,10 +97,11 @@ def update_backup_tree_from_file_list_double_click(event, file_list_tree, tree_w
         tree_widget.see(node_id)
 
 import os
-import sqlite3
 import shutil
 from tkinter import filedialog
 
+from backup_analyzer.manifest_index import get_manifest_index
+
 def show_file_paths(event, file_list_tree, backup_path_var):
     item_id = file_list_tree.identify_row(event.y)
     if not item_id:
@@ -125,33 +127,24 @@ def show_file_paths(event, file_list_tree, backup_path_var):
     #print(f"relativePath  : {relativePath}")
     #print(f"backup_path   : {backup_path_var}")
 
-    manifest_db_path = os.path.join(backup_path_var, "Manifest.db")
-    if not os.path.exists(manifest_db_path):
-        #print(f"[Error] Manifest.db not found at {manifest_db_path}")
+    index = get_manifest_index(backup_path_var, build=False)
+    if index is None:
+        #print(f"[Error] Manifest.db not found at {backup_path_var}")
         return
 
-    try:
-        conn = sqlite3.connect(manifest_db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT fileID FROM Files WHERE domain = ? AND relativePath = ?",
-            (domain, relativePath),
-        )
-        row = cursor.fetchone()
-        conn.close()
-        if not row:
-            print("[Info] Manifest.db에서 일치하는 파일을 찾지 못했습니다.")
-            return
-        fileID = row[0]
-        #print(f"fileID        : {fileID}")
-    except Exception as e:
-        print(f"[Error] SQLite 처리 중 오류 발생: {e}")
+    fileID = index.file_id(domain, relativePath)
+    if not fileID:
+        print("[Info] Manifest.db에서 일치하는 파일을 찾지 못했습니다.")
         return
+    #print(f"fileID        : {fileID}")
 
-    src_path = os.path.join(backup_path_var, fileID[:2], fileID)
+    src_path = index.blob_path(fileID)
     #print(f"filePath      : {src_path}")
     #print(f"fileName      : {fileName}")
 
+    if src_path is None:
+        print("[Error] 백업 파일을 복호화하지 못했습니다.")
+        return
     if not os.path.exists(src_path):
         print("[Error] 백업 파일이 존재하지 않습니다.")
         return
@@ -1,9 +1,26 @@
 import os
-from tkinter import messagebox
+import queue
+import threading
+import tkinter as tk
+from tkinter import messagebox, ttk
 
-from backup_analyzer.manifest_utils import load_manifest_plist, load_manifest_db
+from backup_analyzer.manifest_utils import load_manifest_plist
+from backup_analyzer.manifest_index import get_manifest_index
+from backup_analyzer.manifest_cache import save_manifest_cache
 from backup_analyzer.build_tree import *
 from backup_analyzer.backup_decrypt_utils import is_backup_encrypted
+from backup_analyzer.integrity import verify_backup
+from backup_analyzer.tracing import span
+from backup_analyzer.virtual_backup import get_virtual_backup
+
+
+# 진행 중인 로드의 cancel 이벤트 (메인 스레드에서만 바꿈)
+_active_load: threading.Event | None = None
+
+
+def is_backup_loading() -> bool:
+    """True while a load_backup pipeline is running."""
+    return _active_load is not None
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -18,17 +35,36 @@ def load_backup(
     status_label=None,
     icon_dict=None,
     flag_container=None,
+    on_complete=None,
+    verify_integrity=True,
 ) -> None:
     """
     • `.decrypting` 플래그가 존재하면 “복호화 진행/미완료” 오류 후 종료.
+      단, 비밀번호로 decrypt-on-read 계층이 열려 있으면 그대로 로드한다.
     • 백업이 아직 암호화돼 있고 `.decryption_complete` 가 없다면
       기존과 동일하게 로드 차단.
+    • Manifest 읽기·인덱스·트리 모델 구축은 워커 스레드에서 진행되고
+      (진행률 창 + Cancel), 완료되면 메인 스레드에서 Treeview 를 채운 뒤
+      `flag_container["loaded"]` 를 세우고 `on_complete()` 를 호출한다.
+    • verify_integrity 가 참이면 같은 워커에서 무결성 검증(fileID 해시,
+      blob 누락/고아 파일)을 수행하고 결과를 완료 알림에 함께 보여준다.
+    • 로드가 진행 중이면 새 로드 요청은 거절한다 (먼저 Cancel 하거나
+      끝날 때까지 기다려야 함).
     """
+    global _active_load
+    if _active_load is not None:
+        messagebox.showinfo(
+            "Loading",
+            "Another backup is still loading.\n"
+            "Cancel it or wait for it to finish before loading again.",
+        )
+        return
+
     decrypting_flag   = os.path.join(backup_path, ".decrypting")
     completed_flag    = os.path.join(backup_path, ".decryption_complete")
 
     # ── 미완료/진행 중 검사 ────────────────────────────────────
-    if os.path.exists(decrypting_flag):
+    if os.path.exists(decrypting_flag) and get_virtual_backup(backup_path) is None:
         messagebox.showerror(
             "Error",
             "Decryption is still in progress or was cancelled before completion.\n"
@@ -45,48 +81,206 @@ def load_backup(
     def update_status(message: str) -> None:
         if status_label:
             status_label.config(text=message)
-            status_label.update()
+            status_label.update_idletasks()
 
     update_status("Checking backup directory...")
     if not check_backup_directory(backup_path):
         update_status("Error: Invalid backup directory")
         return
 
-    update_status("Loading Manifest.plist file...")
-    manifest_data = load_manifest_plist(backup_path)
-    if not manifest_data:
-        update_status("Error: Manifest.plist file not found")
-        messagebox.showwarning("Warning", "Manifest.plist file could not be found.")
-        return
+    # ── 백그라운드 파이프라인(plist → index → tree model) ─────────
+    #     Tk 위젯은 메인 스레드에서만 다루고, 워커는 큐로 단계/진행률만 보낸다.
+    q: queue.Queue = queue.Queue()
+    cancel_event = threading.Event()
+    dialog = _LoadProgressDialog(tree_widget.winfo_toplevel(), cancel_event.set)
+    _active_load = cancel_event
 
-    update_status("Loading Manifest.db file...")
-    file_info_list = load_manifest_db(backup_path)
-    if not file_info_list:
-        update_status("Error: Manifest.db file not found")
-        messagebox.showwarning("Warning", "Manifest.db file could not be found.")
-        return
+    def worker():
+        try:
+            q.put(("stage", "Loading Manifest.plist file...", 0))
+            with span("load_backup.plist", "load_backup"):
+                manifest_plist = load_manifest_plist(backup_path)
+            if not manifest_plist:
+                q.put(("warning", "Error: Manifest.plist file not found",
+                       "Manifest.plist file could not be found."))
+                return
 
-    update_status("Building file tree...")
-    file_tree, _ = build_tree(file_info_list)
+            q.put(("stage", "Indexing Manifest.db file...", _STAGE_INDEX[0]))
+            with span("load_backup.index", "load_backup") as s:
+                manifest_index = get_manifest_index(
+                    backup_path,
+                    progress=lambda done, total: q.put(("rows", done, total)),
+                    cancel_event=cancel_event,
+                )
+                if manifest_index:
+                    s.set(rows=len(manifest_index), from_cache=manifest_index.from_cache)
+            if cancel_event.is_set():
+                q.put(("cancelled",))
+                return
+            if not manifest_index:
+                q.put(("warning", "Error: Manifest.db file not found",
+                       "Manifest.db file could not be found."))
+                return
 
-    update_status("Building backup tree...")
-    if icon_dict:
-        path_dict, backup_tree_nodes = build_backup_tree(
-            tree_widget, file_tree, icon_dict
-        )
-    else:
-        path_dict, backup_tree_nodes = build_backup_tree(tree_widget, file_tree)
+            q.put(("stage", "Building file tree...", _STAGE_INDEX[1]))
+            with span("load_backup.build_tree", "load_backup"):
+                file_tree, _ = build_tree(manifest_index)
+            if cancel_event.is_set():
+                q.put(("cancelled",))
+                return
+
+            q.put(("stage", "Computing directory sizes...", 92))
+            with span("load_backup.dir_stats", "load_backup"):
+                dir_stats = compute_dir_stats(file_tree, manifest_index)
+            if cancel_event.is_set():
+                q.put(("cancelled",))
+                return
+
+            report = None
+            if verify_integrity:
+                q.put(("stage", "Verifying backup integrity...", _STAGE_VERIFY[0]))
+                with span("load_backup.verify", "load_backup"):
+                    report = verify_backup(
+                        backup_path,
+                        index=manifest_index,
+                        progress=lambda done, total: q.put(("buckets", done, total)),
+                        cancel_event=cancel_event,
+                    )
+                if cancel_event.is_set():
+                    q.put(("cancelled",))
+                    return
+
+            if not manifest_index.from_cache:
+                q.put(("stage", "Saving manifest cache...", 97))
+                with span("load_backup.save_cache", "load_backup"):
+                    save_manifest_cache(manifest_index)
+
+            q.put(("result", manifest_index, file_tree, dir_stats, report))
+        except Exception as e:
+            q.put(("error", f"Error loading backup\n{e}"))
+
+    def finish(manifest_index, file_tree, dir_stats, report):
+        update_status("Building backup tree...")
+        with span("load_backup.backup_tree", "load_backup"):
+            if icon_dict:
+                path_dict, backup_tree_nodes = build_backup_tree(
+                    tree_widget, file_tree, icon_dict, dir_stats=dir_stats, lazy=True
+                )
+            else:
+                path_dict, backup_tree_nodes = build_backup_tree(
+                    tree_widget, file_tree, dir_stats=dir_stats, lazy=True
+                )
+
+        tree_widget.path_dict = path_dict
+        tree_widget.dir_stats = dir_stats
+        tree_widget.backup_tree_nodes = backup_tree_nodes
+        tree_widget.manifest_index = manifest_index
+        tree_widget.integrity_report = report
+
+        file_list_tree.delete(*file_list_tree.get_children())
+
+        dialog.close()
+        if report is not None and not report.ok:
+            update_status("Backup loaded with integrity warnings")
+            messagebox.showwarning(
+                "Integrity",
+                "Backup has been loaded, but integrity verification found problems:\n\n"
+                + report.describe(),
+            )
+        else:
+            update_status("Backup loaded successfully")
+            messagebox.showinfo("Complete", "Backup has been successfully loaded!")
+
+        if flag_container is not None:
+            flag_container["loaded"] = True
+        if on_complete is not None:
+            on_complete()
+
+    def poll():
+        global _active_load
+        while True:
+            try:
+                tag, *payload = q.get_nowait()
+            except queue.Empty:
+                break
+            if tag in ("warning", "error", "cancelled", "result"):
+                _active_load = None              # 워커 종료 → 다음 로드 허용
+            if tag == "stage":
+                message, percent = payload
+                update_status(message)
+                dialog.set_stage(message, percent)
+            elif tag == "rows":
+                done, total = payload
+                lo, hi = _STAGE_INDEX
+                dialog.set_progress(lo + (hi - lo) * done / total if total else lo,
+                                    f"{done:,}/{total:,} rows")
+            elif tag == "buckets":
+                done, total = payload
+                lo, hi = _STAGE_VERIFY
+                dialog.set_progress(lo + (hi - lo) * done / total, f"{done}/{total} folders")
+            elif tag == "warning":
+                dialog.close()
+                update_status(payload[0])
+                messagebox.showwarning("Warning", payload[1])
+                return
+            elif tag == "error":
+                dialog.close()
+                update_status("Error: backup could not be loaded")
+                messagebox.showerror("Error", payload[0])
+                return
+            elif tag == "cancelled":
+                dialog.close()
+                update_status("Backup load cancelled")
+                return
+            elif tag == "result":
+                finish(*payload)
+                return
+        tree_widget.after(50, poll)
+
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
+
+
+_STAGE_INDEX = (2, 80)   # index 단계가 차지하는 진행률 구간(%)
+_STAGE_VERIFY = (93, 97) # 무결성 검증 구간(%)
+
+
+class _LoadProgressDialog:
+    """Staged progress window with a Cancel button (main thread only)."""
+
+    def __init__(self, master, on_cancel):
+        self._on_cancel = on_cancel
+        self.win = tk.Toplevel(master)
+        self.win.title("Loading Backup")
+        self.win.transient(master)
+        self.stage_lbl = tk.Label(self.win, text="Preparing...", pady=10, anchor="w")
+        self.stage_lbl.pack(fill="x", padx=18)
+        self.bar = ttk.Progressbar(self.win, length=420, mode="determinate", maximum=100)
+        self.bar.pack(padx=18, pady=4)
+        self.detail_lbl = tk.Label(self.win, text="", anchor="e")
+        self.detail_lbl.pack(fill="x", padx=18)
+        ttk.Button(self.win, text="Cancel", command=self.cancel).pack(pady=(6, 14))
+        self.win.protocol("WM_DELETE_WINDOW", self.cancel)
+
+    def set_stage(self, message: str, percent: float) -> None:
+        if self.win.winfo_exists():
+            self.stage_lbl.config(text=message)
+            self.bar["value"] = percent
+            self.detail_lbl.config(text="")
 
-    tree_widget.path_dict = path_dict
-    tree_widget.backup_tree_nodes = backup_tree_nodes
+    def set_progress(self, percent: float, detail: str) -> None:
+        if self.win.winfo_exists():
+            self.bar["value"] = percent
+            self.detail_lbl.config(text=detail)
 
-    file_list_tree.delete(*file_list_tree.get_children())
+    def cancel(self) -> None:
+        self._on_cancel()
+        self.stage_lbl.config(text="Cancelling...")
 
-    update_status("Backup loaded successfully")
-    messagebox.showinfo("Complete", "Backup has been successfully loaded!")
+    def close(self) -> None:
+        if self.win.winfo_exists():
+            self.win.destroy()
 
-    if flag_container is not None:
-        flag_container["loaded"] = True
 
 def check_backup_directory(backup_path: str) -> bool:
     """Validate the backup directory path."""
@@ -0,0 +1,321 @@
+"""
+Headless batch analysis: ``python main.py analyze <backup> --out <dir>``.
+
+Runs every artifact analyzer against one backup without the GUI – as
+concurrent jobs of the ``ArtifactOrchestrator`` – and writes
+machine-readable results as each job completes:
+
+* ``<out>/<stage>.json`` – the records each analyzer produced;
+* ``<out>/summary.json`` – per-stage status, record count, wall time and
+  error text, plus the backup / manifest facts and the largest directories
+  by recursive size (``--largest-dirs``).
+
+Results also go to the backup's case store, so a second run over the same
+backup only re-runs what changed or failed, and a later backup of the same
+device only re-runs the analyzers whose source files changed (``--full``
+re-runs everything, ``--no-case-store`` disables the store).
+
+The normalized tables of the case store are exported on request:
+``--timeline N`` writes ``<out>/timeline.json`` (the first N messages,
+calls, browser visits, calendar events and note edits merged by time) and
+``--number <phone>`` (repeatable) writes ``<out>/numbers.json`` with the
+contacts, calls and conversations that involve each number.
+
+``--trace <file>`` records hot-path spans (Manifest decode, lookups, SQLite
+queries, every analyzer – worker processes included) and writes them as a
+Chrome trace-event file for ``chrome://tracing`` / Perfetto; the per-span
+totals also go to ``summary.json`` (and to stdout with ``--trace-summary``).
+
+Exit code: 0 when every stage finished (an artifact that is simply not in
+the backup counts as finished), 1 when at least one stage failed, 2 when the
+backup itself cannot be opened.
+
+tkinter is blocked in ``sys.modules`` before any analyzer is imported, so a
+GUI dependency creeping into an analyzer fails loudly here instead of
+silently pulling Tk into batch runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+EXIT_OK = 0
+EXIT_STAGE_FAILED = 1
+EXIT_BAD_BACKUP = 2
+
+# ─────────────────────────────────────────────────────────────────
+# JSON 변환
+# ─────────────────────────────────────────────────────────────────
+def to_jsonable(value: Any) -> Any:
+    """Analyzer results (DataFrames, DTOs with ``__slots__``, datetimes, bytes) → JSON types."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (_dt.datetime, _dt.date, _dt.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, "to_dict") and hasattr(value, "columns"):          # pandas.DataFrame
+        return [to_jsonable(rec) for rec in value.to_dict(orient="records")]
+    if hasattr(value, "isoformat"):                                       # pandas.Timestamp
+        return value.isoformat()
+    if hasattr(value, "item"):                                            # numpy scalar
+        return value.item()
+    return _object_record(value)
+
+
+def _object_record(obj: Any) -> Any:
+    """Public attributes and properties of a DTO object."""
+    fields: Dict[str, Any] = {}
+    for name in getattr(obj, "__dict__", {}):
+        fields[name] = getattr(obj, name)
+    for klass in type(obj).__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if hasattr(obj, name):
+                fields[name] = getattr(obj, name)
+        for name, attr in vars(klass).items():
+            if isinstance(attr, property) and name not in fields:
+                try:
+                    fields[name] = getattr(obj, name)
+                except Exception:
+                    pass
+    if not fields:
+        return str(obj)
+    return {k: to_jsonable(v) for k, v in fields.items() if not k.startswith("_")}
+
+
+def _write_json(path: str, payload: Any) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(payload, fp, ensure_ascii=False, indent=1, default=str)
+    os.replace(tmp, path)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 실행
+# ─────────────────────────────────────────────────────────────────
+def _summary_entry(result, out_dir: str) -> Dict[str, Any]:
+    """Write ``<out>/<stage>.json`` for a finished job and return its summary entry."""
+    from artifact_analyzer.orchestrator import STATUS_OK
+
+    entry: Dict[str, Any] = {
+        "stage": result.name, "status": result.status, "count": result.count,
+        "elapsed_sec": round(result.elapsed, 3), "error": result.error, "output": None,
+        "memory_estimate": result.estimate, "from_case_store": result.cached,
+    }
+    if result.trace:
+        entry["traceback"] = result.trace
+    if result.status == STATUS_OK:
+        entry["output"] = f"{result.name}.json"
+        _write_json(os.path.join(out_dir, entry["output"]), to_jsonable(result.value))
+    return entry
+
+
+def _open_backup(backup_path: str, password: Optional[str], use_key_cache: bool) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Unlock (if needed) and index the backup. Returns (error, facts)."""
+    from backup_analyzer.backup_unlock import is_backup_encrypted, unlock_backup
+    from backup_analyzer.manifest_index import get_manifest_index
+    from backup_analyzer.virtual_backup import register_virtual_backup
+
+    facts: Dict[str, Any] = {"encrypted": False}
+    if not os.path.isfile(os.path.join(backup_path, "Manifest.plist")):
+        return "Manifest.plist not found – not an iOS backup folder", facts
+
+    if is_backup_encrypted(backup_path) or os.path.exists(os.path.join(backup_path, ".decrypting")):
+        facts["encrypted"] = True
+        if not password:
+            return "Backup is encrypted: pass --password or set IOS_FORENSIC_PASSWORD", facts
+        class_keys, err = unlock_backup(password, backup_path, use_key_cache)
+        if err:
+            return err.replace("\n", " "), facts
+        register_virtual_backup(backup_path, class_keys)
+
+    started = time.perf_counter()
+    index = get_manifest_index(backup_path)
+    if index is None:
+        return "Manifest.db could not be read", facts
+    facts["manifest_rows"] = len(index)
+    facts["manifest_from_cache"] = index.from_cache
+    facts["manifest_elapsed_sec"] = round(time.perf_counter() - started, 3)
+    return None, facts
+
+
+def _largest_directories(backup_path: str, limit: int) -> List[Dict[str, Any]]:
+    """The *limit* directories with the largest recursive size, from the load-time rollup."""
+    from backup_analyzer.build_tree import build_tree, compute_dir_stats, largest_directories
+    from backup_analyzer.manifest_index import get_manifest_index
+
+    index = get_manifest_index(backup_path)
+    if index is None:
+        return []
+    file_tree, _ = build_tree(index)
+    out = []
+    for tree_path, st in largest_directories(compute_dir_stats(file_tree, index), limit):
+        _, domain, *rel = tree_path.split("/", 2)          # "<domain>/<domain>[/<relativePath>]"
+        out.append({"domain": domain, "relative_path": rel[0] if rel else "", "total_bytes": st.total_bytes,
+                    "file_count": st.file_count, "newest_mtime": st.newest_mtime})
+    return out
+
+
+def _export_case_queries(store, args: argparse.Namespace) -> Dict[str, Any]:
+    """Write ``timeline.json`` / ``numbers.json`` from the case store's normalized tables."""
+    exported: Dict[str, Any] = {}
+    if args.timeline > 0:
+        rows = [dict(r) for r in store.timeline(limit=args.timeline)]
+        _write_json(os.path.join(args.out, "timeline.json"), to_jsonable(rows))
+        exported["timeline"] = {"entries": len(rows), "output": "timeline.json"}
+    if args.number:
+        activity = {
+            number: {kind: [dict(r) for r in rows] for kind, rows in store.activity_for_number(number).items()}
+            for number in args.number
+        }
+        _write_json(os.path.join(args.out, "numbers.json"), to_jsonable(activity))
+        exported["numbers"] = {"numbers": len(activity), "output": "numbers.json"}
+    return exported
+
+
+def _parse_args(argv: List[str], stage_names: Iterable[str]) -> argparse.Namespace:
+    stage_names = list(stage_names)
+    parser = argparse.ArgumentParser(
+        prog="main.py analyze",
+        description="Run every artifact analyzer on an iOS backup and write JSON results.",
+    )
+    parser.add_argument("backup", help="iOS backup folder (contains Manifest.plist / Manifest.db)")
+    parser.add_argument("--out", required=True, help="output directory for <stage>.json and summary.json")
+    parser.add_argument("--password", default=os.environ.get("IOS_FORENSIC_PASSWORD"),
+                        help="backup password (default: $IOS_FORENSIC_PASSWORD)")
+    parser.add_argument("--key-cache", action="store_true",
+                        help="reuse / store unlocked class keys to skip PBKDF2 on later runs")
+    parser.add_argument("--stages", default=",".join(stage_names),
+                        help=f"comma-separated subset of: {', '.join(stage_names)}")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="analyzer worker processes (0 = run in this process; default: by CPU count)")
+    parser.add_argument("--memory-budget", type=int, default=None, metavar="MIB",
+                        help="estimated memory allowed for concurrently running analyzers")
+    parser.add_argument("--no-case-store", action="store_true",
+                        help="neither reuse nor write the backup's case store (.case_store.sqlite)")
+    parser.add_argument("--full", action="store_true",
+                        help="re-run every analyzer instead of reusing unchanged results of a previous backup of the device")
+    parser.add_argument("--verify", action="store_true",
+                        help="also run the backup integrity check (integrity.json)")
+    parser.add_argument("--timeline", type=int, default=0, metavar="N",
+                        help="write the first N cross-artifact timeline entries from the case store (timeline.json)")
+    parser.add_argument("--number", action="append", default=[], metavar="PHONE",
+                        help="write contacts, calls and conversations involving PHONE (numbers.json, repeatable)")
+    parser.add_argument("--largest-dirs", type=int, default=20, metavar="N",
+                        help="list the N largest directories by recursive size in summary.json (0 = skip)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record hot-path spans and write them as a Chrome trace (chrome://tracing, Perfetto)")
+    parser.add_argument("--trace-summary", action="store_true",
+                        help="print per-span totals when the run finishes (implies tracing)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    sys.modules.setdefault("tkinter", None)        # import tkinter → ImportError
+    from artifact_analyzer.orchestrator import (
+        DEFAULT_MEMORY_BUDGET, JOBS, STATUS_FAILED, ArtifactOrchestrator,
+    )
+
+    try:
+        args = _parse_args(sys.argv[1:] if argv is None else argv, JOBS)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_BAD_BACKUP
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in JOBS]
+    if unknown:
+        print(f"[Analyze] unknown stage(s): {', '.join(unknown)}", file=sys.stderr)
+        return EXIT_BAD_BACKUP
+
+    from backup_analyzer import tracing
+
+    if args.trace or args.trace_summary:
+        tracing.enable()
+    backup_path = os.path.abspath(args.backup)
+    os.makedirs(args.out, exist_ok=True)
+    summary: Dict[str, Any] = {
+        "backup_path": backup_path,
+        "started_at": _dt.datetime.now().isoformat(timespec="seconds"),
+        "stages": [],
+    }
+
+    started = time.perf_counter()
+    err, facts = _open_backup(backup_path, args.password, args.key_cache)
+    summary.update(facts)
+    if err:
+        print(f"[Analyze] {err}", file=sys.stderr)
+        summary.update(error=err, exit_code=EXIT_BAD_BACKUP,
+                       elapsed_sec=round(time.perf_counter() - started, 3))
+        _write_json(os.path.join(args.out, "summary.json"), summary)
+        return EXIT_BAD_BACKUP
+
+    if args.verify:
+        from backup_analyzer.integrity import verify_backup
+
+        t0 = time.perf_counter()
+        report = verify_backup(backup_path)
+        if report is not None:
+            _write_json(os.path.join(args.out, "integrity.json"), report.summary())
+        summary["integrity"] = {
+            "ok": None if report is None else report.ok,
+            "elapsed_sec": round(time.perf_counter() - t0, 3),
+            "output": None if report is None else "integrity.json",
+        }
+
+    if args.largest_dirs > 0:
+        summary["largest_directories"] = _largest_directories(backup_path, args.largest_dirs)
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    orchestrator = ArtifactOrchestrator(
+        backup_path,
+        jobs=stages,
+        workers=args.workers,
+        memory_budget=(args.memory_budget * 1024 ** 2 if args.memory_budget else DEFAULT_MEMORY_BUDGET),
+        on_result=lambda result: entries.__setitem__(result.name, _summary_entry(result, args.out)),
+        case_store=not args.no_case_store,
+        incremental=not args.full,
+    )
+    orchestrator.run()
+    summary["workers"] = orchestrator.workers
+    if not args.no_case_store:
+        from artifact_analyzer.case_store import get_case_store
+
+        store = get_case_store(backup_path)
+        summary["case_store"] = store.path if store is not None else None
+        summary["previous_case"] = store.previous if store is not None else None
+        if store is not None and os.path.exists(store.path):
+            summary.update(_export_case_queries(store, args))
+    elif args.timeline > 0 or args.number:
+        print("[Analyze] --timeline / --number read the case store; ignored with --no-case-store",
+              file=sys.stderr)
+    summary["stages"] = [entries[name] for name in stages if name in entries]
+
+    failed = [s["stage"] for s in summary["stages"] if s["status"] == STATUS_FAILED]
+    exit_code = EXIT_STAGE_FAILED if failed else EXIT_OK
+    summary.update(failed=failed, exit_code=exit_code,
+                   elapsed_sec=round(time.perf_counter() - started, 3))
+    if tracing.is_enabled():
+        summary["trace"] = {"file": os.path.abspath(args.trace) if args.trace else None,
+                            "spans": tracing.summary()}
+        if args.trace:
+            count = tracing.write_chrome_trace(args.trace)
+            print(f"[Analyze] {count} spans → {os.path.abspath(args.trace)}")
+        if args.trace_summary:
+            print(tracing.format_summary())
+    _write_json(os.path.join(args.out, "summary.json"), summary)
+    print(f"[Analyze] done in {summary['elapsed_sec']}s → {os.path.abspath(args.out)}"
+          + (f" (failed: {', '.join(failed)})" if failed else ""))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
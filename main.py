@@ -1,4 +1,5 @@
 import importlib
+import multiprocessing
 import sys
 import subprocess
 from pathlib import Path
@@ -30,6 +31,11 @@ def check_requirements(requirements_path="requirements.txt"):
         sys.exit(1)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # decryption worker processes (frozen builds)
+    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
+        # headless batch run – never imports the GUI / tkinter
+        from headless.analyze import main as analyze_main
+        sys.exit(analyze_main(sys.argv[2:]))
     #check_requirements()
     from gui.main_window import start_gui
     start_gui()
\ No newline at end of file
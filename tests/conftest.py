@@ -0,0 +1,101 @@
+"""
+Shared fixtures: a tiny on-disk iOS backup (``Manifest.db`` + hashed blobs)
+built from explicit rows, so every test knows exactly what the index holds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import plistlib
+import sqlite3
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backup_analyzer.manifest_index import FLAG_DIRECTORY, FLAG_FILE, drop_manifest_index  # noqa: E402
+
+
+def file_id_of(domain: str, rel_path: str) -> str:
+    return hashlib.sha1(f"{domain}-{rel_path}".encode("utf-8")).hexdigest()
+
+
+def mbfile_blob(
+    size: int = 0,
+    mtime: int = 1_600_000_000,
+    birth: int = 1_500_000_000,
+    mode: int = 0o100644,
+    inode: int = 1,
+    protection: int = 3,
+    trashed: bool = False,
+    extra=None,
+) -> bytes:
+    """NSKeyedArchiver ``MBFile`` blob as found in ``Files.file``."""
+    mbfile = {
+        "$class": plistlib.UID(2),
+        "Size": size, "LastModified": mtime, "Birth": birth, "Mode": mode,
+        "InodeNumber": inode, "ProtectionClass": protection,
+        "UserID": 501, "GroupID": 501, "Flags": 0,
+    }
+    objects = ["$null", mbfile, {"$classname": "MBFile", "$classes": ["MBFile", "NSObject"]}]
+    if trashed:
+        xattrs = plistlib.dumps({"com.apple.assetsd.trashed": b"\x01"}, fmt=plistlib.FMT_BINARY)
+        mbfile["ExtendedAttributes"] = plistlib.UID(len(objects))
+        objects.append(xattrs)
+    for key, value in (extra or {}).items():
+        mbfile[key] = plistlib.UID(len(objects))
+        objects.append(value)
+    archive = {
+        "$version": 100000, "$archiver": "NSKeyedArchiver",
+        "$top": {"root": plistlib.UID(1)}, "$objects": objects,
+    }
+    return plistlib.dumps(archive, fmt=plistlib.FMT_BINARY)
+
+
+def write_backup(root: str, rows) -> str:
+    """
+    Write ``Manifest.db`` for *rows* of ``(domain, relativePath, payload)``.
+
+    ``payload`` None makes a directory row; bytes make a file row whose blob
+    is written under ``<xx>/<fileID>``.
+    """
+    os.makedirs(root, exist_ok=True)
+    with sqlite3.connect(os.path.join(root, "Manifest.db")) as conn:
+        conn.execute("CREATE TABLE Files (fileID TEXT PRIMARY KEY, domain TEXT, "
+                     "relativePath TEXT, flags INTEGER, file BLOB)")
+        for inode, (domain, rel_path, payload) in enumerate(rows, 1):
+            file_id = file_id_of(domain, rel_path)
+            if payload is None:
+                flags, blob = FLAG_DIRECTORY, mbfile_blob(mode=0o40755, inode=inode)
+            else:
+                flags, blob = FLAG_FILE, mbfile_blob(size=len(payload), mtime=1_600_000_000 + inode, inode=inode)
+                os.makedirs(os.path.join(root, file_id[:2]), exist_ok=True)
+                with open(os.path.join(root, file_id[:2], file_id), "wb") as fp:
+                    fp.write(payload)
+            conn.execute("INSERT INTO Files VALUES (?, ?, ?, ?, ?)", (file_id, domain, rel_path, flags, blob))
+    return root
+
+
+SAMPLE_ROWS = [
+    ("HomeDomain", "", None),
+    ("HomeDomain", "Library", None),
+    ("HomeDomain", "Library/SMS", None),
+    ("HomeDomain", "Library/SMS/sms.db", b"sqlite"),
+    ("HomeDomain", "Library/Preferences/com.apple.Foo.plist", b"<plist/>"),
+    ("CameraRollDomain", "Media/DCIM/100APPLE", None),
+    ("CameraRollDomain", "Media/DCIM/100APPLE/IMG_0001.JPG", b"\xff\xd8jpeg"),
+    ("CameraRollDomain", "Media/DCIM/100APPLE/IMG_0002.PNG", b"\x89PNG"),
+    ("AppDomain-com.example.app", "Documents/Notes.DB", b"notes"),
+]
+
+
+@pytest.fixture
+def sample_backup(tmp_path):
+    """Path of a backup holding :data:`SAMPLE_ROWS`; its shared index is dropped afterwards."""
+    path = write_backup(str(tmp_path / "backup"), SAMPLE_ROWS)
+    yield path
+    drop_manifest_index(path)
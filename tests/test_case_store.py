@@ -0,0 +1,132 @@
+import argparse
+import datetime as dt
+import json
+import os
+
+import pytest
+
+from artifact_analyzer import case_store
+from artifact_analyzer.case_store import (
+    CaseStore,
+    decode_value,
+    encode_value,
+    mac_ts,
+    pack_payload,
+    phone_key,
+    unpack_payload,
+)
+from artifact_analyzer.messenger.sms.sms_analyser import ChatRow
+from artifact_analyzer.orchestrator import JobResult
+from headless.analyze import _export_case_queries
+
+
+def round_trip(value, rebase=None):
+    """Through JSON text, exactly as snapshots are stored."""
+    return decode_value(json.loads(json.dumps(encode_value(value))), rebase)
+
+
+@pytest.mark.parametrize("value", [
+    None, True, 0, -7, 3.5, "", "텍스트",
+    [1, "a", None],
+    (1, (2, "x")),
+    {"name": "a", "items": [1, 2]},
+    {1: "int key", ("a", 1): "tuple key", "$dollar": "reserved prefix"},
+    dt.datetime(2024, 5, 1, 12, 30, 15, 123456),
+    dt.datetime(2024, 5, 1, 12, 30, tzinfo=dt.timezone(dt.timedelta(hours=9))),
+    dt.date(2024, 5, 1),
+    b"\x00\xffbinary",
+])
+def test_round_trip_preserves_value_and_type(value):
+    decoded = round_trip(value)
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_bytes_like_values_decode_as_bytes():
+    assert round_trip(bytearray(b"ab")) == b"ab"
+    assert round_trip(memoryview(b"cd")) == b"cd"
+
+
+def test_allowlisted_object_round_trip():
+    row = ChatRow.__new__(ChatRow)
+    for name, value in zip(ChatRow.__slots__, (7, "+821012345678", 1.0, dt.datetime(2024, 1, 1), 2.0, "Kim")):
+        setattr(row, name, value)
+    decoded = round_trip({"rows": [row]})["rows"][0]
+    assert type(decoded) is ChatRow
+    assert [getattr(decoded, n) for n in ChatRow.__slots__] == [getattr(row, n) for n in ChatRow.__slots__]
+
+
+def test_unlisted_classes_are_refused():
+    class Unlisted:
+        pass
+
+    with pytest.raises(TypeError):
+        encode_value(Unlisted())
+    with pytest.raises(ValueError):
+        decode_value({"$obj": "os:system", "state": {}})
+    with pytest.raises(ValueError):
+        decode_value({"$obj": "subprocess:Popen", "state": {"args": "true"}})
+
+
+def test_dataframe_and_numpy_values():
+    pd = pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+    frame = pd.DataFrame({"a": [1, 2], "when": [pd.Timestamp("2024-01-01 10:00"), pd.NaT]})
+    decoded = round_trip(frame)
+    assert list(decoded.columns) == ["a", "when"]
+    assert decoded["a"].tolist() == [1, 2]
+    assert decoded["when"][0] == dt.datetime(2024, 1, 1, 10, 0)
+    assert pd.isna(decoded["when"][1])
+    assert round_trip(np.int64(5)) == 5 and round_trip(np.float64(0.5)) == 0.5
+
+
+def test_rebase_moves_paths_of_a_previous_case():
+    old, new = os.path.join("old", "backup"), os.path.join("new", "backup")
+    value = {
+        "path": os.path.join(old, "ab", "abcd"),
+        "root": old,
+        "sibling": old + "-other",                  # 접두사만 같은 다른 폴더
+        "text": "unrelated",
+    }
+    decoded = round_trip(value, rebase=(old, new))
+    assert decoded["path"] == os.path.join(new, "ab", "abcd")
+    assert decoded["root"] == new
+    assert decoded["sibling"] == old + "-other"
+    assert decoded["text"] == "unrelated"
+
+
+def test_payload_compression_round_trip():
+    value = {"messages": [("hello", dt.datetime(2024, 1, 1))] * 100}
+    blob = pack_payload(value)
+    assert len(blob) < len(json.dumps(encode_value(value)))
+    assert unpack_payload(blob) == value
+
+
+def test_normalizers():
+    assert phone_key("+82 10-1234-5678") == "01012345678"
+    assert phone_key("010-1234-5678") == "01012345678"
+    assert phone_key(None) == ""
+    assert mac_ts(0) is None and mac_ts("") is None and mac_ts(float("nan")) is None
+    assert mac_ts(1) == 978307201
+
+
+def test_exports_read_the_normalized_tables(sample_backup, tmp_path, monkeypatch):
+    monkeypatch.setattr(case_store, "remember_case", lambda *args: None)
+    store = CaseStore(sample_backup)
+    result = JobResult("chrome")
+    result.value = [("Later", "https://b.example", dt.datetime(2024, 1, 2)),
+                    ("Earlier", "https://a.example", dt.datetime(2024, 1, 1))]
+    result.count = 2
+    assert store.write_results([result]) == 2
+
+    assert [(r["kind"], r["title"], r["ts"]) for r in store.timeline()] == [
+        ("visit", "Earlier", 1704067200.0), ("visit", "Later", 1704153600.0)]
+    args = argparse.Namespace(out=str(tmp_path), timeline=1, number=["010-1234-5678"])
+    assert _export_case_queries(store, args) == {
+        "timeline": {"entries": 1, "output": "timeline.json"},
+        "numbers": {"numbers": 1, "output": "numbers.json"},
+    }
+    with open(tmp_path / "timeline.json", encoding="utf-8") as fp:
+        assert [row["detail"] for row in json.load(fp)] == ["https://a.example"]
+    with open(tmp_path / "numbers.json", encoding="utf-8") as fp:
+        assert json.load(fp) == {"010-1234-5678": {"contacts": [], "calls": [], "conversations": []}}
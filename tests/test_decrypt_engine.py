@@ -0,0 +1,202 @@
+import os
+import struct
+
+import pytest
+from Crypto.Cipher import AES
+
+from backup_analyzer.decrypt_engine import (
+    aes_unwrap,
+    decrypt_blob_file,
+    decrypt_files_parallel,
+    decrypt_in_place,
+    is_plaintext_size,
+    stage_plaintext,
+    unwrap_file_key,
+    verify_decrypted,
+)
+from conftest import mbfile_blob
+
+CLASS_KEY = bytes(range(32))
+PROTECTION_CLASS = 3
+
+
+def aes_wrap(kek: bytes, key: bytes) -> bytes:
+    """RFC 3394 key wrap (the inverse the engine never needs)."""
+    n = len(key) // 8
+    r = [struct.unpack_from(">Q", key, 8 * i)[0] for i in range(n)]
+    a = 0xA6A6A6A6A6A6A6A6
+    ecb = AES.new(kek, AES.MODE_ECB)
+    for j in range(6):
+        for i in range(n):
+            a, r[i] = struct.unpack(">QQ", ecb.encrypt(struct.pack(">QQ", a, r[i])))
+            a ^= n * j + i + 1
+    return struct.pack(">Q", a) + b"".join(struct.pack(">Q", v) for v in r)
+
+
+def cbc_encrypt(plain: bytes, key: bytes) -> bytes:
+    pad = 16 - len(plain) % 16
+    return AES.new(key, AES.MODE_CBC, iv=b"\x00" * 16).encrypt(plain + bytes([pad]) * pad)
+
+
+def encrypted_record(plain: bytes, file_key: bytes, protection: int = PROTECTION_CLASS) -> bytes:
+    wrapped = aes_wrap(CLASS_KEY, file_key)
+    encryption_key = {"NS.data": struct.pack("<I", protection) + wrapped}
+    return mbfile_blob(size=len(plain), protection=protection, extra={"EncryptionKey": encryption_key})
+
+
+def write_blob(root: str, file_id: str, data: bytes) -> str:
+    os.makedirs(os.path.join(root, file_id[:2]), exist_ok=True)
+    path = os.path.join(root, file_id[:2], file_id)
+    with open(path, "wb") as fp:
+        fp.write(data)
+    return path
+
+
+# ─────────────────────────────────────────────────────────────────
+# AES key unwrap (RFC 3394 §4)
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.parametrize("kek, key, wrapped", [
+    ("000102030405060708090A0B0C0D0E0F", "00112233445566778899AABBCCDDEEFF",
+     "1FA68B0A8112B447AEF34BD8FB5A7B829D3E862371D2CFE5"),
+    ("000102030405060708090A0B0C0D0E0F101112131415161718191A1B1C1D1E1F",
+     "00112233445566778899AABBCCDDEEFF000102030405060708090A0B0C0D0E0F",
+     "28C9F404C4B810F4CBCCB35CFB87F8263F5786E2D80ED326CBC7F0E71A99F43BFB988B9B7A02DD21"),
+])
+def test_aes_unwrap_rfc3394_vectors(kek, key, wrapped):
+    kek, key, wrapped = bytes.fromhex(kek), bytes.fromhex(key), bytes.fromhex(wrapped)
+    assert aes_wrap(kek, key) == wrapped
+    assert aes_unwrap(kek, wrapped) == key
+
+
+def test_aes_unwrap_rejects_bad_input():
+    kek = bytes.fromhex("000102030405060708090A0B0C0D0E0F")
+    wrapped = bytearray.fromhex("1FA68B0A8112B447AEF34BD8FB5A7B829D3E862371D2CFE5")
+    wrapped[-1] ^= 1
+    assert aes_unwrap(kek, bytes(wrapped)) is None
+    assert aes_unwrap(bytes(16), bytes.fromhex("1FA68B0A8112B447AEF34BD8FB5A7B829D3E862371D2CFE5")) is None
+    assert aes_unwrap(kek, b"\x00" * 8) is None
+
+
+def test_unwrap_file_key():
+    file_key = os.urandom(32)
+    assert unwrap_file_key({PROTECTION_CLASS: CLASS_KEY}, encrypted_record(b"abc", file_key)) == (file_key, 3)
+    assert unwrap_file_key({PROTECTION_CLASS: CLASS_KEY}, mbfile_blob(size=3)) == (None, -1)
+    with pytest.raises(ValueError):
+        unwrap_file_key({}, encrypted_record(b"abc", file_key))
+    with pytest.raises(ValueError):
+        unwrap_file_key({PROTECTION_CLASS: bytes(32)}, encrypted_record(b"abc", file_key))
+
+
+# ─────────────────────────────────────────────────────────────────
+# AES-CBC + padding
+# ─────────────────────────────────────────────────────────────────
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 4096])
+def test_decrypt_blob_file_strips_padding(tmp_path, size):
+    key, plain = os.urandom(32), os.urandom(size)
+    src, dst = tmp_path / "enc", tmp_path / "dec"
+    src.write_bytes(cbc_encrypt(plain, key))
+    assert decrypt_blob_file(str(src), str(dst), key, size) == size
+    assert dst.read_bytes() == plain
+
+
+@pytest.mark.parametrize("pad", [0, 17, 255])
+def test_decrypt_blob_file_rejects_invalid_padding(tmp_path, pad):
+    key = os.urandom(32)
+    src = tmp_path / "enc"
+    src.write_bytes(AES.new(key, AES.MODE_CBC, iv=b"\x00" * 16).encrypt(b"x" * 15 + bytes([pad])))
+    with pytest.raises(ValueError):
+        decrypt_blob_file(str(src), str(tmp_path / "dec"), key)
+
+
+def test_decrypt_blob_file_rejects_truncated_and_wrong_size(tmp_path):
+    key = os.urandom(32)
+    src = tmp_path / "enc"
+    src.write_bytes(cbc_encrypt(b"hello world", key)[:-1])
+    with pytest.raises(ValueError):
+        decrypt_blob_file(str(src), str(tmp_path / "dec"), key)
+    src.write_bytes(cbc_encrypt(b"hello world", key))
+    with pytest.raises(ValueError):
+        decrypt_blob_file(str(src), str(tmp_path / "dec"), key, expected_size=5)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 백업 안의 파일
+# ─────────────────────────────────────────────────────────────────
+def test_decrypt_in_place_is_idempotent(tmp_path):
+    root, file_id = str(tmp_path), "ab" + "0" * 38
+    file_key, plain = os.urandom(32), b"plaintext payload"
+    blob = encrypted_record(plain, file_key)
+    path = write_blob(root, file_id, cbc_encrypt(plain, file_key))
+    assert not is_plaintext_size(path, blob)
+    assert decrypt_in_place(root, file_id, blob, {PROTECTION_CLASS: CLASS_KEY})
+    with open(path, "rb") as fp:
+        assert fp.read() == plain
+    assert is_plaintext_size(path, blob)
+    assert stage_plaintext(root, file_id, blob, {PROTECTION_CLASS: CLASS_KEY}) == (True, None)
+    assert not os.path.exists(path + "_temp")
+
+
+def test_stage_plaintext_failures_leave_no_temp(tmp_path):
+    root, file_id = str(tmp_path), "cd" + "0" * 38
+    blob = encrypted_record(b"payload", os.urandom(32))
+    assert stage_plaintext(root, file_id, blob, {PROTECTION_CLASS: CLASS_KEY}) == (False, None)
+    path = write_blob(root, file_id, os.urandom(32))                # not this key's ciphertext
+    assert stage_plaintext(root, file_id, blob, {PROTECTION_CLASS: CLASS_KEY}) == (False, None)
+    assert not os.path.exists(path + "_temp")
+
+
+@pytest.mark.parametrize("decline_first", [False, True])
+def test_decrypt_files_parallel(tmp_path, decline_first):
+    root = str(tmp_path)
+    plains, files = {}, []
+    for n in range(40):
+        file_id = f"{n:02x}" + "1" * 38
+        plains[file_id] = os.urandom(n * 7)
+        file_key = os.urandom(32)
+        write_blob(root, file_id, cbc_encrypt(plains[file_id], file_key))
+        files.append((file_id, encrypted_record(plains[file_id], file_key)))
+
+    declined = set()
+
+    def replace(file_id, tmp):
+        if file_id not in declined:                 # 첫 시도는 "읽는 중" 으로 거절
+            declined.add(file_id)
+            return False
+        os.replace(tmp, os.path.join(root, file_id[:2], file_id))
+        return True
+
+    result = decrypt_files_parallel(root, {PROTECTION_CLASS: CLASS_KEY}, files, workers=2,
+                                    replace=replace if decline_first else None)
+    assert result == (40, 0)
+    for file_id, plain in plains.items():
+        with open(os.path.join(root, file_id[:2], file_id), "rb") as fp:
+            assert fp.read() == plain
+        assert not os.path.exists(os.path.join(root, file_id[:2], file_id + "_temp"))
+
+
+def test_verify_decrypted_checks_size_and_header(tmp_path):
+    root, key = str(tmp_path), os.urandom(32)
+    sqlite_plain = b"SQLite format 3\x00" + os.urandom(84)
+    cases = {
+        "sms.db": sqlite_plain,                            # 올바른 평문
+        "garbage.db": os.urandom(len(sqlite_plain)),       # 크기는 맞지만 헤더가 틀림
+        "notes.txt": os.urandom(50),                       # 시그니처 없는 형식 → 크기만
+        "still.plist": b"bplist00" + os.urandom(40),       # 아직 암호문
+        "missing.png": b"\x89PNG\r\n\x1a\n" + bytes(8),      # blob 없음
+    }
+    rows, ids = [], {}
+    for n, (name, plain) in enumerate(cases.items()):
+        file_id = f"{n:02x}" + "2" * 38
+        ids[name] = file_id
+        rows.append((file_id, f"Library/{name}", encrypted_record(plain, key)))
+        if name == "still.plist":
+            write_blob(root, file_id, cbc_encrypt(plain, key))
+        elif name != "missing.png":
+            write_blob(root, file_id, plain)
+    rows.append(("ff" + "2" * 38, "Library/plain.db", mbfile_blob(size=3)))   # 암호화 안 된 레코드
+    journaled = set(ids.values()) | {"ff" + "2" * 38}
+
+    stale, corrupt = verify_decrypted(root, rows, journaled)
+    assert stale == {ids["still.plist"], ids["missing.png"]}
+    assert corrupt == {ids["garbage.db"]}
+    assert verify_decrypted(root, rows, set()) == (set(), set())
@@ -0,0 +1,112 @@
+import os
+import plistlib
+
+import pytest
+
+from backup_analyzer import key_cache
+
+CLASS_KEYS = {1: bytes(range(32)), 3: bytes(range(32, 64)), 11: b"\xaa" * 32}
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Keep entries out of ``~`` and make scrypt cheap (cost is not under test)."""
+    root = str(tmp_path / "home" / ".ios_forensic")
+    monkeypatch.setattr(key_cache, "_CACHE_ROOT", root)
+    monkeypatch.setattr(key_cache, "_SCRYPT_N", 2 ** 10)
+    monkeypatch.setattr(key_cache, "_DERIVED", {})
+    return root
+
+
+@pytest.fixture
+def backup(tmp_path):
+    path = str(tmp_path / "backup")
+    os.makedirs(path)
+    write_manifest_plist(path, "00008030-001A2B3C4D5E6F70")
+    return path
+
+
+def write_manifest_plist(path: str, udid: str) -> None:
+    with open(os.path.join(path, "Manifest.plist"), "wb") as fp:
+        plistlib.dump({"Lockdown": {"UniqueDeviceID": udid}, "IsEncrypted": True}, fp)
+
+
+def entry_file(backup):
+    return key_cache._entry_path(key_cache.cache_id(backup))
+
+
+def test_round_trip(backup):
+    assert key_cache.load_class_keys(backup, "1234") is None
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    assert key_cache.load_class_keys(backup, "1234") == CLASS_KEYS
+    assert key_cache.load_class_keys(backup, b"1234") == CLASS_KEYS
+
+
+def test_wrong_passphrase_misses(backup):
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    assert key_cache.load_class_keys(backup, "12345") is None
+    assert key_cache.load_class_keys(backup, "") is None
+
+
+def test_entry_is_salted_and_keys_are_not_in_clear(backup):
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    with open(entry_file(backup), "rb") as fp:
+        first = fp.read()
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    with open(entry_file(backup), "rb") as fp:
+        second = fp.read()
+    assert first.startswith(b"IFKC2") and second.startswith(b"IFKC2")
+    assert first[5:5 + key_cache._SALT_SIZE] != second[5:5 + key_cache._SALT_SIZE]
+    for key in CLASS_KEYS.values():
+        assert key not in first
+    assert key_cache.load_class_keys(backup, "1234") == CLASS_KEYS
+
+
+def test_other_backup_or_session_misses(backup, cache_root):
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    write_manifest_plist(backup, "00008030-FFFFFFFFFFFFFFFF")           # 다른 Manifest.plist
+    assert key_cache.load_class_keys(backup, "1234") is None
+
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    os.remove(os.path.join(cache_root, "session.key"))                   # 세션 비밀값 분실
+    assert key_cache.load_class_keys(backup, "1234") is None
+
+
+def test_legacy_and_corrupt_entries_miss(backup):
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    path = entry_file(backup)
+    with open(path, "rb") as fp:
+        data = fp.read()
+    for bad in (b"IFKC1" + data[5:], data[:-1], data[:20]):
+        with open(path, "wb") as fp:
+            fp.write(bad)
+        assert key_cache.load_class_keys(backup, "1234") is None
+
+
+def test_hits_derive_the_key_once_per_process(backup, monkeypatch):
+    calls = []
+    scrypt = key_cache.hashlib.scrypt
+    monkeypatch.setattr(key_cache.hashlib, "scrypt", lambda *a, **kw: calls.append(1) or scrypt(*a, **kw))
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    assert len(calls) == 1
+    for _ in range(3):
+        assert key_cache.load_class_keys(backup, "1234") == CLASS_KEYS
+    assert len(calls) == 1                                               # 같은 프로세스 → KDF 없음
+
+    key_cache._DERIVED.clear()                                           # 새 프로세스
+    assert key_cache.load_class_keys(backup, "1234") == CLASS_KEYS
+    assert key_cache.load_class_keys(backup, "1234") == CLASS_KEYS
+    assert len(calls) == 2
+    assert key_cache.load_class_keys(backup, "12345") is None
+    assert len(calls) == 3
+
+
+def test_forget_and_missing_manifest(backup, tmp_path):
+    key_cache.store_class_keys(backup, "1234", CLASS_KEYS)
+    key_cache.forget_class_keys(backup)
+    assert not os.path.exists(entry_file(backup))
+    assert key_cache.load_class_keys(backup, "1234") is None
+
+    assert key_cache.cache_id(str(tmp_path)) is None
+    key_cache.store_class_keys(str(tmp_path), "1234", CLASS_KEYS)           # no-op
+    assert key_cache.load_class_keys(str(tmp_path), "1234") is None
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import struct
+import threading
+
+from backup_analyzer.manifest_index import (
+    FLAG_DIRECTORY,
+    FLAG_FILE,
+    ManifestIndex,
+    get_manifest_index,
+    join_tree_path,
+    split_tree_path,
+)
+from backup_analyzer.virtual_backup import drop_virtual_backup, register_virtual_backup
+from conftest import SAMPLE_ROWS, file_id_of, mbfile_blob
+
+
+def test_tree_path_round_trip():
+    assert split_tree_path("HomeDomain/HomeDomain/Library/SMS/sms.db") == ("HomeDomain", "Library/SMS/sms.db")
+    assert split_tree_path("HomeDomain/HomeDomain") == ("HomeDomain", "")
+    assert split_tree_path("HomeDomain") == ("HomeDomain", "")
+    for domain, rel_path, _ in SAMPLE_ROWS:
+        assert split_tree_path(join_tree_path(domain, rel_path)) == (domain, rel_path)
+
+
+def test_build_matches_manifest(sample_backup):
+    index = ManifestIndex.build(sample_backup, workers=0)
+    assert len(index) == len(SAMPLE_ROWS)
+    for domain, rel_path, payload in SAMPLE_ROWS:
+        assert index.file_id(domain, rel_path) == file_id_of(domain, rel_path)
+        assert index.flags(domain, rel_path) == (FLAG_DIRECTORY if payload is None else FLAG_FILE)
+        if payload is not None:
+            assert index.size(domain, rel_path) == len(payload)
+    assert index.file_id("HomeDomain", "Library/Missing") is None
+    assert index.file_id("NoSuchDomain", "Library") is None
+    assert sorted(index.domains) == sorted({d for d, _, _ in SAMPLE_ROWS})
+
+
+def test_row_accessors(sample_backup):
+    index = ManifestIndex.build(sample_backup, workers=0)
+    row = index.row("HomeDomain", "Library/SMS/sms.db")
+    assert index.row_domain(row) == "HomeDomain"
+    assert index.row_rel_path(row) == "Library/SMS/sms.db"
+    assert index.row_mode(row) == 0o100644
+    assert index.row_mtime(row) is not None
+    assert index.row_protection_class(row) == 3
+    assert not index.row_trashed(row)
+    assert list(index.iter_rows())[row] == (file_id_of("HomeDomain", "Library/SMS/sms.db"),
+                                            "HomeDomain", "Library/SMS/sms.db", FLAG_FILE)
+    assert "HomeDomain/HomeDomain/Library/SMS/sms.db" in index
+    assert "HomeDomain/HomeDomain/Library/SMS/missing.db" not in index
+
+
+def test_rel_path_and_file_id_lookups(sample_backup):
+    index = ManifestIndex.build(sample_backup, workers=0)
+    notes_id = file_id_of("AppDomain-com.example.app", "Documents/Notes.DB")
+    assert index.file_id_by_rel_path("Documents/Notes.DB") == notes_id
+    assert index.file_id_by_rel_path("documents/notes.db") is None
+    assert index.file_id_by_rel_path("documents/notes.db", nocase=True) == notes_id
+    assert index.lookup_file_id(notes_id) == ("AppDomain-com.example.app", "Documents/Notes.DB")
+    assert index.lookup_file_id("00" * 20) is None
+    assert index.lookup_file_id("not-hex") is None
+
+
+def test_resolve(sample_backup):
+    index = ManifestIndex.build(sample_backup, workers=0)
+    path = index.resolve("HomeDomain", "Library/SMS/sms.db")
+    with open(path, "rb") as fp:
+        assert fp.read() == b"sqlite"
+    assert index.resolve_rel_path("library/sms/SMS.DB", nocase=True) == path
+    assert index.resolve("HomeDomain", "Library") is None         # directory rows have no blob
+    os.remove(path)
+    assert index.resolve("HomeDomain", "Library/SMS/sms.db") is None
+
+
+def test_missing_manifest(tmp_path):
+    assert ManifestIndex.build(str(tmp_path), workers=0) is None
+    assert get_manifest_index(str(tmp_path)) is None
+    assert get_manifest_index("") is None
+
+
+def test_shared_index_is_reused_and_rebuilt_on_change(sample_backup):
+    assert get_manifest_index(sample_backup, build=False) is None
+    index = get_manifest_index(sample_backup)
+    assert get_manifest_index(sample_backup) is index
+    assert get_manifest_index(os.path.join(sample_backup, ".")) is index
+
+    with sqlite3.connect(os.path.join(sample_backup, "Manifest.db")) as conn:
+        conn.execute("INSERT INTO Files VALUES (?, 'HomeDomain', 'Library/new.txt', 1, NULL)",
+                     (file_id_of("HomeDomain", "Library/new.txt"),))
+    os.utime(os.path.join(sample_backup, "Manifest.db"), ns=(1, 1))
+    rebuilt = get_manifest_index(sample_backup)
+    assert rebuilt is not index
+    assert rebuilt.file_id("HomeDomain", "Library/new.txt") is not None
+    assert rebuilt.size("HomeDomain", "Library/new.txt") is None
+
+
+def test_concurrent_callers_share_one_build(sample_backup):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_manifest_index(sample_backup)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+
+
+def test_undecryptable_blob_is_unavailable(sample_backup):
+    index = ManifestIndex.build(sample_backup, workers=0)
+    sms_id = file_id_of("HomeDomain", "Library/SMS/sms.db")
+    # 잘못된 클래스 키로 감싼 것처럼 보이는 EncryptionKey → 복호화 실패
+    record = mbfile_blob(size=6, extra={"EncryptionKey": {"NS.data": struct.pack("<I", 3) + bytes(40)}})
+    with sqlite3.connect(os.path.join(sample_backup, "Manifest.db")) as conn:
+        conn.execute("UPDATE Files SET file = ? WHERE fileID = ?", (record, sms_id))
+    register_virtual_backup(sample_backup, {3: bytes(32)})
+    try:
+        assert os.path.exists(os.path.join(sample_backup, sms_id[:2], sms_id))
+        assert index.blob_path(sms_id) is None                      # never the raw ciphertext
+        assert index.resolve("HomeDomain", "Library/SMS/sms.db") is None
+        assert index.resolve_rel_path("Library/SMS/sms.db") is None
+        # records stored without encryption are still served from the blob
+        assert index.resolve("CameraRollDomain", "Media/DCIM/100APPLE/IMG_0001.JPG") is not None
+    finally:
+        drop_virtual_backup(sample_backup)
@@ -0,0 +1,101 @@
+import plistlib
+import struct
+
+import pytest
+
+from backup_analyzer import mbfile_decoder
+from backup_analyzer.mbfile_decoder import (
+    MBFileColumns,
+    decode_mbfile_columns,
+    decode_mbfile_record,
+    read_mbfile_encryption,
+)
+from conftest import mbfile_blob
+
+MISSING = (-1, -1, -1, -1, -1, -1, False)
+
+
+def plistlib_record(blob):
+    """The same fields the slow way, for comparison."""
+    archive = plistlib.loads(blob)
+    objects = archive["$objects"]
+    root = objects[archive["$top"]["root"]]
+    values = [root.get(key, -1) for key in ("Size", "LastModified", "Birth", "Mode", "InodeNumber", "ProtectionClass")]
+    trashed = False
+    if "ExtendedAttributes" in root:
+        xattrs = plistlib.loads(objects[root["ExtendedAttributes"]])
+        flag = xattrs.get("com.apple.assetsd.trashed")
+        trashed = flag[:1] == b"\x01" if isinstance(flag, bytes) else bool(flag)
+    return tuple(values) + (trashed,)
+
+
+def xattrs(**values):
+    return plistlib.dumps(values, fmt=plistlib.FMT_BINARY)
+
+
+@pytest.mark.parametrize("blob", [
+    mbfile_blob(),
+    mbfile_blob(size=123_456_789_012, mtime=1_700_000_000, birth=0, mode=0o40755, inode=2 ** 40, protection=11),
+    mbfile_blob(trashed=True),
+    mbfile_blob(extra={"ExtendedAttributes": xattrs(**{"com.apple.assetsd.trashed": b"\x00"})}),
+    mbfile_blob(extra={"ExtendedAttributes": xattrs(**{"com.apple.assetsd.trashed": True})}),
+    mbfile_blob(extra={"ExtendedAttributes": xattrs(**{"com.apple.assetsd.trashed": 1})}),
+    mbfile_blob(extra={"ExtendedAttributes": xattrs(**{"com.apple.assetsd.UUID": b"x"})}),
+    mbfile_blob(extra={f"Filler{i}": f"value {i}" for i in range(300)}),     # 2-byte refs / offsets
+], ids=["defaults", "large-values", "trashed", "not-trashed", "trashed-bool", "trashed-int",
+        "other-xattr", "wide-refs"])
+def test_record_matches_plistlib(blob):
+    assert decode_mbfile_record(blob) == plistlib_record(blob)
+
+
+def test_missing_fields_are_minus_one():
+    archive = plistlib.loads(mbfile_blob())
+    del archive["$objects"][1]["Size"], archive["$objects"][1]["InodeNumber"]
+    blob = plistlib.dumps(archive, fmt=plistlib.FMT_BINARY)
+    size, _mtime, _birth, _mode, inode, _prot, _trashed = decode_mbfile_record(blob)
+    assert size == -1 and inode == -1
+
+
+@pytest.mark.parametrize("blob", [
+    None, b"", b"bplist00", b"not a plist at all" * 4,
+    plistlib.dumps({"a": 1}, fmt=plistlib.FMT_BINARY),                       # no $top / $objects
+    plistlib.dumps({"$top": {"root": plistlib.UID(9)}, "$objects": ["$null"]}, fmt=plistlib.FMT_BINARY),
+    mbfile_blob()[:-8] + b"\xff" * 8,                                        # offset table out of range
+], ids=["none", "empty", "magic-only", "garbage", "plain-dict", "bad-root-uid", "bad-trailer"])
+def test_malformed_blobs_decode_as_missing(blob):
+    assert decode_mbfile_record(blob) == MISSING
+    assert read_mbfile_encryption(blob) is None
+
+
+def test_read_mbfile_encryption():
+    wrapped = bytes(range(40))
+    blob = mbfile_blob(size=77, protection=4,
+                       extra={"EncryptionKey": {"NS.data": struct.pack("<I", 4) + wrapped}})
+    assert read_mbfile_encryption(blob) == (4, wrapped, 77)
+    assert decode_mbfile_record(blob)[0] == 77
+    assert read_mbfile_encryption(mbfile_blob(size=77)) is None
+
+
+def test_columns_clamp_out_of_range_values():
+    cols = MBFileColumns()
+    cols.append((2 ** 64 - 1, -2 ** 63 - 1, 5, 2 ** 40, 2 ** 63, 300, True))
+    cols.append(decode_mbfile_record(mbfile_blob(size=2 ** 64 - 1, inode=2 ** 63)))   # 16-byte bplist ints
+    assert list(cols.sizes) == [-1, -1]
+    assert list(cols.mtimes)[0] == -1 and list(cols.births)[0] == 5
+    assert list(cols.modes)[0] == -1 and list(cols.inodes) == [-1, -1]
+    assert list(cols.protection)[0] == -1 and list(cols.trashed)[0] == 1
+
+
+def test_columns_preserve_order_in_and_out_of_process(monkeypatch):
+    blobs = [mbfile_blob(size=n, inode=n, trashed=n % 5 == 0) if n % 7 else None for n in range(60)]
+    expected = [decode_mbfile_record(blob) for blob in blobs]
+
+    def rows(cols):
+        return list(zip(cols.sizes, cols.mtimes, cols.births, cols.modes, cols.inodes,
+                        cols.protection, (bool(t) for t in cols.trashed)))
+
+    assert rows(decode_mbfile_columns(blobs)) == expected
+    monkeypatch.setattr(mbfile_decoder, "POOL_MIN_ROWS", 10)
+    monkeypatch.setattr(mbfile_decoder, "_POOL_CHUNK", 7)
+    assert rows(decode_mbfile_columns(blobs, workers=2)) == expected
+    assert len(MBFileColumns.from_bytes(decode_mbfile_columns(blobs).to_bytes())) == len(blobs)
@@ -0,0 +1,87 @@
+import fnmatch
+
+import pytest
+
+from backup_analyzer.backuphelper import BackupPathHelper
+from backup_analyzer.manifest_index import ManifestIndex
+from backup_analyzer.path_search import PathSearch, get_path_search
+from conftest import SAMPLE_ROWS, file_id_of, write_backup
+
+
+@pytest.fixture
+def search(sample_backup):
+    return PathSearch(ManifestIndex.build(sample_backup, workers=0))
+
+
+def paths(search, rows):
+    return sorted(search.index.row_rel_path(r) for r in rows)
+
+
+def reference(predicate):
+    """Rows the old ``LIKE`` queries would have returned, checked the slow way."""
+    return sorted(rel for domain, rel, _ in SAMPLE_ROWS if predicate(domain, rel))
+
+
+def test_contains_is_ascii_case_insensitive(search):
+    assert paths(search, search.find(contains="sms")) == reference(lambda d, r: "sms" in r.lower())
+    assert paths(search, search.find(contains="SMS", nocase=False)) == ["Library/SMS", "Library/SMS/sms.db"]
+    assert search.find(contains="no such thing") == []
+
+
+def test_suffix_prefix_and_glob(search):
+    assert paths(search, search.find(suffix=".db")) == ["Documents/Notes.DB", "Library/SMS/sms.db"]
+    assert paths(search, search.find(suffix=(".jpg", ".png"))) == \
+        ["Media/DCIM/100APPLE/IMG_0001.JPG", "Media/DCIM/100APPLE/IMG_0002.PNG"]
+    assert paths(search, search.find(prefix="library/")) == reference(lambda d, r: r.lower().startswith("library/"))
+    assert paths(search, search.find(glob="media/*/img_000?.*")) == \
+        reference(lambda d, r: fnmatch.fnmatchcase(r.lower(), "media/*/img_000?.*"))
+    assert paths(search, search.find(glob="*.[jp][pn]g")) == \
+        ["Media/DCIM/100APPLE/IMG_0001.JPG", "Media/DCIM/100APPLE/IMG_0002.PNG"]
+
+
+def test_criteria_are_and_ed(search):
+    rows = search.find(contains="img", suffix=".png", domain="CameraRollDomain")
+    assert paths(search, rows) == ["Media/DCIM/100APPLE/IMG_0002.PNG"]
+    assert search.find(contains="img", domain="HomeDomain") == []
+    assert paths(search, search.find(suffix=".db", domain_prefix="AppDomain")) == ["Documents/Notes.DB"]
+    assert paths(search, search.find(domain_contains="camera")) == reference(lambda d, r: d == "CameraRollDomain")
+
+
+def test_empty_needles_do_not_filter(search):
+    every = list(range(len(search.index)))
+    for criteria in ({"contains": ""}, {"suffix": ""}, {"prefix": ""}, {"suffix": ("", ".db")}, {"glob": "*"}):
+        assert search.find(**criteria) == every, criteria
+    assert search.find() == every
+    # 도메인 루트 행(relativePath "")만 빈 glob 과 일치
+    assert paths(search, search.find(glob="")) == [""]
+
+
+def test_limit_first_and_file_pairs(search):
+    rows = search.find(suffix=".db")
+    assert search.find(suffix=".db", limit=1) == rows[:1]
+    assert search.first(suffix=".db") == rows[0]
+    assert search.first(suffix=".nope") is None
+    assert search.file_pairs(search.find(suffix="sms.db")) == \
+        [(file_id_of("HomeDomain", "Library/SMS/sms.db"), "Library/SMS/sms.db")]
+
+
+def test_empty_manifest(tmp_path):
+    search = PathSearch(ManifestIndex.build(write_backup(str(tmp_path / "b"), []), workers=0))
+    assert search.find() == []
+    assert search.find(glob="*") == []
+    assert search.find(contains="") == []
+
+
+def test_shared_search_and_keyword_helper(sample_backup):
+    assert get_path_search(sample_backup, build=False) is None
+    search = get_path_search(sample_backup)
+    assert get_path_search(sample_backup) is search
+
+    helper = BackupPathHelper(sample_backup)
+    sms = [(file_id_of("HomeDomain", "Library/SMS/sms.db"), "Library/SMS/sms.db")]
+    assert helper.find_files_by_keyword("sms.db") == sms
+    assert helper.find_files_by_keyword("sms_db") == sms              # LIKE '_' → 아무 한 글자
+    assert helper.find_files_by_keyword("SMS%db") == sms              # LIKE '%' → 임의 문자열
+    assert helper.find_files_by_keyword("sms__db") == []
+    assert [p for _, p in helper.find_files_by_keyword("IMG", file_type=".png")] == \
+        ["Media/DCIM/100APPLE/IMG_0002.PNG"]
@@ -0,0 +1,90 @@
+from collections import defaultdict
+
+from backup_analyzer.build_tree import PathTrie, build_tree, compute_dir_stats, largest_directories
+from backup_analyzer.manifest_index import FLAG_DIRECTORY, FLAG_FILE, ManifestIndex
+from conftest import SAMPLE_ROWS, file_id_of, write_backup
+
+
+def nested_dict_tree(file_info_list):
+    """The original ``build_tree``: plain nested dicts, leaves are ``{}``."""
+    tree = defaultdict(dict)
+    for _file_id, domain, rel_path, _flags in file_info_list:
+        parts = rel_path.strip("/").split("/")
+        current_level = tree[domain]
+        for i, part in enumerate(parts):
+            if i < len(parts) - 1:
+                current_level = current_level.setdefault(part, {})
+            else:
+                current_level[part] = {}
+    return dict(tree)
+
+
+def as_dict(mapping):
+    return {name: as_dict(child) for name, child in mapping.items()}
+
+
+def named(tree):
+    """Drop the ``""`` entries of domain-root rows; every tree consumer skipped them."""
+    return {name: named(child) for name, child in tree.items() if name}
+
+
+def rows_of(entries):
+    return [(file_id_of(d, r), d, r, FLAG_DIRECTORY if p is None else FLAG_FILE) for d, r, p in entries]
+
+
+def test_trie_matches_nested_dict_tree(sample_backup):
+    index = ManifestIndex.build(sample_backup, workers=0)
+    trie, path_map = build_tree(index)
+    assert isinstance(trie, PathTrie)
+    assert path_map == {}
+    assert as_dict(trie) == named(nested_dict_tree(index.iter_rows()))
+
+
+def test_row_list_input_matches_nested_dict_tree():
+    rows = rows_of(SAMPLE_ROWS + [
+        ("HomeDomain", "/Library/Leading/slash.txt", b"x"),
+        ("HomeDomain", "Library/Trailing/", None),
+        ("MediaDomain", "a/b/c/d/e.txt", b"x"),
+    ])
+    trie, _ = build_tree(rows)
+    assert as_dict(trie) == named(nested_dict_tree(rows))
+
+
+def test_siblings_are_name_ordered_and_mapping_api_works():
+    rows = rows_of([("D", "z", b""), ("D", "a", b""), ("D", "m/x", b""), ("C", "", None)])
+    trie, _ = build_tree(rows)
+    assert list(trie) == ["C", "D"]
+    assert list(trie["D"]) == ["a", "m", "z"]
+    node = trie["D"]["m"]
+    assert node.name == "m" and node.flags is None and node.file_id is None  # implicit directory
+    leaf = node["x"]
+    assert not leaf and leaf.flags == FLAG_FILE and leaf.file_id == file_id_of("D", "m/x")
+    assert trie.find("D", "m/x") == leaf.node
+    assert trie.find("D", "missing") == -1
+    assert "missing" not in trie and "D" in trie
+
+
+def test_dir_stats_roll_up_recursively(tmp_path):
+    path = write_backup(str(tmp_path / "b"), [
+        ("HomeDomain", "Library", None),
+        ("HomeDomain", "Library/a.bin", b"x" * 10),
+        ("HomeDomain", "Library/Sub/b.bin", b"x" * 100),
+        ("HomeDomain", "Library/Sub/Deeper/c.bin", b"x" * 1000),
+        ("HomeDomain", "Empty", None),
+    ])
+    index = ManifestIndex.build(path, workers=0)
+    trie, _ = build_tree(index)
+    stats = compute_dir_stats(trie, index)
+    assert stats["HomeDomain/HomeDomain"].total_bytes == 1110
+    assert stats["HomeDomain/HomeDomain"].file_count == 3
+    assert stats["HomeDomain/HomeDomain/Library/Sub"].total_bytes == 1100
+    assert stats["HomeDomain/HomeDomain/Empty"].file_count == 0
+    assert "HomeDomain/HomeDomain/Library/a.bin" not in stats
+    newest = max(index.row_mtime(r) for r in range(len(index)) if index.row_flags(r) == FLAG_FILE)
+    assert stats["HomeDomain/HomeDomain"].newest_mtime == newest
+    assert [p for p, _ in largest_directories(stats, 2)] == ["HomeDomain/HomeDomain", "HomeDomain/HomeDomain/Library"]
+
+    # a trie built from a row list is rolled up against the index's own trie
+    row_trie, _ = build_tree(list(index.iter_rows()))
+    assert {k: v.total_bytes for k, v in compute_dir_stats(row_trie, index).items()} == \
+        {k: v.total_bytes for k, v in stats.items()}